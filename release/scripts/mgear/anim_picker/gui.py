@@ -45,6 +45,7 @@ from .widgets import overlay_widgets
 
 from .handlers import __EDIT_MODE__
 from .handlers import __SELECTION__
+from .handlers import __SELECTION_INDEX__
 from mgear.core.six.moves import range
 
 # constants -------------------------------------------------------------------
@@ -2157,6 +2158,7 @@ class MainDockWindow(QtWidgets.QWidget):
             self.make_node_active(current_node)
 
         # Refresh selection check
+        __SELECTION_INDEX__.invalidate()
         self.selection_change_event()
 
         # Force view resize
@@ -2282,6 +2284,7 @@ class MainDockWindow(QtWidgets.QWidget):
         self.tab_widget.fit_contents()
 
         # Update selection states
+        __SELECTION_INDEX__.invalidate()
         self.selection_change_event()
 
     def save_character(self):
@@ -2334,7 +2337,7 @@ class MainDockWindow(QtWidgets.QWidget):
         )
         # Add scene open event
         self.cb_manager.newSceneCB(
-            "anim_picker_newScene", self.selection_change_event
+            "anim_picker_newScene", self.scene_change_event
         )
 
     def selection_change_event(self, *args):
@@ -2351,19 +2354,28 @@ class MainDockWindow(QtWidgets.QWidget):
         __SELECTION__.update()
 
         # sync with namespce
-        if not __EDIT_MODE__.get():
-            sel = pm.selected()
-            sync = self.checkbox.isChecked()
-            if sel and sync:
-                ns = sel[0].namespace()
-                if ns:
-                    for i, n in enumerate(self.char_selector_cb.nodes):
-                        if ns in str(n):
-                            self.char_selector_cb.setCurrentIndex(i)
-                            break
-        # Update controls for active tab
-        for item in self.get_picker_items():
-            item.run_selection_check()
+        sync = self.checkbox.isChecked()
+        sel = cmds.ls(sl=True, head=1)
+        if sel and sync:
+            name = sel[0].split("|")[-1]
+            if ":" in name:
+                ns = name.rsplit(":", 1)[0] + ":"
+                for i, n in enumerate(self.char_selector_cb.nodes):
+                    if ns in str(n):
+                        self.char_selector_cb.setCurrentIndex(i)
+                        break
+
+        # Update controls for active tab. Only the items of the controls
+        # with a different selection state are updated
+        view = self.tab_widget.currentWidget()
+        if view is None:
+            return
+        __SELECTION_INDEX__.update(view.scene(), view.get_picker_items)
+
+    def scene_change_event(self, *args):
+        """Event called with a script job from maya on new scene"""
+        __SELECTION_INDEX__.invalidate()
+        self.selection_change_event()
 
 
 # version of the anim picker ui that uses MayaQWidgetDockableMixin for docking
@@ -10,3 +10,4 @@ from . import maya_handlers
 # INIT HANDLERS INSTANCES
 __EDIT_MODE__ = mode_handlers.EditMode()
 __SELECTION__ = maya_handlers.SelectionCheck()
+__SELECTION_INDEX__ = maya_handlers.SelectionIndex()
@@ -183,3 +183,103 @@ class SelectionCheck(object):
 
         # Check if node is in selection lest
         return self.sel.hasItem(node)
+
+
+class SelectionIndex(object):
+    """Control to picker items index, used to update the items selection
+    state from the selection changes only.
+
+    The controls of the items are resolved once, when the index is built,
+    and stored by MObjectHandle hash code. On selection change only the
+    items of the controls added or removed from the selection are updated.
+
+    The index is rebuilt when an indexed control was deleted, like on a
+    reference unload, or when a control not found at build time could have
+    been created since, like on a reference load.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.items = {}
+        self.handles = {}
+        self.selected = set()
+        self.unresolved = False
+
+    def invalidate(self):
+        """Will force the index rebuild on next update"""
+        self.key = None
+
+    @staticmethod
+    def get_selected_hashes():
+        """Return the hash codes of the active selection nodes"""
+        sel = OpenMaya.MSelectionList()
+        OpenMaya.MGlobal.getActiveSelectionList(sel)
+
+        hashes = set()
+        mobject = OpenMaya.MObject()
+        for i in range(sel.length()):
+            try:
+                sel.getDependNode(i, mobject)
+            except RuntimeError:
+                continue
+            hashes.add(OpenMaya.MObjectHandle(mobject).hashCode())
+        return hashes
+
+    def rebuild(self, key, items):
+        """Will index the items controls and set all the items state
+
+        Only items with a single associated control are indexed, like
+        PickerItem.is_selected
+        """
+        self.key = key
+        self.items = {}
+        self.handles = {}
+        self.selected = self.get_selected_hashes()
+        self.unresolved = False
+
+        for item in items:
+            controls = item.get_controls()
+            mobject = None
+            if len(controls) == 1:
+                mobject = SelectionCheck.get_node_mobject(controls[0])
+                # the control could be created later
+                self.unresolved = self.unresolved or not mobject
+            if not mobject or not mobject.hasFn(OpenMaya.MFn.kDagNode):
+                item.set_selected_state(False)
+                continue
+
+            handle = OpenMaya.MObjectHandle(mobject)
+            hash_code = handle.hashCode()
+            self.handles[hash_code] = handle
+            self.items.setdefault(hash_code, []).append(item)
+            item.set_selected_state(hash_code in self.selected)
+
+    def update(self, key, get_items):
+        """Will update the items selection state
+
+        Args:
+            key (object): index key, the index is rebuilt if it changes
+            get_items (function): return the picker items to index
+        """
+        if key is not self.key:
+            self.rebuild(key, get_items())
+            return
+
+        selected = self.get_selected_hashes()
+        changed = selected.symmetric_difference(self.selected)
+        self.selected = selected
+
+        # controls deleted since the index was built, the hash codes could
+        # be reused by new nodes. Or unknown nodes selected, that could be
+        # controls created since the index was built
+        stale = not all(h.isValid() for h in self.handles.values())
+        unknown = self.unresolved and any(
+            h not in self.handles for h in changed & selected
+        )
+        if stale or unknown:
+            self.rebuild(key, get_items())
+            return
+
+        for hash_code in changed:
+            for item in self.items.get(hash_code, []):
+                item.set_selected_state(hash_code in selected)
@@ -1,4 +1,7 @@
+from mgear.core import bake
 from mgear.core import pyqt
+from mgear.core import sampling
+from mgear.core import utils
 from mgear.vendor.Qt import QtCore, QtWidgets
 from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
 import mgear.pymaya as pm
@@ -100,31 +103,61 @@ class SpaceRecorderUI(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         frame_range = int(end - start) + 1
         # store
         oSel = pm.selected()
-        ct = start
-        p_amount = 0
-        increment = 100 / frame_range
-        pm.progressWindow(
-            title="Recording World Spaces", progress=p_amount, max=100
-        )
-        for i in range(frame_range):
-            frame_spaces = []
+        increment = 100.0 / frame_range
+        pm.progressWindow(title="Recording World Spaces", progress=0, max=100)
+
+        def update_progress(index, frame):
             pm.progressWindow(
                 e=True,
-                progress=p_amount,
-                status="Recording Frame:{} ".format(str(i)),
+                progress=(index + 1) * increment,
+                status="Recording Frame:{} ".format(str(index)),
+            )
+
+        try:
+            samples = sampling.sample_world_matrices(
+                oSel,
+                [int(start) + i for i in range(frame_range)],
+                callback=update_progress,
             )
-            for x in oSel:
-                pm.currentTime(int(ct))
-                space = []
-                space.append(x)
-                space.append(x.getMatrix(worldSpace=True))
-                frame_spaces.append(space)
-            ct += 1
-            cls.world_spaces[buffer].append(frame_spaces)
-            p_amount += increment
-        pm.progressWindow(e=True, endProgress=True)
+        finally:
+            pm.progressWindow(e=True, endProgress=True)
+        cls.world_spaces[buffer] = [
+            [[x, samples.get_matrix(i, e)] for e, x in enumerate(oSel)]
+            for i in range(frame_range)
+        ]
+
+    @classmethod
+    def _bake_spaces(cls, nodes, spaces, title):
+        """Set the world spaces on each frame and key the nodes in bulk
+
+        Args:
+            nodes (list): the nodes to key
+            spaces (list): the world matrix of each node, per frame
+            title (str): progress window title
+        """
+        start = pm.playbackOptions(q=True, min=True)
+        end = pm.playbackOptions(q=True, max=True)
+        frame_range = int(end - start) + 1
+        frames = [int(start) + i for i in range(frame_range)]
+        increment = 100.0 / frame_range
+        pm.progressWindow(title=title, progress=0, max=100)
+        recorder = bake.TransformRecorder(nodes, frame_range)
+        try:
+            for i, frame in sampling.iter_frames(frames):
+                pm.progressWindow(
+                    e=True,
+                    progress=i * increment,
+                    status="Apply Frame:{} ".format(str(i)),
+                )
+                for x, matrix in zip(nodes, spaces[i]):
+                    x.setMatrix(matrix, worldSpace=True)
+                recorder.record(i)
+            bake.write_keys(recorder.get_values(), frames)
+        finally:
+            pm.progressWindow(e=True, endProgress=True)
 
     @classmethod
+    @utils.one_undo
     def apply_spaces(cls, buffer=0):
         """Apply the archived world spaces  using the timeline range
 
@@ -134,31 +167,15 @@ class SpaceRecorderUI(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         if not cls.world_spaces[buffer]:
             pm.displayWarning("Space buffer is empty. Please record before")
             return
-        start = pm.playbackOptions(q=True, min=True)
-        end = pm.playbackOptions(q=True, max=True)
-        frame_range = int(end - start) + 1
-        ct = start
-        p_amount = 0
-        increment = 100 / frame_range
-        pm.progressWindow(
-            title="Apply World Spaces", progress=p_amount, max=100
-        )
-        for i in range(frame_range):
-            pm.currentTime(int(ct))
-            frame_spaces = cls.world_spaces[buffer][i]
-            pm.progressWindow(
-                e=True,
-                progress=p_amount,
-                status="Apply Frame:{} ".format(str(i)),
-            )
-            for space in frame_spaces:
-                space[0].setMatrix(space[1], worldSpace=True)
-                pm.setKeyframe(space[0])
-            ct += 1
-            p_amount += increment
-        pm.progressWindow(e=True, endProgress=True)
+        nodes = [space[0] for space in cls.world_spaces[buffer][0]]
+        spaces = [
+            [space[1] for space in frame_spaces]
+            for frame_spaces in cls.world_spaces[buffer]
+        ]
+        cls._bake_spaces(nodes, spaces, "Apply World Spaces")
 
     @classmethod
+    @utils.one_undo
     def apply_to_selection(cls, buffer=0):
         """Apply the world spaces to the selected object using the timeline range
         The order of selection will determine the space used relative to the order
@@ -174,25 +191,13 @@ class SpaceRecorderUI(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         if not oSel:
             pm.displayWarning("Please select object to apply spaces")
             return
-        start = pm.playbackOptions(q=True, min=True)
-        end = pm.playbackOptions(q=True, max=True)
-        frame_range = int(end - start) + 1
-        ct = start
-        p_amount = 0
-        increment = 100 / frame_range
-        pm.progressWindow(
-            title="Apply To Selection World Spaces", progress=p_amount, max=100
+        spaces = [
+            [frame_spaces[e][1] for e in range(len(oSel))]
+            for frame_spaces in cls.world_spaces[buffer]
+        ]
+        cls._bake_spaces(
+            oSel, spaces, "Apply To Selection World Spaces"
         )
-        for i in range(frame_range):
-            pm.currentTime(int(ct))
-            frame_spaces = cls.world_spaces[buffer][i]
-            for e, x in enumerate(oSel):
-                frame_spaces[e][1]
-                x.setMatrix(frame_spaces[e][1], worldSpace=True)
-                pm.setKeyframe(x)
-            ct += 1
-            p_amount += increment
-        pm.progressWindow(e=True, endProgress=True)
 
     @classmethod
     def record_spaces_A(cls):
@@ -3,8 +3,6 @@ import re
 import traceback
 from functools import partial
 
-from .six import PY2
-
 # Maya imports
 from maya import cmds
 import mgear.pymaya as pm
@@ -15,7 +13,9 @@ import mgear
 from mgear.vendor.Qt import QtCore
 from mgear.vendor.Qt import QtWidgets
 from mgear.core import pyqt
+from mgear.core import bake
 from mgear.core import dag
+from mgear.core import sampling
 from mgear.core import transform
 from mgear.core import utils
 from mgear.core import attribute
@@ -197,18 +197,41 @@ def recordNodesMatrices(nodes, desiredTime):
     """get the matrices of the nodes provided and return a dict of
     node:matrix
 
+    The matrices are evaluated in a DG context, so the current time is not
+    changed.
+
     Args:
         nodes (list): of nodes
+        desiredTime (float): the frame to evaluate
 
     Returns:
         dict: node:node matrix
     """
-    nodeToMat_dict = {}
-    for fk in nodes:
-        fk = pm.PyNode(fk)
-        nodeToMat_dict[fk.name()] = fk.getAttr("worldMatrix", time=desiredTime)
+    return recordNodesMatricesRange(
+        nodes, [desiredTime], method=sampling.CONTEXT
+    )[desiredTime]
+
+
+def recordNodesMatricesRange(nodes, frames, method=sampling.TIME):
+    """get the matrices of the nodes provided for each frame
 
-    return nodeToMat_dict
+    Args:
+        nodes (list): of nodes
+        frames (list): of frames
+        method (str, optional): sampling method, "time" or "context"
+
+    Returns:
+        dict: frame:{node:node matrix}
+    """
+    nodes = [pm.PyNode(n) for n in nodes]
+    names = [n.name() for n in nodes]
+    samples = sampling.sample_world_matrices(nodes, frames, method=method)
+    return {
+        frame: {
+            name: samples.get_matrix(fi, ni) for ni, name in enumerate(names)
+        }
+        for fi, frame in enumerate(samples.frames)
+    }
 
 
 def getRootNode():
@@ -1811,16 +1834,9 @@ class AbstractAnimationTransfer(QtWidgets.QDialog):
         # type = (int, int, List[pm.nodetypes.Transform]) ->
         # List[List[pm.datatypes.Matrix]]
         """returns matrice List[frame][controller number]."""
-        res = []
-        for idx, x in enumerate(range(start, end + 1)):
-            tmp = []
-            for n in val_src_nodes:
-                if n:
-                    tmp.append(cmds.getAttr(n + ".worldMatrix", time=x))
-                else:
-                    tmp.append(None)
-            res.append(tmp)
-        return res
+        return sampling.sample_world_matrices(
+            val_src_nodes, range(start, end + 1)
+        ).to_lists()
 
     def transfer(self, startFrame, endFrame, onlyKeyframes, *args, **kwargs):
         # type = (int, int, bool, *str, **str) -> None
@@ -1880,44 +1896,46 @@ class AbstractAnimationTransfer(QtWidgets.QDialog):
         # them into the getWorldMatrix function.
         # Doing it thisway should be safe as we've touched the least amount
         # of code.
-        worldMatrixList = self.getWorldMatrices(
-            startFrame, endFrame, val_src_nodes)
-
         src_keys = pm.keyframe(key_src_nodes, at=["t", "r", "s"], q=True)
         if not src_keys:
             src_keys = []
         keyframeList = sorted(set(src_keys))
-        # if src_keys:
 
-        #     keyframeList = sorted(set(src_keys))
-        # else:
-        #     pm.displayWarning("No keys to transfer.")
-        #     return
+        frames = [
+            x
+            for x in range(startFrame, endFrame + 1)
+            if not onlyKeyframes or x in keyframeList
+        ]
+        samples = sampling.sample_world_matrices(val_src_nodes, frames)
 
         # delete animation in the space switch channel and destination ctrls
         pm.cutKey(key_dst_nodes, at=channels, time=(startFrame, endFrame))
         pm.cutKey(switch_attr_name, time=(startFrame, endFrame))
 
-        for i, x in enumerate(range(startFrame, endFrame + 1)):
-
-            if onlyKeyframes and x not in keyframeList:
-                continue
-
-            pm.currentTime(x)
+        # pose the controls on each frame and record the local values. The
+        # keys are written at the end, in bulk
+        recorder = bake.TransformRecorder(key_dst_nodes, len(frames))
+        switch_values = []
+        for i, x in sampling.iter_frames(frames):
 
             # set the new space in the channel
             self.changeAttrToBoundValue()
+            switch_values.append(cmds.getAttr(switch_attr_name))
 
             # bake the stored transforms to the cotrols
             for j, n in enumerate(key_dst_nodes):
-                if worldMatrixList[i][j]:
-                    n.setMatrix(worldMatrixList[i][j], worldSpace=True)
+                matrix = samples.get(i, j)
+                if matrix:
+                    n.setMatrix(matrix, worldSpace=True)
             if definition == "IK":
                 match_fk_to_ik_arbitrary_lengths(key_src_nodes, switch_attr_name.split(".")[0],
                                                  switch_attr_name.split(".")[1], key_dst_nodes[1])
 
-            pm.setKeyframe(key_dst_nodes, at=channels)
-            pm.setKeyframe(switch_attr_name)
+            recorder.record(i)
+
+        values = recorder.get_values()
+        values[switch_attr_name] = switch_values
+        bake.write_keys(values, frames)
 
         # if versions.current() <= 20180200:
         pm.cycleCheck(e=True)
@@ -1986,40 +2004,39 @@ class ParentSpaceTransfer(AbstractAnimationTransfer):
 
         # get world transform data for the source nodes
         # and store them in a list for each frame
-        world_transform_data = []
-        for i, x in enumerate(range(startFrame, endFrame + 1)):
-            world_transform_data_frame = []
-            if onlyKeyframes and x not in keyframeList:
-                world_transform_data.append([])
-                continue
-
-            pm.currentTime(x)
-            for j, n in enumerate(val_src_nodes):
-                world_transform_data_frame.append(transform.get_world_transform_data(n))
-
-            world_transform_data.append(world_transform_data_frame)
+        frames = [
+            x
+            for x in range(startFrame, endFrame + 1)
+            if not onlyKeyframes or x in keyframeList
+        ]
+        world_transform_data = {}
+        for i, x in sampling.iter_frames(frames):
+            world_transform_data[x] = [
+                transform.get_world_transform_data(n) for n in val_src_nodes
+            ]
         # delete animation in the space switch channel and destination ctrls
         pm.cutKey(key_dst_nodes, at=channels, time=(startFrame, endFrame))
         pm.cutKey(switch_attr_name, time=(startFrame, endFrame))
 
-        # set world transform data to the destination nodes
-        # and set keyframes for the switch attribute
-        for i, x in enumerate(range(startFrame, endFrame + 1)):
-
-            if onlyKeyframes and x not in keyframeList:
-                continue
-
-            pm.currentTime(x)
+        # set world transform data to the destination nodes and record the
+        # local values. The keys are written at the end, in bulk
+        recorder = bake.TransformRecorder(key_dst_nodes, len(frames))
+        switch_values = []
+        for i, x in sampling.iter_frames(frames):
 
             # set the new space in the channel
             self.changeAttrToBoundValue()
+            switch_values.append(cmds.getAttr(switch_attr_name))
 
             # bake the stored transforms to the cotrols
             for j, n in enumerate(key_dst_nodes):
-                transform.set_world_transform_data(n, world_transform_data[i][j])
+                transform.set_world_transform_data(n, world_transform_data[x][j])
+
+            recorder.record(i)
 
-            pm.setKeyframe(key_dst_nodes, at=channels)
-            pm.setKeyframe(switch_attr_name)
+        values = recorder.get_values()
+        values[switch_attr_name] = switch_values
+        bake.write_keys(values, frames)
 
     def transfer(self, startFrame, endFrame, onlyKeyframes, *args, **kwargs):
         # type = (int, int, bool, *str, **str) -> None
@@ -2563,11 +2580,12 @@ class SpineIkFkTransfer(AbstractAnimationTransfer):
             print("Maya version older than: 2018.02")
 
         # create a dict of every frame, and every node involved on that frame
-        matchMatrix_dict = {}
-        for i, x in enumerate(range(startFrame, endFrame + 1)):
-            if onlyKeyframes and x not in keyframeList:
-                continue
-            matchMatrix_dict[x] = recordNodesMatrices(fkControls, x)
+        frames = [
+            x
+            for x in range(startFrame, endFrame + 1)
+            if not onlyKeyframes or x in keyframeList
+        ]
+        matchMatrix_dict = recordNodesMatricesRange(fkControls, frames)
 
         channels = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
 
@@ -2575,16 +2593,15 @@ class SpineIkFkTransfer(AbstractAnimationTransfer):
         pm.cutKey(fkControls, at=channels, time=(startFrame, endFrame))
         pm.cutKey(ikControls, at=channels, time=(startFrame, endFrame))
 
-        if PY2:
-            dic_items = matchMatrix_dict.iteritems
-        else:
-            dic_items = matchMatrix_dict.items
-
-        for frame, matchDict in dic_items():
-            pm.currentTime(frame)
-            transferFunc(fkControls, ikControls, matchMatrix_dict=matchDict)
-
-            pm.setKeyframe(key_dst_nodes, at=channels)
+        # pose the controls on each frame and record the local values. The
+        # keys are written at the end, in bulk
+        recorder = bake.TransformRecorder(key_dst_nodes, len(frames))
+        for i, frame in sampling.iter_frames(frames):
+            transferFunc(
+                fkControls, ikControls, matchMatrix_dict=matchMatrix_dict[frame]
+            )
+            recorder.record(i)
+        bake.write_keys(recorder.get_values(), frames)
         # If there are keys on the source node outside of the provided range
         # this wont have an effect
         attribute.reset_SRT(key_src_nodes)
@@ -0,0 +1,99 @@
+"""Undo support for the API calls.
+
+The API edits (MFnSkinCluster.setWeights, MPlug.setFloat...) are not
+registered in the undo queue. This module is also a Maya plug-in defining
+the mgearApiUndo command: the command doesn't edit the scene, it only
+registers an undo and a redo function in the undo queue, so the API edit is
+undone with the commands around it.
+
+Example:
+    >>> old = fn_skin.setWeights(path, comp, infs, new, returnOldWeights=True)
+    >>> api_undo.commit(
+    ...     undo=lambda: fn_skin.setWeights(path, comp, infs, old),
+    ...     redo=lambda: fn_skin.setWeights(path, comp, infs, new),
+    ... )
+"""
+
+#############################################
+# GLOBAL
+#############################################
+from maya import cmds
+import maya.api.OpenMaya as om2
+
+COMMAND_NAME = "mgearApiUndo"
+PLUGIN_NAME = "api_undo"
+
+# undo and redo functions of the next command call
+try:
+    _PENDING
+except NameError:
+    _PENDING = []
+
+
+def maya_useNewAPI():
+    """Tell Maya this plug-in uses the API 2.0"""
+
+
+class ApiUndoCommand(om2.MPxCommand):
+    """Register the pending undo and redo functions in the undo queue"""
+
+    def __init__(self):
+        super(ApiUndoCommand, self).__init__()
+        self.undo_function = None
+        self.redo_function = None
+
+    @staticmethod
+    def creator():
+        return ApiUndoCommand()
+
+    def doIt(self, args):
+        # Maya loads the plug-in file as another module, the functions are
+        # pending in the mgear module
+        from mgear.core import api_undo
+
+        if api_undo._PENDING:
+            self.undo_function, self.redo_function = api_undo._PENDING.pop()
+
+    def undoIt(self):
+        if self.undo_function:
+            self.undo_function()
+
+    def redoIt(self):
+        if self.redo_function:
+            self.redo_function()
+
+    def isUndoable(self):
+        return True
+
+
+def initializePlugin(plugin):
+    om2.MFnPlugin(plugin, "mGear").registerCommand(
+        COMMAND_NAME, ApiUndoCommand.creator
+    )
+
+
+def uninitializePlugin(plugin):
+    om2.MFnPlugin(plugin).deregisterCommand(COMMAND_NAME)
+
+
+#############################################
+# COMMIT
+#############################################
+
+
+def load():
+    """Load the undo command plug-in, if not loaded yet"""
+    if not cmds.pluginInfo(PLUGIN_NAME, query=True, loaded=True):
+        cmds.loadPlugin(__file__.replace(".pyc", ".py"), quiet=True)
+
+
+def commit(undo, redo):
+    """Register an API edit already done in the undo queue
+
+    Args:
+        undo (function): Function reverting the edit
+        redo (function): Function doing the edit again
+    """
+    load()
+    _PENDING.append((undo, redo))
+    getattr(cmds, COMMAND_NAME)()
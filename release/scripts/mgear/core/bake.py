@@ -0,0 +1,333 @@
+"""Bulk keyframe writer for animation bakes.
+
+The bake tools evaluate the destination controls frame by frame, but the
+keys are not set on every frame. The local channel values are recorded in
+memory, filtered and then written as whole animation curves at once.
+
+Every curve is written with a fixed number of commands, independent of the
+number of keys: the key times and values are set in a single setAttr on a
+new animCurve node, or added to the existing curve in a single
+MFnAnimCurve.addKeys call. The frames to key, i.e. only the keyframes of the
+source, are filtered by the caller.
+
+Example:
+    >>> recorder = bake.TransformRecorder(controls, len(frames))
+    >>> for i, frame in sampling.iter_frames(frames):
+    ...     # pose the controls
+    ...     recorder.record(i)
+    >>> bake.write_keys(recorder.get_values(), frames)
+"""
+
+import math
+from array import array
+
+from maya import cmds
+import maya.api.OpenMaya as om
+
+from mgear.core import api_undo
+from mgear.core import utils
+
+TRS_CHANNELS = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
+ROTATE_CHANNELS = ("rx", "ry", "rz")
+
+# axes sequence of each rotate order value
+ROTATE_ORDER_AXES = ("xyz", "yzx", "zxy", "xzy", "yxz", "zyx")
+
+# animCurve type by attribute type
+CURVE_TYPES = {"doubleLinear": "animCurveTL", "doubleAngle": "animCurveTA"}
+DEFAULT_CURVE_TYPE = "animCurveTU"
+
+
+##########################################################
+# EULER FILTER
+##########################################################
+
+
+def _closest_angle(angle, reference, period):
+    return angle - period * round((angle - reference) / period)
+
+
+def euler_filter(rx, ry, rz, rotate_order=0, period=360.0):
+    """Remove the euler flips of a rotation sequence.
+
+    For each frame, the equivalent rotation closest to the previous frame
+    is used. The equivalent rotations are the full turn offsets and the
+    alternate solution (a + 180, 180 - b, c + 180) of the rotate order axes.
+
+    Args:
+        rx (list): X rotation values
+        ry (list): Y rotation values
+        rz (list): Z rotation values
+        rotate_order (int, optional): Rotate order attribute value
+        period (float, optional): Full turn value. 360 for degrees
+
+    Returns:
+        tuple: The filtered rx, ry and rz lists
+    """
+    half = period * 0.5
+    axes = ROTATE_ORDER_AXES[rotate_order]
+    channels = {"x": list(rx), "y": list(ry), "z": list(rz)}
+    for i in range(1, len(channels["x"])):
+        previous = {a: channels[a][i - 1] for a in "xyz"}
+        current = {a: channels[a][i] for a in "xyz"}
+        alternate = dict(current)
+        alternate[axes[0]] += half
+        alternate[axes[1]] = half - alternate[axes[1]]
+        alternate[axes[2]] += half
+
+        best = None
+        best_distance = None
+        for candidate in (current, alternate):
+            closest = {
+                a: _closest_angle(candidate[a], previous[a], period)
+                for a in "xyz"
+            }
+            distance = sum(abs(closest[a] - previous[a]) for a in "xyz")
+            if best is None or distance < best_distance:
+                best = closest
+                best_distance = distance
+        for a in "xyz":
+            channels[a][i] = best[a]
+    return channels["x"], channels["y"], channels["z"]
+
+
+##########################################################
+# RECORD
+##########################################################
+
+
+class TransformRecorder(object):
+    """Record the local channel values of transforms in memory.
+
+    The values are read with the API, without querying the attributes one
+    by one, and converted to UI units, like the attribute values.
+    """
+
+    def __init__(self, nodes, length, channels=None):
+        """
+        Args:
+            nodes (list): The transforms or transform names
+            length (int): Number of samples to record
+            channels (list, optional): Short names of the recorded channels.
+                Default TRS_CHANNELS
+        """
+        self.nodes = [str(n) for n in nodes]
+        self.channels = channels or TRS_CHANNELS
+        self._fn = []
+        for n in self.nodes:
+            sel = om.MSelectionList()
+            sel.add(n)
+            self._fn.append(om.MFnTransform(sel.getDagPath(0)))
+        self.values = [
+            {c: array("d", [0.0] * length) for c in self.channels}
+            for _ in self.nodes
+        ]
+
+    def record(self, index):
+        """Record the current values.
+
+        Args:
+            index (int): Sample index
+        """
+        distance_unit = om.MDistance.uiUnit()
+        angle_unit = om.MAngle.uiUnit()
+        for fn, values in zip(self._fn, self.values):
+            t = fn.translation(om.MSpace.kTransform)
+            r = fn.rotation()
+            s = fn.scale()
+            current = {
+                "tx": om.MDistance(t.x).asUnits(distance_unit),
+                "ty": om.MDistance(t.y).asUnits(distance_unit),
+                "tz": om.MDistance(t.z).asUnits(distance_unit),
+                "rx": om.MAngle(r.x).asUnits(angle_unit),
+                "ry": om.MAngle(r.y).asUnits(angle_unit),
+                "rz": om.MAngle(r.z).asUnits(angle_unit),
+                "sx": s[0],
+                "sy": s[1],
+                "sz": s[2],
+            }
+            for c in self.channels:
+                values[c][index] = current[c]
+
+    def get_values(self):
+        """Get the recorded values.
+
+        Returns:
+            dict: "node.channel" as key and the list of values as value
+        """
+        result = {}
+        for node, values in zip(self.nodes, self.values):
+            for c in self.channels:
+                result["{}.{}".format(node, c)] = values[c].tolist()
+        return result
+
+
+##########################################################
+# WRITE
+##########################################################
+
+
+def _get_curve_type(attr):
+    return CURVE_TYPES.get(
+        cmds.getAttr(attr, type=True), DEFAULT_CURVE_TYPE
+    )
+
+
+def _is_keyable(attr):
+    if cmds.getAttr(attr, lock=True):
+        return False
+    source = cmds.listConnections(
+        attr, source=True, destination=False, skipConversionNodes=True
+    )
+    if not source:
+        return True
+    return bool(
+        cmds.listConnections(
+            attr,
+            source=True,
+            destination=False,
+            skipConversionNodes=True,
+            type="animCurve",
+        )
+    )
+
+
+def _apply_euler_filter(values):
+    if om.MAngle.uiUnit() == om.MAngle.kRadians:
+        period = math.pi * 2.0
+    else:
+        period = 360.0
+    grouped = {}
+    for attr in values:
+        node, channel = attr.rsplit(".", 1)
+        if channel in ROTATE_CHANNELS:
+            grouped.setdefault(node, {})[channel] = attr
+    for node, attrs in grouped.items():
+        if len(attrs) != 3:
+            continue
+        rx, ry, rz = euler_filter(
+            values[attrs["rx"]],
+            values[attrs["ry"]],
+            values[attrs["rz"]],
+            cmds.getAttr(node + ".rotateOrder"),
+            period,
+        )
+        values[attrs["rx"]] = rx
+        values[attrs["ry"]] = ry
+        values[attrs["rz"]] = rz
+
+
+def _add_keys(curve, frames, values):
+    sel = om.MSelectionList()
+    sel.add(curve)
+    fn_curve = om.MFnAnimCurve(sel.getDependNode(0))
+    curve_type = fn_curve.animCurveType
+    if curve_type == om.MFnAnimCurve.kAnimCurveTA:
+        unit = om.MAngle.uiUnit()
+        values = [om.MAngle(v, unit).asRadians() for v in values]
+    elif curve_type == om.MFnAnimCurve.kAnimCurveTL:
+        unit = om.MDistance.uiUnit()
+        values = [om.MDistance(v, unit).asCentimeters() for v in values]
+    time_unit = om.MTime.uiUnit()
+    change = om.MAnimCurveChange()
+    fn_curve.addKeys(
+        om.MTimeArray([om.MTime(f, time_unit) for f in frames]),
+        om.MDoubleArray(values),
+        keepExistingKeys=True,
+        change=change,
+    )
+    api_undo.commit(change.undoIt, change.redoIt)
+
+
+def write_curve(attr, frames, values, in_tangent=None, out_tangent=None):
+    """Write the keys of a channel in bulk.
+
+    If the channel doesn't have animation, the keys are set on a new
+    animCurve node connected to it. Otherwise the keys of the existing curve
+    in the frames range are replaced. The key clipboard is not used.
+
+    Args:
+        attr (str): The channel. i.e: "arm_L0_fk0_ctl.rx"
+        frames (list): Key frames, sorted
+        values (list): Key values in UI units
+        in_tangent (str, optional): In tangent type. Default is the global
+            preference
+        out_tangent (str, optional): Out tangent type. Default is the global
+            preference
+
+    Returns:
+        str: The animCurve connected to the channel
+    """
+    if not frames:
+        return
+    if in_tangent is None:
+        in_tangent = cmds.keyTangent(query=True, g=True, itt=True)[0]
+    if out_tangent is None:
+        out_tangent = cmds.keyTangent(query=True, g=True, ott=True)[0]
+    time_range = (frames[0], frames[-1])
+
+    existing = cmds.listConnections(
+        attr, source=True, destination=False, type="animCurve"
+    )
+    if existing:
+        curve = existing[0]
+        cmds.cutKey(curve, time=time_range, clear=True)
+        _add_keys(curve, frames, values)
+        cmds.keyTangent(
+            curve, time=time_range, edit=True, itt=in_tangent, ott=out_tangent
+        )
+        return curve
+
+    curve = cmds.createNode(_get_curve_type(attr), skipSelect=True)
+    key_values = []
+    for frame, value in zip(frames, values):
+        key_values.append(frame)
+        key_values.append(value)
+    cmds.setAttr(
+        "{}.ktv[0:{}]".format(curve, len(frames) - 1),
+        *key_values,
+        size=len(frames)
+    )
+    cmds.keyTangent(curve, edit=True, itt=in_tangent, ott=out_tangent)
+    cmds.connectAttr(curve + ".output", attr)
+    node, channel = attr.rsplit(".", 1)
+    long_name = cmds.attributeQuery(channel, node=node, longName=True)
+    return cmds.rename(curve, "{}_{}".format(node.split("|")[-1], long_name))
+
+
+@utils.one_undo
+def write_keys(
+    values,
+    frames,
+    euler_filter=True,
+    in_tangent=None,
+    out_tangent=None,
+):
+    """Write the keys of several channels in bulk, in one undo chunk.
+
+    Locked channels and channels driven by other nodes than animCurves are
+    skipped.
+
+    Args:
+        values (dict): "node.channel" as key and the list of values, one per
+            frame, as value
+        frames (list): The frames, sorted
+        euler_filter (bool, optional): Filter the rx, ry and rz channels
+        in_tangent (str, optional): In tangent type
+        out_tangent (str, optional): Out tangent type
+
+    Returns:
+        list: The keyed channels
+    """
+    frames = list(frames)
+    values = {k: list(v) for k, v in values.items()}
+    if euler_filter:
+        _apply_euler_filter(values)
+
+    keyed = []
+    for attr, attr_values in values.items():
+        if not _is_keyable(attr):
+            continue
+        write_curve(attr, frames, attr_values, in_tangent, out_tangent)
+        keyed.append(attr)
+    return keyed
@@ -0,0 +1,390 @@
+"""Columnar binary container used by the weight IO modules.
+
+A columnar file stores named flat arrays (vertex indices, weights, offsets...)
+as raw little-endian buffers, optionally zlib compressed, followed by a JSON
+footer that describes every record and array in the file.
+
+File layout::
+
+    MAGIC | version (uint32) | array blocks ... | footer JSON |
+    footer size (uint64) | MAGIC
+
+The footer is written last, so records can be streamed to disk one at a time
+without holding the whole file in memory. Uncompressed blocks are 8 bytes
+aligned and can be memory-mapped and read without copying.
+
+This module has no Maya dependency, so files can be inspected or converted
+from a plain python interpreter.
+"""
+
+#############################################
+# GLOBAL
+#############################################
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+MAGIC = b"MGCOLUMN"
+VERSION = 1
+
+# typecode used for each supported data type.
+# array module typecodes are platform dependent, so we resolve them once
+_DTYPES = {
+    "f4": "f",
+    "f8": "d",
+    "u2": "H",
+    "u4": "I" if array("I").itemsize == 4 else "L",
+    "i4": "i" if array("i").itemsize == 4 else "l",
+}
+
+QUANTIZE_MAX = 65535.0
+
+_FOOTER_TAIL = struct.Struct("<Q{}s".format(len(MAGIC)))
+_HEADER = struct.Struct("<{}sI".format(len(MAGIC)))
+_ALIGN = 8
+
+logger = logging.getLogger("mGear.core.columnar")
+
+
+######################################
+# Array helpers
+######################################
+
+
+def new_array(dtype, values=()):
+    """Create a typed flat array for the given data type.
+
+    Args:
+        dtype (str): Data type. One of "f4", "f8", "u2", "u4", "i4"
+        values (iterable, optional): Initial values
+
+    Returns:
+        array.array: The new array
+    """
+    return array(_DTYPES[dtype], values)
+
+
+def quantize(values):
+    """Quantize normalized float values to 16 bits integers.
+
+    Args:
+        values (iterable): Float values in the 0.0 to 1.0 range
+
+    Returns:
+        array.array: uint16 array
+    """
+    return array(
+        _DTYPES["u2"],
+        [int(round(min(max(v, 0.0), 1.0) * QUANTIZE_MAX)) for v in values],
+    )
+
+
+def dequantize(values):
+    """Convert 16 bits quantized values back to float values.
+
+    Args:
+        values (iterable): Quantized values
+
+    Returns:
+        array.array: double array
+    """
+    return array(_DTYPES["f8"], [v / QUANTIZE_MAX for v in values])
+
+
+######################################
+# Writer
+######################################
+
+
+class ColumnarWriter(object):
+    """Stream records of named arrays to a columnar file.
+
+    Example:
+        >>> with ColumnarWriter(path, kind="skin") as writer:
+        ...     writer.write_record({"objName": "body"},
+        ...                         {"values": ("f4", [0.5, 0.5])})
+    """
+
+    def __init__(self, filePath, kind="", compress=True, compressLevel=6):
+        """
+        Args:
+            filePath (str): Destination file path
+            kind (str, optional): Free string stored in the footer to
+                identify the content of the file
+            compress (bool, optional): zlib compress the array blocks
+            compressLevel (int, optional): zlib compression level
+        """
+        self.filePath = filePath
+        self.kind = kind
+        self.compress = compress
+        self.compressLevel = compressLevel
+        self.records = []
+        self.attributes = {}
+        self.bytes_written = 0
+        self._fp = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(abort=exc_type is not None)
+
+    def open(self):
+        self._fp = open(self.filePath, "wb")
+        self._fp.write(_HEADER.pack(MAGIC, VERSION))
+
+    def _pad(self):
+        pad = -self._fp.tell() % _ALIGN
+        if pad:
+            self._fp.write(b"\0" * pad)
+
+    def _write_block(self, dtype, values):
+        if not isinstance(values, array) or values.typecode != _DTYPES[dtype]:
+            values = new_array(dtype, values)
+        if sys.byteorder != "little":
+            values = array(values.typecode, values)
+            values.byteswap()
+        raw = values.tobytes()
+        if self.compress:
+            data = zlib.compress(raw, self.compressLevel)
+        else:
+            data = raw
+        self._pad()
+        offset = self._fp.tell()
+        self._fp.write(data)
+        return {
+            "dtype": dtype,
+            "offset": offset,
+            "size": len(data),
+            "length": len(values),
+            "compressed": self.compress,
+        }
+
+    def write_record(self, meta, arrays):
+        """Write one record to the file.
+
+        Args:
+            meta (dict): JSON serializable metadata of the record
+            arrays (dict): Array name as key and a tuple of (dtype, values)
+                as value
+
+        Returns:
+            dict: The footer entry for the record
+        """
+        record = {"meta": meta, "arrays": {}}
+        for name, (dtype, values) in arrays.items():
+            record["arrays"][name] = self._write_block(dtype, values)
+        self.records.append(record)
+        return record
+
+    def close(self, abort=False):
+        """Write the footer and close the file.
+
+        Args:
+            abort (bool, optional): Remove the file instead of writing the
+                footer
+        """
+        if self._fp is None:
+            return
+        if not abort:
+            footer = json.dumps(
+                {
+                    "kind": self.kind,
+                    "attributes": self.attributes,
+                    "records": self.records,
+                },
+                sort_keys=True,
+            ).encode("utf-8")
+            self._fp.write(footer)
+            self._fp.write(_FOOTER_TAIL.pack(len(footer), MAGIC))
+        self.bytes_written = self._fp.tell()
+        self._fp.close()
+        self._fp = None
+        if abort:
+            # a file without footer can't be read
+            os.remove(self.filePath)
+            self.bytes_written = 0
+
+
+######################################
+# Reader
+######################################
+
+
+class ColumnarReader(object):
+    """Read records from a columnar file.
+
+    Uncompressed arrays are served from a memory map without copying the
+    data, they are released when the reader is closed. Compressed arrays are
+    decompressed on demand.
+
+    Example:
+        >>> with ColumnarReader(path) as reader:
+        ...     for meta, arrays in reader.iter_records():
+        ...         print(meta["objName"], len(arrays["values"]))
+    """
+
+    def __init__(self, filePath, useMmap=True):
+        """
+        Args:
+            filePath (str): Source file path
+            useMmap (bool, optional): Memory-map the file instead of reading
+                the blocks with regular file IO
+        """
+        self.filePath = filePath
+        self.useMmap = useMmap
+        self.kind = ""
+        self.attributes = {}
+        self.records = []
+        self._fp = None
+        self._map = None
+        self._views = []
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.records)
+
+    def open(self):
+        self._fp = open(self.filePath, "rb")
+        magic, version = _HEADER.unpack(self._fp.read(_HEADER.size))
+        if magic != MAGIC:
+            self.close()
+            raise IOError("Not a columnar file: {}".format(self.filePath))
+        if version > VERSION:
+            self.close()
+            raise IOError(
+                "Unsupported columnar file version {}: {}".format(
+                    version, self.filePath
+                )
+            )
+        self._fp.seek(-_FOOTER_TAIL.size, 2)
+        footerSize, magic = _FOOTER_TAIL.unpack(
+            self._fp.read(_FOOTER_TAIL.size)
+        )
+        if magic != MAGIC:
+            self.close()
+            raise IOError("Truncated columnar file: {}".format(self.filePath))
+        self._fp.seek(-_FOOTER_TAIL.size - footerSize, 2)
+        footer = json.loads(self._fp.read(footerSize).decode("utf-8"))
+        self.kind = footer.get("kind", "")
+        self.attributes = footer.get("attributes", {})
+        self.records = footer["records"]
+        if self.useMmap:
+            self._map = mmap.mmap(
+                self._fp.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+    def close(self):
+        for view in self._views:
+            try:
+                view.release()
+            except BufferError:
+                # exported to another object, i.e: a numpy array
+                pass
+        self._views = []
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # slices of the arrays are still referenced. The map is
+                # released when the last of them is garbage collected
+                logger.debug(
+                    "Memory map still in use: {}".format(self.filePath)
+                )
+            self._map = None
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+    def _read_bytes(self, offset, size):
+        if self._map is not None:
+            return memoryview(self._map)[offset : offset + size]
+        self._fp.seek(offset)
+        return self._fp.read(size)
+
+    def read_array(self, block, copy=False):
+        """Read the array described by a footer block entry.
+
+        Args:
+            block (dict): The block entry from the record "arrays" dict
+            copy (bool, optional): Return a new array.array even when the
+                block could be served from the memory map. The memory map
+                views are released when the reader is closed
+
+        Returns:
+            array.array or memoryview: Flat typed sequence of values
+        """
+        typecode = _DTYPES[block["dtype"]]
+        data = self._read_bytes(block["offset"], block["size"])
+        if block["compressed"]:
+            data = zlib.decompress(data)
+        elif (
+            not copy
+            and isinstance(data, memoryview)
+            and sys.byteorder == "little"
+        ):
+            view = data.cast(typecode)
+            self._views.append(view)
+            return view
+        values = array(typecode)
+        values.frombytes(bytes(data))
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+    def read_record(self, index, copy=False):
+        """Read one record.
+
+        Args:
+            index (int): Record index
+            copy (bool, optional): Force a copy of memory-mapped arrays
+
+        Returns:
+            tuple: (meta dict, dict of arrays)
+        """
+        record = self.records[index]
+        arrays = {
+            name: self.read_array(block, copy=copy)
+            for name, block in record["arrays"].items()
+        }
+        return record["meta"], arrays
+
+    def iter_records(self, copy=False):
+        """Iterate over the records of the file, one at a time.
+
+        Args:
+            copy (bool, optional): Force a copy of memory-mapped arrays
+
+        Yields:
+            tuple: (meta dict, dict of arrays)
+        """
+        for i in range(len(self.records)):
+            yield self.read_record(i, copy=copy)
+
+
+def is_columnar_file(filePath):
+    """Check if a file is a columnar file looking at the header.
+
+    Args:
+        filePath (str): File path
+
+    Returns:
+        bool: True if the file starts with the columnar magic
+    """
+    try:
+        with open(filePath, "rb") as fp:
+            return fp.read(len(MAGIC)) == MAGIC
+    except (IOError, OSError):
+        return False
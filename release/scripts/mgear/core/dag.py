@@ -1,8 +1,19 @@
 """Nvigate the DAG hierarchy"""
 
+from collections import OrderedDict
 
-import maya.cmds as cmds
+import maya.api.OpenMaya as om
 import mgear.pymaya as pm
+from .six import string_types
+
+# maximum number of hierarchy indices kept in the session cache
+INDEX_CACHE_SIZE = 16
+
+# Hierarchy indices of the session, kept on module reload
+try:
+    HIERARCHY_INDEX_CACHE
+except NameError:
+    HIERARCHY_INDEX_CACHE = {"indices": OrderedDict(), "callbacks": []}
 
 #############################################
 # DAG
@@ -52,8 +63,10 @@ def findChild(node, name):
                                     comp_guide.root.name()))
 
     """
-    # return __findChildren(node, name, True)
-    return __findChild(node, name)
+    path = get_hierarchy_index(node).find(name)
+    if not path:
+        return False
+    return pm.PyNode(path)
 
 
 def findChildren(node, name):
@@ -86,82 +99,43 @@ def findChildrenPartial(node, name):
 
 
 def __findChildren(node, name, firstOnly=False, partialName=False):
+    """Search the children using the hierarchy index of the node.
 
+    Arguments:
+        node (dagNode): The input node to search
+        name (str): The name or the last name token to search
+        firstOnly (bool, optional): Return only the first child
+        partialName (bool, optional): Match the last token of the name
+
+    Returns:
+        dagNode or dagNode list: The children. False if not found
+    """
+    index = get_hierarchy_index(node)
     if partialName:
-        children = [item for item
-                    in node.listRelatives(allDescendents=True,
-                                          type="transform", fullPath=True)
-                    if item.split("|")[-1].split("_")[-1] == name]
+        children = index.find_suffix(name)
     else:
-        children = [item for item
-                    in node.listRelatives(allDescendents=True,
-                                          type="transform", fullPath=True)
-                    if item.split("|")[-1] == name]
+        children = index.find_all(name)
     if not children:
         return False
     if firstOnly:
-        return children[0]
-
-    return children
+        return pm.PyNode(children[0])
 
+    return [pm.PyNode(x) for x in children]
 
-def __findChild(node, name):
-    """This find children function will stop search after first
-     child found.child
 
-    This is a faster version of __findchildren
+def __findChildren2(node, name, firstOnly=False, partialName=False):
+    """Deprecated. Same as __findChildren
 
     Arguments:
         node (dagNode): The input node to search
         name (str): The name to search
+        firstOnly (bool, optional): Return only the first child
+        partialName (bool, optional): Match the last token of the name
 
     Returns:
-        dagNode: Children node
-    """
-    try:
-        for item in cmds.listRelatives(node.name(),
-                                       allDescendents=True,
-                                       type="transform", fullPath=True):
-            if item.split("|")[-1] == name:
-                return pm.PyNode(item)
-    except pm.MayaNodeError:
-        for item in node.listRelatives(allDescendents=True,
-                                       type="transform", fullPath=True):
-            if item.split("|")[-1] == name:
-                return item
-
-    return False
-
-
-def __findChildren2(node, name, firstOnly=False, partialName=False):
-    """This function is using Maya cmds instead of PyMel
-
-    Arguments:
-        node (TYPE): Description
-        name (TYPE): Description
-        firstOnly (bool, optional): Description
-        partialName (bool, optional): Description
-
-    Returns:
-        TYPE: Description
+        dagNode or dagNode list: The children. False if not found
     """
-    oName = node.name()
-    if partialName:
-        children = [item for item
-                    in cmds.listRelatives(oName, allDescendents=True,
-                                          type="transform")
-                    if item.split("|")[-1].split("_")[-1] == name]
-    else:
-        children = [item for item
-                    in cmds.listRelatives(oName, allDescendents=True,
-                                          type="transform")
-                    if item.split("|")[-1] == name]
-    if not children:
-        return False
-    if firstOnly:
-        return pm.PyNode(children[0])
-
-    return [pm.PyNode(x) for x in children]
+    return __findChildren(node, name, firstOnly, partialName)
 
 
 def findComponentChildren(node, name, sideIndex):
@@ -183,23 +157,16 @@ def findComponentChildren(node, name, sideIndex):
                                              oldSideIndex)
 
     """
-    children = []
-    for item in node.listRelatives(allDescendents=True,
-                                   type="transform", fullPath=True):
-        checkName = item.split("|")[-1].split("_")
-        if checkName[0] == name and checkName[1] == sideIndex:
-            children.append(item)
-
-    return children
+    return [
+        pm.PyNode(x)
+        for x in get_hierarchy_index(node).find_component(name, sideIndex)
+    ]
 
 
 def findComponentChildren2(node, name, sideIndex):
     """Returns the component children of input component root.
 
-    This function is using Maya cmds instead of PyMel
-
-    Note:
-        This method is specific to work with shifter guides naming conventions
+    Deprecated. Same as findComponentChildren
 
     Arguments:
         node (dagNode): The input node to search
@@ -208,29 +175,14 @@ def findComponentChildren2(node, name, sideIndex):
 
     Returns:
         dagNode list: The children dagNodes
-
-    >>> objList =  dag.findComponentChildren(self.parent,
-                                             oldName,
-                                             oldSideIndex)
-
     """
-    children = []
-    for item in cmds.listRelatives(node.name(), allDescendents=True,
-                                   fullPath=True, type="transform"):
-        checkName = item.split("|")[-1].split("_")
-        if checkName[0] == name and checkName[1] == sideIndex:
-            children.append(item)
-
-    return [pm.PyNode(x) for x in children]
+    return findComponentChildren(node, name, sideIndex)
 
 
 def findComponentChildren3(node, name, sideIndex):
     """Returns the component children of input component root.
 
-    This function is using Maya cmds instead of PyMel
-
-    Note:
-        This method is specific to work with shifter guides naming conventions
+    Deprecated. Same as findComponentChildren
 
     Arguments:
         node (dagNode): The input node to search
@@ -239,19 +191,287 @@ def findComponentChildren3(node, name, sideIndex):
 
     Returns:
         dagNode list: The children dagNodes
+    """
+    return findComponentChildren(node, name, sideIndex)
 
-    >>> objList =  dag.findComponentChildren(self.parent,
-                                             oldName,
-                                             oldSideIndex)
 
+#############################################
+# HIERARCHY INDEX
+#############################################
+
+
+def _split_name(name):
+    """Get the name tokens without namespace.
+
+    Arguments:
+        name (str): Node short name
+
+    Returns:
+        list: The name tokens
     """
-    children = []
-    for item in cmds.listRelatives(node.name(), allDescendents=True,
-                                   fullPath=True, type="transform") or []:
-        checkName = item.split("|")[-1]
-        in_name = "_".join([name, sideIndex])
+    return name.split(":")[-1].split("_")
 
-        if in_name in checkName:
-            children.append(item)
 
-    return [pm.PyNode(x) for x in children]
+def _get_mobject(node):
+    if isinstance(node, om.MObject):
+        return node
+    sel = om.MSelectionList()
+    sel.add(node if isinstance(node, string_types) else node.longName())
+    return sel.getDependNode(0)
+
+
+class HierarchyIndex(object):
+    """Name index of the transforms below a root node.
+
+    One traversal of the hierarchy builds the short name, suffix token and
+    component (name and side index tokens) maps, so the queries don't need
+    to list and split all the descendants every time.
+
+    The index is updated with the DAG and name changed callbacks. Added
+    nodes and renames are indexed incrementally, any other change of the
+    hierarchy flags the index to be rebuilt on the next query.
+
+    Use get_hierarchy_index to get the cached index of a node.
+
+    >>> index = dag.get_hierarchy_index(model)
+    >>> index.find("arm_L0_root")
+    >>> index.find_component("arm", "L0")
+    """
+
+    def __init__(self, root):
+        """
+        Arguments:
+            root (dagNode, str or MObject): The root of the hierarchy.
+        """
+        self.root = om.MObjectHandle(_get_mobject(root))
+        self.dirty = True
+        self._nodes = {}
+        self._by_name = {}
+        self._by_suffix = {}
+        self._by_component = {}
+
+    def is_valid(self):
+        return self.root.isValid()
+
+    def rebuild(self):
+        """Traverse the hierarchy and build the name maps."""
+        self._nodes = {}
+        self._by_name = {}
+        self._by_suffix = {}
+        self._by_component = {}
+        self.dirty = False
+        if self.is_valid():
+            self._add_hierarchy(self.root.object(), include_root=False)
+
+    def _add_hierarchy(self, mobject, include_root=True):
+        dag_it = om.MItDag(om.MItDag.kDepthFirst, om.MFn.kTransform)
+        dag_it.reset(mobject, om.MItDag.kDepthFirst, om.MFn.kTransform)
+        while not dag_it.isDone():
+            obj = dag_it.currentItem()
+            if include_root or obj != mobject:
+                self._add(obj, om.MFnDagNode(obj).name())
+            dag_it.next()
+
+    def _add(self, obj, name):
+        handle = om.MObjectHandle(obj)
+        key = handle.hashCode()
+        if key in self._nodes:
+            return
+        tokens = _split_name(name)
+        self._nodes[key] = (handle, name)
+        self._by_name.setdefault(name, []).append(handle)
+        self._by_suffix.setdefault(tokens[-1], []).append(handle)
+        if len(tokens) > 1:
+            self._by_component.setdefault(
+                (tokens[0], tokens[1]), []
+            ).append(handle)
+
+    def _remove(self, key):
+        handle, name = self._nodes.pop(key)
+        tokens = _split_name(name)
+        maps = [(self._by_name, name), (self._by_suffix, tokens[-1])]
+        if len(tokens) > 1:
+            maps.append((self._by_component, (tokens[0], tokens[1])))
+        for table, k in maps:
+            table[k] = [h for h in table[k] if h.hashCode() != key]
+            if not table[k]:
+                del table[k]
+
+    def contains(self, mobject):
+        """Check if a node is indexed.
+
+        Arguments:
+            mobject (MObject): The node
+
+        Returns:
+            bool: True if the node is in the index
+        """
+        return om.MObjectHandle(mobject).hashCode() in self._nodes
+
+    # =====================================================
+    # Callbacks
+
+    def child_added(self, child, parent):
+        if self.dirty:
+            return
+        parent_obj = parent.node()
+        if parent_obj == self.root.object() or self.contains(parent_obj):
+            self._add_hierarchy(child.node())
+
+    def child_changed(self, child, parent):
+        if self.dirty:
+            return
+        parent_obj = parent.node()
+        if parent_obj == self.root.object() or self.contains(parent_obj):
+            self.dirty = True
+
+    def name_changed(self, mobject, prev_name):
+        if self.dirty:
+            return
+        key = om.MObjectHandle(mobject).hashCode()
+        if key in self._nodes:
+            self._remove(key)
+            self._add(mobject, om.MFnDependencyNode(mobject).name())
+
+    # =====================================================
+    # Queries
+
+    def _get(self, table, key):
+        if self.dirty:
+            self.rebuild()
+        return [
+            om.MDagPath.getAPathTo(h.object()).fullPathName()
+            for h in getattr(self, table).get(key, [])
+            if h.isValid()
+        ]
+
+    def find(self, name):
+        """Get the first transform with a matching short name.
+
+        Arguments:
+            name (str): The short name
+
+        Returns:
+            str: The full path name or None if not found
+        """
+        paths = self._get("_by_name", name)
+        if paths:
+            return paths[0]
+
+    def find_all(self, name):
+        """Get the transforms with a matching short name.
+
+        Arguments:
+            name (str): The short name
+
+        Returns:
+            list: The full path names
+        """
+        return self._get("_by_name", name)
+
+    def find_suffix(self, suffix):
+        """Get the transforms with a matching last name token.
+
+        Arguments:
+            suffix (str): The last token of the name. i.e: "root"
+
+        Returns:
+            list: The full path names
+        """
+        return self._get("_by_suffix", suffix)
+
+    def find_component(self, name, sideIndex):
+        """Get the transforms of a component.
+
+        Note:
+            This method is specific to work with shifter guides naming
+            conventions. i.e: "arm_L0_root"
+
+        Arguments:
+            name (str): The component name. i.e: "arm"
+            sideIndex (str): The side and index. i.e: "L0"
+
+        Returns:
+            list: The full path names
+        """
+        return self._get("_by_component", (name, sideIndex))
+
+
+def _dag_added_callback(child, parent, *args):
+    for index in HIERARCHY_INDEX_CACHE["indices"].values():
+        index.child_added(child, parent)
+
+
+def _dag_changed_callback(child, parent, *args):
+    for index in HIERARCHY_INDEX_CACHE["indices"].values():
+        index.child_changed(child, parent)
+
+
+def _name_changed_callback(mobject, prev_name, *args):
+    if not mobject.hasFn(om.MFn.kTransform):
+        return
+    for index in HIERARCHY_INDEX_CACHE["indices"].values():
+        index.name_changed(mobject, prev_name)
+
+
+def _scene_changed_callback(*args):
+    clear_hierarchy_indices()
+
+
+def _install_callbacks():
+    if HIERARCHY_INDEX_CACHE["callbacks"]:
+        return
+    callbacks = [
+        om.MDagMessage.addChildAddedCallback(_dag_added_callback),
+        om.MDagMessage.addChildRemovedCallback(_dag_changed_callback),
+        om.MDagMessage.addChildReorderedCallback(_dag_changed_callback),
+        om.MNodeMessage.addNameChangedCallback(
+            om.MObject(), _name_changed_callback
+        ),
+    ]
+    for msg in (
+        om.MSceneMessage.kBeforeNew,
+        om.MSceneMessage.kBeforeOpen,
+        om.MSceneMessage.kBeforeImport,
+        om.MSceneMessage.kBeforeReference,
+    ):
+        callbacks.append(
+            om.MSceneMessage.addCallback(msg, _scene_changed_callback)
+        )
+    HIERARCHY_INDEX_CACHE["callbacks"] = callbacks
+
+
+def get_hierarchy_index(node):
+    """Get the cached hierarchy index of a node.
+
+    The index is created and cached the first time. The callbacks that keep
+    the cached indices updated are removed when the cache is cleared, and
+    the cache is cleared before a new scene is opened or a file imported.
+
+    Arguments:
+        node (dagNode, str or MObject): The root of the hierarchy
+
+    Returns:
+        HierarchyIndex: The index
+    """
+    mobject = _get_mobject(node)
+    key = om.MObjectHandle(mobject).hashCode()
+    indices = HIERARCHY_INDEX_CACHE["indices"]
+    index = indices.get(key)
+    if index is None or not index.is_valid() or (
+        index.root.object() != mobject
+    ):
+        _install_callbacks()
+        index = HierarchyIndex(mobject)
+        indices[key] = index
+        while len(indices) > INDEX_CACHE_SIZE:
+            indices.popitem(last=False)
+    return index
+
+
+def clear_hierarchy_indices():
+    """Clear the hierarchy index cache and remove the callbacks."""
+    for callback_id in HIERARCHY_INDEX_CACHE["callbacks"]:
+        om.MMessage.removeCallback(callback_id)
+    HIERARCHY_INDEX_CACHE["callbacks"] = []
+    HIERARCHY_INDEX_CACHE["indices"].clear()
@@ -47,6 +47,11 @@ def install_skinning_menu():
             partial(skin.exportJsonSkinPack, None, None),
             "mgear_package_out.svg",
         ),
+        (
+            "Export Skin Pack Columnar",
+            partial(skin.exportColumnarSkinPack, None, None),
+            "mgear_package_out.svg",
+        ),
         ("-----", None),
         ("Get Names in gSkin File", partial(skin.getObjsFromSkinFile, None)),
         ("-----", None),
@@ -60,6 +65,16 @@ def install_skinning_menu():
             partial(wmap.export_weights_selected, None),
             "mgear_log-out.svg",
         ),
+        (
+            "Import Deformers Weight Maps Binary",
+            partial(wmap.import_deformers_weights_selected, None),
+            "mgear_log-in.svg",
+        ),
+        (
+            "Export Selected Deformers Weight Maps Binary",
+            partial(wmap.export_deformers_weights_selected, None),
+            "mgear_log-out.svg",
+        ),
     )
 
     mgear.menu.install("Skin and Weights", commands, image="mgear_skin.svg")
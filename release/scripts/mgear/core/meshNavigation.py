@@ -6,8 +6,26 @@
 import mgear.pymaya as pm
 import mgear.pymaya.datatypes as datatypes
 from maya import OpenMaya as om
+import maya.api.OpenMaya as om2
 from . import utils
 
+try:
+    import numpy as np
+
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
+
+# batches bigger than this use the mesh intersector instead of
+# MFnMesh.getClosestPoint
+INTERSECTOR_MIN_QUERIES = 8
+
+# mirror vertex maps by (mesh, axis, topology) key
+try:
+    SYMMETRY_MAP_CACHE
+except NameError:
+    SYMMETRY_MAP_CACHE = {}
+
 
 #############################################
 # Vertex
@@ -307,47 +325,321 @@ def bBoxData(obj=None, yZero=False, *args):
 #################################################
 
 
-def getClosestPolygonFromTransform(geo, loc):
-    """Get closest polygon from transform
+def _as_position(loc):
+    """Get the world position of a transform or a position
 
     Arguments:
-        geo (dagNode): Mesh object
-        loc (matrix): location transform
+        loc (dagNode or list): Transform or position
 
     Returns:
-        Closest Polygon
-
+        Vector: The position
     """
     if isinstance(
         loc, (pm.nodetypes.Transform, pm.nodetypes.Joint, pm.nodetypes.Locator)
     ):
-        pos = loc.getTranslation(space="world")
-    else:
-        pos = datatypes.Vector(loc[0], loc[1], loc[2])
+        return loc.getTranslation(space="world")
+    return datatypes.Vector(loc[0], loc[1], loc[2])
+
+
+def _as_positions(positions):
+    """Get a list of (x, y, z) positions from transforms or positions"""
+    if NUMPY_READY and isinstance(positions, np.ndarray):
+        return positions.tolist()
+    result = []
+    for p in positions:
+        p = _as_position(p)
+        result.append((p[0], p[1], p[2]))
+    return result
 
-    nodeDagPath = om.MObject()
+
+def _get_mesh_dag_path2(geo):
+    """Get the API 2.0 mesh shape dag path of a mesh or mesh transform"""
+    sel = om2.MSelectionList()
     try:
-        selectionList = om.MSelectionList()
-        selectionList.add(geo.name())
-        nodeDagPath = om.MDagPath()
-        selectionList.getDagPath(0, nodeDagPath)
+        sel.add(str(geo))
+        dag_path = sel.getDagPath(0)
     except Exception as e:
         raise RuntimeError(
-            "om.MDagPath() failed " "on {}. \n {}".format(geo.name(), e)
+            "om2.MDagPath() failed on {}. \n {}".format(geo, e)
+        )
+    if not dag_path.hasFn(om2.MFn.kMesh):
+        raise ValueError("Node is not a mesh: {}".format(geo))
+    if dag_path.apiType() == om2.MFn.kTransform:
+        dag_path.extendToShape()
+    return dag_path
+
+
+class MeshQuery(object):
+    """Reusable closest location queries on a mesh
+
+    The mesh function set, the world space points, the face vertices and
+    the mesh intersector are built once, on first use, and reused by all
+    the queries. All the queries take lists of positions and return one
+    result per position.
+
+    The query doesn't track the mesh changes. Create a new query or call
+    refresh() if the mesh is deformed or edited.
+
+    Example:
+        >>> query = MeshQuery("body_geo")
+        >>> query.closest_vertices([(0, 10, 0), (1, 10, 0)])
+        [1204, 1217]
+        >>> query.mirror_vertices([1204])
+        [3310]
+    """
+
+    def __init__(self, mesh):
+        """
+        Arguments:
+            mesh (dagNode or str): Mesh shape or transform
+        """
+        self.dag_path = _get_mesh_dag_path2(mesh)
+        self.fn = om2.MFnMesh(self.dag_path)
+        self.refresh()
+
+    def refresh(self):
+        """Clear the cached points, topology and intersector"""
+        self._points = None
+        self._face_offsets = None
+        self._face_vertices = None
+        self._intersector = None
+
+    @property
+    def name(self):
+        return self.dag_path.fullPathName()
+
+    @property
+    def partial_name(self):
+        return self.dag_path.partialPathName()
+
+    @property
+    def points(self):
+        """World space points. (n, 3) numpy array or list of tuples"""
+        if self._points is None:
+            points = self.fn.getPoints(om2.MSpace.kWorld)
+            points = [(p.x, p.y, p.z) for p in points]
+            if NUMPY_READY:
+                points = np.array(points, dtype=np.float64).reshape(-1, 3)
+            self._points = points
+        return self._points
+
+    @property
+    def intersector(self):
+        """Mesh intersector in world space"""
+        if self._intersector is None:
+            self._intersector = om2.MMeshIntersector()
+            self._intersector.create(
+                self.dag_path.node(), self.dag_path.inclusiveMatrix()
+            )
+        return self._intersector
+
+    def topology_key(self):
+        """Key identifying the mesh topology
+
+        Returns:
+            tuple: mesh name and vertex, edge and face count
+        """
+        return (
+            self.name,
+            self.fn.numVertices,
+            self.fn.numEdges,
+            self.fn.numPolygons,
         )
 
-    mfnMesh = om.MFnMesh(nodeDagPath)
+    def face_vertices(self, face):
+        """Get the vertices of a face
+
+        Arguments:
+            face (int): Face index
+
+        Returns:
+            list: Vertex indices
+        """
+        if self._face_vertices is None:
+            return list(self.fn.getPolygonVertices(face))
+        return self._face_vertices[
+            self._face_offsets[face] : self._face_offsets[face + 1]
+        ]
+
+    def load_topology(self):
+        """Read the face vertices of the whole mesh at once"""
+        if self._face_vertices is None:
+            counts, connects = self.fn.getVertices()
+            offsets = [0]
+            for c in counts:
+                offsets.append(offsets[-1] + c)
+            self._face_offsets = offsets
+            self._face_vertices = list(connects)
+
+    def closest_faces(self, positions):
+        """Get the closest face of each position
+
+        Arguments:
+            positions (list): World positions or transforms
+
+        Returns:
+            list: Face indices
+        """
+        points = [om2.MPoint(*p) for p in _as_positions(positions)]
+        use_intersector = (
+            len(points) >= INTERSECTOR_MIN_QUERIES
+            or self._intersector is not None
+        )
+        if not use_intersector:
+            return [
+                self.fn.getClosestPoint(p, om2.MSpace.kWorld)[1]
+                for p in points
+            ]
+        intersector = self.intersector
+        return [intersector.getClosestPoint(p).face for p in points]
+
+    def closest_vertices(self, positions):
+        """Get the closest vertex of each position
+
+        The vertex is the closest vertex of the closest face, like
+        getClosestVertexFromTransform
+
+        Arguments:
+            positions (list): World positions or transforms
+
+        Returns:
+            list: Vertex indices
+        """
+        positions = _as_positions(positions)
+        faces = self.closest_faces(positions)
+        points = self.points
+        if len(positions) >= INTERSECTOR_MIN_QUERIES:
+            self.load_topology()
+
+        result = []
+        for pos, face in zip(positions, faces):
+            verts = self.face_vertices(face)
+            if NUMPY_READY:
+                delta = points[verts] - (pos[0], pos[1], pos[2])
+                closest = int(np.argmin(np.einsum("ij,ij->i", delta, delta)))
+                result.append(verts[closest])
+                continue
+            best = None
+            best_distance = None
+            for v in verts:
+                p = points[v]
+                d = (
+                    (p[0] - pos[0]) ** 2
+                    + (p[1] - pos[1]) ** 2
+                    + (p[2] - pos[2]) ** 2
+                )
+                if best is None or d < best_distance:
+                    best = v
+                    best_distance = d
+            result.append(best)
+        return result
+
+    def vertex_positions(self, vertices):
+        """Get the world positions of vertices
+
+        Arguments:
+            vertices (list): Vertex indices
+
+        Returns:
+            list: (x, y, z) tuples
+        """
+        points = self.points
+        return [tuple(float(x) for x in points[v]) for v in vertices]
+
+    def mirror_positions(self, positions, axis=0):
+        """Mirror world positions
+
+        Arguments:
+            positions (list): World positions or transforms
+            axis (int, optional): Mirror axis. 0 is X
+
+        Returns:
+            list: Mirrored positions
+        """
+        mirrored = []
+        for p in _as_positions(positions):
+            p = list(p)
+            p[axis] *= -1
+            mirrored.append(p)
+        return mirrored
+
+    def symmetry_map(self, axis=0):
+        """Get the mirror vertex of every vertex
+
+        The map is computed from the mirrored points the first time and is
+        cached by topology, so it stays valid if the mesh is deformed
+        afterwards. Compute it on a symmetric pose.
+
+        Arguments:
+            axis (int, optional): Mirror axis. 0 is X
+
+        Returns:
+            list: Mirror vertex index per vertex
+        """
+        key = self.topology_key() + (axis,)
+        symmetry = SYMMETRY_MAP_CACHE.get(key)
+        if symmetry is None:
+            points = self.points
+            if NUMPY_READY:
+                mirrored = points.copy()
+                mirrored[:, axis] *= -1
+            else:
+                mirrored = self.mirror_positions(points, axis)
+            symmetry = self.closest_vertices(mirrored)
+            SYMMETRY_MAP_CACHE[key] = symmetry
+        return symmetry
+
+    def mirror_vertices(self, vertices, axis=0):
+        """Get the mirror vertex of each vertex, using the symmetry map
+
+        Arguments:
+            vertices (list): Vertex indices
+            axis (int, optional): Mirror axis. 0 is X
+
+        Returns:
+            list: Mirror vertex indices
+        """
+        symmetry = self.symmetry_map(axis)
+        return [symmetry[v] for v in vertices]
+
+    def edge_between(self, v1, v2):
+        """Get the edge connecting 2 vertices
+
+        Arguments:
+            v1 (int): Vertex index
+            v2 (int): Vertex index
+
+        Returns:
+            int: Edge index or None if the vertices are not connected
+        """
+        it = om2.MItMeshVertex(self.dag_path)
+        it.setIndex(v1)
+        edges1 = set(it.getConnectedEdges())
+        it.setIndex(v2)
+        for e in it.getConnectedEdges():
+            if e in edges1:
+                return e
+        return None
+
+
+def clear_symmetry_map_cache():
+    """Clear the cached mirror vertex maps"""
+    SYMMETRY_MAP_CACHE.clear()
 
-    pointA = om.MPoint(pos.x, pos.y, pos.z)
-    pointB = om.MPoint()
-    space = om.MSpace.kWorld
 
-    util = om.MScriptUtil()
-    util.createFromInt(0)
-    idPointer = util.asIntPtr()
+def getClosestPolygonFromTransform(geo, loc):
+    """Get closest polygon from transform
 
-    mfnMesh.getClosestPoint(pointA, pointB, space, idPointer)
-    idx = om.MScriptUtil(idPointer).asInt()
+    Arguments:
+        geo (dagNode): Mesh object
+        loc (matrix): location transform
+
+    Returns:
+        Closest Polygon
+
+    """
+    pos = _as_position(loc)
+    idx = MeshQuery(geo).closest_faces([pos])[0]
 
     return geo.f[idx], pos
 
@@ -355,6 +647,8 @@ def getClosestPolygonFromTransform(geo, loc):
 def getClosestVertexFromTransform(geo, loc):
     """Get closest vertex from transform
 
+    For many locations use MeshQuery.closest_vertices
+
     Arguments:
         geo (dagNode or str): Mesh object
         loc (matrix): location transform
@@ -366,17 +660,22 @@ def getClosestVertexFromTransform(geo, loc):
 
     """
     geo = utils.as_pynode(geo)
-    polygon, pos = getClosestPolygonFromTransform(geo, loc)
+    pos = _as_position(loc)
+    query = MeshQuery(geo)
+    face = query.closest_faces([pos])[0]
 
-    faceVerts = [geo.vtx[i] for i in polygon.getVertices()]
+    # only the face points are needed for a single query
     closestVert = None
     minLength = None
-    for v in faceVerts:
-        thisLength = (pos - v.getPosition(space="world")).length()
+    for v in query.face_vertices(face):
+        p = query.fn.getPoint(v, om2.MSpace.kWorld)
+        thisLength = (
+            (p.x - pos[0]) ** 2 + (p.y - pos[1]) ** 2 + (p.z - pos[2]) ** 2
+        )
         if minLength is None or thisLength < minLength:
             minLength = thisLength
             closestVert = v
-    return closestVert
+    return geo.vtx[closestVert]
 
 
 def find_mirror_edge(obj, edgeIndx):
@@ -396,14 +695,11 @@ def find_mirror_edge(obj, edgeIndx):
     v2 = edge.getPoint(1, space="world")
 
     # mirror vectors in X axis
-    mv1 = [v1[0] * -1, v1[1], v1[2]]
-    mv2 = [v2[0] * -1, v2[1], v2[2]]
-
-    vtx1 = getClosestVertexFromTransform(obj.getShape(), mv1)
-    vtx2 = getClosestVertexFromTransform(obj.getShape(), mv2)
-    for ee in vtx1.connectedEdges():
-        if ee in vtx2.connectedEdges():
-            return ee
+    query = MeshQuery(obj.getShape())
+    vtx1, vtx2 = query.closest_vertices(query.mirror_positions([v1, v2]))
+    mirror_edge = query.edge_between(vtx1, vtx2)
+    if mirror_edge is not None:
+        return pm.PyNode("{}.e[{}]".format(query.name, mirror_edge))
 
 
 def get_closes_edge_index(sourceGeo, targetGeo, edgeIndx):
@@ -418,24 +714,17 @@ def get_closes_edge_index(sourceGeo, targetGeo, edgeIndx):
         edgeIndx (int): Edge Index
 
     Returns:
-        PyNode: Description
+        int: The edge index
     """
     edge = pm.PyNode("{}.e[{}]".format(sourceGeo, str(edgeIndx)))
 
-    verts = edge.connectedVertices()
-
-    closes_v = []
-    for v in verts:
-        vv = getClosestVertexFromTransform(
-            targetGeo, v.getPosition(space="world")
-        )
-        closes_v.append(vv)
+    positions = [
+        v.getPosition(space="world") for v in edge.connectedVertices()
+    ]
 
-    v1_edges = closes_v[0].connectedEdges()
-    v2_edges = closes_v[1].connectedEdges()
-    for e in v1_edges:
-        if e in v2_edges:
-            return e.index()
+    query = MeshQuery(targetGeo)
+    closes_v = query.closest_vertices(positions)
+    return query.edge_between(closes_v[0], closes_v[1])
 
 
 def get_selected_mesh():
@@ -0,0 +1,236 @@
+"""Sample the world matrices of a set of nodes over a frame range.
+
+The matrices of all the nodes are read with the API in a single pass per
+frame, and stored in one contiguous buffer of frames x nodes x 16 values.
+
+Two sampling methods are available:
+    time: Change the current time once per frame and read all the nodes.
+        The scene is evaluated once per frame, using the evaluation manager
+        if it is enabled. This is the fastest method for most rigs.
+    context: Evaluate the worldMatrix plugs in a DG context for each frame,
+        without changing the current time. Useful for single frames or
+        small node sets.
+
+Example:
+    >>> samples = sampling.sample_world_matrices(controls, range(1, 101))
+    >>> samples.get_matrix(0, 2)  # first frame, third node
+    >>> samples.as_numpy().shape
+    (100, 3, 4, 4)
+"""
+
+import contextlib
+from array import array
+
+from maya import cmds
+import maya.api.OpenMaya as om
+from mgear.pymaya import datatypes
+
+try:
+    import numpy as np
+
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
+
+TIME = "time"
+CONTEXT = "context"
+SAMPLING_METHODS = (TIME, CONTEXT)
+
+_MATRIX_SIZE = 16
+
+
+class MatrixSamples(object):
+    """World matrices of a node list over a frame list.
+
+    The values are stored in a flat double array with (frames, nodes, 16)
+    layout. Nodes with no value (None in the node list) keep an empty slot.
+
+    Attributes:
+        nodes (list): The sampled nodes
+        frames (list): The sampled frames
+        valid (list): False for the None nodes
+        data (array): The flat matrix values
+    """
+
+    def __init__(self, nodes, frames):
+        self.nodes = list(nodes)
+        self.frames = list(frames)
+        self.valid = [bool(n) for n in self.nodes]
+        self.data = array(
+            "d", [0.0] * (len(self.frames) * len(self.nodes) * _MATRIX_SIZE)
+        )
+        self._frame_index = {f: i for i, f in enumerate(self.frames)}
+
+    def _offset(self, frame_index, node_index):
+        return (frame_index * len(self.nodes) + node_index) * _MATRIX_SIZE
+
+    def frame_index(self, frame):
+        """Get the index of a sampled frame.
+
+        Args:
+            frame (float): The frame
+
+        Returns:
+            int: The frame index or None if the frame is not sampled
+        """
+        return self._frame_index.get(frame)
+
+    def set(self, frame_index, node_index, matrix):
+        """Store a matrix.
+
+        Args:
+            frame_index (int): Frame index
+            node_index (int): Node index
+            matrix (MMatrix or list): The matrix or the 16 values
+        """
+        offset = self._offset(frame_index, node_index)
+        self.data[offset : offset + _MATRIX_SIZE] = array("d", list(matrix))
+
+    def get(self, frame_index, node_index):
+        """Get the 16 values of a matrix.
+
+        Args:
+            frame_index (int): Frame index
+            node_index (int): Node index
+
+        Returns:
+            list: The matrix values or None if the node is not valid
+        """
+        if not self.valid[node_index]:
+            return None
+        offset = self._offset(frame_index, node_index)
+        return self.data[offset : offset + _MATRIX_SIZE].tolist()
+
+    def get_matrix(self, frame_index, node_index):
+        """Get a matrix.
+
+        Args:
+            frame_index (int): Frame index
+            node_index (int): Node index
+
+        Returns:
+            Matrix: The matrix or None if the node is not valid
+        """
+        values = self.get(frame_index, node_index)
+        if values is None:
+            return None
+        return datatypes.Matrix(values)
+
+    def to_lists(self):
+        """Get the matrices as nested lists.
+
+        Returns:
+            list: [frame][node] list of 16 values. None for not valid nodes
+        """
+        return [
+            [self.get(fi, ni) for ni in range(len(self.nodes))]
+            for fi in range(len(self.frames))
+        ]
+
+    def as_numpy(self):
+        """Get the samples as numpy array. The data is not copied.
+
+        Returns:
+            ndarray: (frames, nodes, 4, 4) array
+
+        Raises:
+            ImportError: If numpy is not available
+        """
+        if not NUMPY_READY:
+            raise ImportError("numpy is not available")
+        return np.frombuffer(self.data, dtype=np.float64).reshape(
+            len(self.frames), len(self.nodes), 4, 4
+        )
+
+
+def _get_dag_path(node):
+    sel = om.MSelectionList()
+    sel.add(str(node))
+    return sel.getDagPath(0)
+
+
+def _get_world_matrix_plug(dag_path):
+    plug = om.MFnDagNode(dag_path).findPlug("worldMatrix", False)
+    return plug.elementByLogicalIndex(dag_path.instanceNumber())
+
+
+@contextlib.contextmanager
+def keep_current_time():
+    """Restore the current time at the end of the block."""
+    current_time = cmds.currentTime(query=True)
+    try:
+        yield
+    finally:
+        cmds.currentTime(current_time)
+
+
+def iter_frames(frames):
+    """Change the current time once per frame.
+
+    The current time is restored when the iteration ends.
+
+    Args:
+        frames (list): The frames
+
+    Yields:
+        tuple: Frame index and frame
+    """
+    with keep_current_time():
+        for i, frame in enumerate(frames):
+            cmds.currentTime(frame, update=True)
+            yield i, frame
+
+
+def _read_in_context(plug, context):
+    if hasattr(context, "makeCurrent"):
+        previous = context.makeCurrent()
+        try:
+            return plug.asMObject()
+        finally:
+            previous.makeCurrent()
+    return plug.asMObject(context)
+
+
+def sample_world_matrices(nodes, frames, method=TIME, callback=None):
+    """Sample the world matrices of the nodes over the frames.
+
+    Args:
+        nodes (list): Nodes or node names. None items are allowed and
+            return None values
+        frames (list): Frames to sample
+        method (str, optional): "time" or "context". See module docstring
+        callback (function, optional): Called after each frame with the
+            frame index and the frame. i.e: to update a progress bar
+
+    Returns:
+        MatrixSamples: The samples
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError(
+            "Not valid sampling method: {}. Use {}".format(
+                method, SAMPLING_METHODS
+            )
+        )
+    samples = MatrixSamples(nodes, frames)
+    paths = [_get_dag_path(n) if n else None for n in samples.nodes]
+
+    if method == CONTEXT:
+        plugs = [_get_world_matrix_plug(p) if p else None for p in paths]
+        unit = om.MTime.uiUnit()
+        for fi, frame in enumerate(samples.frames):
+            context = om.MDGContext(om.MTime(frame, unit))
+            for ni, plug in enumerate(plugs):
+                if plug is not None:
+                    data = _read_in_context(plug, context)
+                    samples.set(fi, ni, om.MFnMatrixData(data).matrix())
+            if callback:
+                callback(fi, frame)
+    else:
+        for fi, frame in iter_frames(samples.frames):
+            for ni, path in enumerate(paths):
+                if path is not None:
+                    samples.set(fi, ni, path.inclusiveMatrix())
+            if callback:
+                callback(fi, frame)
+
+    return samples
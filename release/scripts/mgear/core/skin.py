@@ -13,23 +13,43 @@ This module is derivated from Chad Vernon's Skin IO.
 import os
 import json
 import pickle as pickle
+import timeit
+from concurrent import futures
 
 import mgear.pymaya as pm
 from maya import cmds
 import maya.OpenMaya as OpenMaya
 import maya.OpenMayaAnim as OpenMayaAnim
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as om2anim
 from .six import string_types
 from mgear.vendor.Qt import QtWidgets
 from mgear.vendor.Qt import QtCore
 from mgear.vendor.Qt import QtGui
 from mgear.core import pyqt
 from mgear.core import utils
+from mgear.core import columnar
 from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
 
+try:
+    import numpy as np
+
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
+
 FILE_EXT = ".gSkin"
 FILE_JSON_EXT = ".jSkin"
+FILE_COLUMNAR_EXT = ".cSkin"
 PACK_EXT = ".gSkinPack"
 
+SKIN_FILE_EXTS = (FILE_EXT, FILE_JSON_EXT, FILE_COLUMNAR_EXT)
+PRUNE_VALUE = 0.001
+# Maximum number of threads used to process the skin pack files
+PACK_WORKERS = min(8, os.cpu_count() or 1)
+COLUMNAR_KIND = "mgear_skin"
+COLUMNAR_PRECISIONS = ("f4", "f8", "u2")
+
 ######################################
 # Skin getters
 ######################################
@@ -187,12 +207,132 @@ def getCurrentWeights(skinCls, dagPath, components):
     return weights
 
 
+def _strip_namespace(name):
+    return "|".join([x.split(":")[-1] for x in name.split("|")])
+
+
+def _as_numpy(values):
+    """Convert an API 2.0 MDoubleArray to a numpy array
+
+    The array buffer is shared when the array exposes one, otherwise the
+    values are converted in a single call, without python loops.
+
+    Arguments:
+        values (MDoubleArray): The API array
+
+    Returns:
+        ndarray: float64 array
+    """
+    try:
+        result = np.frombuffer(memoryview(values), dtype=np.float64)
+    except TypeError:
+        return np.array(values, dtype=np.float64)
+    # the weights are edited in place before being set back
+    return result if result.flags.writeable else result.copy()
+
+
+def _to_mdoublearray(values):
+    """Convert a numpy array to an API 2.0 MDoubleArray
+
+    Arguments:
+        values (ndarray): The values, flattened in C order
+
+    Returns:
+        MDoubleArray: The API array
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64).ravel()
+    result = om2.MDoubleArray(len(values), 0.0)
+    try:
+        np.frombuffer(memoryview(result), dtype=np.float64)[:] = values
+    except TypeError:
+        result = om2.MDoubleArray(values)
+    return result
+
+
+def _get_weights_buffer(skinCls, dagPath, components):
+    """Get the skincluster weights as a (components, influences) numpy array
+
+    The API 1.0 components are converted to API 2.0 through the selection
+    strings, so the full weight buffer can be read in one call.
+
+    Arguments:
+        skinCls (PyNode): The skincluster node
+        dagPath (MDagPath): The skincluster dagpath
+        components (MObject): The skincluster components
+
+    Returns:
+        tuple: MFnSkinCluster (API 2.0), dagPath (API 2.0),
+            components (API 2.0), numpy weights array and the list of
+            influence names
+    """
+    sel = OpenMaya.MSelectionList()
+    sel.add(dagPath, components)
+    selStrings = OpenMaya.MStringArray()
+    sel.getSelectionStrings(selStrings)
+
+    sel2 = om2.MSelectionList()
+    for ii in range(selStrings.length()):
+        sel2.add(selStrings[ii])
+    dagPath2, components2 = sel2.getComponent(0)
+
+    sel2 = om2.MSelectionList()
+    sel2.add(skinCls.name())
+    skinFn = om2anim.MFnSkinCluster(sel2.getDependNode(0))
+
+    weights, numInfluences = skinFn.getWeights(dagPath2, components2)
+    weights = _as_numpy(weights).reshape(-1, numInfluences)
+
+    influences = [
+        p.partialPathName() for p in skinFn.influenceObjects()
+    ]
+    return skinFn, dagPath2, components2, weights, influences
+
+
 ######################################
 # Skin Collectors
 ######################################
 
 
 def collectInfluenceWeights(skinCls, dagPath, components, dataDic):
+    """Collect the influence weights in the compressed {vtx: weight} format
+
+    Uses the numpy path when available and the pure python path as fallback.
+
+    Arguments:
+        skinCls (PyNode): The skincluster node
+        dagPath (MDagPath): The skincluster dagpath
+        components (MObject): The skincluster components
+        dataDic (dict): The skin data dictionary to fill
+    """
+    if NUMPY_READY:
+        try:
+            _collectInfluenceWeightsNumpy(
+                skinCls, dagPath, components, dataDic
+            )
+            return
+        except Exception as e:
+            pm.displayWarning(
+                "{}: numpy weights collection failed, using python. "
+                "{}".format(skinCls.name(), e)
+            )
+    _collectInfluenceWeightsPython(skinCls, dagPath, components, dataDic)
+
+
+def _collectInfluenceWeightsNumpy(skinCls, dagPath, components, dataDic):
+    _, _, _, weights, influences = _get_weights_buffer(
+        skinCls, dagPath, components
+    )
+    dataDic["vertexCount"] = weights.shape[0]
+    for ii, influenceName in enumerate(influences):
+        # gather the whole influence column and skip 0.0 weights.
+        column = weights[:, ii]
+        nonZero = np.flatnonzero(column)
+        dataDic["weights"][_strip_namespace(influenceName)] = dict(
+            zip(nonZero.tolist(), column[nonZero].tolist())
+        )
+
+
+def _collectInfluenceWeightsPython(skinCls, dagPath, components, dataDic):
     weights = getCurrentWeights(skinCls, dagPath, components)
 
     influencePaths = OpenMaya.MDagPathArray()
@@ -202,7 +342,7 @@ def collectInfluenceWeights(skinCls, dagPath, components, dataDic):
     numComponentsPerInfluence = int(weights.length() / numInfluences)
     for ii in range(influencePaths.length()):
         influenceName = influencePaths[ii].partialPathName()
-        influenceWithoutNamespace = pm.PyNode(influenceName).stripNamespace()
+        influenceWithoutNamespace = _strip_namespace(influenceName)
         # build a dictionary of {vtx: weight}. Skip 0.0 weights.
         inf_w = {
             jj: weights[jj * numInfluences + ii]
@@ -241,6 +381,401 @@ def collectData(skinCls, dataDic):
     dataDic["skinClsName"] = skinCls.name()
 
 
+######################################
+# Skin files
+######################################
+
+
+def _weight_columns(wtValues):
+    """Get the sparse (indices, values) column of an influence.
+
+    Args:
+        wtValues (dict, list or tuple): The weights in compressed
+            {vtx: weight}, uncompressed [weight, ...] or columnar
+            (indices, values) format.
+
+    Returns:
+        tuple: List of vertex indices and list of weights. Zero weights
+            are skipped
+    """
+    if isinstance(wtValues, tuple):
+        return wtValues
+    if isinstance(wtValues, dict):
+        # JSON keys are strings, the binary format keys are int
+        items = sorted((int(k), v) for k, v in wtValues.items() if v != 0.0)
+    else:
+        items = [(k, v) for k, v in enumerate(wtValues) if v != 0.0]
+    return [k for k, _ in items], [v for _, v in items]
+
+
+def skin_data_to_columns(dataDic, precision="f4"):
+    """Convert a skin data dictionary to a columnar record.
+
+    The weights are stored CSR style. For the influence at index i, the
+    weights are in values[offsets[i]:offsets[i + 1]] and the vertex index
+    of each weight in the same range of the indices array.
+
+    Args:
+        dataDic (dict): Skin data dictionary as built by collectData
+        precision (str, optional): Weight values data type. "f4" float32,
+            "f8" float64 (lossless) or "u2" 16 bits quantized.
+
+    Returns:
+        tuple: (meta dict, arrays dict) ready for ColumnarWriter.write_record
+    """
+    if precision not in COLUMNAR_PRECISIONS:
+        raise ValueError("Not valid skin precision: {}".format(precision))
+
+    if dataDic.get("skinDataFormat") in ("compressed", "columnar"):
+        vertexCount = dataDic["vertexCount"]
+    else:
+        vertexCount = len(dataDic["blendWeights"])
+
+    influences = []
+    offsets = columnar.new_array("u4", [0])
+    indices = columnar.new_array("u4")
+    values = []
+    for influence, wtValues in dataDic["weights"].items():
+        inf_indices, inf_values = _weight_columns(wtValues)
+        influences.append(str(influence))
+        indices.extend(inf_indices)
+        values.extend(inf_values)
+        offsets.append(len(indices))
+
+    blendIndices, blendValues = _weight_columns(dataDic["blendWeights"])
+
+    if precision == "u2":
+        values = columnar.quantize(values)
+        blendValues = columnar.quantize(blendValues)
+    meta = {
+        "objName": dataDic["objName"],
+        "nameSpace": dataDic["nameSpace"],
+        "skinClsName": dataDic["skinClsName"],
+        "skinningMethod": dataDic.get("skinningMethod", 0),
+        "normalizeWeights": dataDic.get("normalizeWeights", 1),
+        "vertexCount": vertexCount,
+        "influences": influences,
+        "precision": precision,
+    }
+    arrays = {
+        "offsets": ("u4", offsets),
+        "indices": ("u4", indices),
+        "values": (precision, values),
+        "blendIndices": ("u4", blendIndices),
+        "blendValues": (precision, blendValues),
+    }
+    return meta, arrays
+
+
+def skin_data_from_columns(meta, arrays):
+    """Build a skin data dictionary from a columnar record.
+
+    The weights of each influence are returned as a (indices, values) tuple
+    and the data dictionary is flagged with the "columnar" skinDataFormat.
+
+    Args:
+        meta (dict): Record metadata
+        arrays (dict): Record arrays
+
+    Returns:
+        dict: Skin data dictionary
+    """
+    offsets = arrays["offsets"]
+    indices = arrays["indices"]
+    values = arrays["values"]
+    blendValues = arrays["blendValues"]
+    if meta["precision"] == "u2":
+        values = columnar.dequantize(values)
+        blendValues = columnar.dequantize(blendValues)
+
+    weights = {}
+    for ii, influence in enumerate(meta["influences"]):
+        start, end = offsets[ii], offsets[ii + 1]
+        weights[influence] = (indices[start:end], values[start:end])
+
+    dataDic = {
+        "weights": weights,
+        "blendWeights": (arrays["blendIndices"], blendValues),
+        "skinDataFormat": "columnar",
+    }
+    for key in (
+        "objName",
+        "nameSpace",
+        "skinClsName",
+        "skinningMethod",
+        "normalizeWeights",
+        "vertexCount",
+    ):
+        dataDic[key] = meta[key]
+    return dataDic
+
+
+def skin_data_to_compressed(dataDic):
+    """Convert a columnar skin data dictionary to the compressed format.
+
+    Args:
+        dataDic (dict): Skin data dictionary
+
+    Returns:
+        dict: Skin data dictionary with {vtx: weight} dictionaries
+    """
+    if dataDic.get("skinDataFormat") != "columnar":
+        return dataDic
+    newDic = dict(dataDic)
+    newDic["weights"] = {
+        influence: dict(zip(*_weight_columns(wtValues)))
+        for influence, wtValues in dataDic["weights"].items()
+    }
+    newDic["blendWeights"] = dict(
+        zip(*_weight_columns(dataDic["blendWeights"]))
+    )
+    newDic["skinDataFormat"] = "compressed"
+    return newDic
+
+
+def iterSkinFile(filePath):
+    """Iterate the skin data stored in a skin file.
+
+    Columnar files are streamed, one object at a time.
+
+    Args:
+        filePath (str): gSkin, jSkin or cSkin file path
+
+    Yields:
+        dict: Skin data dictionary per object
+    """
+    if filePath.endswith(FILE_COLUMNAR_EXT):
+        with columnar.ColumnarReader(filePath) as reader:
+            for meta, arrays in reader.iter_records():
+                yield skin_data_from_columns(meta, arrays)
+    else:
+        for dataDic in readSkinFile(filePath)["objDDic"]:
+            yield dataDic
+
+
+def readSkinFile(filePath):
+    """Read a skin file.
+
+    Args:
+        filePath (str): gSkin, jSkin or cSkin file path
+
+    Returns:
+        dict: The skin data pack with "objs" and "objDDic" keys
+    """
+    if filePath.endswith(FILE_EXT):
+        with open(filePath, "rb") as fp:
+            return pickle.load(fp)
+    elif filePath.endswith(FILE_COLUMNAR_EXT):
+        packDic = {"objs": [], "objDDic": [], "bypassObj": []}
+        with columnar.ColumnarReader(filePath) as reader:
+            for meta, arrays in reader.iter_records(copy=True):
+                packDic["objs"].append(meta["objName"])
+                packDic["objDDic"].append(skin_data_from_columns(meta, arrays))
+        return packDic
+    else:
+        with open(filePath, "r") as fp:
+            return json.load(fp)
+
+
+def writeSkinFile(filePath, packDic, precision="f4", compress=True):
+    """Write a skin data pack to a file.
+
+    The format is selected by the file extension.
+
+    Args:
+        filePath (str): gSkin, jSkin or cSkin file path
+        packDic (dict): The skin data pack with "objs" and "objDDic" keys
+        precision (str, optional): Columnar weights data type. "f4", "f8"
+            or "u2"
+        compress (bool, optional): Compress the columnar arrays. Uncompressed
+            files can be memory-mapped on read
+
+    Returns:
+        int: Size of the written file in bytes
+    """
+    if filePath.endswith(FILE_COLUMNAR_EXT):
+        with columnar.ColumnarWriter(
+            filePath, kind=COLUMNAR_KIND, compress=compress
+        ) as writer:
+            for dataDic in packDic["objDDic"]:
+                writer.write_record(*skin_data_to_columns(dataDic, precision))
+    else:
+        packDic = dict(packDic)
+        packDic["objDDic"] = [
+            skin_data_to_compressed(d) for d in packDic["objDDic"]
+        ]
+        if filePath.endswith(FILE_EXT):
+            with open(filePath, "wb") as fp:
+                pickle.dump(packDic, fp, pickle.HIGHEST_PROTOCOL)
+        else:
+            with open(filePath, "w") as fp:
+                json.dump(packDic, fp, indent=4, sort_keys=True)
+    return os.path.getsize(filePath)
+
+
+def convertSkinFile(filePath, outPath=None, precision="f8", compress=True):
+    """Convert a skin file between the gSkin, jSkin and cSkin formats.
+
+    With the default "f8" precision the conversion to cSkin is lossless.
+
+    Args:
+        filePath (str): Source skin file path
+        outPath (str, optional): Destination file path. If None, the source
+            path with the cSkin extension is used
+        precision (str, optional): Columnar weights data type
+        compress (bool, optional): Compress the columnar arrays
+
+    Returns:
+        str: The destination file path
+    """
+    if not outPath:
+        outPath = os.path.splitext(filePath)[0] + FILE_COLUMNAR_EXT
+    writeSkinFile(
+        outPath, readSkinFile(filePath), precision=precision, compress=compress
+    )
+    return outPath
+
+
+def convertSkinPack(packPath, file_ext=FILE_COLUMNAR_EXT, **kwargs):
+    """Convert all the skin files of a skin pack.
+
+    The pack file is updated to point to the converted files.
+
+    Args:
+        packPath (str): Skin pack file path
+        file_ext (str, optional): Destination skin file extension
+        **kwargs: convertSkinFile keyword arguments
+
+    Returns:
+        list: The converted file names
+    """
+    with open(packPath) as fp:
+        packDic = json.load(fp)
+    rootPath = os.path.dirname(packPath)
+    packFiles = []
+    for pFile in packDic["packFiles"]:
+        newFile = os.path.splitext(pFile)[0] + file_ext
+        convertSkinFile(
+            os.path.join(rootPath, pFile),
+            os.path.join(rootPath, newFile),
+            **kwargs
+        )
+        packFiles.append(newFile)
+    packDic["packFiles"] = packFiles
+    with open(packPath, "w") as f:
+        f.write(json.dumps(packDic, indent=4, sort_keys=True) + "\n")
+    return packFiles
+
+
+def collectObjectData(obj, skinCls):
+    """Collect the skin data dictionary of an object
+
+    Arguments:
+        obj (PyNode): The skinned object
+        skinCls (PyNode): The skincluster node
+
+    Returns:
+        dict: The skin data dictionary
+    """
+    dataDic = {
+        "weights": {},
+        "blendWeights": [],
+        "skinClsName": "",
+        "objName": obj.name(),
+        "nameSpace": obj.namespace(),
+        "vertexCount": 0,
+        "skinDataFormat": "compressed",
+    }
+    collectData(skinCls, dataDic)
+    return dataDic
+
+
+def pruneData(dataDic, value=PRUNE_VALUE):
+    """Prune small weights from a skin data dictionary
+
+    This is the in-memory equivalent of skinPercent pruneWeights. The
+    weights below the value are removed and, if the skin weights are
+    normalized, the remaining weights of the affected vertices are
+    normalized again. The scene is not modified.
+
+    Arguments:
+        dataDic (dict): The skin data dictionary
+        value (float, optional): The prune value
+
+    Returns:
+        dict: The pruned skin data dictionary in compressed format
+    """
+    columns = {
+        influence: _weight_columns(wtValues)
+        for influence, wtValues in dataDic["weights"].items()
+    }
+    pruned = {}
+    totals = {}
+    for influence, (indices, values) in columns.items():
+        kept = [(k, v) for k, v in zip(indices, values) if v >= value]
+        pruned[influence] = kept
+        for k, v in kept:
+            totals[k] = totals.get(k, 0.0) + v
+
+    normalize = dataDic.get("normalizeWeights", 1) == 1
+    weights = {}
+    for influence, kept in pruned.items():
+        if normalize:
+            weights[influence] = {k: v / totals[k] for k, v in kept}
+        else:
+            weights[influence] = dict(kept)
+
+    newDic = skin_data_to_compressed(dataDic)
+    newDic["weights"] = weights
+    if dataDic.get("skinDataFormat") not in ("compressed", "columnar"):
+        newDic["vertexCount"] = len(dataDic["blendWeights"])
+        newDic["blendWeights"] = dict(
+            zip(*_weight_columns(dataDic["blendWeights"]))
+        )
+    newDic["skinDataFormat"] = "compressed"
+    return newDic
+
+
+def _displayPackReport(report, title):
+    """Display the per mesh timings and file sizes of a skin pack
+
+    Arguments:
+        report (list): List of dictionaries with the mesh stats
+        title (str): Report title
+    """
+    print("{} ({} files)".format(title, len(report)))
+    totalBytes = 0
+    for stats in sorted(report, key=lambda x: x["bytes"], reverse=True):
+        totalBytes += stats["bytes"]
+        print(
+            "  {:<40} maya: {:>8.3f}s  io: {:>8.3f}s  {:>12,} bytes".format(
+                stats["mesh"], stats["maya"], stats["io"], stats["bytes"]
+            )
+        )
+    print("  Total: {:,} bytes".format(totalBytes))
+
+
+def _writePackFile(filePath, dataDic, prune):
+    # worker thread task. No Maya calls allowed here
+    start = timeit.default_timer()
+    if prune:
+        dataDic = pruneData(dataDic)
+    packDic = {
+        "objs": [dataDic["objName"]],
+        "objDDic": [dataDic],
+        "bypassObj": [],
+    }
+    size = writeSkinFile(filePath, packDic)
+    return size, timeit.default_timer() - start
+
+
+def _readPackFile(filePath):
+    # worker thread task. No Maya calls allowed here
+    start = timeit.default_timer()
+    packDic = readSkinFile(filePath)
+    return packDic, os.path.getsize(filePath), timeit.default_timer() - start
+
+
 ######################################
 # Skin export
 ######################################
@@ -261,6 +796,7 @@ def exportSkin(filePath=None, objs=None, *args):
         f2 = "jSkin ASCII  (*{});;gSkin Binary (*{})".format(
             FILE_JSON_EXT, FILE_EXT
         )
+        f2 += ";;cSkin Columnar (*{})".format(FILE_COLUMNAR_EXT)
         f3 = ";;All Files (*.*)"
         fileFilters = f2 + f3
         filePath = pm.fileDialog2(fileMode=0, fileFilter=fileFilters)
@@ -270,9 +806,7 @@ def exportSkin(filePath=None, objs=None, *args):
         else:
             return False
 
-    if not filePath.endswith(FILE_EXT) and not filePath.endswith(
-        FILE_JSON_EXT
-    ):
+    if not filePath.endswith(SKIN_FILE_EXTS):
         # filePath += file_ext
         pm.displayWarning("Not valid file extension for: {}".format(filePath))
         return
@@ -292,22 +826,9 @@ def exportSkin(filePath=None, objs=None, *args):
             # Otherwise, compressing will do almost nothing!
             if isinstance(obj.getShape(), pm.nodetypes.Mesh):
                 # TODO: Implement pruning on nurbs. Less straight-forward
-                pm.skinPercent(skinCls, obj, pruneWeights=0.001)
-
-            dataDic = {
-                "weights": {},
-                "blendWeights": [],
-                "skinClsName": "",
-                "objName": "",
-                "nameSpace": "",
-                "vertexCount": 0,
-                "skinDataFormat": "compressed",
-            }
-
-            dataDic["objName"] = obj.name()
-            dataDic["nameSpace"] = obj.namespace()
+                pm.skinPercent(skinCls, obj, pruneWeights=PRUNE_VALUE)
 
-            collectData(skinCls, dataDic)
+            dataDic = collectObjectData(obj, skinCls)
 
             packDic["objs"].append(obj.name())
             packDic["objDDic"].append(dataDic)
@@ -322,19 +843,40 @@ def exportSkin(filePath=None, objs=None, *args):
             )
 
     if packDic["objs"]:
-        if filePath.endswith(FILE_EXT):
-            with open(filePath, "wb") as fp:
-                pickle.dump(packDic, fp, pickle.HIGHEST_PROTOCOL)
-        else:
-            with open(filePath, "w") as fp:
-                json.dump(packDic, fp, indent=4, sort_keys=True)
+        writeSkinFile(filePath, packDic)
 
         return True
 
 
 @utils.timeFunc
-def exportSkinPack(packPath=None, objs=None, use_json=False, *args):
-    if use_json:
+def exportSkinPack(
+    packPath=None,
+    objs=None,
+    use_json=False,
+    use_columnar=False,
+    *args,
+    workers=PACK_WORKERS
+):
+    """Export the skin of each object to a file and write the skin pack
+
+    The raw weights are collected from Maya in the main thread. The pruning,
+    serialization, compression and file writing run in a thread pool: zlib,
+    numpy and the file IO release the GIL.
+
+    Args:
+        packPath (str, optional): Skin pack file path. If None, a file
+            dialog is shown
+        objs (list, optional): Objects to export. Default is the selection
+        use_json (bool, optional): Export the skin files as jSkin
+        use_columnar (bool, optional): Export the skin files as cSkin
+        workers (int, optional): Number of worker threads
+
+    Returns:
+        list: Per mesh report with the timings and file sizes
+    """
+    if use_columnar:
+        file_ext = FILE_COLUMNAR_EXT
+    elif use_json:
         file_ext = FILE_JSON_EXT
     else:
         file_ext = FILE_EXT
@@ -364,33 +906,64 @@ def exportSkinPack(packPath=None, objs=None, use_json=False, *args):
 
     packDic["rootPath"], packName = os.path.split(packPath)
 
-    for obj in objs:
-        fileName = obj.stripNamespace() + file_ext
-        filePath = os.path.join(packDic["rootPath"], fileName)
-        if exportSkin(filePath, [obj], use_json):
+    # Gather the raw weights from Maya in the main thread and process,
+    # prune, compress and write the files in the worker pool
+    report = []
+    jobs = []
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for obj in objs:
+            skinCls = getSkinCluster(obj)
+            if not skinCls:
+                pm.displayWarning(
+                    obj.name() + ": Skipped because don't have Skin Cluster"
+                )
+                continue
+            start = timeit.default_timer()
+            dataDic = collectObjectData(obj, skinCls)
+            stats = {
+                "mesh": obj.name(),
+                "maya": timeit.default_timer() - start,
+            }
+            # TODO: Implement pruning on nurbs. Less straight-forward
+            prune = isinstance(obj.getShape(), pm.nodetypes.Mesh)
+            fileName = obj.stripNamespace() + file_ext
+            filePath = os.path.join(packDic["rootPath"], fileName)
+            job = executor.submit(_writePackFile, filePath, dataDic, prune)
+            jobs.append((fileName, stats, job))
+
+        for fileName, stats, job in jobs:
+            try:
+                stats["bytes"], stats["io"] = job.result()
+            except Exception as e:
+                pm.displayWarning(
+                    "{}: Skin export failed. {}".format(stats["mesh"], e)
+                )
+                continue
             packDic["packFiles"].append(fileName)
-            pm.displayInfo(filePath)
-        else:
-            pm.displayWarning(
-                obj.name() + ": Skipped because don't have Skin Cluster"
-            )
+            report.append(stats)
 
     if packDic["packFiles"]:
         data_string = json.dumps(packDic, indent=4, sort_keys=True)
         with open(packPath, "w") as f:
             f.write(data_string + "\n")
+        _displayPackReport(report, "Skin Pack export")
         pm.displayInfo("Skin Pack exported: " + packPath)
     else:
         pm.displayWarning(
             "Any of the selected objects have Skin Cluster. "
             "Skin Pack export aborted."
         )
+    return report
 
 
 def exportJsonSkinPack(packPath=None, objs=None, *args):
     exportSkinPack(packPath, objs, use_json=True)
 
 
+def exportColumnarSkinPack(packPath=None, objs=None, *args):
+    exportSkinPack(packPath, objs, use_columnar=True)
+
+
 ######################################
 # Skin setters
 ######################################
@@ -400,6 +973,8 @@ def exportJsonSkinPack(packPath=None, objs=None, *args):
 def setInfluenceWeights(skinCls, dagPath, components, dataDic, compressed):
     """Sets influence weights for a given skin cluster.
 
+    Uses the numpy path when available and the pure python path as fallback.
+
     Args:
         skinCls (PyNode): The skin cluster node.
         dagPath (MDagPath): The DAG path of the mesh.
@@ -407,6 +982,74 @@ def setInfluenceWeights(skinCls, dagPath, components, dataDic, compressed):
         dataDic (dict): A dictionary containing influence weights.
         compressed (bool): Whether to use compressed weight format.
     """
+    if NUMPY_READY:
+        try:
+            _setInfluenceWeightsNumpy(
+                skinCls, dagPath, components, dataDic, compressed
+            )
+            return
+        except Exception as e:
+            pm.displayWarning(
+                "{}: numpy weights assignment failed, using python. "
+                "{}".format(skinCls.name(), e)
+            )
+    _setInfluenceWeightsPython(
+        skinCls, dagPath, components, dataDic, compressed
+    )
+
+
+def _setInfluenceWeightsNumpy(
+    skinCls, dagPath, components, dataDic, compressed
+):
+    skinFn, dagPath2, components2, weights, _ = _get_weights_buffer(
+        skinCls, dagPath, components
+    )
+    numComponents, numInfluences = weights.shape
+
+    influenceMap = {
+        om2.MFnDependencyNode(p.node()).name(): ii
+        for ii, p in enumerate(skinFn.influenceObjects())
+    }
+
+    columnarData = dataDic.get("skinDataFormat") == "columnar"
+    for importedInfluence, wtValues in dataDic["weights"].items():
+        influenceIndex = influenceMap.get(importedInfluence)
+        if influenceIndex is None:
+            continue
+        if columnarData or compressed:
+            if columnarData:
+                indices = np.asarray(wtValues[0], dtype=np.int64)
+                values = np.asarray(wtValues[1], dtype=np.float64)
+            else:
+                # JSON keys are strings, the binary format keys are int
+                indices = np.fromiter(
+                    (int(k) for k in wtValues),
+                    dtype=np.int64,
+                    count=len(wtValues),
+                )
+                values = np.fromiter(
+                    wtValues.values(), dtype=np.float64, count=len(wtValues)
+                )
+            valid = indices < numComponents
+            # scatter the sparse column on a cleared influence
+            weights[:, influenceIndex] = 0.0
+            weights[indices[valid], influenceIndex] = values[valid]
+        else:
+            values = np.asarray(wtValues[:numComponents], dtype=np.float64)
+            weights[: len(values), influenceIndex] = values
+
+    skinFn.setWeights(
+        dagPath2,
+        components2,
+        om2.MIntArray(list(range(numInfluences))),
+        _to_mdoublearray(weights),
+        False,
+    )
+
+
+def _setInfluenceWeightsPython(
+    skinCls, dagPath, components, dataDic, compressed
+):
     unusedImports = []
     weights = getCurrentWeights(skinCls, dagPath, components)
 
@@ -422,10 +1065,17 @@ def setInfluenceWeights(skinCls, dagPath, components, dataDic, compressed):
         for ii in range(influencePaths.length())
     }
 
+    columnarData = dataDic.get("skinDataFormat") == "columnar"
     for importedInfluence, wtValues in dataDic["weights"].items():
         influenceIndex = influenceMap.get(importedInfluence)
         if influenceIndex is not None:
-            if compressed:
+            if columnarData:
+                # sparse column. Clear the influence and set non zero weights
+                for jj in range(numComponentsPerInfluence):
+                    weights.set(0.0, jj * numInfluences + influenceIndex)
+                for jj, wt in zip(*wtValues):
+                    weights.set(wt, jj * numInfluences + influenceIndex)
+            elif compressed:
                 for jj in range(numComponentsPerInfluence):
                     wt = wtValues.get(jj, wtValues.get(str(jj), 0.0))
 
@@ -448,7 +1098,11 @@ def setInfluenceWeights(skinCls, dagPath, components, dataDic, compressed):
 
 # @utils.timeFunc
 def setBlendWeights(skinCls, dagPath, components, dataDic, compressed):
-    if compressed:
+    if dataDic.get("skinDataFormat") == "columnar":
+        blendWeights = OpenMaya.MDoubleArray(dataDic["vertexCount"])
+        for index, value in zip(*dataDic["blendWeights"]):
+            blendWeights.set(value, index)
+    elif compressed:
         # The compressed format skips 0.0 weights. If the key is empty,
         # set it to 0.0. JSON keys can't be integers. The vtx number key
         # is unicode. example: vtx[35] would be: u"35": 0.6974,
@@ -485,10 +1139,13 @@ def setData(skinCls, dataDic, compressed):
 def _getObjsFromSkinFile(filePath=None, *args):
     # retrive the object names inside gSkin file
     if not filePath:
-        f1 = "mGear Skin (*{0} *{1})".format(FILE_EXT, FILE_JSON_EXT)
+        f1 = "mGear Skin (*{0} *{1} *{2})".format(
+            FILE_EXT, FILE_JSON_EXT, FILE_COLUMNAR_EXT
+        )
         f2 = ";;gSkin Binary (*{0});;jSkin ASCII  (*{1})".format(
             FILE_EXT, FILE_JSON_EXT
         )
+        f2 += ";;cSkin Columnar (*{0})".format(FILE_COLUMNAR_EXT)
         f3 = ";;All Files (*.*)"
         fileFilters = f1 + f2 + f3
         filePath = pm.fileDialog2(fileMode=1, fileFilter=fileFilters)
@@ -497,14 +1154,11 @@ def _getObjsFromSkinFile(filePath=None, *args):
     if not isinstance(filePath, string_types):
         filePath = filePath[0]
 
-    # Read in the file
-    with open(filePath, "r") as fp:
-        if filePath.endswith(FILE_EXT):
-            data = pickle.load(fp)
-        else:
-            data = json.load(fp)
+    if filePath.endswith(FILE_COLUMNAR_EXT):
+        with columnar.ColumnarReader(filePath) as reader:
+            return [r["meta"]["objName"] for r in reader.records]
 
-        return data["objs"]
+    return readSkinFile(filePath)["objs"]
 
 
 def getObjsFromSkinFile(filePath=None, *args):
@@ -518,10 +1172,13 @@ def getObjsFromSkinFile(filePath=None, *args):
 def importSkin(filePath=None, *args):
 
     if not filePath:
-        f1 = "mGear Skin (*{0} *{1})".format(FILE_EXT, FILE_JSON_EXT)
+        f1 = "mGear Skin (*{0} *{1} *{2})".format(
+            FILE_EXT, FILE_JSON_EXT, FILE_COLUMNAR_EXT
+        )
         f2 = ";;gSkin Binary (*{0});;jSkin ASCII  (*{1})".format(
             FILE_EXT, FILE_JSON_EXT
         )
+        f2 += ";;cSkin Columnar (*{0})".format(FILE_COLUMNAR_EXT)
         f3 = ";;All Files (*.*)"
         fileFilters = f1 + f2 + f3
         filePath = pm.fileDialog2(fileMode=1, fileFilter=fileFilters)
@@ -530,101 +1187,122 @@ def importSkin(filePath=None, *args):
     if not isinstance(filePath, string_types):
         filePath = filePath[0]
 
-    # Read in the file
-    if filePath.endswith(FILE_EXT):
-        with open(filePath, "rb") as fp:
-            dataPack = pickle.load(fp)
-    else:
-        with open(filePath, "r") as fp:
-            dataPack = json.load(fp)
+    # Read in the file. Columnar files are streamed one object at a time
+    for data in iterSkinFile(filePath):
+        importSkinData(data)
 
-    for data in dataPack["objDDic"]:
-        # This checks if the jSkin file has the new style compressed format.
-        # use a skinDataFormat key to check for backwards compatibility.
-        # If it doesn't exist, just continue with the old method.
-        compressed = False
-        if "skinDataFormat" in data:
-            if data["skinDataFormat"] == "compressed":
-                compressed = True
 
-        try:
-            skinCluster = False
-            objName = data["objName"]
-            objNode = pm.PyNode(objName)
+def importSkinData(data):
+    """Apply the skin data dictionary of one object to the scene
 
-            try:
-                # use getShapes() else meshes with 2+ shapes will fail.
-                # TODO: multiple shape nodes is not currently supported in
-                # the file structure! It should raise an error.
-                # Also noIntermediate otherwise it will count shapeOrig nodes.
-                objShapes = objNode.getShapes(noIntermediate=True)
-
-                if isinstance(objNode.getShape(), pm.nodetypes.Mesh):
-                    meshVertices = pm.polyEvaluate(objShapes, vertex=True)
-                elif isinstance(objNode.getShape(), pm.nodetypes.NurbsSurface):
-                    # if nurbs, count the cvs instead of the vertices.
-                    meshVertices = sum([len(shape.cv) for shape in objShapes])
-                elif isinstance(objNode.getShape(), pm.nodetypes.NurbsCurve):
-                    # meshVertices = sum([len(shape.cv) for shape in objShapes])
-                    meshVertices = sum(1 for _ in objShapes[0].cv)
-                else:
-                    # TODO: Implement other skinnable objs like lattices.
-                    meshVertices = 0
-
-                if compressed:
-                    importedVertices = data["vertexCount"]
-                else:
-                    importedVertices = len(data["blendWeights"])
-                if meshVertices != importedVertices:
-                    warningMsg = "Vertex counts on {} do not match. {} != {}"
-                    pm.displayWarning(
-                        warningMsg.format(
-                            objName, meshVertices, importedVertices
-                        )
-                    )
-                    continue
-            except Exception:
-                pass
+    Args:
+        data (dict): Skin data dictionary
+
+    Returns:
+        bool: True if the skin was imported
+    """
+    # This checks if the jSkin file has the new style compressed format.
+    # use a skinDataFormat key to check for backwards compatibility.
+    # If it doesn't exist, just continue with the old method.
+    compressed = False
+    if "skinDataFormat" in data:
+        if data["skinDataFormat"] in ("compressed", "columnar"):
+            compressed = True
 
-            if getSkinCluster(objNode):
-                skinCluster = getSkinCluster(objNode)
+    try:
+        skinCluster = False
+        objName = data["objName"]
+        objNode = pm.PyNode(objName)
+
+        try:
+            # use getShapes() else meshes with 2+ shapes will fail.
+            # TODO: multiple shape nodes is not currently supported in
+            # the file structure! It should raise an error.
+            # Also noIntermediate otherwise it will count shapeOrig nodes.
+            objShapes = objNode.getShapes(noIntermediate=True)
+
+            if isinstance(objNode.getShape(), pm.nodetypes.Mesh):
+                meshVertices = pm.polyEvaluate(objShapes, vertex=True)
+            elif isinstance(objNode.getShape(), pm.nodetypes.NurbsSurface):
+                # if nurbs, count the cvs instead of the vertices.
+                meshVertices = sum([len(shape.cv) for shape in objShapes])
+            elif isinstance(objNode.getShape(), pm.nodetypes.NurbsCurve):
+                # meshVertices = sum([len(shape.cv) for shape in objShapes])
+                meshVertices = sum(1 for _ in objShapes[0].cv)
             else:
-                try:
-                    joints = list(data["weights"].keys())
-                    # strip | from longName, or skinCluster command may fail.
-                    skinName = data["skinClsName"].replace("|", "")
-                    skinCluster = pm.skinCluster(
-                        joints, objNode, tsb=True, nw=2, n=skinName
-                    )
-                except Exception:
-                    sceneJoints = set(
-                        [pm.PyNode(x).name() for x in pm.ls(type="joint")]
-                    )
-                    notFound = []
-                    for j in data["weights"].keys():
-                        if j not in sceneJoints:
-                            notFound.append(str(j))
-                    pm.displayWarning(
-                        "Object: " + objName + " Skiped. Can't "
-                        "found corresponding deformer for the "
-                        "following joints: " + str(notFound)
+                # TODO: Implement other skinnable objs like lattices.
+                meshVertices = 0
+
+            if compressed:
+                importedVertices = data["vertexCount"]
+            else:
+                importedVertices = len(data["blendWeights"])
+            if meshVertices != importedVertices:
+                warningMsg = "Vertex counts on {} do not match. {} != {}"
+                pm.displayWarning(
+                    warningMsg.format(
+                        objName, meshVertices, importedVertices
                     )
-                    continue
+                )
+                return False
+        except Exception:
+            pass
 
-            if isinstance(skinCluster, list):
-                skinCluster = skinCluster[0]
+        if getSkinCluster(objNode):
+            skinCluster = getSkinCluster(objNode)
+        else:
+            try:
+                joints = list(data["weights"].keys())
+                # strip | from longName, or skinCluster command may fail.
+                skinName = data["skinClsName"].replace("|", "")
+                skinCluster = pm.skinCluster(
+                    joints, objNode, tsb=True, nw=2, n=skinName
+                )
+            except Exception:
+                sceneJoints = set(
+                    [pm.PyNode(x).name() for x in pm.ls(type="joint")]
+                )
+                notFound = []
+                for j in data["weights"].keys():
+                    if j not in sceneJoints:
+                        notFound.append(str(j))
+                pm.displayWarning(
+                    "Object: " + objName + " Skiped. Can't "
+                    "found corresponding deformer for the "
+                    "following joints: " + str(notFound)
+                )
+                return False
 
-            if skinCluster:
-                setData(skinCluster, data, compressed)
-                print("Imported skin for: {}".format(objName))
+        if isinstance(skinCluster, list):
+            skinCluster = skinCluster[0]
 
-        except Exception:
-            warningMsg = "Object: {} Skipped. Can NOT be found in the scene"
-            pm.displayWarning(warningMsg.format(objName))
+        if skinCluster:
+            setData(skinCluster, data, compressed)
+            print("Imported skin for: {}".format(objName))
+            return True
+
+    except Exception:
+        warningMsg = "Object: {} Skipped. Can NOT be found in the scene"
+        pm.displayWarning(warningMsg.format(objName))
+    return False
 
 
 @utils.timeFunc
-def importSkinPack(filePath=None, *args):
+def importSkinPack(filePath=None, *args, workers=PACK_WORKERS):
+    """Import all the skin files of a skin pack
+
+    The skin files are read, decompressed and decoded in a thread pool while
+    the weights are applied in the main thread. No Maya call is done in the
+    pool.
+
+    Args:
+        filePath (str, optional): Skin pack file path. If None, a file
+            dialog is shown
+        workers (int, optional): Number of worker threads
+
+    Returns:
+        list: Per mesh report with the timings and file sizes
+    """
     if not filePath:
         filePath = pm.fileDialog2(
             fileMode=1, fileFilter="mGear skinPack (*%s)" % PACK_EXT
@@ -636,9 +1314,36 @@ def importSkinPack(filePath=None, *args):
 
     with open(filePath) as fp:
         packDic = json.load(fp)
-        for pFile in packDic["packFiles"]:
-            filePath = os.path.join(os.path.split(filePath)[0], pFile)
-            importSkin(filePath, True)
+
+    # Read and decode the skin files in the worker pool and apply the
+    # weights in the main thread, in the pack order, as they are ready
+    rootPath = os.path.split(filePath)[0]
+    report = []
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        jobs = [
+            (f, executor.submit(_readPackFile, os.path.join(rootPath, f)))
+            for f in packDic["packFiles"]
+        ]
+        for pFile, job in jobs:
+            try:
+                dataPack, size, ioTime = job.result()
+            except Exception as e:
+                pm.displayWarning("{}: Skin read failed. {}".format(pFile, e))
+                continue
+            start = timeit.default_timer()
+            for data in dataPack["objDDic"]:
+                importSkinData(data)
+            report.append(
+                {
+                    "mesh": ", ".join(dataPack["objs"]),
+                    "maya": timeit.default_timer() - start,
+                    "io": ioTime,
+                    "bytes": size,
+                }
+            )
+
+    _displayPackReport(report, "Skin Pack import")
+    return report
 
 
 ######################################
@@ -646,8 +1351,39 @@ def importSkinPack(filePath=None, *args):
 ######################################
 
 
+def _copySkinByIndex(sourceSkin, targetSkin):
+    """Copy the skin weights by vertex index using the columnar data
+
+    Args:
+        sourceSkin (PyNode): Source skin cluster
+        targetSkin (PyNode): Target skin cluster
+    """
+    dataDic = {
+        "weights": {},
+        "blendWeights": [],
+        "skinClsName": "",
+        "objName": "",
+        "nameSpace": "",
+        "vertexCount": 0,
+        "skinDataFormat": "compressed",
+    }
+    collectData(sourceSkin, dataDic)
+    dataDic = skin_data_from_columns(*skin_data_to_columns(dataDic, "f8"))
+    setData(targetSkin, dataDic, True)
+
+
 @utils.timeFunc
 def skinCopy(sourceMesh=None, targetMesh=None, *args, **kwargs):
+    """Copy the skin from the source mesh to the target meshes
+
+    Args:
+        sourceMesh (PyNode or str, optional): Source mesh with skinCluster
+        targetMesh (PyNode or str, optional): Target mesh
+        **kwargs: "name" for the new skinCluster name. "byIndex" to copy the
+            weights by vertex index when the meshes have the same vertex
+            count, using the in-memory columnar skin data instead of
+            copySkinWeights
+    """
     if not sourceMesh or not targetMesh:
         if len(pm.selected()) >= 2:
             sourceMesh = pm.selected()[-1]
@@ -684,14 +1420,25 @@ def skinCopy(sourceMesh=None, targetMesh=None, *args, **kwargs):
             skinCluster = pm.skinCluster(
                 oDef, targetMesh, tsb=True, nw=1, n=skinName
             )[0]
-            pm.copySkinWeights(
-                sourceSkin=ss.stripNamespace(),
-                destinationSkin=skinCluster.name(),
-                noMirror=True,
-                influenceAssociation="oneToOne",
-                smooth=True,
-                normalize=True,
-            )
+            byIndex = kwargs.get("byIndex", False)
+            if byIndex:
+                try:
+                    byIndex = pm.polyEvaluate(
+                        sourceMesh, vertex=True
+                    ) == pm.polyEvaluate(targetMesh, vertex=True)
+                except Exception:
+                    byIndex = False
+            if byIndex:
+                _copySkinByIndex(ss, skinCluster)
+            else:
+                pm.copySkinWeights(
+                    sourceSkin=ss.stripNamespace(),
+                    destinationSkin=skinCluster.name(),
+                    noMirror=True,
+                    influenceAssociation="oneToOne",
+                    smooth=True,
+                    normalize=True,
+                )
             skinCluster.skinningMethod.set(skinMethod)
         else:
             errorMsg = "Source Mesh : {} doesn't have a skinCluster."
@@ -0,0 +1,1359 @@
+"""NumPy reference implementation of the mgear_solvers nodes.
+
+The solver nodes of src/mgear_solvers.h can only be evaluated inside Maya.
+This module reproduces their compute methods with numpy, evaluating many
+frames in a single call and without Maya, for offline validation of rigs
+and exported animation, precomputing match poses or testing changes to
+the C++ solvers against golden values.
+
+Conventions, same as the Maya API:
+    Matrices are (..., 4, 4) arrays with row vectors, the translation in
+    the last row.
+    Quaternions are (..., 4) arrays of (x, y, z, w).
+    Euler rotations are in XYZ order.
+
+Every solver takes per frame inputs as arrays with the frames on the first
+axis. Matrices of shape (4, 4) and scalars are broadcast to all the frames.
+
+The nodes compute in single precision for the float attributes, so the
+results of this module match Maya within about 1e-5.
+
+Supported nodes:
+    mgear_ikfk2Bone: ikfk2bone
+    mgear_rollSplineKine: roll_spline_kine
+    mgear_squashStretch2: squash_stretch2
+    mgear_springNode: spring
+    mgear_matrixConstraint: matrix_constraint
+
+mgear_slideCurve2 and mgear_curveCns are deformers working on NURBS curves
+and are not supported.
+
+Example:
+    >>> out = solvers.ikfk2bone(root, ikref, upv, fk0, fk1, fk2, blend=1.0,
+    ...                         length_a=3.0, length_b=4.0)
+    >>> out["outB"].shape
+    (100, 4, 4)
+
+The benchmark can be run from a shell, without Maya:
+    python solvers.py --frames 10000
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+
+# same truncated value as the C++ solvers
+PI = 3.14159265
+
+IKFK2BONE_OUTPUTS = ("outA", "outB", "outCenter", "outEff")
+
+_IDENTITY = np.identity(4)
+
+
+#############################################
+# VECTOR
+#############################################
+
+
+def _normalize(v):
+    """Normalize the vectors. Null vectors are left unchanged, like
+    MVector.normalize.
+    """
+    length = np.linalg.norm(v, axis=-1, keepdims=True)
+    return v / np.where(length == 0.0, 1.0, length)
+
+
+def _dot(a, b):
+    return np.sum(a * b, axis=-1)
+
+
+def _lerp(a, b, blend):
+    blend = np.asarray(blend, dtype=np.float64)
+    if np.ndim(a) > np.ndim(blend):
+        blend = blend[..., None]
+    return a * (1.0 - blend) + b * blend
+
+
+def _rotate_along_axis(v, axis, angle):
+    """rotateVectorAlongAxis of utils.cpp. The MQuaternion product is
+    reversed compared to the Hamilton product, so the vector is rotated by
+    -angle with the right hand rule.
+    """
+    return _rotate_by(v, _axis_angle_quaternion(axis, -angle))
+
+
+def _rotate_by(v, q):
+    """MVector.rotateBy(MQuaternion), the quaternion is not normalized."""
+    return np.einsum("...i,...ij->...j", v, _quaternion_rows(q))
+
+
+def _axis_angle_quaternion(axis, angle):
+    half = np.asarray(angle, dtype=np.float64) * 0.5
+    return np.concatenate(
+        [axis * np.sin(half)[..., None], np.cos(half)[..., None]], axis=-1
+    )
+
+
+def bezier4point(a, tan_a, d, tan_d, u):
+    """Position and normalized tangent on a bezier segment, like
+    bezier4point in utils.cpp
+
+    Args:
+        a (ndarray): (..., 3) first point
+        tan_a (ndarray): (..., 3) tangent of the first point
+        d (ndarray): (..., 3) last point
+        tan_d (ndarray): (..., 3) tangent of the last point
+        u (ndarray): (...) parameter on the segment
+
+    Returns:
+        tuple: (..., 3) positions and (..., 3) tangents
+    """
+    b = a + tan_a
+    c = d - tan_d
+    ab = _lerp(a, b, u)
+    bc = _lerp(b, c, u)
+    cd = _lerp(c, d, u)
+    abbc = _lerp(ab, bc, u)
+    bccd = _lerp(bc, cd, u)
+    return _lerp(abbc, bccd, u), _normalize(bccd - abbc)
+
+
+#############################################
+# QUATERNION
+#############################################
+
+
+def _quaternion_rows(q):
+    """Rows of MQuaternion.asMatrix, without normalization."""
+    x, y, z, w = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    rows = np.empty(q.shape[:-1] + (3, 3))
+    rows[..., 0, 0] = 1.0 - 2.0 * (y * y + z * z)
+    rows[..., 0, 1] = 2.0 * (x * y + z * w)
+    rows[..., 0, 2] = 2.0 * (x * z - y * w)
+    rows[..., 1, 0] = 2.0 * (x * y - z * w)
+    rows[..., 1, 1] = 1.0 - 2.0 * (x * x + z * z)
+    rows[..., 1, 2] = 2.0 * (y * z + x * w)
+    rows[..., 2, 0] = 2.0 * (x * z + y * w)
+    rows[..., 2, 1] = 2.0 * (y * z - x * w)
+    rows[..., 2, 2] = 1.0 - 2.0 * (x * x + y * y)
+    return rows
+
+
+def quaternion_to_rotation(q):
+    """Rotation matrices of quaternions
+
+    Args:
+        q (ndarray): (..., 4) quaternions, normalized before conversion
+
+    Returns:
+        ndarray: (..., 3, 3) rotation matrices
+    """
+    return _quaternion_rows(_normalize(np.asarray(q, dtype=np.float64)))
+
+
+def rotation_to_quaternion(rotation):
+    """Quaternions of rotation matrices, with a positive w
+
+    Args:
+        rotation (ndarray): (..., 3, 3) orthonormal rotation matrices
+
+    Returns:
+        ndarray: (..., 4) quaternions
+    """
+    # column vector form
+    r = np.swapaxes(np.asarray(rotation, dtype=np.float64), -1, -2)
+    m00, m11, m22 = r[..., 0, 0], r[..., 1, 1], r[..., 2, 2]
+    candidates = np.stack(
+        [
+            1.0 + m00 + m11 + m22,
+            1.0 + m00 - m11 - m22,
+            1.0 - m00 + m11 - m22,
+            1.0 - m00 - m11 + m22,
+        ],
+        axis=-1,
+    )
+    case = np.argmax(candidates, axis=-1)
+    s = np.sqrt(np.maximum(np.max(candidates, axis=-1), 1e-300)) * 2.0
+
+    wx = (r[..., 2, 1] - r[..., 1, 2]) / s
+    wy = (r[..., 0, 2] - r[..., 2, 0]) / s
+    wz = (r[..., 1, 0] - r[..., 0, 1]) / s
+    xy = (r[..., 0, 1] + r[..., 1, 0]) / s
+    xz = (r[..., 0, 2] + r[..., 2, 0]) / s
+    yz = (r[..., 1, 2] + r[..., 2, 1]) / s
+    quarter = s * 0.25
+
+    q = np.empty(r.shape[:-2] + (4,))
+    for index, (x, y, z, w) in enumerate(
+        (
+            (wx, wy, wz, quarter),
+            (quarter, xy, xz, wx),
+            (xy, quarter, yz, wy),
+            (xz, yz, quarter, wz),
+        )
+    ):
+        mask = case == index
+        q[mask] = np.stack([x, y, z, w], axis=-1)[mask]
+
+    return np.where(q[..., 3:] < 0.0, -q, q)
+
+
+def slerp(qa, qb, blend):
+    """Spherical interpolation of quaternions, along the shortest path
+
+    Args:
+        qa (ndarray): (..., 4) quaternions at blend 0
+        qb (ndarray): (..., 4) quaternions at blend 1
+        blend (float or ndarray): blend value
+
+    Returns:
+        ndarray: (..., 4) quaternions
+    """
+    blend = np.asarray(blend, dtype=np.float64)
+    dot = _dot(qa, qb)
+    qb = np.where(dot[..., None] < 0.0, -qb, qb)
+    dot = np.clip(np.abs(dot), -1.0, 1.0)
+    angle = np.arccos(dot)
+    sin_angle = np.sin(angle)
+    close = sin_angle < 1e-10
+    safe = np.where(close, 1.0, sin_angle)
+    scale_a = np.where(
+        close, 1.0 - blend, np.sin((1.0 - blend) * angle) / safe
+    )
+    scale_b = np.where(close, blend, np.sin(blend * angle) / safe)
+    return qa * scale_a[..., None] + qb * scale_b[..., None]
+
+
+#############################################
+# EULER
+#############################################
+
+
+def euler_to_rotation(euler):
+    """Rotation matrices of XYZ euler rotations
+
+    Args:
+        euler (ndarray): (..., 3) rotations in radians
+
+    Returns:
+        ndarray: (..., 3, 3) rotation matrices
+    """
+    euler = np.asarray(euler, dtype=np.float64)
+    cx, cy, cz = [np.cos(euler[..., i]) for i in range(3)]
+    sx, sy, sz = [np.sin(euler[..., i]) for i in range(3)]
+    rows = np.empty(euler.shape[:-1] + (3, 3))
+    rows[..., 0, 0] = cy * cz
+    rows[..., 0, 1] = cy * sz
+    rows[..., 0, 2] = -sy
+    rows[..., 1, 0] = sx * sy * cz - cx * sz
+    rows[..., 1, 1] = sx * sy * sz + cx * cz
+    rows[..., 1, 2] = sx * cy
+    rows[..., 2, 0] = cx * sy * cz + sx * sz
+    rows[..., 2, 1] = cx * sy * sz - sx * cz
+    rows[..., 2, 2] = cx * cy
+    return rows
+
+
+def rotation_to_euler(rotation):
+    """XYZ euler rotations of rotation matrices
+
+    Args:
+        rotation (ndarray): (..., 3, 3) rotation matrices
+
+    Returns:
+        ndarray: (..., 3) rotations in radians
+    """
+    r = np.asarray(rotation, dtype=np.float64)
+    return np.stack(
+        [
+            np.arctan2(r[..., 1, 2], r[..., 2, 2]),
+            np.arcsin(np.clip(-r[..., 0, 2], -1.0, 1.0)),
+            np.arctan2(r[..., 0, 1], r[..., 0, 0]),
+        ],
+        axis=-1,
+    )
+
+
+#############################################
+# MATRIX
+#############################################
+
+
+def orthonormalize(axes):
+    """Rotation of the axes, like getQuaternionFromAxes in utils.cpp. The
+    axes are orthonormalized in x, y, z order, z is flipped if the axes
+    are left handed.
+
+    Args:
+        axes (ndarray): (..., 3, 3) x, y and z axes as rows
+
+    Returns:
+        ndarray: (..., 3, 3) rotation matrices
+    """
+    return decompose_matrices(_matrices(axes))[1]
+
+
+def decompose_matrices(matrices):
+    """Decompose matrices like MTransformationMatrix, as scale * shear *
+    rotation * translation
+
+    Args:
+        matrices (ndarray): (..., 4, 4) matrices
+
+    Returns:
+        tuple: (..., 3) translations, (..., 3, 3) rotations, (..., 3)
+        scales and (..., 3) xy, xz, yz shears
+    """
+    m = np.asarray(matrices, dtype=np.float64)
+    row0, row1, row2 = m[..., 0, :3], m[..., 1, :3], m[..., 2, :3]
+
+    sx = np.linalg.norm(row0, axis=-1)
+    axis_x = _normalize(row0)
+    d01 = _dot(row1, axis_x)
+    row1 = row1 - d01[..., None] * axis_x
+    sy = np.linalg.norm(row1, axis=-1)
+    axis_y = _normalize(row1)
+    axis_z = np.cross(axis_x, axis_y)
+    d02 = _dot(row2, axis_x)
+    d12 = _dot(row2, axis_y)
+    sz = _dot(row2, axis_z)
+
+    safe_sy = np.where(sy == 0.0, 1.0, sy)
+    safe_sz = np.where(sz == 0.0, 1.0, sz)
+    shear = np.stack([d01 / safe_sy, d02 / safe_sz, d12 / safe_sz], axis=-1)
+    rotation = np.stack([axis_x, axis_y, axis_z], axis=-2)
+    scale = np.stack([sx, sy, sz], axis=-1)
+    return m[..., 3, :3].copy(), rotation, scale, shear
+
+
+def compose_matrices(translation, rotation, scale=None, shear=None):
+    """Compose matrices like MTransformationMatrix.asMatrix
+
+    Args:
+        translation (ndarray): (..., 3) translations
+        rotation (ndarray): (..., 3, 3) rotations
+        scale (ndarray, optional): (..., 3) scales
+        shear (ndarray, optional): (..., 3) xy, xz, yz shears
+
+    Returns:
+        ndarray: (..., 4, 4) matrices
+    """
+    rotation = np.asarray(rotation, dtype=np.float64)
+    rows = rotation.copy()
+    if shear is not None:
+        shear = np.asarray(shear, dtype=np.float64)
+        rows[..., 1, :] += shear[..., 0, None] * rotation[..., 0, :]
+        rows[..., 2, :] += (
+            shear[..., 1, None] * rotation[..., 0, :]
+            + shear[..., 2, None] * rotation[..., 1, :]
+        )
+    if scale is not None:
+        rows = rows * np.asarray(scale, dtype=np.float64)[..., :, None]
+
+    m = _matrices(rows)
+    m[..., 3, :3] = translation
+    return m
+
+
+def _matrices(rows):
+    """4x4 matrices from 3x3 matrices"""
+    m = np.zeros(rows.shape[:-2] + (4, 4))
+    m[..., :3, :3] = rows
+    m[..., 3, 3] = 1.0
+    return m
+
+
+def _set_scale(matrices, scale):
+    t, r, _, shear = decompose_matrices(matrices)
+    return compose_matrices(t, r, scale, shear)
+
+
+def _set_rotation(matrices, rotation):
+    t, _, s, shear = decompose_matrices(matrices)
+    return compose_matrices(t, rotation, s, shear)
+
+
+def _set_translation(matrices, translation):
+    m = np.array(matrices, dtype=np.float64)
+    m[..., 3, :3] = translation
+    return m
+
+
+def interpolate_transforms(a, b, blend):
+    """Interpolate matrices, like interpolateTransform in utils.cpp.
+    Translation and scale are interpolated linearly, the rotation
+    spherically, the shear is removed
+
+    Args:
+        a (ndarray): (..., 4, 4) matrices at blend 0
+        b (ndarray): (..., 4, 4) matrices at blend 1
+        blend (float or ndarray): blend value
+
+    Returns:
+        ndarray: (..., 4, 4) matrices
+    """
+    ta, ra, sa, _ = decompose_matrices(a)
+    tb, rb, sb, _ = decompose_matrices(b)
+    q = slerp(rotation_to_quaternion(ra), rotation_to_quaternion(rb), blend)
+    result = compose_matrices(
+        _lerp(ta, tb, blend), quaternion_to_rotation(q), _lerp(sa, sb, blend)
+    )
+    blend = np.asarray(blend)[..., None, None]
+    return np.where(blend == 0.0, a, np.where(blend == 1.0, b, result))
+
+
+def _inverse(matrices):
+    return np.linalg.inv(matrices)
+
+
+def _frames(*values):
+    """Broadcast per frame arrays and scalars to a common frame count
+
+    Returns:
+        int: number of frames
+    """
+    count = 1
+    for value in values:
+        shape = np.shape(value)
+        if shape and shape[0] != 1:
+            if count not in (1, shape[0]):
+                raise ValueError(
+                    "Inconsistent frame counts {} and {}".format(
+                        count, shape[0]
+                    )
+                )
+            count = shape[0]
+    return count
+
+
+def _per_frame_matrices(matrices, frames):
+    if matrices is None:
+        matrices = _IDENTITY
+    matrices = np.asarray(matrices, dtype=np.float64)
+    if matrices.ndim == 2:
+        matrices = matrices[None]
+    return np.broadcast_to(matrices, (frames, 4, 4))
+
+
+def _per_frame_values(values, frames, size=None):
+    values = np.asarray(values, dtype=np.float64)
+    shape = (frames,) if size is None else (frames, size)
+    if size is not None and values.ndim == 1:
+        values = values[None]
+    elif size is None and values.ndim == 0:
+        values = values[None]
+    return np.broadcast_to(values, shape)
+
+
+#############################################
+# mgear_ikfk2Bone
+#############################################
+
+
+def _ik_transforms(
+    root,
+    eff,
+    upv,
+    length_a,
+    length_b,
+    negate,
+    roll,
+    scale_a,
+    scale_b,
+    max_stretch,
+    softness,
+    slide,
+    reverse,
+):
+    """getIKTransform of ikfk2Bone.cpp, for all the outputs at once"""
+    _, _, root_scale, _ = decompose_matrices(root)
+    root_pos = root[:, 3, :3]
+    eff_pos = eff[:, 3, :3]
+    upv_pos = upv[:, 3, :3]
+    root_eff = eff_pos - root_pos
+    roll_axis = _normalize(root_eff)
+    root_eff_distance = np.linalg.norm(root_eff, axis=-1)
+    global_scale = root_scale[:, 0]
+
+    # distance with max stretch
+    rest_length = (length_a * scale_a + length_b * scale_b) * global_scale
+    distance = np.minimum(root_eff_distance, rest_length * max_stretch)
+
+    # softness and stretch
+    softness = softness * rest_length * 0.1
+    stretch = np.maximum(1.0, distance / rest_length)
+    da = rest_length - softness
+    soft = (softness > 0.0) & (root_eff_distance > da)
+    safe_softness = np.where(soft, softness, 1.0)
+    new_length = (
+        safe_softness
+        * (1.0 - np.exp(-(root_eff_distance - da) / safe_softness))
+        + da
+    )
+    stretch = np.where(soft, distance / new_length, stretch)
+
+    length_a = length_a * stretch * scale_a * global_scale
+    length_b = length_b * stretch * scale_b * global_scale
+
+    # reverse
+    d = distance / (length_a + length_b)
+    reverse_scale = np.where(
+        reverse < 0.5,
+        1.0 - (reverse * 2.0 * (1.0 - d)),
+        1.0 - ((1.0 - reverse) * 2.0 * (1.0 - d)),
+    )
+    length_a = length_a * reverse_scale
+    length_b = length_b * reverse_scale
+    invert = reverse > 0.5
+
+    # slide
+    slide_add = np.where(
+        slide < 0.5,
+        length_a * (slide * 2.0) - length_a,
+        length_b * (slide * 2.0) - length_b,
+    )
+    length_a = length_a + slide_add
+    length_b = length_b - slide_add
+
+    # angles inside the triangle
+    valid = (root_eff_distance < length_a + length_b) & (
+        root_eff_distance > np.abs(length_a - length_b) + 1e-6
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos_a = (
+            length_a ** 2 + root_eff_distance ** 2 - length_b ** 2
+        ) / (2.0 * length_a * root_eff_distance)
+        cos_b = (
+            length_b ** 2 + length_a ** 2 - root_eff_distance ** 2
+        ) / (2.0 * length_b * length_a)
+    angle_a = np.arccos(np.clip(np.where(valid, cos_a, 1.0), -1.0, 1.0))
+    angle_b = np.arccos(np.clip(np.where(valid, cos_b, 1.0), -1.0, 1.0))
+    angle_a = np.where(valid, np.where(invert, -angle_a, angle_a), 0.0)
+    angle_b = np.where(valid, np.where(invert, -angle_b, angle_b), 0.0)
+
+    # X and Z axis
+    x_axis = _normalize(root_eff)
+    y_axis = _normalize(upv_pos - _lerp(root_pos, eff_pos, 0.5))
+    y_axis = _rotate_along_axis(y_axis, roll_axis, roll)
+    z_axis = _normalize(np.cross(x_axis, y_axis))
+    y_axis = _normalize(np.cross(z_axis, x_axis))
+
+    sign = np.where(negate, -1.0, 1.0)[:, None]
+    outputs = {}
+
+    # outA
+    x_a = np.where(
+        (angle_a != 0.0)[:, None],
+        _rotate_along_axis(x_axis, z_axis, -angle_a),
+        x_axis,
+    )
+    x_out = x_a * sign
+    rotation = orthonormalize(
+        np.stack([x_out, np.cross(z_axis, x_out), z_axis], axis=-2)
+    )
+    outputs["outA"] = compose_matrices(
+        root_pos,
+        rotation,
+        np.stack([length_a, global_scale, global_scale], axis=-1),
+    )
+
+    # outB
+    bone_pos = root_pos + x_a * length_a[:, None]
+    x_b = np.where(
+        (angle_b != 0.0)[:, None],
+        _rotate_along_axis(x_a, z_axis, -(angle_b - PI)),
+        x_a,
+    )
+    x_out = x_b * sign
+    rotation = orthonormalize(
+        np.stack([x_out, np.cross(z_axis, x_out), z_axis], axis=-2)
+    )
+    outputs["outB"] = compose_matrices(
+        bone_pos,
+        rotation,
+        np.stack([length_b, global_scale, global_scale], axis=-1),
+    )
+
+    # outCenter
+    angle_center = np.where(invert, angle_b + PI * 2.0, angle_b)
+    x_c = np.where(
+        (angle_b != 0.0)[:, None],
+        _rotate_along_axis(x_a, z_axis, -(angle_center * 0.5 - PI * 0.5)),
+        x_a,
+    )
+    z_c = _normalize(np.cross(x_c, y_axis))
+    x_c = x_c * sign
+    rotation = orthonormalize(
+        np.stack([x_c, np.cross(z_c, x_c), z_c], axis=-2)
+    )
+    outputs["outCenter"] = compose_matrices(bone_pos, rotation, root_scale)
+
+    # outEff
+    eff_pos = bone_pos + x_b * length_b[:, None]
+    outputs["outEff"] = _set_translation(eff, eff_pos)
+    return outputs
+
+
+def _fk_transforms(bone1, bone2, eff, negate):
+    """getFKTransform of ikfk2Bone.cpp, for all the outputs at once"""
+    outputs = {}
+    sign = np.where(negate, -1.0, 1.0)[:, None]
+    _, rotation1, _, _ = decompose_matrices(bone1)
+    _, rotation2, _, _ = decompose_matrices(bone2)
+    ones = np.ones(len(bone1))
+
+    # outA
+    x_axis = bone2[:, 3, :3] - bone1[:, 3, :3]
+    scale = np.stack([np.linalg.norm(x_axis, axis=-1), ones, ones], -1)
+    x_axis = _normalize(x_axis * sign)
+    z_axis = rotation1[:, 2]
+    rotation = orthonormalize(
+        np.stack([x_axis, np.cross(z_axis, x_axis), z_axis], axis=-2)
+    )
+    outputs["outA"] = _set_rotation(_set_scale(bone1, scale), rotation)
+
+    # outB
+    x_axis = eff[:, 3, :3] - bone2[:, 3, :3]
+    scale = np.stack([np.linalg.norm(x_axis, axis=-1), ones, ones], -1)
+    x_axis = _normalize(x_axis * sign)
+    y_axis = rotation2[:, 1]
+    z_axis = _normalize(np.cross(x_axis, y_axis))
+    y_axis = _normalize(np.cross(z_axis, x_axis))
+    rotation = orthonormalize(np.stack([x_axis, y_axis, z_axis], axis=-2))
+    outputs["outB"] = _set_rotation(_set_scale(bone2, scale), rotation)
+
+    # outCenter, only +/-180 degree but without the shear issue
+    local = np.matmul(bone2, _inverse(bone1))
+    _, local_rotation, _, _ = decompose_matrices(local)
+    half = euler_to_rotation(rotation_to_euler(local_rotation) * 0.5)
+    local = _set_rotation(local, half)
+    _, rotation, _, _ = decompose_matrices(np.matmul(local, bone1))
+    outputs["outCenter"] = compose_matrices(bone2[:, 3, :3], rotation)
+
+    # outEff
+    outputs["outEff"] = np.array(eff)
+    return outputs
+
+
+def ikfk2bone(
+    root,
+    ikref,
+    upv,
+    fk0,
+    fk1,
+    fk2,
+    blend=0.0,
+    length_a=0.0,
+    length_b=0.0,
+    negate=False,
+    roll=0.0,
+    scale_a=1.0,
+    scale_b=1.0,
+    max_stretch=1.5,
+    softness=0.0,
+    slide=0.5,
+    reverse=0.0,
+    a_parent=None,
+    b_parent=None,
+    center_parent=None,
+    eff_parent=None,
+):
+    """Evaluate mgear_ikfk2Bone
+
+    The arguments are the node attributes, the defaults are the node
+    defaults. The matrices are (frames, 4, 4) or (4, 4) arrays and the
+    other arguments scalars or (frames,) arrays.
+
+    Args:
+        root (ndarray): root matrices
+        ikref (ndarray): ik reference matrices
+        upv (ndarray): up vector matrices
+        fk0 (ndarray): first fk bone matrices
+        fk1 (ndarray): second fk bone matrices
+        fk2 (ndarray): fk effector matrices
+        blend (float or ndarray, optional): 0 for fk, 1 for ik
+        length_a (float or ndarray, optional): length of the first bone
+        length_b (float or ndarray, optional): length of the second bone
+        negate (bool or ndarray, optional): negate the x axis
+        roll (float or ndarray, optional): roll in degrees
+        scale_a (float or ndarray, optional): scale of the first bone
+        scale_b (float or ndarray, optional): scale of the second bone
+        max_stretch (float or ndarray, optional): maximum stretch
+        softness (float or ndarray, optional): ik softness
+        slide (float or ndarray, optional): slide of the middle joint
+        reverse (float or ndarray, optional): reverse the bend
+        a_parent (ndarray, optional): parent matrices of outA
+        b_parent (ndarray, optional): parent matrices of outB
+        center_parent (ndarray, optional): parent matrices of outCenter
+        eff_parent (ndarray, optional): parent matrices of outEff
+
+    Returns:
+        dict: outA, outB, outCenter and outEff (frames, 4, 4) matrices
+    """
+    frames = _frames(
+        *[
+            np.asarray(m)[None] if np.ndim(m) == 2 else m
+            for m in (root, ikref, upv, fk0, fk1, fk2)
+        ]
+        + [
+            blend,
+            length_a,
+            length_b,
+            negate,
+            roll,
+            scale_a,
+            scale_b,
+            max_stretch,
+            softness,
+            slide,
+            reverse,
+        ]
+    )
+    root, ikref, upv, fk0, fk1, fk2 = [
+        _per_frame_matrices(m, frames)
+        for m in (root, ikref, upv, fk0, fk1, fk2)
+    ]
+    blend = _per_frame_values(blend, frames)
+    negate = np.broadcast_to(np.asarray(negate, dtype=bool), (frames,))
+
+    ik = _ik_transforms(
+        root,
+        ikref,
+        upv,
+        *[
+            _per_frame_values(v, frames)
+            for v in (length_a, length_b)
+        ],
+        negate,
+        np.radians(_per_frame_values(roll, frames)),
+        *[
+            _per_frame_values(v, frames)
+            for v in (scale_a, scale_b, max_stretch, softness, slide, reverse)
+        ]
+    )
+    fk = _fk_transforms(fk0, fk1, fk2, negate)
+
+    result = {}
+    blending = (blend != 0.0) & (blend != 1.0)
+    if np.any(blending):
+        # remove the scale to avoid the shearing issue
+        no_scale = np.ones((frames, 3))
+        names = ("outA", "outB", "outEff")
+        ik_bone1, ik_bone2, ik_eff = [
+            _set_scale(ik[name], no_scale) for name in names
+        ]
+        fk_bone1, fk_bone2, fk_eff = [
+            _set_scale(fk[name], no_scale) for name in names
+        ]
+
+        # from global to local
+        ik_eff = np.matmul(ik_eff, _inverse(ik_bone2))
+        fk_eff = np.matmul(fk_eff, _inverse(fk_bone2))
+        ik_bone2 = np.matmul(ik_bone2, _inverse(ik_bone1))
+        fk_bone2 = np.matmul(fk_bone2, _inverse(fk_bone1))
+
+        bone1 = interpolate_transforms(fk_bone1, ik_bone1, blend)
+        bone2 = interpolate_transforms(fk_bone2, ik_bone2, blend)
+        eff = interpolate_transforms(fk_eff, ik_eff, blend)
+
+        # back to global
+        bone2 = np.matmul(bone2, bone1)
+        eff = np.matmul(eff, bone2)
+        blended = _fk_transforms(bone1, bone2, eff, negate)
+    else:
+        blended = fk
+
+    parents = (a_parent, b_parent, center_parent, eff_parent)
+    for name, parent in zip(IKFK2BONE_OUTPUTS, parents):
+        matrices = np.where(
+            (blend == 0.0)[:, None, None],
+            fk[name],
+            np.where((blend == 1.0)[:, None, None], ik[name], blended[name]),
+        )
+        parent = _per_frame_matrices(parent, frames)
+        result[name] = np.matmul(matrices, _inverse(parent))
+
+    return result
+
+
+def ikfk2bone_fk_match(root, ikref, upv, **kwargs):
+    """World matrices of the fk controls matching the ik pose, like the
+    IK to FK switch of anim_utils.ikFkMatch, for all the frames at once.
+
+    Args:
+        root (ndarray): root matrices
+        ikref (ndarray): ik reference matrices
+        upv (ndarray): up vector matrices
+        **kwargs: the other ikfk2bone arguments, blend and the fk matrices
+            are ignored
+
+    Returns:
+        tuple: (frames, 4, 4) world matrices of fk0, fk1 and fk2, without
+        scale
+    """
+    kwargs.update(blend=1.0, fk0=_IDENTITY, fk1=_IDENTITY, fk2=_IDENTITY)
+    for name in ("a_parent", "b_parent", "eff_parent"):
+        kwargs.pop(name, None)
+    outputs = ikfk2bone(root, ikref, upv, **kwargs)
+    no_scale = np.ones(outputs["outA"].shape[:-2] + (3,))
+    return tuple(
+        _set_scale(outputs[name], no_scale)
+        for name in ("outA", "outB", "outEff")
+    )
+
+
+def ikfk2bone_ik_match(fk0, fk1, fk2, upv_distance=None):
+    """Ik reference matrices and up vector positions matching a fk pose,
+    like the FK to IK switch of anim_utils.ikFkMatch
+
+    Args:
+        fk0 (ndarray): (frames, 4, 4) world matrices of the first bone
+        fk1 (ndarray): (frames, 4, 4) world matrices of the second bone
+        fk2 (ndarray): (frames, 4, 4) world matrices of the effector
+        upv_distance (float or ndarray, optional): distance of the up
+            vector from the middle joint, the length of the chain by default
+
+    Returns:
+        tuple: (frames, 4, 4) ik reference matrices and (frames, 3) up
+        vector positions
+    """
+    fk0, fk1, fk2 = [np.asarray(m, dtype=np.float64) for m in (fk0, fk1, fk2)]
+    root_pos = fk0[..., 3, :3]
+    mid_pos = fk1[..., 3, :3]
+    eff_pos = fk2[..., 3, :3]
+    if upv_distance is None:
+        upv_distance = np.linalg.norm(
+            mid_pos - root_pos, axis=-1
+        ) + np.linalg.norm(eff_pos - mid_pos, axis=-1)
+
+    # direction from the root/eff line to the middle joint
+    line = _normalize(eff_pos - root_pos)
+    projected = root_pos + line * _dot(mid_pos - root_pos, line)[..., None]
+    direction = _normalize(mid_pos - projected)
+    upv_pos = mid_pos + direction * np.asarray(upv_distance)[..., None]
+    return np.array(fk2), upv_pos
+
+
+#############################################
+# mgear_rollSplineKine
+#############################################
+
+
+def _gather(values, indices):
+    return values[np.arange(len(indices)), indices]
+
+
+def _resample(samples, tangents, targets):
+    """Find the position and tangent at the normalized length of a
+    polyline, like the resample loops of rollSplineKine.cpp
+
+    Args:
+        samples (ndarray): (frames, count, 3) sample positions
+        tangents (ndarray): (frames, count, 3) sample tangents
+        targets (ndarray): (frames,) normalized lengths
+
+    Returns:
+        tuple: (frames, 3) positions and tangents, null if the target
+        was not found
+    """
+    lengths = np.linalg.norm(np.diff(samples, axis=1), axis=-1)
+    lengths = np.concatenate(
+        [np.zeros((len(samples), 1)), np.cumsum(lengths, axis=1)], axis=1
+    )
+    lengths = lengths / lengths[:, -1:]
+
+    found = (targets[:, None] >= lengths[:, :-1]) & (
+        targets[:, None] <= lengths[:, 1:]
+    )
+    index = np.argmax(found, axis=1)
+    start = _gather(lengths, index)
+    end = _gather(lengths, index + 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v = (targets - start) / (end - start)
+    valid = np.any(found, axis=1)[:, None]
+    position = _lerp(_gather(samples, index), _gather(samples, index + 1), v)
+    tangent = _lerp(_gather(tangents, index), _gather(tangents, index + 1), v)
+    return (
+        np.where(valid, position, 0.0),
+        np.where(valid, tangent, 0.0),
+    )
+
+
+def roll_spline_kine(
+    inputs,
+    ctl_parents,
+    rolls,
+    u=0.0,
+    output_parent=None,
+    resample=False,
+    subdiv=10,
+    absolute=False,
+):
+    """Evaluate mgear_rollSplineKine
+
+    Args:
+        inputs (ndarray): (frames, count, 4, 4) or (count, 4, 4) matrices
+            of the controls
+        ctl_parents (ndarray): matrices of the control parents, same shape
+        rolls (ndarray): (frames, count) or (count,) rolls in degrees
+        u (float or ndarray, optional): position on the spline, 0 to 1
+        output_parent (ndarray, optional): parent matrices of the output
+        resample (bool, optional): resample the spline for an uniform
+            distribution
+        subdiv (int, optional): number of samples for the resampling
+        absolute (bool, optional): resample the whole spline instead of
+            the current segment
+
+    Returns:
+        ndarray: (frames, 4, 4) output matrices
+    """
+    inputs = np.asarray(inputs, dtype=np.float64)
+    ctl_parents = np.asarray(ctl_parents, dtype=np.float64)
+    rolls = np.asarray(rolls, dtype=np.float64)
+    count = inputs.shape[-3]
+    if count < 2:
+        raise ValueError("mgear_rollSplineKine needs at least 2 inputs")
+
+    frames = _frames(
+        inputs if inputs.ndim == 4 else inputs[None],
+        ctl_parents if ctl_parents.ndim == 4 else ctl_parents[None],
+        rolls if rolls.ndim == 2 else rolls[None],
+        u,
+    )
+    inputs = np.broadcast_to(inputs, (frames, count, 4, 4))
+    ctl_parents = np.broadcast_to(ctl_parents, (frames, count, 4, 4))
+    rolls = np.radians(np.broadcast_to(rolls, (frames, count)))
+    u = _per_frame_values(u, frames)
+
+    pos = inputs[..., 3, :3]
+    _, rotations, scales, _ = decompose_matrices(inputs)
+    tangents = rotations[..., 0, :] * (scales[..., 0:1] * 2.5)
+    _, parent_rotations, _, _ = decompose_matrices(ctl_parents)
+    parent_quaternions = rotation_to_quaternion(parent_rotations)
+
+    step = 1.0 / max(1, count - 1)
+    index1 = np.minimum(count - 2, np.floor(u / step).astype(int))
+    index2 = index1 + 1
+    v = (u - step * index1) / step
+
+    def segment(index_a, index_b, param):
+        return bezier4point(
+            _gather(pos, index_a),
+            _gather(tangents, index_a),
+            _gather(pos, index_b),
+            _gather(tangents, index_b),
+            param,
+        )
+
+    if not resample:
+        bezier_pos, x_axis = segment(index1, index2, v)
+    else:
+        sample_u = np.arange(1, subdiv) / float(subdiv - 1)
+        sample_u = np.broadcast_to(sample_u, (frames, subdiv - 1))
+        if absolute:
+            start = 0
+            sample_index1 = np.minimum(
+                count - 2, np.floor(sample_u / step).astype(int)
+            )
+            sample_v = (sample_u - step * sample_index1) / step
+            targets = u
+        else:
+            start = index1
+            sample_index1 = np.broadcast_to(index1[:, None], sample_u.shape)
+            sample_v = sample_u
+            targets = v
+
+        samples = []
+        sample_tangents = []
+        for i in range(subdiv - 1):
+            position, tangent = segment(
+                sample_index1[:, i], sample_index1[:, i] + 1, sample_v[:, i]
+            )
+            samples.append(position)
+            sample_tangents.append(tangent)
+        first = np.broadcast_to(start, (frames,))
+        samples.insert(0, _gather(pos, first))
+        sample_tangents.insert(0, _gather(tangents, first))
+        bezier_pos, x_axis = _resample(
+            np.stack(samples, axis=1),
+            np.stack(sample_tangents, axis=1),
+            targets,
+        )
+
+    # scaling, straight interpolation
+    scale = _lerp(_gather(scales, index1), _gather(scales, index2), v)
+
+    # rotation
+    q = slerp(
+        _gather(parent_quaternions, index1),
+        _gather(parent_quaternions, index2),
+        v,
+    )
+    y_axis = _rotate_by(np.array([0.0, 1.0, 0.0]), q)
+    roll = _lerp(_gather(rolls, index1), _gather(rolls, index2), v)
+    y_axis = _rotate_by(
+        y_axis,
+        np.concatenate(
+            [
+                x_axis * np.sin(roll / 2.0)[:, None],
+                np.cos(roll / 2.0)[:, None],
+            ],
+            axis=-1,
+        ),
+    )
+    z_axis = _normalize(np.cross(x_axis, y_axis))
+    y_axis = _normalize(np.cross(z_axis, x_axis))
+    rotation = orthonormalize(np.stack([x_axis, y_axis, z_axis], axis=-2))
+
+    # the node sets the x scale three times, so the output scale is the
+    # interpolated z scale and the y and z scale of the last input
+    out_scale = np.stack(
+        [scale[:, 2], scales[:, -1, 1], scales[:, -1, 2]], axis=-1
+    )
+    result = compose_matrices(bezier_pos, rotation, out_scale)
+    parent = _per_frame_matrices(output_parent, frames)
+    return np.matmul(result, _inverse(parent))
+
+
+#############################################
+# mgear_squashStretch2
+#############################################
+
+
+def squash_stretch2(
+    driver,
+    global_scale=(1.0, 1.0, 1.0),
+    blend=1.0,
+    driver_min=1.0,
+    driver_ctr=3.0,
+    driver_max=6.0,
+    axis=0,
+    squash=0.5,
+    stretch=-0.5,
+):
+    """Evaluate mgear_squashStretch2
+
+    Args:
+        driver (float or ndarray): driver values
+        global_scale (ndarray, optional): (3,) or (frames, 3) scales
+        blend (float or ndarray, optional): blend with the global scale
+        driver_min (float or ndarray, optional): driver value of the full
+            squash
+        driver_ctr (float or ndarray, optional): driver rest value
+        driver_max (float or ndarray, optional): driver value of the full
+            stretch
+        axis (int, optional): 0, 1 or 2, the axis not scaled
+        squash (float or ndarray, optional): squash amount
+        stretch (float or ndarray, optional): stretch amount
+
+    Returns:
+        ndarray: (frames, 3) output scales
+    """
+    global_scale = np.asarray(global_scale, dtype=np.float64)
+    frames = _frames(
+        driver,
+        global_scale if global_scale.ndim == 2 else global_scale[None],
+        blend,
+        driver_min,
+        driver_ctr,
+        driver_max,
+        squash,
+        stretch,
+    )
+    driver, blend, driver_min, driver_ctr, driver_max, squash, stretch = [
+        _per_frame_values(v, frames)
+        for v in (
+            driver,
+            blend,
+            driver_min,
+            driver_ctr,
+            driver_max,
+            squash,
+            stretch,
+        )
+    ]
+    global_scale = _per_frame_values(global_scale, frames, 3)
+
+    stretch = stretch * np.clip(
+        np.maximum(driver - driver_ctr, 0.0)
+        / np.maximum(driver_max - driver_ctr, 0.0001),
+        0.0,
+        1.0,
+    )
+    squash = squash * np.clip(
+        np.maximum(driver_ctr - driver, 0.0)
+        / np.maximum(driver_ctr - driver_min, 0.0001),
+        0.0,
+        1.0,
+    )
+    factor = np.maximum(0.0, 1.0 + squash + stretch)[:, None]
+    scaled = np.array(global_scale) * np.where(
+        np.arange(3) != axis, factor, 1.0
+    )
+    return np.maximum(_lerp(global_scale, scaled, blend), 0.0001)
+
+
+#############################################
+# mgear_springNode
+#############################################
+
+
+def spring(goal, time=None, stiffness=1.0, damping=1.0, intensity=1.0):
+    """Evaluate mgear_springNode over consecutive frames
+
+    The node keeps its state between evaluations, so the frames are
+    evaluated in order, but all the springs are evaluated at once. Like the
+    node, the simulation restarts from the goal if the time goes backward
+    or jumps by more than one frame.
+
+    Args:
+        goal (ndarray): (frames, 3) or (frames, springs, 3) goal positions
+        time (ndarray, optional): (frames,) time of each frame, one frame
+            apart by default
+        stiffness (float or ndarray, optional): scalar or per spring
+        damping (float or ndarray, optional): scalar or per spring
+        intensity (float or ndarray, optional): scalar or per spring
+
+    Returns:
+        ndarray: output positions, same shape as the goal
+    """
+    goal = np.asarray(goal, dtype=np.float64)
+    if time is None:
+        time = np.arange(len(goal), dtype=np.float64)
+    time = np.asarray(time, dtype=np.float64)
+
+    stiffness, damping, intensity = [
+        np.asarray(v, dtype=np.float64)[..., None]
+        for v in (stiffness, damping, intensity)
+    ]
+
+    output = np.empty_like(goal)
+    previous_position = current_position = goal[0]
+    previous_time = time[0]
+    for frame in range(len(goal)):
+        frame_goal = goal[frame]
+        time_difference = time[frame] - previous_time
+        if time_difference > 1.0 or time_difference < 0.0:
+            previous_position = current_position = frame_goal
+
+        velocity = (current_position - previous_position) * (1.0 - damping)
+        new_position = current_position + velocity
+        new_position = new_position + (frame_goal - new_position) * stiffness
+
+        previous_position = current_position
+        current_position = new_position
+        previous_time = time[frame]
+
+        output[frame] = frame_goal + (new_position - frame_goal) * intensity
+
+    return output
+
+
+#############################################
+# mgear_matrixConstraint
+#############################################
+
+
+def matrix_constraint(
+    driver_matrix,
+    driven_parent_inverse_matrix=None,
+    driven_rest_matrix=None,
+    driver_rotation_offset=(0.0, 0.0, 0.0),
+    rotation_multiplier=(1.0, 1.0, 1.0),
+    scale_multiplier=(1.0, 1.0, 1.0),
+):
+    """Evaluate mgear_matrixConstraint
+
+    Args:
+        driver_matrix (ndarray): driver matrices
+        driven_parent_inverse_matrix (ndarray, optional): parent inverse
+            matrices of the driven
+        driven_rest_matrix (ndarray, optional): rest matrices of the driven
+        driver_rotation_offset (ndarray, optional): (3,) or (frames, 3)
+            rotation offset in degrees
+        rotation_multiplier (ndarray, optional): (3,) or (frames, 3)
+        scale_multiplier (ndarray, optional): (3,) or (frames, 3)
+
+    Returns:
+        dict: outputMatrix and outputDriverOffsetMatrix (frames, 4, 4)
+        matrices, translate, rotate (in degrees), scale and shear (frames,
+        3) values
+    """
+    vectors = [
+        np.asarray(v, dtype=np.float64)
+        for v in (
+            driver_rotation_offset,
+            rotation_multiplier,
+            scale_multiplier,
+        )
+    ]
+    matrices = [
+        m if m is None or np.ndim(m) == 3 else np.asarray(m)[None]
+        for m in (
+            driver_matrix,
+            driven_parent_inverse_matrix,
+            driven_rest_matrix,
+        )
+    ]
+    frames = _frames(
+        *[m for m in matrices if m is not None]
+        + [v if v.ndim == 2 else v[None] for v in vectors]
+    )
+    driver, parent_inverse, rest = [
+        _per_frame_matrices(m, frames) for m in matrices
+    ]
+    offset, rotation_mult, scale_mult = [
+        _per_frame_values(v, frames, 3) for v in vectors
+    ]
+
+    # rotation offset in the driver space
+    t, rotation, s, shear = decompose_matrices(driver)
+    offset_rotation = euler_to_rotation(np.radians(offset))
+    driver_offset = compose_matrices(
+        t, np.matmul(offset_rotation, rotation), s, shear
+    )
+
+    mult_matrix = np.matmul(driver_offset, parent_inverse)
+    rotate_matrix = np.matmul(mult_matrix, _inverse(rest))
+
+    _, rotation, _, _ = decompose_matrices(rotate_matrix)
+    q = rotation_to_quaternion(rotation)
+    q[:, :3] *= rotation_mult
+    rotation = quaternion_to_rotation(q)
+
+    translation, _, scale, shear = decompose_matrices(mult_matrix)
+    scale = scale * scale_mult
+    output = compose_matrices(translation, rotation, scale, shear)
+
+    return {
+        "outputMatrix": output,
+        "outputDriverOffsetMatrix": driver_offset,
+        "translate": translation,
+        "rotate": np.degrees(rotation_to_euler(rotation)),
+        "scale": scale,
+        "shear": shear,
+    }
+
+
+#############################################
+# VALIDATION
+#############################################
+
+
+def compare_matrices(expected, actual, tolerance=1e-4):
+    """Compare matrices per frame, for example the evaluated solvers with
+    the matrices exported from Maya
+
+    Args:
+        expected (ndarray): (frames, ..., 4, 4) matrices
+        actual (ndarray): matrices, same shape
+        tolerance (float, optional): maximum absolute difference
+
+    Returns:
+        tuple: (frames,) maximum difference per frame and the indices of
+        the frames over the tolerance
+    """
+    difference = np.abs(
+        np.asarray(expected, dtype=np.float64)
+        - np.asarray(actual, dtype=np.float64)
+    )
+    difference = difference.reshape(len(difference), -1).max(axis=1)
+    return difference, np.flatnonzero(difference > tolerance)
+
+
+#############################################
+# BENCHMARK
+#############################################
+
+
+def _random_matrices(frames, random):
+    euler = random.uniform(-PI, PI, (frames, 3))
+    translation = random.uniform(-10.0, 10.0, (frames, 3))
+    return compose_matrices(translation, euler_to_rotation(euler))
+
+
+def benchmark(frames=1000, repeat=3, seed=0):
+    """Compare the evaluation of all the frames in a single call with one
+    call per frame, like the per frame evaluation of the node in Maya
+
+    Args:
+        frames (int, optional): number of frames
+        repeat (int, optional): number of repetitions, the best is kept
+        seed (int, optional): seed of the random inputs
+
+    Returns:
+        dict: solver name: (batch seconds, per frame seconds)
+    """
+    random = np.random.RandomState(seed)
+    root, ikref, upv, fk0, fk1, fk2 = [
+        _random_matrices(frames, random) for _ in range(6)
+    ]
+    blend = random.uniform(0.0, 1.0, frames)
+    inputs = np.stack(
+        [_random_matrices(frames, random) for _ in range(4)], axis=1
+    )
+    rolls = random.uniform(-90.0, 90.0, (frames, 4))
+    u = random.uniform(0.0, 1.0, frames)
+    driver = random.uniform(0.0, 8.0, frames)
+
+    cases = {
+        "ikfk2bone": lambda i: ikfk2bone(
+            root[i],
+            ikref[i],
+            upv[i],
+            fk0[i],
+            fk1[i],
+            fk2[i],
+            blend=blend[i],
+            length_a=3.0,
+            length_b=4.0,
+        ),
+        "roll_spline_kine": lambda i: roll_spline_kine(
+            inputs[i], inputs[i], rolls[i], u[i], resample=True
+        ),
+        "squash_stretch2": lambda i: squash_stretch2(driver[i]),
+        "matrix_constraint": lambda i: matrix_constraint(root[i]),
+    }
+
+    results = {}
+    for name, case in cases.items():
+        everything = slice(None)
+        batch = min(
+            timeit.repeat(lambda: case(everything), number=1, repeat=repeat)
+        )
+        per_frame = min(
+            timeit.repeat(
+                lambda: [case(slice(i, i + 1)) for i in range(frames)],
+                number=1,
+                repeat=repeat,
+            )
+        )
+        results[name] = (batch, per_frame)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark of the mgear_solvers reference evaluator"
+    )
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.frames, args.repeat)
+    print(
+        "{:<20} {:>12} {:>12} {:>14}".format(
+            "solver", "batch (s)", "frame (s)", "frames/s"
+        )
+    )
+    for name, (batch, per_frame) in results.items():
+        print(
+            "{:<20} {:>12.4f} {:>12.4f} {:>14.0f}".format(
+                name, batch, per_frame, args.frames / batch
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
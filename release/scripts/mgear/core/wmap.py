@@ -1,13 +1,289 @@
 # Weigth maps IO
 
 import json
+import os
+import sys
 
 from maya import cmds
 import mgear.pymaya as pm
-import maya.OpenMaya as OpenMaya
-from .six import string_types
+import maya.api.OpenMaya as om2
+from mgear.core import columnar
+
+try:
+    import numpy as np
+
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
 
 FILE_EXT = ".wmap"
+FILE_BINARY_EXT = ".wts"
+BINARY_KIND = "deformer_weights"
+
+# Weight maps are stored as float in Maya, so "f4" is lossless
+DEFAULT_PRECISION = "f4"
+
+
+######################################
+# Buffers
+######################################
+
+
+def _as_buffer(values, dtype="f8"):
+    """Convert weight values to a numpy array, or an array.array if numpy
+    is not available
+
+    Args:
+        values (iterable): The weight values
+        dtype (str, optional): columnar data type
+
+    Returns:
+        ndarray or array.array: The weights buffer
+    """
+    # getAttr returns a single value for one element ranges
+    if isinstance(values, (float, int)):
+        values = [values]
+    if NUMPY_READY:
+        return np.asarray(values, dtype=np.dtype("<" + dtype))
+    return columnar.new_array(dtype, values)
+
+
+def _to_columnar(values, dtype):
+    """Convert a weights buffer to a columnar array without python loops"""
+    if NUMPY_READY and isinstance(values, np.ndarray):
+        result = columnar.new_array(dtype)
+        result.frombytes(values.astype("<" + dtype, copy=False).tobytes())
+        if sys.byteorder != "little":
+            result.byteswap()
+        return result
+    return columnar.new_array(dtype, values)
+
+
+def _is_normalized(values):
+    """Check that all the weight values are in the 0.0 to 1.0 range"""
+    if NUMPY_READY:
+        values = np.asarray(values)
+        return not values.size or (
+            values.min() >= 0.0 and values.max() <= 1.0
+        )
+    return all(0.0 <= v <= 1.0 for v in values)
+
+
+def _to_list(values):
+    if hasattr(values, "tolist"):
+        return values.tolist()
+    return list(values)
+
+
+######################################
+# Deformer weights
+######################################
+
+
+def get_deformed_geometry(deformer):
+    """Get the geometry deformed by a deformer with its weightList index
+
+    Args:
+        deformer (PyNode or str): Name or pynode of a deformer
+
+    Returns:
+        list: (index, geometry full path name) tuples
+    """
+    deformer = str(deformer)
+    geometry = cmds.deformer(deformer, query=True, geometry=True) or []
+    indices = (
+        cmds.deformer(deformer, query=True, geometryIndices=True) or []
+    )
+    return [
+        (index, cmds.ls(geo, long=True)[0])
+        for index, geo in zip(indices, geometry)
+    ]
+
+
+def get_point_count(geometry):
+    """Get the number of points (vertices, cvs, lattice points) of a shape
+
+    Args:
+        geometry (str): The shape name
+
+    Returns:
+        int: The number of points
+    """
+    sel = om2.MSelectionList()
+    sel.add(geometry)
+    return om2.MItGeometry(sel.getDagPath(0)).count()
+
+
+def _get_weights_plug(deformer, index):
+    """Get the weights plug of one geometry of a deformer
+
+    Args:
+        deformer (str): The deformer name
+        index (int): The geometry weightList index
+
+    Returns:
+        MPlug: The weightList[index].weights plug
+    """
+    sel = om2.MSelectionList()
+    sel.add(deformer)
+    fn_node = om2.MFnDependencyNode(sel.getDependNode(0))
+    weight_list = fn_node.findPlug("weightList", False)
+    return weight_list.elementByLogicalIndex(index).child(0)
+
+
+def read_weights(deformer, index, count):
+    """Read the weight map of one geometry
+
+    The weights multi is sparse: the elements never set or left to the
+    default value are not stored. They are filled with the attribute
+    default, so the result always has one value per point.
+
+    Args:
+        deformer (str): The deformer name
+        index (int): The geometry weightList index
+        count (int): Number of points of the geometry
+
+    Returns:
+        ndarray or array.array: The weights. One value per point
+    """
+    if not count:
+        return _as_buffer([])
+
+    plug = _get_weights_plug(deformer, index)
+    default = om2.MFnNumericAttribute(plug.attribute()).default
+    indices = plug.getExistingArrayAttributeIndices()
+    values = []
+    if len(indices):
+        # the existing elements values, in the logical indices order
+        values = _as_buffer(cmds.getAttr(plug.name()))
+
+    if NUMPY_READY:
+        weights = np.full(count, default, dtype=np.float64)
+        indices = np.array(indices, dtype=np.int64)
+        valid = indices < count
+        weights[indices[valid]] = np.asarray(values)[valid]
+        return weights
+
+    weights = _as_buffer([default] * count)
+    for i, value in zip(indices, values):
+        if i < count:
+            weights[i] = value
+    return weights
+
+
+def write_weights(deformer, index, values, undoable=True):
+    """Write the weight map of one geometry
+
+    Args:
+        deformer (str): The deformer name
+        index (int): The geometry weightList index
+        values (iterable): The weights. One value per point
+        undoable (bool, optional): Write with a single ranged setAttr that
+            can be undone. Batch callers without undo can set it to False
+            to write the plugs directly with the API
+    """
+    values = _to_list(values)
+    if not values:
+        return
+
+    if undoable:
+        cmds.setAttr(
+            "{0}.weightList[{1}].weights[0:{2}]".format(
+                deformer, index, len(values) - 1
+            ),
+            *values,
+            size=len(values)
+        )
+        return
+
+    plug = _get_weights_plug(deformer, index)
+    for i, value in enumerate(values):
+        plug.elementByLogicalIndex(i).setFloat(value)
+
+
+def get_weights_buffers(deformer):
+    """Get the weight maps of a deformer as buffers
+
+    Args:
+        deformer (PyNode or str): Name or pynode of a deformer with weight map
+
+    Returns:
+        list: (geometry full path name, weights buffer) tuples, in the
+            weightList order
+    """
+    deformer = str(deformer)
+    return [
+        (geo, read_weights(deformer, index, get_point_count(geo)))
+        for index, geo in get_deformed_geometry(deformer)
+    ]
+
+
+def set_weights_buffers(deformer, buffers):
+    """Set the weight maps of a deformer from buffers
+
+    The weight maps are matched by geometry full path name. If the geometry
+    is not found, the short name without namespace is used. The names can be
+    the shapes names or the transforms names, as stored by the older .wmap
+    files.
+
+    Args:
+        deformer (PyNode or str): Name or pynode of a deformer with weight map
+        buffers (list or dict): (geometry name, weights) tuples or
+            dictionary
+
+    Returns:
+        list: The geometry with weights applied
+    """
+    deformer = str(deformer)
+    if isinstance(buffers, dict):
+        buffers = buffers.items()
+
+    geometry = get_deformed_geometry(deformer)
+    by_path = {geo: index for index, geo in geometry}
+    by_short = {}
+    for index, geo in geometry:
+        by_short.setdefault(_short_name(geo), index)
+        parent = cmds.listRelatives(geo, parent=True, fullPath=True) or []
+        for name in parent:
+            by_short.setdefault(_short_name(name), index)
+
+    applied = []
+    for geo, values in buffers:
+        index = None
+        for shape in _get_shapes(geo):
+            index = by_path.get(shape)
+            if index is not None:
+                break
+        if index is None:
+            index = by_short.get(_short_name(geo))
+        if index is None:
+            continue
+        write_weights(deformer, index, values)
+        applied.append(geo)
+    return applied
+
+
+def _get_shapes(name):
+    """Get the shapes full path names of a geometry name
+
+    Args:
+        name (str): Shape or transform name
+
+    Returns:
+        list: The shapes. The shape itself if name is a shape, and an empty
+            list if the node doesn't exist
+    """
+    if not cmds.objExists(name):
+        return []
+    if cmds.ls(name, shapes=True):
+        return cmds.ls(name, long=True)
+    return cmds.listRelatives(
+        name, shapes=True, noIntermediate=True, fullPath=True
+    ) or []
+
+
+def _short_name(name):
+    return name.split("|")[-1].split(":")[-1]
 
 
 def get_weights(deformer):
@@ -21,41 +297,11 @@ def get_weights(deformer):
     Returns:
         dict: The weights dictionary
     """
-    if isinstance(deformer, string_types):
-        deformer = pm.PyNode(deformer)
     dataDic = {}
     dataDic["_deformed_index"] = []
-    try:
-        fnSet = OpenMaya.MFnSet(deformer.__apimfn__().deformerSet())
-        members = OpenMaya.MSelectionList()
-        fnSet.getMembers(members, False)
-        dagPath = OpenMaya.MDagPath()
-        components = OpenMaya.MObject()
-        members.getDagPath(0, dagPath, components)
-
-        for m in range(members.length()):
-            dagPath = OpenMaya.MDagPath()
-            members.getDagPath(m, dagPath, components)
-            weights = OpenMaya.MFloatArray()
-            deformer.__apimfn__().getWeights(dagPath, components, weights)
-            dataDic[dagPath.fullPathName()] = [
-                weights[i] for i in range(weights.length())
-            ]
-            dataDic["_deformed_index"].append(dagPath.fullPathName())
-    except:
-        # Fallback to Maya cmds if Open Maya deformerSet and getWeights Fail
-        # Since Maya 2022 with new Component tags system this 2 method are not
-        # working because deformer Set are not used anymore
-        def_objs = deformer.outputGeometry.listConnections()
-        for e, mesh in enumerate(def_objs):
-            VertexNb = cmds.polyEvaluate(mesh.name(), v=1) - 1
-            weight = cmds.getAttr(
-                "{0}.weightList[{1}].weights[0:{2}]".format(
-                    deformer.name(), e, VertexNb
-                )
-            )
-            dataDic[mesh.fullPathName()] = weight
-            dataDic["_deformed_index"].append(mesh.fullPathName())
+    for geo, values in get_weights_buffers(deformer):
+        dataDic[geo] = _to_list(values)
+        dataDic["_deformed_index"].append(geo)
 
     return dataDic
 
@@ -67,53 +313,106 @@ def set_weights(deformer, dataWeights):
 
     Args:
         deformer (PyNode or str): Name or pynode of a deformer with weight map
+        dataWeights (dict): The weights dictionary
     """
+    geometry = dataWeights.get("_deformed_index") or [
+        k for k in dataWeights if k != "_deformed_index"
+    ]
+    set_weights_buffers(
+        deformer, [(geo, dataWeights[geo]) for geo in geometry]
+    )
+
+
+######################################
+# Files
+######################################
 
-    if isinstance(deformer, string_types):
-        deformer = pm.PyNode(deformer)
-    try:
-        fnSet = OpenMaya.MFnSet(deformer.__apimfn__().deformerSet())
-        members = OpenMaya.MSelectionList()
-        fnSet.getMembers(members, False)
-        dagPath = OpenMaya.MDagPath()
-        components = OpenMaya.MObject()
-        members.getDagPath(0, dagPath, components)
-
-        for m in range(members.length()):
-            dagPath = OpenMaya.MDagPath()
-            members.getDagPath(m, dagPath, components)
-            dw = dataWeights[dagPath.fullPathName()]
-            weights = OpenMaya.MFloatArray(len(dw))
-            for x in range(len(dw)):
-                weights.set(dw[x], int(x))
-
-            deformer.__apimfn__().setWeight(dagPath, components, weights)
-    except:
-        # Fallback to Maya cmds if Open Maya deformerSet and getWeights Fail
-        # Since Maya 2022 with new Component tags system this 2 method are not
-        # working because deformer Set are not used anymore
-        def_objs = deformer.outputGeometry.listConnections()
-        for mesh in def_objs:
-            if mesh.fullPathName() in dataWeights.keys():
-                weights = dataWeights[mesh.fullPathName()]
-                VertexNb = cmds.polyEvaluate(mesh.name(), v=1) - 1
-                idx = dataWeights["_deformed_index"].index(mesh.fullPathName())
-                cmds.setAttr(
-                    "{0}.weightList[{1}].weights[0:{2}]".format(
-                        deformer.name(), idx, VertexNb
-                    ),
-                    *weights,
-                    size=len(weights)
+
+def write_weights_file(
+    data, filePath, precision=DEFAULT_PRECISION, compress=True
+):
+    """Write deformers weight maps to a binary file
+
+    Each geometry weight map is stored as one record of the columnar file.
+
+    Args:
+        data (dict): Deformer name as key and the list of (geometry,
+            weights) tuples as value
+        filePath (str): Destination file path
+        precision (str, optional): Weights data type. "f4", "f8" or "u2"
+            (16 bits quantized). The weight maps out of the 0.0 to 1.0
+            range are stored as "f4" instead of "u2"
+        compress (bool, optional): zlib compress the weights
+
+    Returns:
+        int: The file size in bytes
+    """
+    with columnar.ColumnarWriter(
+        filePath, kind=BINARY_KIND, compress=compress
+    ) as writer:
+        writer.attributes["deformers"] = list(data)
+        for deformer, buffers in data.items():
+            for geo, values in buffers:
+                dtype = precision
+                if dtype == "u2" and not _is_normalized(values):
+                    # quantization would clamp the weights, keep them as is
+                    dtype = "f4"
+                if dtype == "u2":
+                    values = columnar.quantize(values)
+                else:
+                    values = _to_columnar(values, dtype)
+                writer.write_record(
+                    {"deformer": deformer, "geometry": geo},
+                    {"weights": (dtype, values)},
                 )
+    return writer.bytes_written
+
+
+def read_weights_file(filePath):
+    """Read deformers weight maps from a binary file
+
+    Args:
+        filePath (str): The file path
+
+    Returns:
+        dict: Deformer name as key and the list of (geometry, weights)
+            tuples as value
+
+    Raises:
+        IOError: If the file is not a deformer weights file
+    """
+    data = {}
+    with columnar.ColumnarReader(filePath) as reader:
+        if reader.kind != BINARY_KIND:
+            raise IOError("Not a deformer weights file: {}".format(filePath))
+        for deformer in reader.attributes.get("deformers", []):
+            data[deformer] = []
+        for meta, arrays in reader.iter_records(copy=True):
+            values = arrays["weights"]
+            if values.typecode == columnar.new_array("u2").typecode:
+                values = columnar.dequantize(values)
+            if NUMPY_READY:
+                values = np.frombuffer(values, dtype=values.typecode)
+            data.setdefault(meta["deformer"], []).append(
+                (meta["geometry"], values)
+            )
+    return data
 
 
 def export_weights(deformer, filePath):
     """Export the wmap to a  json file
 
+    If the file extension is .wts the binary format is used
+
     Args:
         deformer (PyNode or str): Name or pynode of a deformer with weight map
         filePath (str): Path to save the file
     """
+    if os.path.splitext(filePath)[-1] == FILE_BINARY_EXT:
+        write_weights_file(
+            {str(deformer): get_weights_buffers(deformer)}, filePath
+        )
+        return
     wdata = get_weights(deformer)
     with open(filePath, "w") as fp:
         json.dump(wdata, fp, indent=4, sort_keys=True)
@@ -122,16 +421,94 @@ def export_weights(deformer, filePath):
 def import_weights(deformer, filePath):
     """Import the wmap from a  json file
 
+    Binary .wts files are also supported. The first deformer in the file is
+    used.
+
     Args:
         deformer (PyNode or str): Name or pynode of a deformer to
                                   assign the wmap
         filePath (str): Path to load the file
     """
+    if columnar.is_columnar_file(filePath):
+        data = read_weights_file(filePath)
+        if data:
+            set_weights_buffers(deformer, list(data.values())[0])
+        return
     with open(filePath, "r") as fp:
         wdata = json.load(fp)
     set_weights(deformer, wdata)
 
 
+def get_weight_deformers(nodes):
+    """Get the deformers with weight map in the history of the nodes
+
+    Args:
+        nodes (list): Geometry nodes
+
+    Returns:
+        list: The deformer names. (cluster, softMod, wire...)
+    """
+    history = cmds.listHistory(
+        [str(n) for n in nodes], pruneDagObjects=True
+    ) or []
+    deformers = []
+    for node in cmds.ls(history, type="weightGeometryFilter"):
+        if node not in deformers:
+            deformers.append(node)
+    return deformers
+
+
+def export_deformers_weights(
+    nodes, filePath, precision=DEFAULT_PRECISION, compress=True
+):
+    """Export the weight maps of all the deformers of the nodes to a single
+    binary file
+
+    Args:
+        nodes (list): Geometry nodes
+        filePath (str): Path to save the .wts file
+        precision (str, optional): Weights data type. "f4", "f8" or "u2"
+        compress (bool, optional): zlib compress the weights
+
+    Returns:
+        list: The exported deformers
+    """
+    data = {}
+    for deformer in get_weight_deformers(nodes):
+        data[deformer] = get_weights_buffers(deformer)
+    write_weights_file(data, filePath, precision=precision, compress=compress)
+    return list(data)
+
+
+def import_deformers_weights(filePath, deformers=None):
+    """Import the weight maps of a binary file
+
+    The deformers are matched by name. If the deformer is not found, the
+    name without namespace is used.
+
+    Args:
+        filePath (str): The .wts file path
+        deformers (list, optional): Import only these deformers
+
+    Returns:
+        list: The deformers with weights applied
+    """
+    data = read_weights_file(filePath)
+    imported = []
+    for deformer, buffers in data.items():
+        if deformers and deformer not in deformers:
+            continue
+        target = deformer
+        if not cmds.objExists(target):
+            target = deformer.split(":")[-1]
+        if not cmds.objExists(target):
+            pm.displayWarning("Deformer not found: {}".format(deformer))
+            continue
+        set_weights_buffers(target, buffers)
+        imported.append(target)
+    return imported
+
+
 def export_weights_selected(filePath=None, *args):
     """Export the wmap to a  json file from selected objet
 
@@ -174,16 +551,62 @@ def import_weights_selected(filePath=None, *args):
     import_weights(deformer, filePath)
 
 
-def file_browser(mode=1):
+def export_deformers_weights_selected(filePath=None, *args):
+    """Export the weight maps of all the deformers of the selected objects
+
+    Args:
+        filePath (str): Path to save the file. If None wil pop up file browser
+    """
+    oSel = pm.selected()
+    if not oSel:
+        pm.displayWarning("Nothing selected to export weights")
+        return
+
+    if not filePath:
+        filePath = file_browser(mode=0, ext=FILE_BINARY_EXT)
+    if not filePath:
+        return
+
+    deformers = export_deformers_weights(oSel, filePath)
+    pm.displayInfo(
+        "{} deformers weight maps exported: {}".format(
+            len(deformers), filePath
+        )
+    )
+
+
+def import_deformers_weights_selected(filePath=None, *args):
+    """Import the weight maps of all the deformers in a binary file
+
+    Args:
+        filePath (str): Path to load the file. If None wil pop up file browser
+    """
+    if not filePath:
+        filePath = file_browser(mode=1, ext=FILE_BINARY_EXT)
+    if not filePath:
+        return
+
+    deformers = import_deformers_weights(filePath)
+    pm.displayInfo(
+        "{} deformers weight maps imported".format(len(deformers))
+    )
+
+
+def file_browser(mode=1, ext=FILE_EXT):
     """open file browser
 
     Args:
         mode (int, optional): 0 save mode, 1 load mode
+        ext (str, optional): File extension
 
     Returns:
         str: file path
     """
-    fileFilters = "Deformer Weigth map (*{})".format(FILE_EXT)
+    fileFilters = "Deformer Weigth map (*{})".format(ext)
+    if ext == FILE_EXT:
+        fileFilters += ";;Deformer Weigth map Binary (*{})".format(
+            FILE_BINARY_EXT
+        )
     startDir = pm.workspace(q=True, rootDirectory=True)
     filePath = pm.fileDialog2(
         fileMode=mode, startingDirectory=startDir, fileFilter=fileFilters
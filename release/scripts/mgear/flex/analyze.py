@@ -10,6 +10,9 @@ you want to update with Flex
 from __future__ import absolute_import
 from mgear.flex import logger
 from mgear.flex.decorators import timer
+from mgear.flex.fingerprint import classify_changes
+from mgear.flex.fingerprint import get_shapes_changes
+from mgear.flex.fingerprint import UNCHANGED
 from mgear.flex.query import get_matching_shapes_from_group
 from mgear.flex.query import get_missing_shapes_from_group
 from mgear.flex.query import is_matching_bouding_box
@@ -26,6 +29,11 @@ def analyze_groups(source, target):
 
     :param target: maya transform node
     :type target: str
+
+    :return: the matching shapes, mismatching types, mismatching count,
+             mismatching bounding box and the source shape: changes
+             classification dict
+    :rtype: dict, list, list, list, dict
     """
 
     logger.debug("Analysing the following groups - source: {}  - target: {}"
@@ -46,10 +54,16 @@ def analyze_groups(source, target):
     mismatched_bbox = [x for x in matching_shapes if not
                        is_matching_bouding_box(x, matching_shapes[x])]
 
+    # gets the changes classification
+    changes = get_shapes_changes(matching_shapes)
+    changes = dict((x, classify_changes(changes[x])) for x in changes)
+
     logger.info("-" * 90)
     logger.info("Mismatch shapes types: {}".format(mismatched_types))
     logger.info("Mismatch vertices shapes: {}".format(mismatched_count))
     logger.info("Mismatch volume shapes: {}".format(mismatched_bbox))
+    logger.info("Changed shapes: {}".format(
+        [x for x in changes if changes[x] != UNCHANGED]))
     logger.warning("-" * 90)
     logger.warning("Source missing shapes: {}" .format(
         get_missing_shapes_from_group(source, target)))
@@ -57,4 +71,5 @@ def analyze_groups(source, target):
         get_missing_shapes_from_group(target, source)))
     logger.warning("-" * 90)
 
-    return matching_shapes, mismatched_types, mismatched_count, mismatched_bbox
+    return (matching_shapes, mismatched_types, mismatched_count,
+            mismatched_bbox, changes)
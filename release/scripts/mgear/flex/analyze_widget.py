@@ -77,7 +77,7 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
 
         # creates the table
         self.table_widget = QtWidgets.QTableWidget()
-        self.table_widget.setColumnCount(6)
+        self.table_widget.setColumnCount(7)
         self.table_widget.setIconSize(QtCore.QSize(20, 20))
 
         # adds headers
@@ -86,7 +86,8 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
                                                      "Type",
                                                      "Count",
                                                      "B-Box",
-                                                     "Result"])
+                                                     "Result",
+                                                     "Change"])
 
         # setup headers look and feel
         h_header = self.table_widget.horizontalHeader()
@@ -98,12 +99,14 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
         h_header.setSectionResizeMode(3, QtWidgets.QHeaderView.Fixed)
         h_header.setSectionResizeMode(4, QtWidgets.QHeaderView.Fixed)
         h_header.setSectionResizeMode(5, QtWidgets.QHeaderView.Fixed)
+        h_header.setSectionResizeMode(
+            6, QtWidgets.QHeaderView.ResizeToContents)
         h_header.setSectionsClickable(False)
 
         # hides vertical header
         self.table_widget.verticalHeader().setVisible(False)
 
-    def add_item(self, source, target, match, count, bbox):
+    def add_item(self, source, target, match, count, bbox, change=""):
         """ Handles adding items to the table widget
 
         :param source: the source shape element
@@ -114,6 +117,9 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
 
         :param match: whether the type matches
         :type match: bool
+
+        :param change: the changes classification of the shape
+        :type change: str
         """
 
         # source item
@@ -165,6 +171,12 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
         if source in match:
             result_item.setIcon(self.red_icon)
 
+        # change item
+        change_item = QtWidgets.QTableWidgetItem()
+        change_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        change_item.setText(change)
+        change_item.setFlags(QtCore.Qt.ItemIsEnabled)
+
         # insert items
         self.table_widget.insertRow(0)
         self.table_widget.setRowHeight(0, 19)
@@ -174,3 +186,4 @@ class FlexAnalyzeDialog(QtWidgets.QDialog):
         self.table_widget.setItem(0, 3, count_item)
         self.table_widget.setItem(0, 4, bbox_item)
         self.table_widget.setItem(0, 5, result_item)
+        self.table_widget.setItem(0, 6, change_item)
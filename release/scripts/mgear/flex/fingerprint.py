@@ -0,0 +1,453 @@
+""" flex.fingerprint
+
+flex.fingerprint module computes compact fingerprints of the shapes geometry
+and attributes, allowing Flex to find which shapes changed and skip the
+others during the update
+
+:module: flex.fingerprint
+"""
+
+# imports
+from __future__ import absolute_import
+from array import array
+from collections import namedtuple
+import hashlib
+from maya import cmds
+import maya.api.OpenMaya as om
+from mgear.flex import logger
+from mgear.flex.attributes import COMPONENT_DISPLAY_ATTRIBUTES
+from mgear.flex.attributes import OBJECT_DISPLAY_ATTRIBUTES
+from mgear.flex.attributes import RENDER_STATS_ATTRIBUTES
+from mgear.flex.decorators import timer
+from mgear.flex.query import get_parent
+from mgear.flex.query import get_shape_orig
+
+try:
+    import numpy as np
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
+
+# changes classification
+UNCHANGED = "unchanged"
+ATTRIBUTES_ONLY = "attributes only"
+POINTS_ONLY = "points only"
+TOPOLOGY_CHANGED = "topology changed"
+
+# fingerprint fields requiring a shape update
+GEOMETRY_FIELDS = ("type", "topology", "points", "uvs", "normals", "colors",
+                   "creases", "transform")
+
+# default points and uvs tolerance
+TOLERANCE = 0.0001
+
+Fingerprint = namedtuple("Fingerprint", ["type", "topology", "points", "uvs",
+                                         "normals", "colors", "creases",
+                                         "transform", "attributes"])
+
+
+def _hash(*chunks):
+    """ Returns a short hash of the given chunks
+
+    :param chunks: bytes or values to hash
+    :type chunks: bytes or object
+
+    :return: the hash hexadecimal digest
+    :rtype: str
+    """
+
+    hash_object = hashlib.sha1()
+    for chunk in chunks:
+        if not isinstance(chunk, bytes):
+            chunk = repr(chunk).encode("utf-8")
+        hash_object.update(chunk)
+        # separator, avoids collisions between consecutive chunks
+        hash_object.update(b"|")
+
+    return hash_object.hexdigest()
+
+
+def _quantize(values, tolerance):
+    """ Returns the given values rounded to the tolerance as bytes
+
+    .. note:: Values closer than the tolerance can still round to different
+              steps. This only gives false changes, which are safe as the
+              shape is then updated like before.
+
+    :param values: flat list of float values
+    :type values: list(float)
+
+    :param tolerance: rounding step
+    :type tolerance: float
+
+    :return: the quantized values
+    :rtype: bytes
+    """
+
+    if NUMPY_READY:
+        return np.rint(np.asarray(values, dtype=np.float64) / tolerance
+                       ).astype(np.int64).tobytes()
+
+    return array("q", [int(round(v / tolerance)) for v in values]).tobytes()
+
+
+def _flatten(values, width, size=3):
+    """ Returns the given API array of vectors as a flat list of floats
+
+    :param values: API array of points, vectors or colors
+    :type values: om.MPointArray
+
+    :param width: number of values per element in the API array
+    :type width: int
+
+    :param size: number of values kept per element
+    :type size: int
+
+    :return: the flat values
+    :rtype: np.ndarray or list(float)
+    """
+
+    if NUMPY_READY:
+        return np.array(values, dtype=np.float64).reshape(-1, width)[
+            :, :size].ravel()
+
+    return [c for v in values for c in tuple(v)[:size]]
+
+
+def _get_dag_path(shape):
+    """ Returns the API dag path of the given shape
+
+    :param shape: maya shape node
+    :type shape: str
+
+    :return: the shape dag path
+    :rtype: om.MDagPath
+    """
+
+    selection = om.MSelectionList()
+    selection.add(shape)
+    return selection.getDagPath(0)
+
+
+def get_attribute_names(shape):
+    """ Returns the attributes names that Flex can update on the given shape
+
+    :param shape: maya shape node
+    :type shape: str
+
+    :return: the user defined, display, render and plug-in attributes
+    :rtype: list(str)
+    """
+
+    return ((cmds.listAttr(shape, userDefined=True) or []) +
+            OBJECT_DISPLAY_ATTRIBUTES + COMPONENT_DISPLAY_ATTRIBUTES +
+            RENDER_STATS_ATTRIBUTES +
+            (cmds.listAttr(shape, fromPlugin=True) or []))
+
+
+def get_attributes_hash(shape, attributes):
+    """ Returns the hash of the given attributes values
+
+    :param shape: maya shape node
+    :type shape: str
+
+    :param attributes: attributes names. Missing attributes are hashed as
+                       missing
+    :type attributes: list(str)
+
+    :return: the attributes hash
+    :rtype: str
+    """
+
+    values = []
+    for attribute in attributes:
+        plug = "{}.{}".format(shape, attribute)
+        try:
+            values.append((attribute, cmds.getAttr(plug)))
+        except (RuntimeError, ValueError):
+            values.append((attribute, None))
+
+    return _hash(*values)
+
+
+def get_fingerprint(shape, geometry=None, attributes=None,
+                    tolerance=TOLERANCE):
+    """ Returns the fingerprint of the given shape
+
+    :param shape: maya shape node
+    :type shape: str
+
+    :param geometry: the shape node to read the geometry from. The orig shape
+                     on deformed shapes. Default to the shape itself
+    :type geometry: str
+
+    :param attributes: the attributes names to hash. Defaults to the shape
+                       attributes updated by Flex
+    :type attributes: list(str)
+
+    :param tolerance: points and uvs tolerance
+    :type tolerance: float
+
+    :return: the shape fingerprint
+    :rtype: Fingerprint
+    """
+
+    geometry = geometry or shape
+    shape_type = cmds.objectType(geometry)
+    dag_path = _get_dag_path(geometry)
+
+    # normals, colors and creases are only hashed on meshes
+    uvs = normals = colors = creases = None
+    if shape_type == "mesh":
+        topology, points, uvs, normals, colors, creases = _get_mesh_hashes(
+            dag_path, tolerance)
+    elif shape_type == "nurbsCurve":
+        topology, points = _get_curve_hashes(dag_path, tolerance)
+    else:
+        topology, points = _get_surface_hashes(dag_path, tolerance)
+
+    # transform local matrix, used when the transform is updated
+    parent = get_parent(shape)
+    transform = None
+    if parent:
+        transform = _hash(_quantize(cmds.getAttr("{}.matrix".format(
+            parent[0])), tolerance))
+
+    if attributes is None:
+        attributes = get_attribute_names(shape)
+
+    return Fingerprint(shape_type, topology, points, uvs, normals, colors,
+                       creases, transform,
+                       get_attributes_hash(shape, attributes))
+
+
+def _get_curve_hashes(dag_path, tolerance):
+    """ Returns the topology and points hashes of a nurbs curve
+
+    :param dag_path: nurbs curve dag path
+    :type dag_path: om.MDagPath
+
+    :param tolerance: points tolerance
+    :type tolerance: float
+
+    :return: the topology and points hashes
+    :rtype: str, str
+    """
+
+    fn_curve = om.MFnNurbsCurve(dag_path)
+    topology = _hash(fn_curve.degree, fn_curve.form, fn_curve.numCVs,
+                     _quantize(list(fn_curve.knots()), tolerance))
+    points = _hash(_quantize(_flatten(fn_curve.cvPositions(), 4), tolerance))
+
+    return topology, points
+
+
+def _get_mesh_hashes(dag_path, tolerance):
+    """ Returns the topology, points, uvs, normals, colors and creases hashes
+    of a mesh
+
+    The normals hash covers the edges smoothing and the locked normals. The
+    colors hash covers the color sets names and face vertex colors.
+
+    :param dag_path: mesh dag path
+    :type dag_path: om.MDagPath
+
+    :param tolerance: points, uvs, normals and colors tolerance
+    :type tolerance: float
+
+    :return: the topology, points, uvs, normals, colors and creases hashes
+    :rtype: str, str, str, str, str, str
+    """
+
+    fn_mesh = om.MFnMesh(dag_path)
+
+    counts, connects = fn_mesh.getVertices()
+    topology = _hash(fn_mesh.numVertices, array("i", counts).tobytes(),
+                     array("i", connects).tobytes())
+
+    points = _hash(_quantize(_flatten(fn_mesh.getFloatPoints(), 4),
+                             tolerance))
+
+    uv_chunks = []
+    for uv_set in fn_mesh.getUVSetNames():
+        u_values, v_values = fn_mesh.getUVs(uv_set)
+        uv_counts, uv_ids = fn_mesh.getAssignedUVs(uv_set)
+        uv_chunks.extend([uv_set,
+                          _quantize(list(u_values) + list(v_values),
+                                    tolerance),
+                          array("i", uv_counts).tobytes(),
+                          array("i", uv_ids).tobytes()])
+
+    smoothing = array("b", [fn_mesh.isEdgeSmooth(i)
+                            for i in range(fn_mesh.numEdges)])
+    normal_counts, normal_ids = fn_mesh.getNormalIds()
+    # the unlocked normals follow the points and smoothing, only the locked
+    # normals values are hashed
+    normal_values = _flatten(fn_mesh.getNormals(), 3)
+    locked = [i for i in range(fn_mesh.numNormals)
+              if fn_mesh.isNormalLocked(i)]
+    normals = _hash(smoothing.tobytes(), array("i", normal_ids).tobytes(),
+                    locked, _quantize([normal_values[i * 3 + j]
+                                       for i in locked for j in range(3)],
+                                      tolerance))
+
+    color_chunks = []
+    for color_set in fn_mesh.getColorSetNames():
+        color_chunks.extend([color_set, _quantize(_flatten(
+            fn_mesh.getFaceVertexColors(color_set), 4, 4), tolerance)])
+
+    return (topology, points, _hash(*uv_chunks), normals,
+            _hash(*color_chunks), _get_creases_hash(fn_mesh, tolerance))
+
+
+def _get_creases_hash(fn_mesh, tolerance):
+    """ Returns the hash of the edges and vertices creases of a mesh
+
+    :param fn_mesh: mesh function set
+    :type fn_mesh: om.MFnMesh
+
+    :param tolerance: creases tolerance
+    :type tolerance: float
+
+    :return: the creases hash
+    :rtype: str
+    """
+
+    chunks = []
+    for getter in (fn_mesh.getCreaseEdges, fn_mesh.getCreaseVertices):
+        try:
+            ids, values = getter()
+        except RuntimeError:
+            # no creases
+            ids, values = [], []
+        chunks.extend([array("i", ids).tobytes(),
+                       _quantize(list(values), tolerance)])
+
+    return _hash(*chunks)
+
+
+def _get_surface_hashes(dag_path, tolerance):
+    """ Returns the topology and points hashes of a nurbs surface
+
+    :param dag_path: nurbs surface dag path
+    :type dag_path: om.MDagPath
+
+    :param tolerance: points tolerance
+    :type tolerance: float
+
+    :return: the topology and points hashes
+    :rtype: str, str
+    """
+
+    fn_surface = om.MFnNurbsSurface(dag_path)
+    topology = _hash(fn_surface.degreeInU, fn_surface.degreeInV,
+                     fn_surface.formInU, fn_surface.formInV,
+                     fn_surface.numCVsInU, fn_surface.numCVsInV,
+                     _quantize(list(fn_surface.knotsInU()) +
+                               list(fn_surface.knotsInV()), tolerance))
+    points = _hash(_quantize(_flatten(fn_surface.cvPositions(), 4),
+                             tolerance))
+
+    return topology, points
+
+
+def compare_fingerprints(source, target, compare_transform=False):
+    """ Returns the fingerprint fields that differs between source and target
+
+    :param source: source shape fingerprint
+    :type source: Fingerprint
+
+    :param target: target shape fingerprint
+    :type target: Fingerprint
+
+    :param compare_transform: whether the transform differences count, when
+                              the update replaces the target transform
+    :type compare_transform: bool
+
+    :return: the changed fields names
+    :rtype: set(str)
+    """
+
+    changes = set(field for field in Fingerprint._fields
+                  if getattr(source, field) != getattr(target, field))
+
+    if not compare_transform:
+        changes.discard("transform")
+
+    return changes
+
+
+def classify_changes(changes):
+    """ Returns the classification of the given fingerprint changes
+
+    :param changes: changed fingerprint fields as returned by
+                    compare_fingerprints
+    :type changes: set(str)
+
+    :return: UNCHANGED, ATTRIBUTES_ONLY, POINTS_ONLY or TOPOLOGY_CHANGED.
+             Points only covers any geometry change keeping the topology
+    :rtype: str
+    """
+
+    if not changes:
+        return UNCHANGED
+
+    if "type" in changes or "topology" in changes:
+        return TOPOLOGY_CHANGED
+
+    if changes.intersection(GEOMETRY_FIELDS):
+        return POINTS_ONLY
+
+    return ATTRIBUTES_ONLY
+
+
+@timer
+def get_shapes_changes(matching_shapes, compare_transform=False,
+                       tolerance=TOLERANCE):
+    """ Returns the changes between each source and target shapes
+
+    Source and target fingerprints are computed in a single pass. The target
+    geometry is read from the orig shape on deformed shapes, as this is the
+    shape Flex updates. The attributes are compared using the source
+    attributes names.
+
+    :param matching_shapes: source shape: target shape matching dict
+    :type matching_shapes: dict
+
+    :param compare_transform: whether the transform differences count, when
+                              the update replaces the target transform
+    :type compare_transform: bool
+
+    :param tolerance: points and uvs tolerance
+    :type tolerance: float
+
+    :return: source shape: changed fingerprint fields
+    :rtype: dict
+    """
+
+    changes = {}
+    for source, target in matching_shapes.items():
+        try:
+            attributes = get_attribute_names(source)
+            source_print = get_fingerprint(source, attributes=attributes,
+                                           tolerance=tolerance)
+
+            orig_shape = get_shape_orig(target)
+            target_print = get_fingerprint(
+                target, geometry=orig_shape[0] if orig_shape else None,
+                attributes=attributes, tolerance=tolerance)
+
+        except RuntimeError as error:
+            # fingerprint failed, the shape is updated like before
+            logger.warning("Can't compare {} and {}: {}".format(
+                source, target, error))
+            changes[source] = set(Fingerprint._fields)
+            continue
+
+        changes[source] = compare_fingerprints(source_print, target_print,
+                                               compare_transform)
+
+    logger.info("Changed shapes: {} / {}".format(
+        len([x for x in changes if changes[x]]), len(changes)))
+
+    return changes
@@ -58,6 +58,7 @@ class Flex(object):
                                  "plugin_attributes": False,
                                  "hold_transform_values": True,
                                  "mismatched_topologies": True,
+                                 "skip_unchanged": True,
                                  }
 
     def __check_source_and_target_properties(self):
@@ -88,6 +89,7 @@ class Flex(object):
            * plugin_attributes
            * hold_transform_values
            * mismatched_topologies
+           * skip_unchanged
         """
 
         # gather ui options
@@ -109,6 +111,8 @@ class Flex(object):
             self.ui.transformed_hold_check.isChecked())
         ui_options["mismatched_topologies"] = (
             self.ui.mismatched_topologies.isChecked())
+        ui_options["skip_unchanged"] = (
+            self.ui.skip_unchanged_check.isChecked())
 
         return ui_options
 
@@ -293,7 +297,8 @@ class Flex(object):
         """ Scans the shapes inside the source and target group
 
         This function will query each source and corresponding target shape
-        checking if their type, vertices count and bounding box matches
+        checking if their type, vertices count and bounding box matches, and
+        which kind of changes they have
 
         :param update_ui: whether or not the analyze ui should be updated
         :type: bool
@@ -307,13 +312,13 @@ class Flex(object):
 
         # runs analyze
         matching_shapes, mismatched_types, mismatched_count, \
-            mismatched_bbox = analyze_groups(source=self.source_group,
-                                             target=self.target_group)
+            mismatched_bbox, changes = analyze_groups(
+                source=self.source_group, target=self.target_group)
 
         if update_ui:
             [self.analyze_ui.add_item(shape, matching_shapes[shape],
                                       mismatched_types, mismatched_count,
-                                      mismatched_bbox)
+                                      mismatched_bbox, changes[shape])
              for shape in matching_shapes]
 
     @set_focus
@@ -426,6 +431,8 @@ class Flex(object):
                    "component_display": False,
                    "plugin_attributes": False,
                    "hold_transform_values": True,
+                   "mismatched_topologies": True,
+                   "skip_unchanged": True,
                   }
         """
 
@@ -217,6 +217,13 @@ class FlexDialog(QtWidgets.QDialog):
         )
         self.component_attributes_check.setChecked(False)
 
+        # skips the shapes without changes
+        self.skip_unchanged_check = QtWidgets.QCheckBox("Skip Unchanged Shapes")
+        self.skip_unchanged_check.setChecked(True)
+        self.skip_unchanged_check.setStatusTip(
+            "Compares the shapes fingerprints and only updates the changed ones"
+        )
+
         # adds widgets to layout
         grid_layout.addWidget(self.user_attributes_check, 0, 0, 1, 1)
         grid_layout.addWidget(self.plugin_attributes_check, 0, 1, 1, 1)
@@ -224,6 +231,7 @@ class FlexDialog(QtWidgets.QDialog):
         #         grid_layout.addWidget(self.vertex_colours_check, 1, 2, 1, 1)
         grid_layout.addWidget(self.display_attributes_check, 1, 0, 1, 1)
         grid_layout.addWidget(self.component_attributes_check, 1, 1, 1, 1)
+        grid_layout.addWidget(self.skip_unchanged_check, 1, 2, 1, 1)
         grid_layout.addWidget(t_n_d_widget, 2, 0, 1, 3)
 
         # adds the group box widget to the widgets_layout
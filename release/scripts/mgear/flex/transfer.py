@@ -0,0 +1,466 @@
+""" flex.transfer
+
+flex.transfer module handles transferring the deformers weights in memory
+when a shape topology changes. The weights are read as arrays before the
+update, mapped to the new topology using a point correspondence computed
+once per shape and written back in bulk.
+
+:module: flex.transfer
+"""
+
+# imports
+from __future__ import absolute_import
+from maya import cmds
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+from mgear.core import api_undo
+from mgear.core import wmap
+from mgear.flex import logger
+from mgear.flex.decorators import timer
+
+try:
+    import numpy as np
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
+
+# shape types supported by the in memory transfer
+TRANSFER_TYPES = ("mesh", "nurbsCurve")
+
+# component types for each supported shape type
+COMPONENT_TYPES = {"mesh": om.MFn.kMeshVertComponent,
+                   "nurbsCurve": om.MFn.kCurveCVComponent}
+
+
+def _get_dag_path(shape):
+    """ Returns the API dag path of the given shape
+
+    :param shape: maya shape node
+    :type shape: str
+
+    :return: the shape dag path
+    :rtype: om.MDagPath
+    """
+
+    selection = om.MSelectionList()
+    selection.add(shape)
+    return selection.getDagPath(0)
+
+
+def _get_complete_component(shape):
+    """ Returns a component containing all the points of the given shape
+
+    :param shape: maya shape node
+    :type shape: str
+
+    :return: the shape dag path and the component
+    :rtype: om.MDagPath, om.MObject
+    """
+
+    dag_path = _get_dag_path(shape)
+    fn_component = om.MFnSingleIndexedComponent()
+    component = fn_component.create(COMPONENT_TYPES[cmds.objectType(shape)])
+    fn_component.setCompleteData(om.MItGeometry(dag_path).count())
+
+    return dag_path, component
+
+
+def _get_points(dag_path):
+    """ Returns the object space points of the given shape
+
+    :param dag_path: shape dag path
+    :type dag_path: om.MDagPath
+
+    :return: the shape points
+    :rtype: om.MPointArray
+    """
+
+    return om.MItGeometry(dag_path).allPositions(om.MSpace.kObject)
+
+
+def _to_array(points):
+    """ Returns the given points as a (count, 3) numpy array
+
+    :param points: the points
+    :type points: om.MPointArray
+
+    :rtype: np.ndarray
+    """
+
+    return np.array(points, dtype=np.float64).reshape(-1, 4)[:, :3]
+
+
+def _to_list(values):
+    """ Returns the given array values as a list of floats
+
+    :param values: numpy array, Maya array or list
+    :type values: list
+
+    :rtype: list(float)
+    """
+
+    if hasattr(values, "tolist"):
+        return values.tolist()
+
+    return list(values)
+
+
+def _get_skin_fn(skin):
+    """ Returns the API function set of the given skin cluster
+
+    :param skin: skin cluster node name
+    :type skin: str
+
+    :return: the skin cluster function set
+    :rtype: oma.MFnSkinCluster
+    """
+
+    selection = om.MSelectionList()
+    selection.add(skin)
+    return oma.MFnSkinCluster(selection.getDependNode(0))
+
+
+def is_transfer_supported(shape):
+    """ Returns if the in memory weights transfer supports the given shape
+
+    :param shape: maya shape node
+    :type shape: str
+
+    :rtype: bool
+    """
+
+    return cmds.objectType(shape) in TRANSFER_TYPES
+
+
+class GeometrySnapshot(object):
+    """ In memory copy of a shape geometry
+
+    Keeps the points and, on meshes, a copy of the mesh data so the new
+    topology can be mapped to it after the shape is updated.
+    """
+
+    def __init__(self, shape):
+        """ Copies the given shape geometry
+
+        :param shape: maya shape node
+        :type shape: str
+        """
+
+        dag_path = _get_dag_path(shape)
+        self.shape_type = cmds.objectType(shape)
+        self.points = _get_points(dag_path)
+        self.count = len(self.points)
+        self.mesh = None
+
+        if self.shape_type == "mesh":
+            # the mesh data owns the copy, it needs to be kept alive
+            self.mesh_data = om.MFnMeshData().create()
+            self.mesh = om.MFnMesh().copy(dag_path.node(), self.mesh_data)
+
+    def get_mapping(self, shape):
+        """ Returns the mapping from the given shape points to this snapshot
+
+        Mesh points are mapped on the closest point on the snapshot surface,
+        interpolating the weights of its triangle vertices. Other shapes use
+        the closest snapshot point.
+
+        :param shape: maya shape node, with the new topology
+        :type shape: str
+
+        :return: the points mapping
+        :rtype: PointMapping
+        """
+
+        points = _get_points(_get_dag_path(shape))
+
+        if self.mesh is not None:
+            return self.__get_barycentric_mapping(points)
+
+        return self.__get_closest_mapping(points)
+
+    def __get_barycentric_mapping(self, points):
+        """ Returns the barycentric mapping of the given points
+
+        :param points: the new topology points
+        :type points: om.MPointArray
+
+        :rtype: PointMapping
+        """
+
+        intersector = om.MMeshIntersector()
+        intersector.create(self.mesh, om.MMatrix())
+        fn_mesh = om.MFnMesh(self.mesh)
+
+        # triangles vertices are shared by many points
+        triangles = {}
+
+        indices = []
+        weights = []
+        for point in points:
+            point_on_mesh = intersector.getClosestPoint(point)
+            key = (point_on_mesh.face, point_on_mesh.triangle)
+            if key not in triangles:
+                triangles[key] = fn_mesh.getPolygonTriangleVertices(*key)
+            u, v = point_on_mesh.barycentricCoords
+            indices.extend(triangles[key])
+            weights.extend((u, v, 1.0 - u - v))
+
+        return PointMapping(indices, weights, 3)
+
+    def __get_closest_mapping(self, points):
+        """ Returns the closest point mapping of the given points
+
+        :param points: the new topology points
+        :type points: om.MPointArray
+
+        :rtype: PointMapping
+        """
+
+        return get_closest_mapping(self.points, points)
+
+
+def get_closest_mapping(old_points, points):
+    """ Returns the mapping of the given points on the closest old points
+
+    :param old_points: the old topology points
+    :type old_points: om.MPointArray
+
+    :param points: the new topology points
+    :type points: om.MPointArray
+
+    :rtype: PointMapping
+    """
+
+    if NUMPY_READY:
+        old_array = _to_array(old_points)
+        indices = [int(np.argmin(((old_array - point) ** 2).sum(axis=1)))
+                   for point in _to_array(points)]
+    else:
+        indices = [min(range(len(old_points)),
+                       key=lambda i: old_points[i].distanceTo(p))
+                   for p in points]
+
+    return PointMapping(indices, [1.0] * len(indices), 1)
+
+
+class PointMapping(object):
+    """ Correspondence from the points of a new topology to an old one
+
+    Each new point is a weighted sum of a fixed number (width) of old points.
+    """
+
+    def __init__(self, indices, weights, width):
+        """ Initialise the mapping
+
+        :param indices: flat old points indices, width per new point
+        :type indices: list(int)
+
+        :param weights: flat interpolation weights, width per new point
+        :type weights: list(float)
+
+        :param width: number of old points per new point
+        :type width: int
+        """
+
+        self.width = width
+        self.count = len(indices) // width
+
+        if NUMPY_READY:
+            self.indices = np.asarray(indices, dtype=np.int64).reshape(
+                self.count, width)
+            self.weights = np.asarray(weights, dtype=np.float64).reshape(
+                self.count, width, 1)
+        else:
+            self.indices = list(indices)
+            self.weights = list(weights)
+
+    def apply(self, values, columns=1):
+        """ Maps per point values from the old topology to the new one
+
+        :param values: flat old values, columns per point
+        :type values: list(float)
+
+        :param columns: number of values per point
+        :type columns: int
+
+        :return: flat new values, columns per point
+        :rtype: list(float)
+        """
+
+        if NUMPY_READY:
+            values = np.asarray(values, dtype=np.float64).reshape(-1, columns)
+            return (values[self.indices] * self.weights).sum(axis=1).ravel()
+
+        result = [0.0] * (self.count * columns)
+        for i in range(self.count):
+            for j in range(self.width):
+                index = self.indices[i * self.width + j]
+                weight = self.weights[i * self.width + j]
+                for column in range(columns):
+                    result[i * columns + column] += (
+                        values[index * columns + column] * weight)
+
+        return result
+
+
+def get_skin_weights(skin, shape):
+    """ Returns the given skin cluster weights on the given shape
+
+    :param skin: skin cluster node name
+    :type skin: str
+
+    :param shape: the shape deformed by the skin cluster
+    :type shape: str
+
+    :return: flat weights (influences per point), influences count and the
+             blend weights
+    :rtype: om.MDoubleArray, int, om.MDoubleArray
+    """
+
+    fn_skin = _get_skin_fn(skin)
+    dag_path, component = _get_complete_component(shape)
+    weights, influences = fn_skin.getWeights(dag_path, component)
+
+    return (weights, influences,
+            fn_skin.getBlendWeights(dag_path, component))
+
+
+def set_skin_weights(skin, shape, weights, influences, blend_weights):
+    """ Sets all the given skin cluster weights in a single call
+
+    The API weights setters are registered in the undo queue, so the weights
+    are undone with the shape update.
+
+    :param skin: skin cluster node name
+    :type skin: str
+
+    :param shape: the shape deformed by the skin cluster
+    :type shape: str
+
+    :param weights: flat weights, influences per point
+    :type weights: list(float)
+
+    :param influences: influences count
+    :type influences: int
+
+    :param blend_weights: dual quaternion blend weights
+    :type blend_weights: list(float)
+    """
+
+    fn_skin = _get_skin_fn(skin)
+    dag_path, component = _get_complete_component(shape)
+    indices = om.MIntArray(list(range(influences)))
+    weights = om.MDoubleArray(_to_list(weights))
+    blend_weights = om.MDoubleArray(_to_list(blend_weights))
+
+    old_blend_weights = fn_skin.getBlendWeights(dag_path, component)
+    old_weights = fn_skin.setWeights(dag_path, component, indices, weights,
+                                     False, True)
+    fn_skin.setBlendWeights(dag_path, component, blend_weights)
+
+    def undo():
+        fn_skin.setWeights(dag_path, component, indices, old_weights, False)
+        fn_skin.setBlendWeights(dag_path, component, old_blend_weights)
+
+    def redo():
+        fn_skin.setWeights(dag_path, component, indices, weights, False)
+        fn_skin.setBlendWeights(dag_path, component, blend_weights)
+
+    api_undo.commit(undo, redo)
+
+
+def _get_weight_index(deformer, shape):
+    """ Returns the weightList index of the shape on the given deformer
+
+    :param deformer: deformer node name
+    :type deformer: str
+
+    :param shape: maya shape node
+    :type shape: str
+
+    :return: the geometry index or None if shape isn't deformed
+    :rtype: int
+    """
+
+    shape = cmds.ls(shape, long=True)[0]
+    for index, geometry in wmap.get_deformed_geometry(deformer):
+        if geometry == shape:
+            return index
+
+
+@timer
+def create_weights_backup(shape, shape_orig, skin_nodes, cluster_nodes):
+    """ Reads the given deformers weights in memory
+
+    :param shape: the deformed shape node name
+    :type shape: str
+
+    :param shape_orig: the intermediate shape that will be updated
+    :type shape_orig: str
+
+    :param skin_nodes: skin cluster nodes names
+    :type skin_nodes: list(str)
+
+    :param cluster_nodes: cluster nodes names
+    :type cluster_nodes: list(str)
+
+    :return: the weights backup
+    :rtype: dict
+    """
+
+    logger.info("Creating in memory weights backup for {}".format(
+        skin_nodes + cluster_nodes))
+
+    backup = {"snapshot": GeometrySnapshot(shape_orig),
+              "skinCluster": {},
+              "cluster": {}}
+
+    for node in skin_nodes:
+        backup["skinCluster"][node] = get_skin_weights(node, shape)
+
+    for node in cluster_nodes:
+        index = _get_weight_index(node, shape)
+        if index is None:
+            continue
+        weights = wmap.read_weights(node, index, backup["snapshot"].count)
+        # clusters left out of the backup are updated with weight files
+        if len(weights) != backup["snapshot"].count:
+            logger.warning("Can't read {} weights in memory".format(node))
+            continue
+        backup["cluster"][node] = (index, weights)
+
+    return backup
+
+
+@timer
+def update_weights_from_backup(backup, shape, shape_orig):
+    """ Writes the backup weights mapped on the updated shape topology
+
+    The point mapping is computed once and shared by all the deformers. It
+    is computed on the intermediate shape, as the deformed shape points are
+    moved by the other deformers.
+
+    :param backup: weights backup from create_weights_backup
+    :type backup: dict
+
+    :param shape: the deformed shape node name, with the new topology
+    :type shape: str
+
+    :param shape_orig: the updated intermediate shape
+    :type shape_orig: str
+    """
+
+    if not backup["skinCluster"] and not backup["cluster"]:
+        return
+
+    mapping = backup["snapshot"].get_mapping(shape_orig)
+
+    for node, (weights, influences, blend_weights) in (
+            backup["skinCluster"].items()):
+        logger.info("Updating skin weights on {}".format(node))
+        set_skin_weights(node, shape, mapping.apply(weights, influences),
+                         influences, mapping.apply(blend_weights))
+
+    for node, (index, weights) in backup["cluster"].items():
+        logger.info("Updating cluster weights on {}".format(node))
+        wmap.write_weights(node, index, mapping.apply(weights))
@@ -17,6 +17,9 @@ from mgear.flex.attributes import COMPONENT_DISPLAY_ATTRIBUTES
 from mgear.flex.attributes import OBJECT_DISPLAY_ATTRIBUTES
 from mgear.flex.attributes import RENDER_STATS_ATTRIBUTES
 from mgear.flex.decorators import timer
+from mgear.flex.fingerprint import GEOMETRY_FIELDS
+from mgear.flex.fingerprint import classify_changes
+from mgear.flex.fingerprint import get_shapes_changes
 from mgear.flex.query import get_deformers
 from mgear.flex.query import get_matching_shapes_from_group
 from mgear.flex.query import get_missing_shapes_from_group
@@ -27,6 +30,7 @@ from mgear.flex.query import is_matching_bouding_box
 from mgear.flex.query import is_matching_count
 from mgear.flex.query import is_matching_type
 from mgear.flex.query import lock_unlock_attribute
+from mgear.flex.transfer import update_weights_from_backup
 from mgear.flex.update_utils import add_attribute
 from mgear.flex.update_utils import copy_cluster_weights
 from mgear.flex.update_utils import copy_map1_name
@@ -200,22 +204,26 @@ def update_deformed_mismatching_shape(source, target, shape_orig):
     set_deformer_state(deformers, False)
 
     # creates deformers backups
-    bs_nodes, skin_nodes, cluster_nodes = create_deformers_backups(source,
-                                                                   target,
-                                                                   shape_orig,
-                                                                   deformers)
+    bs_nodes, skin_nodes, cluster_nodes, weights_backup = \
+        create_deformers_backups(source, target, shape_orig, deformers)
+
     # updates target shape
     update_shape(source, shape_orig)
 
-    # updates skinning nodes
-    update_skincluster_node(skin_nodes, deformers["skinCluster"])
+    # updates skinning and cluster weights from the in memory backup
+    if weights_backup:
+        update_weights_from_backup(weights_backup, target, shape_orig)
 
-    # updates blendshapes nodes
-    update_blendshapes_nodes(bs_nodes, deformers["blendShape"])
+    # or from the backup nodes
+    else:
+        update_skincluster_node(skin_nodes, deformers["skinCluster"])
 
-    # update cluster nodes
+    # clusters not kept in memory are updated from the weight files
     update_clusters_nodes(target, cluster_nodes)
 
+    # updates blendshapes nodes
+    update_blendshapes_nodes(bs_nodes, deformers["blendShape"])
+
     # updates uv sets on target shape
     update_uvs_sets(target)
 
@@ -325,6 +333,12 @@ def update_rig(source, target, options):
 
     :param options: update options
     :type options: dict
+
+    .. note:: With the skip_unchanged option, the shapes fingerprints are
+              compared first. Unchanged shapes are skipped, the shape update
+              only runs on geometry changes and the attributes update on
+              attributes changes. This way the update time depends on the
+              number of changed shapes.
     """
 
     # gets the matching shapes
@@ -334,18 +348,44 @@ def update_rig(source, target, options):
     logger.info("Matching shapes: {}" .format(matching_shapes))
     logger.info("-" * 90)
 
+    # finds the changed shapes, so unchanged ones are not updated
+    changes = None
+    if options.get("skip_unchanged", True):
+        changes = get_shapes_changes(
+            matching_shapes,
+            compare_transform=not options["hold_transform_values"])
+
     for shape in matching_shapes:
+        # runs the full update when changes are not checked
+        shape_changes = changes[shape] if changes is not None else None
+
+        if shape_changes is not None and not shape_changes:
+            logger.debug("Skipping unchanged shape: {}".format(
+                matching_shapes[shape]))
+            continue
+
         logger.debug("-" * 90)
         logger.debug("Updating: {}".format(matching_shapes[shape]))
 
-        if options["deformed"]:
+        if shape_changes is not None:
+            logger.debug("Shape changes: {}".format(
+                classify_changes(shape_changes)))
+
+        update_geometry = (shape_changes is None or
+                           bool(shape_changes.intersection(GEOMETRY_FIELDS)))
+
+        if options["deformed"] and update_geometry:
             update_deformed_shape(shape, matching_shapes[shape],
                                   options["mismatched_topologies"])
 
-        if options["transformed"]:
+        if options["transformed"] and update_geometry:
             update_transformed_shape(shape, matching_shapes[shape],
                                      options["hold_transform_values"])
 
+        # attributes are up to date, only the geometry changed
+        if shape_changes is not None and "attributes" not in shape_changes:
+            continue
+
         if options["user_attributes"]:
             update_user_attributes(shape, matching_shapes[shape])
 
@@ -21,6 +21,8 @@ from mgear.flex.query import get_shape_orig
 from mgear.flex.query import get_shape_type_attributes
 from mgear.flex.query import get_temp_folder
 from mgear.flex.query import is_matching_type
+from mgear.flex.transfer import create_weights_backup
+from mgear.flex.transfer import is_transfer_supported
 
 
 def add_attribute(source, target, attribute_name):
@@ -433,20 +435,40 @@ def create_deformers_backups(source, target, shape_orig, deformers):
     :param deformers: deformers used on target
     :type deformers: dict
 
-    :return: deformers backups nodes created
-    :rtype: list, list
+    :return: deformers backups nodes created, cluster weight files and the in
+             memory weights backup
+    :rtype: list, list, dict, dict
+
+    .. note:: On meshes and curves the skinning and clusters weights are kept
+              in memory, no backup node is created. Weight files are only
+              created for the clusters weights that can't be read.
     """
 
     # declare return values
     bs_nodes = []
     skin_nodes = []
     cluster_nodes = []
+    weights_backup = None
 
     # creates blendshapes nodes backup
     if len(deformers["blendShape"]):
         bs_nodes = create_blendshapes_backup(target, source,
                                              deformers["blendShape"])
 
+    # creates the in memory skincluster and clusters weights backup
+    if is_transfer_supported(shape_orig):
+        weights_backup = create_weights_backup(
+            target, shape_orig, deformers["skinCluster"][:1],
+            deformers["cluster"])
+
+        # clusters weights that can't be read in memory use weight files
+        nodes = [x for x in deformers["cluster"]
+                 if x not in weights_backup["cluster"]]
+        if nodes:
+            cluster_nodes = create_clusters_backup(target, nodes)
+
+        return bs_nodes, skin_nodes, cluster_nodes, weights_backup
+
     # creates skincluster nodes backup
     if len(deformers["skinCluster"]):
         skin_nodes = create_skincluster_backup(shape_orig,
@@ -455,7 +477,7 @@ def create_deformers_backups(source, target, shape_orig, deformers):
     if len(deformers["cluster"]):
         cluster_nodes = create_clusters_backup(target, deformers["cluster"])
 
-    return bs_nodes, skin_nodes, cluster_nodes
+    return bs_nodes, skin_nodes, cluster_nodes, weights_backup
 
 
 def create_duplicate(shape, duplicate_name):
@@ -7,6 +7,7 @@ from . import util
 from .bind import PyNode
 from .node import nt
 from .attr import Attribute
+from .plugs import getAttrs, setAttrs
 from .geometry import MeshVertex, MeshFace, NurbsCurveCV, MeshEdge
 from . import datatypes
 
@@ -83,6 +83,27 @@ class Attribute(base.Attr):
     def plug(self):
         return self.__plug
 
+    def isValid(self):
+        """Check if the plug still exists. The plug of a deleted dynamic
+        attribute is not valid
+
+        Returns:
+            bool: True if the plug is valid
+        """
+        this_plug = super(Attribute, self).__getattribute__("_Attribute__plug")
+        if this_plug.isNull:
+            return False
+
+        obj = this_plug.node()
+        if not OpenMaya.MObjectHandle(obj).isValid():
+            return False
+
+        if not this_plug.isDynamic:
+            return True
+
+        attr_name = OpenMaya.MFnAttribute(this_plug.attribute()).name
+        return OpenMaya.MFnDependencyNode(obj).hasAttribute(attr_name)
+
     def name(self):
         this_plug = super(Attribute, self).__getattribute__("_Attribute__plug")
         obj = this_plug.node()
@@ -136,16 +157,7 @@ class Attribute(base.Attr):
     def node(self):
         from . import node
 
-        obj = self.__plug.node()
-
-        if obj.hasFn(OpenMaya.MFn.kDagNode):
-            nfunc = OpenMaya.MFnDagNode(
-                OpenMaya.MDagPath.getAPathTo(obj)
-            ).partialPathName
-        else:
-            nfunc = OpenMaya.MFnDependencyNode(obj).name
-
-        return node.BindNode(nfunc())
+        return node.BindNode(self.__plug.node())
 
     def nodeName(self):
         return self.node().name()
@@ -1,8 +1,8 @@
-from maya import cmds
 import re
 from . import base
 from . import node
 from . import geometry
+from . import exception
 
 
 def __find_attr(name):
@@ -59,11 +59,10 @@ def PyNode(name_or_node):
                     )
                 )
     else:
-        # Check if the node exists before attempting to bind
-        if not cmds.objExists(name_or_node):
+        # bind the node, the instance is reused if the node is cached
+        try:
+            return node.BindNode(name_or_node)
+        except exception.MayaNodeError:
             raise RuntimeError(
                 "Node '{}' does not exist.".format(name_or_node)
             )
-
-        # If it exists, bind and return the node
-        return node.BindNode(name_or_node)
@@ -0,0 +1,109 @@
+"""Process wide cache of the pymaya node instances.
+
+The nodes are keyed by the hash code of their MObjectHandle, so the same
+instance (and the plugs it already resolved) is returned every time a node
+is bound, whatever the name used to find it.
+
+Names are not cached: the partial name of a node changes when it is renamed,
+reparented or when another node takes the same short name. The node is
+always found by name with the API and only the instance is reused.
+
+The entries are removed when the node is deleted, and the whole cache is
+cleared before a new scene is created, opened, imported or referenced.
+"""
+from maya.api import OpenMaya
+
+
+try:
+    NODES
+except NameError:
+    NODES = {}
+
+try:
+    CALLBACK_IDS
+except NameError:
+    CALLBACK_IDS = []
+
+
+def _nodeRemoved(mobject, *args):
+    removeNode(mobject)
+
+
+def _sceneChanged(*args):
+    clear()
+
+
+def installCallbacks():
+    """Register the cache invalidation callbacks, if not registered yet."""
+    if CALLBACK_IDS:
+        return
+
+    CALLBACK_IDS.append(
+        OpenMaya.MDGMessage.addNodeRemovedCallback(_nodeRemoved)
+    )
+    for msg in (
+        OpenMaya.MSceneMessage.kBeforeNew,
+        OpenMaya.MSceneMessage.kBeforeOpen,
+        OpenMaya.MSceneMessage.kBeforeImport,
+        OpenMaya.MSceneMessage.kBeforeReference,
+    ):
+        CALLBACK_IDS.append(
+            OpenMaya.MSceneMessage.addCallback(msg, _sceneChanged)
+        )
+
+
+def removeCallbacks():
+    """Remove the cache invalidation callbacks and clear the cache."""
+    for cid in CALLBACK_IDS:
+        try:
+            OpenMaya.MMessage.removeCallback(cid)
+        except RuntimeError:
+            pass
+    del CALLBACK_IDS[:]
+    clear()
+
+
+def getNode(mobject):
+    """Get the cached node instance of a MObject
+
+    Args:
+        mobject (MObject): dependency node
+
+    Returns:
+        _Node: the cached instance or None
+    """
+    handle = OpenMaya.MObjectHandle(mobject)
+    node = NODES.get(handle.hashCode())
+    if node is None:
+        return None
+
+    if not handle.isAlive() or node.object() != mobject:
+        # deleted node or hash code collision
+        NODES.pop(handle.hashCode(), None)
+        return None
+
+    return node
+
+
+def addNode(node):
+    """Cache a node instance
+
+    Args:
+        node (_Node): the node
+    """
+    installCallbacks()
+    NODES[OpenMaya.MObjectHandle(node.object()).hashCode()] = node
+
+
+def removeNode(mobject):
+    """Remove the cached instance of a MObject
+
+    Args:
+        mobject (MObject): dependency node
+    """
+    NODES.pop(OpenMaya.MObjectHandle(mobject).hashCode(), None)
+
+
+def clear():
+    """Remove all the cached instances."""
+    NODES.clear()
@@ -5,6 +5,7 @@ from maya import cmds
 from . import cmd
 from . import attr
 from . import base
+from . import cache
 from . import datatypes
 from . import exception
 from . import geometry
@@ -204,12 +205,13 @@ class _Node(base.Node):
         return _Node.__selection_list.getDependNode(0)
 
     def __hash__(self):
-        return hash(self.name())
+        return self.__hash
 
     def __init__(self, nodename_or_mobject):
         super(_Node, self).__init__()
         self.__attrs = {}
         self.__api_mfn = None
+        self.__hash = None
 
         if isinstance(nodename_or_mobject, OpenMaya.MObject):
             self.__obj = nodename_or_mobject
@@ -225,6 +227,7 @@ class _Node(base.Node):
                 "Not a dependency node '{}'".format(nodename_or_mobject)
             )
 
+        self.__hash = OpenMaya.MObjectHandle(self.__obj).hashCode()
         self.__fn_dg = OpenMaya.MFnDependencyNode(self.__obj)
         self.__api_mfn = self.__fn_dg
         self.__is_transform = False
@@ -262,6 +265,11 @@ class _Node(base.Node):
         try:
             return super(_Node, self).__getattribute__(name)
         except AttributeError:
+            # resolve the attributes of the node with the api first
+            fn_dg = super(_Node, self).__getattribute__("_Node__fn_dg")
+            if fn_dg.hasAttribute(name):
+                return super(_Node, self).__getattribute__("attr")(name)
+
             nfnc = super(_Node, self).__getattribute__("name")
             if cmds.ls("{}.{}".format(nfnc(), name)):
                 return super(_Node, self).__getattribute__("attr")(name)
@@ -278,13 +286,14 @@ class _Node(base.Node):
 
     def __eq__(self, other):
         if isinstance(other, str):
-            other = _Node(other)
-        return self.__obj == other.__obj
+            other_obj = _Node.__getObjectFromName(other)
+            return other_obj is not None and self.__obj == other_obj
+        if isinstance(other, _Node):
+            return self.__obj == other.__obj
+        return False
 
     def __ne__(self, other):
-        if isinstance(other, str):
-            other = _Node(other)
-        return self.__obj != other.__obj
+        return not self.__eq__(other)
 
     def __str__(self):
         """Return the long name of the node as a string."""
@@ -301,23 +310,49 @@ class _Node(base.Node):
     def object(self):
         return self.__obj
 
+    def __validDag(self):
+        """Return the dag function set, re-resolved if the path is stale.
+
+        The cached instances outlive the reparenting, instancing and
+        renaming of the parents, which invalidate the path found at
+        construction.
+        """
+        fdag = super(_Node, self).__getattribute__("_Node__fn_dag")
+        if fdag is None:
+            return None
+
+        dagpath = super(_Node, self).__getattribute__("_Node__dagpath")
+        if dagpath.isValid():
+            return fdag
+
+        obj = super(_Node, self).__getattribute__("_Node__obj")
+        dagpath = OpenMaya.MDagPath.getAPathTo(obj)
+        fdag = OpenMaya.MFnDagNode(dagpath)
+        self.__dagpath = dagpath
+        self.__fn_dag = fdag
+        self.__api_mfn = fdag
+        return fdag
+
     def dgFn(self):
         return self.__fn_dg
 
     def dagFn(self):
-        return self.__fn_dag
+        return self.__validDag()
 
     def dagPath(self):
+        if self.__validDag() is None:
+            return None
         return self.__dagpath
 
     def isDag(self):
         return self.__fn_dag is not None
 
     def __apimfn__(self):
+        self.__validDag()
         return self.__api_mfn
 
     def name(self, long=False):
-        fdag = super(_Node, self).__getattribute__("_Node__fn_dag")
+        fdag = super(_Node, self).__getattribute__("_Node__validDag")()
         if fdag is not None:
             return fdag.partialPathName() if not long else fdag.fullPathName()
         fdg = super(_Node, self).__getattribute__("_Node__fn_dg")
@@ -330,7 +365,7 @@ class _Node(base.Node):
         return self.name()
 
     def longName(self):
-        fdag = super(_Node, self).__getattribute__("_Node__fn_dag")
+        fdag = super(_Node, self).__getattribute__("_Node__validDag")()
         if fdag is not None:
             return fdag.fullPathName()
         fdg = super(_Node, self).__getattribute__("_Node__fn_dg")
@@ -338,7 +373,7 @@ class _Node(base.Node):
 
     def shortName(self):
         """Return the short name of the node."""
-        fdag = super(_Node, self).__getattribute__("_Node__fn_dag")
+        fdag = super(_Node, self).__getattribute__("_Node__validDag")()
         if fdag is not None:
             return fdag.partialPathName().split("|")[-1]
         fdg = super(_Node, self).__getattribute__("_Node__fn_dg")
@@ -412,7 +447,10 @@ class _Node(base.Node):
         # Check if the attribute is already cached
         attr_cache = super(_Node, self).__getattribute__("_Node__attrs")
         if name in attr_cache:
-            return attr_cache[name]
+            cached = attr_cache[name]
+            if cached.isValid():
+                return cached
+            del attr_cache[name]
 
         # Split the attribute name to handle compound attributes
         parts = name.split(".")
@@ -980,8 +1018,45 @@ class Joint(_Node):
 nt.registerClass("joint", cls=Joint)
 
 
+def _getDependNode(name):
+    sel = OpenMaya.MSelectionList()
+    try:
+        sel.add(name)
+        return sel.getDependNode(0)
+    except (RuntimeError, TypeError):
+        return None
+
+
 def BindNode(name):
-    if not cmds.objExists(name):
+    """Get the node instance of a node name or MObject
+
+    The instances are shared, the same node always returns the same
+    instance while it exists. See the cache module
+
+    Args:
+        name (str or MObject): the node
+
+    Returns:
+        _Node: the node instance
+
+    Raises:
+        exception.MayaNodeError: if the node doesn't exist
+    """
+    if isinstance(name, OpenMaya.MObject):
+        obj = name
+    else:
+        obj = _getDependNode(name)
+    if (
+        obj is None
+        or obj.isNull()
+        or not obj.hasFn(OpenMaya.MFn.kDependencyNode)
+    ):
         raise exception.MayaNodeError("No such node '{}'".format(name))
 
-    return nt.getTypeClass(cmds.nodeType(name))(name)
+    node = cache.getNode(obj)
+    if node is None:
+        typename = OpenMaya.MFnDependencyNode(obj).typeName
+        node = nt.getTypeClass(typename)(obj)
+        cache.addNode(node)
+
+    return node
@@ -0,0 +1,335 @@
+"""Bulk attribute access.
+
+getAttrs and setAttrs resolve the plugs once, through the cached node
+instances, and read or write the values with the API instead of running one
+command per attribute. The values use the same types and UI units as
+getAttr and setAttr.
+
+Attributes not supported by the API path (array plugs, generic compounds,
+data types other than string and matrix) fall back to the commands.
+
+The API writes can't be undone. setAttrs is undoable by default and then
+runs one setAttr command per plug, in a single undo chunk: only the plugs
+resolution is faster than a setAttr loop. Pass undoable=False for the bulk
+write.
+
+Example:
+    >>> values = pm.getAttrs(["ctl.tx", "ctl.rotate", "ctl.visibility"])
+    >>> pm.setAttrs({"ctl.tx": 1.0, "ctl.rotate": [0, 90, 0]})
+"""
+from maya.api import OpenMaya
+
+from . import attr
+from . import cmd
+from . import datatypes
+from . import exception
+from . import node
+from . import util
+
+
+_VECTOR_TYPES = (
+    OpenMaya.MFn.kAttribute3Double,
+    OpenMaya.MFn.kAttribute3Float,
+    OpenMaya.MFn.kAttribute3Short,
+    OpenMaya.MFn.kAttribute3Int,
+)
+
+_COMPOUND_NUMERIC_TYPES = _VECTOR_TYPES + (
+    OpenMaya.MFn.kAttribute2Double,
+    OpenMaya.MFn.kAttribute2Float,
+    OpenMaya.MFn.kAttribute2Short,
+    OpenMaya.MFn.kAttribute2Int,
+    OpenMaya.MFn.kAttribute4Double,
+)
+
+_LINEAR_TYPES = (
+    OpenMaya.MFn.kDoubleLinearAttribute,
+    OpenMaya.MFn.kFloatLinearAttribute,
+)
+
+_ANGLE_TYPES = (
+    OpenMaya.MFn.kDoubleAngleAttribute,
+    OpenMaya.MFn.kFloatAngleAttribute,
+)
+
+_MATRIX_TYPES = (OpenMaya.MFn.kMatrixAttribute,)
+
+_FLOAT_TYPES = (
+    OpenMaya.MFnNumericData.kFloat,
+    OpenMaya.MFnNumericData.kDouble,
+)
+
+_INT_TYPES = (
+    OpenMaya.MFnNumericData.kByte,
+    OpenMaya.MFnNumericData.kChar,
+    OpenMaya.MFnNumericData.kShort,
+    OpenMaya.MFnNumericData.kInt,
+    OpenMaya.MFnNumericData.kInt64,
+)
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def toPlug(attribute):
+    """Get the MPlug of an attribute
+
+    Args:
+        attribute (str, Attribute or MPlug): the attribute
+
+    Returns:
+        MPlug: the plug
+
+    Raises:
+        exception.MayaAttributeError: if the attribute doesn't exist
+    """
+    if isinstance(attribute, OpenMaya.MPlug):
+        return attribute
+
+    if isinstance(attribute, attr.Attribute):
+        return attribute.plug()
+
+    nodename, _, attrname = str(attribute).partition(".")
+    if not attrname:
+        raise exception.MayaAttributeError(
+            "Not an attribute name '{}'".format(attribute)
+        )
+
+    try:
+        return node.BindNode(nodename).attr(attrname).plug()
+    except exception.MayaNodeError:
+        raise exception.MayaAttributeError(
+            "No such attribute '{}'".format(attribute)
+        )
+
+
+def _plugName(plug):
+    return attr.Attribute(plug).name()
+
+
+def _leafValue(plug, obj, api_type):
+    if api_type == OpenMaya.MFn.kNumericAttribute:
+        numeric_type = OpenMaya.MFnNumericAttribute(obj).numericType()
+        if numeric_type == OpenMaya.MFnNumericData.kBoolean:
+            return plug.asBool()
+        if numeric_type in _FLOAT_TYPES:
+            return plug.asDouble()
+        if numeric_type in _INT_TYPES:
+            return plug.asInt()
+
+    elif api_type in _LINEAR_TYPES:
+        return plug.asMDistance().asUnits(OpenMaya.MDistance.uiUnit())
+
+    elif api_type in _ANGLE_TYPES:
+        return plug.asMAngle().asUnits(OpenMaya.MAngle.uiUnit())
+
+    elif api_type == OpenMaya.MFn.kTimeAttribute:
+        return plug.asMTime().asUnits(OpenMaya.MTime.uiUnit())
+
+    elif api_type == OpenMaya.MFn.kEnumAttribute:
+        return plug.asShort()
+
+    elif api_type == OpenMaya.MFn.kTypedAttribute:
+        data_type = OpenMaya.MFnTypedAttribute(obj).attrType()
+        if data_type == OpenMaya.MFnData.kString:
+            return plug.asString()
+        if data_type == OpenMaya.MFnData.kMatrix:
+            data = OpenMaya.MFnMatrixData(plug.asMObject())
+            return datatypes.Matrix(data.matrix())
+
+    elif api_type in _MATRIX_TYPES:
+        data = OpenMaya.MFnMatrixData(plug.asMObject())
+        return datatypes.Matrix(data.matrix())
+
+    raise _Unsupported()
+
+
+def _getPlugValue(plug):
+    if plug.isArray:
+        raise _Unsupported()
+
+    obj = plug.attribute()
+    api_type = obj.apiType()
+    if api_type in _COMPOUND_NUMERIC_TYPES:
+        values = [
+            _getPlugValue(plug.child(i)) for i in range(plug.numChildren())
+        ]
+        if api_type in _VECTOR_TYPES:
+            return datatypes.Vector(values)
+        return tuple(values)
+
+    return _leafValue(plug, obj, api_type)
+
+
+def getAttrs(attributes):
+    """Get the values of many attributes
+
+    Args:
+        attributes (list): of attribute names, Attribute or MPlug
+
+    Returns:
+        list: the values, in the same order
+
+    Raises:
+        exception.MayaAttributeError: if an attribute doesn't exist
+    """
+    values = []
+    for attribute in attributes:
+        plug = toPlug(attribute)
+        try:
+            values.append(_getPlugValue(plug))
+        except _Unsupported:
+            values.append(cmd.getAttr(_plugName(plug)))
+
+    return values
+
+
+def _checkFreeToChange(plug):
+    if plug.isFreeToChange() != OpenMaya.MPlug.kFreeToChange:
+        raise exception.MayaAttributeError(
+            "The attribute '{}' is locked or connected and cannot be "
+            "modified.".format(_plugName(plug))
+        )
+
+
+def _setAttrCommand(plug, value):
+    kwargs = {}
+    api_type = plug.attribute().apiType()
+    if api_type in _MATRIX_TYPES or (
+        api_type == OpenMaya.MFn.kTypedAttribute
+        and OpenMaya.MFnTypedAttribute(plug.attribute()).attrType()
+        == OpenMaya.MFnData.kMatrix
+    ):
+        kwargs["type"] = "matrix"
+        value = list(_toMatrix(value))
+    cmd.setAttr(_plugName(plug), value, **kwargs)
+
+
+def _toMatrix(value):
+    if isinstance(value, OpenMaya.MMatrix):
+        return value
+    value = list(value)
+    if len(value) == 4:
+        value = [v for row in value for v in row]
+    return OpenMaya.MMatrix(value)
+
+
+def _setLeafValue(modifier, plug, obj, api_type, value):
+    if api_type == OpenMaya.MFn.kNumericAttribute:
+        numeric_type = OpenMaya.MFnNumericAttribute(obj).numericType()
+        if numeric_type == OpenMaya.MFnNumericData.kBoolean:
+            modifier.newPlugValueBool(plug, bool(value))
+            return
+        if numeric_type in _FLOAT_TYPES:
+            modifier.newPlugValueDouble(plug, float(value))
+            return
+        if numeric_type in _INT_TYPES:
+            modifier.newPlugValueInt(plug, int(value))
+            return
+
+    elif api_type in _LINEAR_TYPES:
+        modifier.newPlugValueMDistance(
+            plug, OpenMaya.MDistance(value, OpenMaya.MDistance.uiUnit())
+        )
+        return
+
+    elif api_type in _ANGLE_TYPES:
+        modifier.newPlugValueMAngle(
+            plug, OpenMaya.MAngle(value, OpenMaya.MAngle.uiUnit())
+        )
+        return
+
+    elif api_type == OpenMaya.MFn.kTimeAttribute:
+        modifier.newPlugValueMTime(
+            plug, OpenMaya.MTime(value, OpenMaya.MTime.uiUnit())
+        )
+        return
+
+    elif api_type == OpenMaya.MFn.kEnumAttribute:
+        if isinstance(value, str):
+            value = OpenMaya.MFnEnumAttribute(obj).fieldValue(value)
+        modifier.newPlugValueShort(plug, int(value))
+        return
+
+    elif api_type == OpenMaya.MFn.kTypedAttribute:
+        data_type = OpenMaya.MFnTypedAttribute(obj).attrType()
+        if data_type == OpenMaya.MFnData.kString:
+            modifier.newPlugValueString(plug, value)
+            return
+        if data_type == OpenMaya.MFnData.kMatrix:
+            data = OpenMaya.MFnMatrixData().create(_toMatrix(value))
+            modifier.newPlugValue(plug, data)
+            return
+
+    elif api_type in _MATRIX_TYPES:
+        data = OpenMaya.MFnMatrixData().create(_toMatrix(value))
+        modifier.newPlugValue(plug, data)
+        return
+
+    raise _Unsupported()
+
+
+def _setPlugValue(modifier, plug, value):
+    if plug.isArray:
+        raise _Unsupported()
+
+    obj = plug.attribute()
+    api_type = obj.apiType()
+    if api_type in _COMPOUND_NUMERIC_TYPES:
+        value = list(value)
+        if len(value) != plug.numChildren():
+            raise exception.MayaAttributeError(
+                "Expected {} values for '{}', got {}".format(
+                    plug.numChildren(), _plugName(plug), len(value)
+                )
+            )
+        for i, child_value in enumerate(value):
+            _setPlugValue(modifier, plug.child(i), child_value)
+        return
+
+    _setLeafValue(modifier, plug, obj, api_type, value)
+
+
+def setAttrs(values, undoable=True):
+    """Set the values of many attributes
+
+    With undoable False, all the values are written with a single
+    MDGModifier. The modifier is not registered in the undo queue, so this
+    is meant for batch processes like the rig build. With undoable True,
+    the default, the resolved plugs are set with one setAttr command each,
+    in a single undo chunk. This is about as slow as a setAttr loop.
+
+    Args:
+        values (dict or list): attribute as key and value as value, or a
+            list of (attribute, value) pairs. The attributes can be names,
+            Attribute or MPlug
+        undoable (bool, optional): register the changes in the undo queue
+
+    Raises:
+        exception.MayaAttributeError: if an attribute doesn't exist, is
+            locked or connected. Nothing is set in that case
+    """
+    if isinstance(values, dict):
+        values = values.items()
+    pairs = [(toPlug(a), v) for a, v in values]
+    for plug, _ in pairs:
+        _checkFreeToChange(plug)
+
+    if undoable:
+        with util.UndoChunk():
+            for plug, value in pairs:
+                _setAttrCommand(plug, value)
+        return
+
+    modifier = OpenMaya.MDGModifier()
+    fallback = []
+    for plug, value in pairs:
+        try:
+            _setPlugValue(modifier, plug, value)
+        except _Unsupported:
+            fallback.append((plug, value))
+    modifier.doIt()
+
+    for plug, value in fallback:
+        _setAttrCommand(plug, value)
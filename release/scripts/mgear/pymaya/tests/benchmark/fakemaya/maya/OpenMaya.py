@@ -0,0 +1,14 @@
+"""Stand-in of the Maya Python API 1.0.
+
+pymaya only uses API 1.0 for a few mesh queries, which are not modelled.
+The classes needed at import time are shared with the API 2.0 stand-in.
+"""
+from maya.api.OpenMaya import (  # noqa: F401
+    MDagPath,
+    MFn,
+    MFnSingleIndexedComponent,
+    MItMeshPolygon,
+    MSelectionList,
+    MSpace,
+    MVector,
+)
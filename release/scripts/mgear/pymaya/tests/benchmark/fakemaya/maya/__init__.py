@@ -0,0 +1,3 @@
+"""Minimal stand-in of the maya package, to run the pymaya benchmarks
+without Maya. See the benchmark run module.
+"""
@@ -0,0 +1,573 @@
+"""Commands of the Maya stand-in.
+
+maya.cmds only re-exports the names listed in __all__: pymaya wraps every
+callable of maya.cmds, so the helpers of this module must stay out of it.
+
+The flags follow the Maya commands, long and short names. Only the flags
+used by pymaya and the benchmarks are supported.
+"""
+import fnmatch
+import math
+
+from maya import _scene
+
+
+__all__ = [
+    "about",
+    "addAttr",
+    "allNodeTypes",
+    "attributeQuery",
+    "createNode",
+    "currentTime",
+    "delete",
+    "deleteAttr",
+    "file",
+    "getAttr",
+    "listAttr",
+    "listConnections",
+    "listHistory",
+    "listRelatives",
+    "ls",
+    "nodeType",
+    "objExists",
+    "parent",
+    "rename",
+    "select",
+    "setAttr",
+    "undoInfo",
+    "xform",
+]
+
+_SCENE = _scene.SCENE
+
+_TYPE_NAMES = {
+    "double": "double",
+    "distance": "doubleLinear",
+    "angle": "doubleAngle",
+    "bool": "bool",
+    "long": "long",
+    "enum": "enum",
+    "string": "string",
+    "matrix": "matrix",
+    "message": "message",
+}
+
+_ADD_ATTR_TYPES = {
+    "double": "double",
+    "float": "double",
+    "doubleLinear": "distance",
+    "doubleAngle": "angle",
+    "bool": "bool",
+    "long": "long",
+    "short": "long",
+    "byte": "long",
+    "enum": "enum",
+    "matrix": "matrix",
+    "message": "message",
+    "string": "string",
+}
+
+_CURRENT_TIME = [1.0]
+
+
+def _flag(kwargs, long_name, short_name, default=None):
+    if long_name in kwargs:
+        return kwargs[long_name]
+    return kwargs.get(short_name, default)
+
+
+def _flatten(args):
+    result = []
+    for arg in args:
+        if isinstance(arg, (list, tuple, set)):
+            result.extend(_flatten(arg))
+        else:
+            result.append(arg)
+    return result
+
+
+def _find(name):
+    try:
+        return _SCENE.find(name)
+    except KeyError:
+        raise ValueError("No object matches name: {}".format(name))
+
+
+def _find_plug(name):
+    try:
+        return _SCENE.find_plug(name)
+    except KeyError:
+        raise ValueError("No object matches name: {}".format(name))
+
+
+def _node_name(node, long_name=False):
+    return node.full_path() if long_name else node.partial_path()
+
+
+def _is_transform(node):
+    return "transform" in _scene.type_chain(node.type)
+
+
+# values --------------------------------------------------
+
+
+def _to_ui(d, value):
+    if d.kind == "angle":
+        return math.degrees(value)
+    if d.kind == "bool":
+        return bool(value)
+    if d.kind in ("long", "enum"):
+        return int(value)
+    if d.kind == "matrix":
+        return list(value)
+    if d.kind == "message":
+        return None
+    return value
+
+
+def _from_ui(d, value):
+    if d.kind == "angle":
+        return math.radians(value)
+    if d.kind == "bool":
+        return bool(value)
+    if d.kind == "enum" and isinstance(value, str):
+        return d.enum_names.index(value)
+    if d.kind in ("long", "enum"):
+        return int(value)
+    if d.kind == "matrix":
+        return tuple(float(v) for v in value)
+    if d.kind == "string":
+        return value
+    return float(value)
+
+
+def _plug_value(node, d, index):
+    if d.kind == "compound":
+        return [tuple(_to_ui(c, node.get_value(c)) for c in d.children)]
+    return _to_ui(d, node.get_value(d, index))
+
+
+def _check_settable(node, path, name):
+    d = path[-1][0]
+    names = [p.name for p, _ in path] + [c.name for c in d.children]
+    if any(n in node.locked for n in names):
+        raise RuntimeError(
+            "setAttr: The attribute '{}' is locked or connected and cannot "
+            "be modified.".format(name)
+        )
+    if d.computed:
+        raise RuntimeError(
+            "setAttr: The attribute '{}' is read only.".format(name)
+        )
+
+
+# nodes ---------------------------------------------------
+
+
+def createNode(node_type, name=None, n=None, parent=None, p=None,
+               skipSelect=False, ss=False):
+    name = name or n
+    parent = parent or p
+    parent_node = _find(parent) if parent else None
+    if (
+        parent_node is None
+        and node_type in _scene.NODE_TYPES
+        and "shape" in _scene.type_chain(node_type)
+    ):
+        # shapes are always created under a new transform
+        parent_node = _SCENE.create("transform", node_type + "1")
+    node = _SCENE.create(node_type, name, parent_node)
+    if not (skipSelect or ss):
+        _SCENE.selection = [node]
+    return _node_name(node)
+
+
+def rename(*args, **kwargs):
+    if len(args) == 1:
+        if not _SCENE.selection:
+            raise RuntimeError("rename: No object is selected")
+        node = _SCENE.selection[0]
+    else:
+        node = _find(args[0])
+    _SCENE.rename(node, args[-1])
+    return _node_name(node)
+
+
+def delete(*args, **kwargs):
+    names = _flatten(args) or [_node_name(n) for n in _SCENE.selection]
+    nodes = [_find(name) for name in names]
+    for node in nodes:
+        if node.alive:
+            _SCENE.delete(node)
+
+
+def objExists(name):
+    try:
+        if "." in name:
+            _SCENE.find_plug(name)
+        else:
+            _SCENE.find(name)
+    except (KeyError, ValueError):
+        return False
+    return True
+
+
+def nodeType(name, inherited=False, i=False, apiType=False, api=False):
+    node = _find(name.split(".")[0])
+    if inherited or i:
+        return [t for t in reversed(_scene.type_chain(node.type))
+                if t != "dependNode"]
+    return node.type
+
+
+def allNodeTypes(**kwargs):
+    return list(_scene.NODE_TYPES)
+
+
+def parent(*args, **kwargs):
+    names = _flatten(args) or [_node_name(n) for n in _SCENE.selection]
+    world = _flag(kwargs, "world", "w", False)
+    relative = _flag(kwargs, "relative", "r", False)
+    if world:
+        new_parent = None
+    else:
+        if len(names) < 2:
+            raise RuntimeError("parent: Not enough objects or values.")
+        new_parent = _find(names.pop())
+
+    result = []
+    for name in names:
+        node = _find(name)
+        world_matrix = node.world_matrix()
+        _SCENE.reparent(node, new_parent)
+        if not relative and _is_transform(node):
+            local = world_matrix
+            if new_parent is not None:
+                local = _scene.mult(
+                    world_matrix, _scene.inverse(new_parent.world_matrix())
+                )
+            node.set_local_matrix(local)
+        result.append(_node_name(node))
+    return result
+
+
+def select(*args, **kwargs):
+    if _flag(kwargs, "clear", "cl", False):
+        _SCENE.selection = []
+        return
+    nodes = [_find(name) for name in _flatten(args)]
+    if _flag(kwargs, "add", "add", False):
+        _SCENE.selection.extend(n for n in nodes
+                                if n not in _SCENE.selection)
+    elif _flag(kwargs, "deselect", "d", False):
+        _SCENE.selection = [n for n in _SCENE.selection if n not in nodes]
+    else:
+        _SCENE.selection = nodes
+
+
+def ls(*args, **kwargs):
+    long_name = _flag(kwargs, "long", "l", False)
+    node_type = _flag(kwargs, "type", "typ")
+    if _flag(kwargs, "selection", "sl", False):
+        nodes = list(_SCENE.selection)
+    elif not args:
+        nodes = list(_SCENE.nodes)
+    else:
+        nodes = []
+        for pattern in _flatten(args):
+            if "." in pattern:
+                if objExists(pattern):
+                    if not node_type:
+                        nodes.append(pattern)
+                continue
+            if any(c in pattern for c in "*?"):
+                nodes.extend(
+                    n for n in _SCENE.nodes
+                    if fnmatch.fnmatchcase(n.name, pattern)
+                )
+                continue
+            try:
+                nodes.append(_SCENE.find(pattern))
+            except (KeyError, ValueError):
+                pass
+
+    if node_type:
+        types = node_type if isinstance(node_type, list) else [node_type]
+        nodes = [
+            n for n in nodes
+            if set(types).intersection(_scene.type_chain(n.type))
+        ]
+    if _flag(kwargs, "dag", "dag", False):
+        nodes = [n for n in nodes if n.is_dag]
+    if _flag(kwargs, "transforms", "tr", False):
+        nodes = [n for n in nodes if _is_transform(n)]
+
+    return [
+        n if isinstance(n, str) else _node_name(n, long_name) for n in nodes
+    ]
+
+
+def listRelatives(*args, **kwargs):
+    names = _flatten(args) or [_node_name(n) for n in _SCENE.selection]
+    long_name = _flag(kwargs, "fullPath", "f", False) or _flag(
+        kwargs, "path", "pa", False
+    )
+    shapes = _flag(kwargs, "shapes", "s", False)
+    node_type = _flag(kwargs, "type", "typ")
+    result = []
+    for name in names:
+        node = _find(name)
+        if _flag(kwargs, "parent", "p", False):
+            relatives = [node.parent] if node.parent else []
+        elif _flag(kwargs, "allDescendents", "ad", False):
+            relatives = []
+            stack = list(node.children)
+            while stack:
+                child = stack.pop()
+                relatives.append(child)
+                stack.extend(child.children)
+        else:
+            relatives = list(node.children)
+        for relative in relatives:
+            chain = _scene.type_chain(relative.type)
+            if shapes and "shape" not in chain:
+                continue
+            if node_type and node_type not in chain:
+                continue
+            result.append(_node_name(relative, long_name))
+    return result or None
+
+
+def listConnections(*args, **kwargs):
+    return None
+
+
+def listHistory(*args, **kwargs):
+    return [_node_name(_find(name)) for name in _flatten(args)]
+
+
+# attributes ----------------------------------------------
+
+
+def getAttr(name, type=False, typ=False, **kwargs):
+    node, path = _find_plug(name)
+    d, index = path[-1]
+    if type or typ:
+        if d.kind == "compound":
+            return "double{}".format(len(d.children))
+        return _TYPE_NAMES[d.kind]
+    return _plug_value(node, d, index)
+
+
+def setAttr(name, *values, **kwargs):
+    node, path = _find_plug(name)
+    d = path[-1][0]
+
+    lock = _flag(kwargs, "lock", "l")
+    if lock is not None:
+        if lock:
+            node.locked.add(d.name)
+        else:
+            node.locked.discard(d.name)
+    if not values:
+        return
+
+    _check_settable(node, path, name)
+    values = _flatten(values)
+    if d.kind == "compound":
+        if len(values) != len(d.children):
+            raise RuntimeError(
+                "setAttr: Wrong number of values for '{}'".format(name)
+            )
+        for child, value in zip(d.children, values):
+            node.values[child.name] = _from_ui(child, value)
+        _SCENE.dirty(node)
+    elif d.kind == "matrix":
+        node.set_value(d, _from_ui(d, values))
+    else:
+        node.set_value(d, _from_ui(d, values[0]))
+    _SCENE.undo_count += 1
+
+
+def addAttr(*args, **kwargs):
+    names = _flatten(args) or [_node_name(n) for n in _SCENE.selection]
+    long_name = _flag(kwargs, "longName", "ln")
+    short_name = _flag(kwargs, "shortName", "sn", long_name)
+    attr_type = _flag(kwargs, "attributeType", "at")
+    data_type = _flag(kwargs, "dataType", "dt")
+    kind = _ADD_ATTR_TYPES.get(attr_type or data_type or "double")
+    if kind is None:
+        raise RuntimeError(
+            "addAttr: Unsupported type '{}'".format(attr_type or data_type)
+        )
+
+    default = _flag(kwargs, "defaultValue", "dv", 0.0)
+    enum_names = _flag(kwargs, "enumName", "en", "")
+    if kind == "matrix":
+        default = _scene.IDENTITY
+    elif kind == "string":
+        default = None
+    elif kind != "message":
+        default = _from_ui(_scene.AttrDef("", "", kind), default)
+
+    for name in names:
+        node = _find(name)
+        if node.attr_def(long_name) is not None:
+            raise RuntimeError(
+                "addAttr: Found an attribute named '{}'".format(long_name)
+            )
+        d = _scene.AttrDef(
+            long_name,
+            short_name,
+            kind,
+            default,
+            dynamic=True,
+            enum_names=[e.split("=")[0] for e in enum_names.split(":") if e],
+        )
+        node.dynamic[long_name] = d
+        node.dynamic[short_name] = d
+
+
+def deleteAttr(*args, **kwargs):
+    name = args[0]
+    attr_name = _flag(kwargs, "attribute", "at")
+    if attr_name:
+        name = "{}.{}".format(name, attr_name)
+    node, path = _find_plug(name)
+    d = path[-1][0]
+    if not d.dynamic:
+        raise RuntimeError(
+            "deleteAttr: Cannot delete static attribute '{}'".format(name)
+        )
+    node.dynamic.pop(d.name, None)
+    node.dynamic.pop(d.short, None)
+    node.values.pop(d.name, None)
+    node.locked.discard(d.name)
+    d.alive = False
+
+
+def attributeQuery(attr_name, node=None, n=None, **kwargs):
+    node = _find(node or n)
+    d = node.attr_def(attr_name)
+    if _flag(kwargs, "exists", "ex", False):
+        return d is not None
+    if d is None:
+        raise RuntimeError(
+            "attributeQuery: No attribute named '{}'".format(attr_name)
+        )
+    if _flag(kwargs, "listEnum", "le", False):
+        return [":".join(d.enum_names)]
+    if _flag(kwargs, "keyable", "k", False):
+        return d.kind not in ("matrix", "message", "string")
+    if _flag(kwargs, "listChildren", "lc", False):
+        return [c.name for c in d.children] or None
+    raise RuntimeError("attributeQuery: Unsupported flags")
+
+
+def listAttr(*args, **kwargs):
+    names = _flatten(args) or [_node_name(n) for n in _SCENE.selection]
+    keyable = _flag(kwargs, "keyable", "k", False)
+    user_defined = _flag(kwargs, "userDefined", "ud", False)
+    short = _flag(kwargs, "shortNames", "sn", False)
+    result = []
+    for name in names:
+        node = _find(name)
+        for d in node.attr_names():
+            if user_defined and not d.dynamic:
+                continue
+            if keyable and (
+                d.computed
+                or d.kind in ("matrix", "message", "string", "compound")
+            ):
+                continue
+            result.append(d.short if short else d.name)
+    return result or None
+
+
+# transforms ----------------------------------------------
+
+
+def xform(*args, **kwargs):
+    names = _flatten(args) or [_node_name(n) for n in _SCENE.selection]
+    node = _find(names[0])
+    query = _flag(kwargs, "query", "q", False)
+    world = _flag(kwargs, "worldSpace", "ws", False)
+    matrix = _flag(kwargs, "matrix", "m")
+    translation = _flag(kwargs, "translation", "t")
+    rotation = _flag(kwargs, "rotation", "ro")
+    scale = _flag(kwargs, "scale", "s")
+
+    if query:
+        if matrix:
+            return list(node.world_matrix() if world
+                        else node.local_matrix())
+        if translation:
+            if world:
+                return list(node.world_matrix()[12:15])
+            return node.channels("translate")
+        if rotation:
+            return [math.degrees(v) for v in node.channels("rotate")]
+        if scale:
+            return node.channels("scale")
+        raise RuntimeError("xform: Unsupported query")
+
+    for name in names:
+        node = _find(name)
+        if matrix is not None:
+            local = tuple(float(v) for v in _flatten([matrix]))
+            if world and node.parent is not None:
+                local = _scene.mult(
+                    local, _scene.inverse(node.parent.world_matrix())
+                )
+            node.set_local_matrix(local)
+        if translation is not None:
+            values = list(translation)
+            if world and node.parent is not None:
+                parent_inverse = _scene.inverse(node.parent.world_matrix())
+                point = _scene.IDENTITY[:12] + tuple(values) + (1.0,)
+                values = _scene.mult(point, parent_inverse)[12:15]
+            for axis, value in zip("XYZ", values):
+                node.values["translate" + axis] = float(value)
+        if rotation is not None:
+            for axis, value in zip("XYZ", rotation):
+                node.values["rotate" + axis] = math.radians(value)
+        if scale is not None:
+            for axis, value in zip("XYZ", scale):
+                node.values["scale" + axis] = float(value)
+        _SCENE.dirty(node)
+
+
+# scene ---------------------------------------------------
+
+
+def file(*args, **kwargs):
+    if _flag(kwargs, "new", "new", False):
+        _SCENE.clear()
+        return "untitled"
+    if _flag(kwargs, "query", "q", False) and _flag(
+        kwargs, "sceneName", "sn", False
+    ):
+        return ""
+    raise RuntimeError("file: Only new scenes are supported")
+
+
+def undoInfo(**kwargs):
+    if _flag(kwargs, "query", "q", False):
+        return _SCENE.undo_state
+    state = _flag(kwargs, "state", "st")
+    if state is not None:
+        _SCENE.undo_state = bool(state)
+
+
+def currentTime(*args, **kwargs):
+    if args:
+        _CURRENT_TIME[0] = float(args[0])
+    return _CURRENT_TIME[0]
+
+
+def about(**kwargs):
+    if _flag(kwargs, "apiVersion", "api", False):
+        return 20240000
+    if _flag(kwargs, "batch", "b", False):
+        return True
+    return "2024"
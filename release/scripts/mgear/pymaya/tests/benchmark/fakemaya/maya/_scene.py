@@ -0,0 +1,567 @@
+"""In memory scene of the Maya stand-in.
+
+Only the data needed by the pymaya benchmarks is modelled: dependency and
+DAG nodes, static and dynamic attributes, transform evaluation and a few
+callbacks. Lookups use dictionaries, so the cost measured by the benchmarks
+stays in the code calling the stand-in.
+"""
+import math
+import re
+
+
+RE_INDEX = re.compile(r"^(\w+)\[(\d+)\]$")
+
+# node type: (parent type, is dag)
+NODE_TYPES = {
+    "dependNode": (None, False),
+    "network": ("dependNode", False),
+    "unknown": ("dependNode", False),
+    "multiplyDivide": ("dependNode", False),
+    "dagNode": ("dependNode", True),
+    "transform": ("dagNode", True),
+    "joint": ("transform", True),
+    "shape": ("dagNode", True),
+    "locator": ("shape", True),
+    "mesh": ("shape", True),
+    "nurbsCurve": ("shape", True),
+}
+
+ROTATE_ORDERS = ("xyz", "yzx", "zxy", "xzy", "yxz", "zyx")
+
+
+##########################################################
+# MATRIX
+##########################################################
+
+IDENTITY = (1.0, 0.0, 0.0, 0.0,
+            0.0, 1.0, 0.0, 0.0,
+            0.0, 0.0, 1.0, 0.0,
+            0.0, 0.0, 0.0, 1.0)
+
+
+def mult(a, b):
+    """Row major 4x4 product of two flat matrices."""
+    return tuple(
+        a[r * 4] * b[c]
+        + a[r * 4 + 1] * b[4 + c]
+        + a[r * 4 + 2] * b[8 + c]
+        + a[r * 4 + 3] * b[12 + c]
+        for r in range(4)
+        for c in range(4)
+    )
+
+
+def inverse(m):
+    """Inverse of a flat 4x4 matrix, Gauss-Jordan elimination."""
+    a = [list(m[r * 4:r * 4 + 4]) + [1.0 if r == c else 0.0
+                                      for c in range(4)]
+         for r in range(4)]
+    for col in range(4):
+        pivot = max(range(col, 4), key=lambda r: abs(a[r][col]))
+        if abs(a[pivot][col]) < 1e-12:
+            raise ValueError("Singular matrix")
+        a[col], a[pivot] = a[pivot], a[col]
+        p = a[col][col]
+        a[col] = [v / p for v in a[col]]
+        for r in range(4):
+            if r != col:
+                f = a[r][col]
+                a[r] = [v - f * w for v, w in zip(a[r], a[col])]
+    return tuple(v for row in a for v in row[4:])
+
+
+def axis_rotation(axis, angle):
+    c = math.cos(angle)
+    s = math.sin(angle)
+    if axis == "x":
+        return (1.0, 0.0, 0.0, 0.0, 0.0, c, s, 0.0,
+                0.0, -s, c, 0.0, 0.0, 0.0, 0.0, 1.0)
+    if axis == "y":
+        return (c, 0.0, -s, 0.0, 0.0, 1.0, 0.0, 0.0,
+                s, 0.0, c, 0.0, 0.0, 0.0, 0.0, 1.0)
+    return (c, s, 0.0, 0.0, -s, c, 0.0, 0.0,
+            0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+
+
+def euler_matrix(rotation, order=0):
+    """Rotation matrix of radian euler angles."""
+    m = IDENTITY
+    for axis in ROTATE_ORDERS[order]:
+        m = mult(m, axis_rotation(axis, rotation["xyz".index(axis)]))
+    return m
+
+
+def matrix_euler(m):
+    """XYZ radian euler angles of a rotation matrix without scale."""
+    sy = max(-1.0, min(1.0, -m[2]))
+    y = math.asin(sy)
+    if abs(math.cos(y)) > 1e-9:
+        x = math.atan2(m[6], m[10])
+        z = math.atan2(m[1], m[0])
+    else:
+        x = math.atan2(-m[9], m[5])
+        z = 0.0
+    return [x, y, z]
+
+
+def compose(translate, rotate, scale, order=0, orient=None):
+    """Local matrix of the transform channels. Angles in radians."""
+    m = (scale[0], 0.0, 0.0, 0.0, 0.0, scale[1], 0.0, 0.0,
+         0.0, 0.0, scale[2], 0.0, 0.0, 0.0, 0.0, 1.0)
+    m = mult(m, euler_matrix(rotate, order))
+    if orient is not None:
+        m = mult(m, euler_matrix(orient))
+    m = list(m)
+    m[12:15] = translate
+    return tuple(m)
+
+
+def decompose(m):
+    """Translate, XYZ radian rotate and scale of a matrix without shear."""
+    rows = [m[0:3], m[4:7], m[8:11]]
+    scale = [math.sqrt(sum(v * v for v in row)) for row in rows]
+    rot = []
+    for row, s in zip(rows, scale):
+        rot.extend([v / s if s else 0.0 for v in row] + [0.0])
+    rot.extend([0.0, 0.0, 0.0, 1.0])
+    return list(m[12:15]), matrix_euler(rot), scale
+
+
+##########################################################
+# ATTRIBUTES
+##########################################################
+
+
+class AttrDef(object):
+    """Attribute definition.
+
+    Attributes:
+        name (str): long name
+        short (str): short name
+        kind (str): double, distance, angle, bool, long, enum, string,
+            matrix, message or compound
+        children (list): child definitions of compound attributes
+        parent (AttrDef): compound parent
+        default (variant): default value
+        array (bool): multi attribute
+        computed (bool): value computed from the node
+        dynamic (bool): added with addAttr
+        enum_names (list): enum field names
+    """
+
+    def __init__(
+        self,
+        name,
+        short,
+        kind,
+        default=0.0,
+        children=None,
+        array=False,
+        computed=False,
+        dynamic=False,
+        enum_names=None,
+    ):
+        self.name = name
+        self.short = short
+        self.kind = kind
+        self.default = default
+        self.children = children or []
+        self.parent = None
+        self.array = array
+        self.computed = computed
+        self.dynamic = dynamic
+        self.enum_names = enum_names or []
+        self.alive = True
+        for c in self.children:
+            c.parent = self
+
+
+def _vector(name, short, kind, default=0.0):
+    return AttrDef(
+        name,
+        short,
+        "compound",
+        children=[
+            AttrDef(name + a.upper(), short + a, kind, default)
+            for a in "xyz"
+        ],
+    )
+
+
+def _base_attrs():
+    return [
+        AttrDef("message", "msg", "message"),
+        AttrDef("caching", "cch", "bool", False),
+        AttrDef("isHistoricallyInteresting", "ihi", "long", 2),
+        AttrDef("nodeState", "nds", "enum", 0,
+                enum_names=["Normal", "HasNoEffect", "Blocking"]),
+    ]
+
+
+def _dag_attrs():
+    return [
+        AttrDef("visibility", "v", "bool", True),
+        AttrDef("intermediateObject", "io", "bool", False),
+        AttrDef("template", "tmp", "bool", False),
+        AttrDef("matrix", "m", "matrix", computed=True),
+        AttrDef("inverseMatrix", "im", "matrix", computed=True),
+        AttrDef("worldMatrix", "wm", "matrix", array=True, computed=True),
+        AttrDef("worldInverseMatrix", "wim", "matrix", array=True,
+                computed=True),
+        AttrDef("parentMatrix", "pm", "matrix", array=True, computed=True),
+    ]
+
+
+def _transform_attrs():
+    return [
+        _vector("translate", "t", "distance"),
+        _vector("rotate", "r", "angle"),
+        _vector("scale", "s", "double", 1.0),
+        _vector("shear", "sh", "double"),
+        _vector("rotatePivot", "rp", "distance"),
+        _vector("scalePivot", "sp", "distance"),
+        AttrDef("rotateOrder", "ro", "enum", 0,
+                enum_names=["xyz", "yzx", "zxy", "xzy", "yxz", "zyx"]),
+        AttrDef("inheritsTransform", "it", "bool", True),
+        AttrDef("displayHandle", "dh", "bool", False),
+        AttrDef("displayLocalAxis", "dla", "bool", False),
+    ]
+
+
+def _joint_attrs():
+    return [
+        _vector("jointOrient", "jo", "angle"),
+        AttrDef("radius", "radi", "double", 1.0),
+        AttrDef("segmentScaleCompensate", "ssc", "bool", True),
+        AttrDef("drawStyle", "ds", "enum", 0,
+                enum_names=["Bone", "Multi-child as Box", "None"]),
+    ]
+
+
+def _multiply_divide_attrs():
+    return [
+        _vector("input1", "i1", "double"),
+        _vector("input2", "i2", "double", 1.0),
+        _vector("output", "o", "double"),
+        AttrDef("operation", "op", "enum", 1,
+                enum_names=["No operation", "Multiply", "Divide", "Power"]),
+    ]
+
+
+_TYPE_ATTRS = {
+    "dependNode": _base_attrs,
+    "dagNode": _dag_attrs,
+    "transform": _transform_attrs,
+    "joint": _joint_attrs,
+    "multiplyDivide": _multiply_divide_attrs,
+}
+
+try:
+    _TYPE_DEFS
+except NameError:
+    _TYPE_DEFS = {}
+
+
+def type_chain(node_type):
+    chain = []
+    while node_type:
+        chain.append(node_type)
+        node_type = NODE_TYPES[node_type][0]
+    return chain
+
+
+def type_attr_defs(node_type):
+    """Static attribute definitions of a node type, by long and short name.
+
+    The definitions are shared by all the nodes of the same type, like the
+    attribute MObjects in Maya.
+    """
+    defs = _TYPE_DEFS.get(node_type)
+    if defs is None:
+        defs = {}
+        for t in reversed(type_chain(node_type)):
+            for a in _TYPE_ATTRS.get(t, list)():
+                for d in [a] + a.children:
+                    defs[d.name] = d
+                    defs[d.short] = d
+        _TYPE_DEFS[node_type] = defs
+    return defs
+
+
+##########################################################
+# NODES
+##########################################################
+
+
+class Node(object):
+    """Scene node."""
+
+    def __init__(self, scene, node_type, name):
+        self.scene = scene
+        self.type = node_type
+        self.name = name
+        self.parent = None
+        self.children = []
+        self.values = {}
+        self.locked = set()
+        self.dynamic = {}
+        self.alive = True
+        self.is_dag = NODE_TYPES[node_type][1]
+        self.static = type_attr_defs(node_type)
+
+    # attributes --------------------------------------------
+
+    def attr_def(self, name):
+        d = self.static.get(name)
+        if d is None:
+            d = self.dynamic.get(name)
+        return d
+
+    def attr_names(self):
+        seen = []
+        for d in list(self.static.values()) + list(self.dynamic.values()):
+            if d not in seen:
+                seen.append(d)
+        return seen
+
+    def get_value(self, d, index=None):
+        """Internal value of a leaf attribute. Angles in radians."""
+        if d.computed:
+            return self.computed_value(d)
+        return self.values.get(d.name, d.default)
+
+    def set_value(self, d, value):
+        self.values[d.name] = value
+        self.scene.dirty(self)
+
+    def computed_value(self, d):
+        if d.name == "matrix":
+            return self.local_matrix()
+        if d.name == "inverseMatrix":
+            return inverse(self.local_matrix())
+        if d.name == "worldMatrix":
+            return self.world_matrix()
+        if d.name == "worldInverseMatrix":
+            return inverse(self.world_matrix())
+        if d.name == "parentMatrix":
+            return self.parent.world_matrix() if self.parent else IDENTITY
+        return d.default
+
+    # transforms --------------------------------------------
+
+    def channels(self, name):
+        return [self.values.get(name + a, 1.0 if name == "scale" else 0.0)
+                for a in "XYZ"]
+
+    def local_matrix(self):
+        if "transform" not in type_chain(self.type):
+            return IDENTITY
+        orient = None
+        if self.type == "joint":
+            orient = self.channels("jointOrient")
+        return compose(
+            self.channels("translate"),
+            self.channels("rotate"),
+            self.channels("scale"),
+            int(self.values.get("rotateOrder", 0)),
+            orient,
+        )
+
+    def world_matrix(self):
+        cache = self.scene.world_cache
+        m = cache.get(id(self))
+        if m is None:
+            m = self.local_matrix()
+            if self.parent is not None:
+                m = mult(m, self.parent.world_matrix())
+            cache[id(self)] = m
+        return m
+
+    def set_local_matrix(self, m):
+        translate, rotate, scale = decompose(m)
+        if self.type == "joint":
+            orient = euler_matrix(self.channels("jointOrient"))
+            rot_only = list(m)
+            rot_only[12:15] = [0.0, 0.0, 0.0]
+            rows = []
+            for r, s in zip(range(3), scale):
+                rows.extend([v / s if s else 0.0
+                             for v in rot_only[r * 4:r * 4 + 3]] + [0.0])
+            rows.extend([0.0, 0.0, 0.0, 1.0])
+            rotate = matrix_euler(mult(tuple(rows), inverse(orient)))
+        for name, values in (
+            ("translate", translate),
+            ("rotate", rotate),
+            ("scale", scale),
+        ):
+            for a, v in zip("XYZ", values):
+                self.values[name + a] = v
+        self.scene.dirty(self)
+
+    # names -------------------------------------------------
+
+    def full_path(self):
+        if not self.is_dag:
+            return self.name
+        path = []
+        node = self
+        while node is not None:
+            path.append(node.name)
+            node = node.parent
+        return "|" + "|".join(reversed(path))
+
+    def partial_path(self):
+        if not self.is_dag:
+            return self.name
+        if len(self.scene.by_name.get(self.name, ())) == 1:
+            return self.name
+        return self.full_path()[1:]
+
+
+class Scene(object):
+    """The nodes of the stand-in scene."""
+
+    def __init__(self):
+        self.nodes = []
+        self.by_name = {}
+        self.selection = []
+        self.world_cache = {}
+        self.node_removed_callbacks = {}
+        self.scene_callbacks = {}
+        self.undo_state = True
+        self.undo_count = 0
+        self.next_callback = 1
+
+    def dirty(self, node=None):
+        """Invalidate the world matrices of a node and its descendants, or
+        of all the nodes.
+
+        The world matrix of a node is only cached after the one of its
+        parent, so the descendants of a node without cached matrix don't
+        have one either.
+        """
+        if node is None:
+            self.world_cache.clear()
+            return
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            if self.world_cache.pop(id(n), None) is not None:
+                stack.extend(n.children)
+
+    def unique_name(self, name):
+        if name not in self.by_name:
+            return name
+        base = name.rstrip("0123456789") or name
+        i = 1
+        while "{}{}".format(base, i) in self.by_name:
+            i += 1
+        return "{}{}".format(base, i)
+
+    def create(self, node_type, name=None, parent=None):
+        if node_type not in NODE_TYPES:
+            raise RuntimeError("Unknown object type: {}".format(node_type))
+        name = self.unique_name(name or node_type + "1")
+        node = Node(self, node_type, name)
+        self.nodes.append(node)
+        self.by_name.setdefault(name, []).append(node)
+        if parent is not None:
+            self.reparent(node, parent)
+        self.undo_count += 1
+        return node
+
+    def reparent(self, node, parent):
+        self.dirty(node)
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        node.parent = parent
+        if parent is not None:
+            parent.children.append(node)
+
+    def rename(self, node, name):
+        self.by_name[node.name].remove(node)
+        if not self.by_name[node.name]:
+            del self.by_name[node.name]
+        node.name = self.unique_name(name)
+        self.by_name.setdefault(node.name, []).append(node)
+        return node.name
+
+    def delete(self, node):
+        self.dirty(node)
+        for child in list(node.children):
+            self.delete(child)
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        self.nodes.remove(node)
+        self.by_name[node.name].remove(node)
+        if not self.by_name[node.name]:
+            del self.by_name[node.name]
+        if node in self.selection:
+            self.selection.remove(node)
+        for callback in list(self.node_removed_callbacks.values()):
+            callback(node)
+        node.alive = False
+
+    def clear(self):
+        for callback in list(self.scene_callbacks.values()):
+            callback()
+        for node in self.nodes:
+            node.alive = False
+        self.nodes = []
+        self.by_name = {}
+        self.selection = []
+        self.dirty()
+
+    def find(self, name):
+        """Find a node by short name, partial or full path.
+
+        Raises:
+            KeyError: if the node doesn't exist
+            ValueError: if more than one node matches the name
+        """
+        short = name.rsplit("|", 1)[-1]
+        candidates = self.by_name.get(short)
+        if not candidates:
+            raise KeyError(name)
+        if "|" in name:
+            full = name if name.startswith("|") else "|" + name
+            candidates = [
+                n for n in candidates
+                if n.full_path() == full
+                or (not name.startswith("|")
+                    and n.full_path().endswith("|" + name))
+            ]
+            if not candidates:
+                raise KeyError(name)
+        if len(candidates) > 1:
+            raise ValueError("More than one object matches name: " + name)
+        return candidates[0]
+
+    def find_plug(self, name):
+        """Find the node and attribute path of a plug name.
+
+        Returns:
+            tuple: node and list of (AttrDef, index) from the root attribute
+
+        Raises:
+            KeyError: if the node or attribute doesn't exist
+        """
+        node_name, _, attr_path = name.partition(".")
+        node = self.find(node_name)
+        path = []
+        for part in attr_path.split("."):
+            index = None
+            match = RE_INDEX.match(part)
+            if match:
+                part, index = match.group(1), int(match.group(2))
+            d = node.attr_def(part)
+            if d is None:
+                raise KeyError(name)
+            path.append((d, index))
+        return node, path
+
+
+try:
+    SCENE
+except NameError:
+    SCENE = Scene()
@@ -0,0 +1,1794 @@
+"""Stand-in of maya.api.OpenMaya for the pymaya benchmarks.
+
+The classes and methods used by pymaya are implemented on top of the in
+memory scene, with the same signatures as the Maya Python API 2.0. The math
+classes expose the usual public methods, so the pymaya datatypes wrappers
+do the same amount of work per instance than with Maya.
+"""
+import math
+
+from maya import _scene
+
+
+_SCENE = _scene.SCENE
+
+
+class MFn(object):
+    kInvalid = 0
+    kBase = 1
+    kDependencyNode = 4
+    kDagNode = 107
+    kTransform = 110
+    kJoint = 121
+    kShape = 248
+    kGeometric = 265
+    kLocator = 281
+    kMesh = 296
+    kNurbsCurve = 267
+    kMultiplyDivide = 444
+    kComponent = 524
+    kMeshVertComponent = 31
+    kMeshEdgeComponent = 32
+    kMeshPolygonComponent = 33
+    kCurveCVComponent = 28
+    kAttribute = 554
+    kNumericAttribute = 566
+    kCompoundAttribute = 571
+    kDoubleLinearAttribute = 558
+    kFloatLinearAttribute = 559
+    kDoubleAngleAttribute = 556
+    kFloatAngleAttribute = 557
+    kTimeAttribute = 563
+    kEnumAttribute = 581
+    kTypedAttribute = 582
+    kMatrixAttribute = 584
+    kFloatMatrixAttribute = 585
+    kMessageAttribute = 586
+    kAttribute2Double = 735
+    kAttribute2Float = 736
+    kAttribute2Short = 737
+    kAttribute2Int = 738
+    kAttribute3Double = 739
+    kAttribute3Float = 740
+    kAttribute3Short = 741
+    kAttribute3Int = 742
+    kAttribute4Double = 743
+    kBlendShape = 336
+    kSkinClusterFilter = 682
+
+
+_NODE_FN = {
+    "dependNode": MFn.kDependencyNode,
+    "dagNode": MFn.kDagNode,
+    "transform": MFn.kTransform,
+    "joint": MFn.kJoint,
+    "shape": MFn.kShape,
+    "locator": MFn.kLocator,
+    "mesh": MFn.kMesh,
+    "nurbsCurve": MFn.kNurbsCurve,
+    "multiplyDivide": MFn.kMultiplyDivide,
+}
+
+_ATTR_FN = {
+    "double": MFn.kNumericAttribute,
+    "bool": MFn.kNumericAttribute,
+    "long": MFn.kNumericAttribute,
+    "distance": MFn.kDoubleLinearAttribute,
+    "angle": MFn.kDoubleAngleAttribute,
+    "enum": MFn.kEnumAttribute,
+    "string": MFn.kTypedAttribute,
+    "matrix": MFn.kMatrixAttribute,
+    "message": MFn.kMessageAttribute,
+}
+
+
+def _node_fn_types(node):
+    types = set(_NODE_FN[t] for t in _scene.type_chain(node.type)
+                if t in _NODE_FN)
+    if MFn.kShape in types:
+        types.add(MFn.kGeometric)
+    return types
+
+
+def _attr_api_type(d):
+    if d.kind == "compound":
+        if len(d.children) == 3 and all(
+            c.kind in ("double", "distance", "angle") for c in d.children
+        ):
+            return MFn.kAttribute3Double
+        return MFn.kCompoundAttribute
+    return _ATTR_FN[d.kind]
+
+
+##########################################################
+# OBJECTS
+##########################################################
+
+
+class MObject(object):
+    def __init__(self, target=None):
+        self._target = target
+
+    def isNull(self):
+        return self._target is None or not getattr(
+            self._target, "alive", True
+        )
+
+    def apiType(self):
+        t = self._target
+        if t is None:
+            return MFn.kInvalid
+        if isinstance(t, _scene.Node):
+            return _NODE_FN.get(t.type, MFn.kDependencyNode)
+        if isinstance(t, _scene.AttrDef):
+            return _attr_api_type(t)
+        return MFn.kBase
+
+    def hasFn(self, fn):
+        t = self._target
+        if isinstance(t, _scene.Node):
+            return fn in _node_fn_types(t)
+        if isinstance(t, _scene.AttrDef):
+            api_type = _attr_api_type(t)
+            if fn in (api_type, MFn.kAttribute):
+                return True
+            if fn == MFn.kCompoundAttribute:
+                return t.kind == "compound"
+            if fn == MFn.kNumericAttribute:
+                return api_type == MFn.kNumericAttribute
+        return False
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, MObject) and self._target is other._target
+        )
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+
+MObject.kNullObj = MObject()
+
+
+class MObjectHandle(object):
+    def __init__(self, obj=None):
+        self._obj = obj if obj is not None else MObject()
+
+    def hashCode(self):
+        return id(self._obj._target)
+
+    def isValid(self):
+        return not self._obj.isNull()
+
+    def isAlive(self):
+        return not self._obj.isNull()
+
+    def object(self):
+        return self._obj
+
+
+class MDagPath(object):
+    def __init__(self, node=None):
+        self._node = node
+
+    @staticmethod
+    def getAPathTo(obj):
+        return MDagPath(obj._target)
+
+    def node(self):
+        return MObject(self._node)
+
+    def transform(self):
+        node = self._node
+        if node.type not in ("transform", "joint") and node.parent:
+            node = node.parent
+        return MObject(node)
+
+    def fullPathName(self):
+        return self._node.full_path()
+
+    def partialPathName(self):
+        return self._node.partial_path()
+
+    def instanceNumber(self):
+        return 0
+
+    def isValid(self):
+        return self._node is not None and self._node.alive
+
+    def isInstanced(self):
+        return False
+
+    def inclusiveMatrix(self):
+        return MMatrix(self._node.world_matrix())
+
+    def exclusiveMatrix(self):
+        parent = self._node.parent
+        return MMatrix(parent.world_matrix() if parent else _scene.IDENTITY)
+
+    def inclusiveMatrixInverse(self):
+        return self.inclusiveMatrix().inverse()
+
+    def length(self):
+        return self._node.full_path().count("|")
+
+
+class MSelectionList(object):
+    def __init__(self, other=None):
+        self._items = list(other._items) if other else []
+
+    def add(self, item):
+        if isinstance(item, MObject):
+            self._items.append((item._target, None))
+            return self
+        if isinstance(item, MDagPath):
+            self._items.append((item._node, None))
+            return self
+        if isinstance(item, MPlug):
+            self._items.append((item._node, item._path))
+            return self
+        try:
+            if "." in item:
+                node, path = _SCENE.find_plug(item)
+                self._items.append((node, path))
+            else:
+                self._items.append((_SCENE.find(item), None))
+        except KeyError:
+            raise RuntimeError("(kInvalidParameter): Object does not exist")
+        except ValueError as e:
+            raise RuntimeError("(kInvalidParameter): " + str(e))
+        return self
+
+    def clear(self):
+        self._items = []
+        return self
+
+    def length(self):
+        return len(self._items)
+
+    def isEmpty(self):
+        return not self._items
+
+    def getDependNode(self, index):
+        return MObject(self._items[index][0])
+
+    def getDagPath(self, index):
+        node = self._items[index][0]
+        if not node.is_dag:
+            raise TypeError("Not a DAG node")
+        return MDagPath(node)
+
+    def getPlug(self, index):
+        node, path = self._items[index]
+        if not path:
+            raise TypeError("Not a plug")
+        return MPlug(node, path)
+
+    def getComponent(self, index):
+        return (self.getDagPath(index), MObject())
+
+    def getSelectionStrings(self, index=None):
+        items = self._items if index is None else [self._items[index]]
+        return [MPlug(n, p).name() if p else n.partial_path()
+                for n, p in items]
+
+
+##########################################################
+# FUNCTION SETS
+##########################################################
+
+
+class MFnBase(object):
+    def __init__(self, obj=None):
+        self._obj = obj if obj is not None else MObject()
+
+    def object(self):
+        return self._obj
+
+    def hasObj(self, obj):
+        return True
+
+
+class MFnDependencyNode(MFnBase):
+    def __init__(self, obj=None):
+        if isinstance(obj, MDagPath):
+            obj = obj.node()
+        super(MFnDependencyNode, self).__init__(obj)
+        self._node = self._obj._target
+
+    def name(self):
+        return self._node.name
+
+    def setName(self, name):
+        return _SCENE.rename(self._node, name)
+
+    @property
+    def typeName(self):
+        return self._node.type
+
+    @property
+    def isShared(self):
+        return False
+
+    @property
+    def isFromReferencedFile(self):
+        return False
+
+    @property
+    def namespace(self):
+        return ":".join(self._node.name.split(":")[:-1])
+
+    def hasAttribute(self, name):
+        return self._node.attr_def(name) is not None
+
+    def attribute(self, name):
+        d = self._node.attr_def(name)
+        return MObject(d) if d is not None else MObject()
+
+    def attributeCount(self):
+        return len(self._node.attr_names())
+
+    def findPlug(self, attribute, wantNetworkedPlug=False):
+        if isinstance(attribute, MObject):
+            d = attribute._target
+        else:
+            d = self._node.attr_def(attribute)
+        if d is None:
+            raise RuntimeError("(kInvalidParameter): Cannot find item")
+        path = []
+        parent = d.parent
+        while parent is not None:
+            path.insert(0, (parent, None))
+            parent = parent.parent
+        path.append((d, None))
+        return MPlug(self._node, path)
+
+    def plugsAlias(self, plug):
+        return ""
+
+
+class MFnDagNode(MFnDependencyNode):
+    def __init__(self, obj=None):
+        super(MFnDagNode, self).__init__(obj)
+
+    def dagPath(self):
+        return MDagPath(self._node)
+
+    def getPath(self):
+        return MDagPath(self._node)
+
+    def fullPathName(self):
+        return self._node.full_path()
+
+    def partialPathName(self):
+        return self._node.partial_path()
+
+    def parentCount(self):
+        return 1 if self._node.parent is not None else 0
+
+    def parent(self, index=0):
+        return MObject(self._node.parent)
+
+    def childCount(self):
+        return len(self._node.children)
+
+    def child(self, index):
+        return MObject(self._node.children[index])
+
+    @property
+    def isIntermediateObject(self):
+        return bool(self._node.values.get("intermediateObject", False))
+
+    @property
+    def inUnderWorld(self):
+        return False
+
+    def transformationMatrix(self):
+        return MMatrix(self._node.local_matrix())
+
+
+class MFnTransform(MFnDagNode):
+    def transformation(self):
+        return MTransformationMatrix(MMatrix(self._node.local_matrix()))
+
+    def transformationMatrix(self):
+        return MMatrix(self._node.local_matrix())
+
+    def setTransformation(self, transform):
+        if isinstance(transform, MTransformationMatrix):
+            transform = transform.asMatrix()
+        self._node.set_local_matrix(tuple(transform))
+
+    def translation(self, space):
+        if space == MSpace.kWorld:
+            m = self._node.world_matrix()
+        else:
+            m = self._node.local_matrix()
+        return MVector(m[12], m[13], m[14])
+
+    def setTranslation(self, vector, space):
+        values = [vector[0], vector[1], vector[2]]
+        if space == MSpace.kWorld and self._node.parent is not None:
+            parent = _scene.inverse(self._node.parent.world_matrix())
+            values = list(MPoint(*values) * MMatrix(parent))[:3]
+        for a, v in zip("XYZ", values):
+            self._node.values["translate" + a] = v
+        _SCENE.dirty(self._node)
+
+    def rotation(self, space=None, asQuaternion=False):
+        if space is None:
+            space = MSpace.kTransform
+        rotate = self._node.channels("rotate")
+        euler = MEulerRotation(
+            rotate[0],
+            rotate[1],
+            rotate[2],
+            int(self._node.values.get("rotateOrder", 0)),
+        )
+        if asQuaternion:
+            return euler.asQuaternion()
+        return euler
+
+    def setRotation(self, rotation, space=None):
+        if isinstance(rotation, MQuaternion):
+            rotation = rotation.asEulerRotation()
+        for a, v in zip("XYZ", (rotation.x, rotation.y, rotation.z)):
+            self._node.values["rotate" + a] = v
+        _SCENE.dirty(self._node)
+
+    def scale(self):
+        return self._node.channels("scale")
+
+    def setScale(self, scale):
+        for a, v in zip("XYZ", scale):
+            self._node.values["scale" + a] = v
+        _SCENE.dirty(self._node)
+
+    def rotationOrder(self):
+        return int(self._node.values.get("rotateOrder", 0)) + 1
+
+
+class MFnAttribute(MFnBase):
+    def __init__(self, obj=None):
+        super(MFnAttribute, self).__init__(obj)
+        self._def = self._obj._target
+
+    @property
+    def name(self):
+        return self._def.name
+
+    @property
+    def shortName(self):
+        return self._def.short
+
+    @property
+    def dynamic(self):
+        return self._def.dynamic
+
+    @property
+    def keyable(self):
+        return self._def.kind not in ("matrix", "message", "string")
+
+    @property
+    def array(self):
+        return self._def.array
+
+    @property
+    def parent(self):
+        return MObject(self._def.parent)
+
+
+class MFnNumericData(MFnBase):
+    kInvalid = 0
+    kBoolean = 1
+    kByte = 2
+    kChar = 3
+    kShort = 4
+    k2Short = 5
+    k3Short = 6
+    kLong = 7
+    kInt = 7
+    k2Long = 8
+    k2Int = 8
+    k3Long = 9
+    k3Int = 9
+    kInt64 = 10
+    kFloat = 11
+    k2Float = 12
+    k3Float = 13
+    kDouble = 14
+    k2Double = 15
+    k3Double = 16
+    k4Double = 17
+    kAddr = 18
+
+
+_NUMERIC_TYPES = {
+    "double": MFnNumericData.kDouble,
+    "bool": MFnNumericData.kBoolean,
+    "long": MFnNumericData.kInt,
+}
+
+
+class MFnNumericAttribute(MFnAttribute):
+    def numericType(self):
+        return _NUMERIC_TYPES.get(self._def.kind, MFnNumericData.kInvalid)
+
+
+class MFnCompoundAttribute(MFnAttribute):
+    def numChildren(self):
+        return len(self._def.children)
+
+    def child(self, index):
+        return MObject(self._def.children[index])
+
+
+class MFnEnumAttribute(MFnAttribute):
+    def fieldName(self, value):
+        return self._def.enum_names[value]
+
+    def fieldValue(self, name):
+        return self._def.enum_names.index(name)
+
+    def getMin(self):
+        return 0
+
+    def getMax(self):
+        return len(self._def.enum_names) - 1
+
+
+class MFnData(MFnBase):
+    kInvalid = 0
+    kNumeric = 1
+    kPlugin = 2
+    kPluginGeometry = 3
+    kString = 4
+    kMatrix = 5
+    kStringArray = 6
+    kDoubleArray = 7
+    kIntArray = 9
+    kPointArray = 10
+    kVectorArray = 11
+    kComponentList = 13
+    kMesh = 14
+    kNurbsCurve = 16
+
+
+class MFnTypedAttribute(MFnAttribute):
+    def attrType(self):
+        if self._def.kind == "string":
+            return MFnData.kString
+        return MFnData.kInvalid
+
+
+class _MatrixData(object):
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self.alive = True
+
+
+class MFnMatrixData(MFnBase):
+    def create(self, matrix=None):
+        self._obj = MObject(_MatrixData(MMatrix(matrix or MMatrix())))
+        return self._obj
+
+    def matrix(self):
+        return MMatrix(self._obj._target.matrix)
+
+    def set(self, matrix):
+        self._obj._target.matrix = MMatrix(matrix)
+
+
+##########################################################
+# PLUGS
+##########################################################
+
+
+class MPlug(object):
+    kFreeToChange = 0
+    kNotFreeToChange = 1
+    kChildrenNotFreeToChange = 2
+
+    def __init__(self, node=None, path=None):
+        if isinstance(node, MPlug):
+            node, path = node._node, node._path
+        self._node = node
+        self._path = list(path or [])
+
+    @property
+    def _def(self):
+        return self._path[-1][0]
+
+    @property
+    def _index(self):
+        return self._path[-1][1]
+
+    @property
+    def isNull(self):
+        return not self._path or not self._node.alive
+
+    @property
+    def isArray(self):
+        return self._def.array and self._index is None
+
+    @property
+    def isElement(self):
+        return self._def.array and self._index is not None
+
+    @property
+    def isCompound(self):
+        return self._def.kind == "compound"
+
+    @property
+    def isChild(self):
+        return len(self._path) > 1
+
+    @property
+    def isDynamic(self):
+        return self._def.dynamic
+
+    @property
+    def isKeyable(self):
+        return self._def.kind not in ("matrix", "message", "string")
+
+    @property
+    def isLocked(self):
+        return self._def.name in self._node.locked
+
+    @property
+    def isConnected(self):
+        return False
+
+    @property
+    def isDestination(self):
+        return False
+
+    @property
+    def isSource(self):
+        return False
+
+    def node(self):
+        return MObject(self._node)
+
+    def attribute(self):
+        return MObject(self._def)
+
+    def numChildren(self):
+        return len(self._def.children)
+
+    def child(self, index):
+        if isinstance(index, MObject):
+            d = index._target
+        else:
+            d = self._def.children[index]
+        return MPlug(self._node, self._path + [(d, None)])
+
+    def parent(self):
+        return MPlug(self._node, self._path[:-1])
+
+    def array(self):
+        return MPlug(self._node, self._path[:-1] + [(self._def, None)])
+
+    def elementByLogicalIndex(self, index):
+        if not self._def.array:
+            raise TypeError("Not an array plug")
+        return MPlug(self._node, self._path[:-1] + [(self._def, index)])
+
+    def logicalIndex(self):
+        return self._index
+
+    def numElements(self):
+        return 1 if self._def.array else 0
+
+    def getExistingArrayAttributeIndices(self):
+        return [0] if self._def.array else []
+
+    def partialName(
+        self,
+        includeNodeName=False,
+        includeNonMandatoryIndices=False,
+        includeInstancedIndices=False,
+        useAlias=False,
+        useFullAttributePath=False,
+        useLongNames=False,
+    ):
+        path = self._path if useFullAttributePath else self._path[-1:]
+        parts = []
+        for d, index in path:
+            part = d.name if useLongNames else d.short
+            if index is not None:
+                part += "[{}]".format(index)
+            parts.append(part)
+        name = ".".join(parts)
+        if includeNodeName:
+            name = "{}.{}".format(self._node.partial_path(), name)
+        return name
+
+    def name(self):
+        return self.partialName(True, False, False, False, False, True)
+
+    def isFreeToChange(self, checkParents=True, checkChildren=True):
+        names = [d.name for d, _ in self._path]
+        if checkChildren:
+            names.extend(c.name for c in self._def.children)
+        if any(n in self._node.locked for n in names):
+            return MPlug.kNotFreeToChange
+        return MPlug.kFreeToChange
+
+    # values ------------------------------------------------
+
+    def _value(self):
+        return self._node.get_value(self._def, self._index)
+
+    def asDouble(self):
+        return float(self._value())
+
+    def asFloat(self):
+        return float(self._value())
+
+    def asInt(self):
+        return int(self._value())
+
+    def asShort(self):
+        return int(self._value())
+
+    def asBool(self):
+        return bool(self._value())
+
+    def asString(self):
+        return self._value() or ""
+
+    def asMObject(self):
+        return MObject(_MatrixData(MMatrix(self._value())))
+
+    def asMDistance(self):
+        return MDistance(self._value())
+
+    def asMAngle(self):
+        return MAngle(self._value())
+
+    def asMTime(self):
+        return MTime(self._value())
+
+    def _set(self, value):
+        self._node.set_value(self._def, value)
+
+    def setDouble(self, value):
+        self._set(float(value))
+
+    def setFloat(self, value):
+        self._set(float(value))
+
+    def setInt(self, value):
+        self._set(int(value))
+
+    def setShort(self, value):
+        self._set(int(value))
+
+    def setBool(self, value):
+        self._set(bool(value))
+
+    def setString(self, value):
+        self._set(value)
+
+    def setMDistance(self, value):
+        self._set(value.value)
+
+    def setMAngle(self, value):
+        self._set(value.value)
+
+    def setMObject(self, value):
+        self._set(tuple(value._target.matrix))
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, MPlug)
+            and self._node is other._node
+            and self._path == other._path
+        )
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+
+class MDGModifier(object):
+    def __init__(self):
+        self._ops = []
+
+    def _add(self, plug, setter, value):
+        self._ops.append((plug, setter, value))
+        return self
+
+    def newPlugValue(self, plug, value):
+        return self._add(plug, "setMObject", value)
+
+    def newPlugValueBool(self, plug, value):
+        return self._add(plug, "setBool", value)
+
+    def newPlugValueDouble(self, plug, value):
+        return self._add(plug, "setDouble", value)
+
+    def newPlugValueFloat(self, plug, value):
+        return self._add(plug, "setFloat", value)
+
+    def newPlugValueInt(self, plug, value):
+        return self._add(plug, "setInt", value)
+
+    def newPlugValueShort(self, plug, value):
+        return self._add(plug, "setShort", value)
+
+    def newPlugValueString(self, plug, value):
+        return self._add(plug, "setString", value)
+
+    def newPlugValueMDistance(self, plug, value):
+        return self._add(plug, "setMDistance", value)
+
+    def newPlugValueMAngle(self, plug, value):
+        return self._add(plug, "setMAngle", value)
+
+    def newPlugValueMTime(self, plug, value):
+        return self._add(plug, "setDouble", value.value)
+
+    def deleteNode(self, obj):
+        self._ops.append((obj, "delete", None))
+        return self
+
+    def doIt(self):
+        for target, setter, value in self._ops:
+            if setter == "delete":
+                _SCENE.delete(target._target)
+            else:
+                getattr(target, setter)(value)
+        return self
+
+    def undoIt(self):
+        return self
+
+
+class MDagModifier(MDGModifier):
+    pass
+
+
+##########################################################
+# UNITS
+##########################################################
+
+
+class _Unit(object):
+    _factors = {}
+    _ui = None
+
+    def __init__(self, value=0.0, unit=None):
+        if unit is None:
+            unit = self._internal
+        self.value = value * self._factors[unit]
+        self.unit = self._internal
+
+    @classmethod
+    def uiUnit(cls):
+        return cls._ui
+
+    @classmethod
+    def internalUnit(cls):
+        return cls._internal
+
+    def asUnits(self, unit):
+        return self.value / self._factors[unit]
+
+
+class MDistance(_Unit):
+    kInvalid = 0
+    kInches = 1
+    kFeet = 2
+    kYards = 3
+    kMiles = 4
+    kMillimeters = 5
+    kCentimeters = 6
+    kKilometers = 7
+    kMeters = 8
+    _factors = {
+        kInches: 2.54,
+        kFeet: 30.48,
+        kYards: 91.44,
+        kMiles: 160934.4,
+        kMillimeters: 0.1,
+        kCentimeters: 1.0,
+        kKilometers: 100000.0,
+        kMeters: 100.0,
+    }
+    _internal = kCentimeters
+    _ui = kCentimeters
+
+
+class MAngle(_Unit):
+    kInvalid = 0
+    kRadians = 1
+    kDegrees = 2
+    kAngMinutes = 3
+    kAngSeconds = 4
+    _factors = {
+        kRadians: 1.0,
+        kDegrees: math.pi / 180.0,
+        kAngMinutes: math.pi / 10800.0,
+        kAngSeconds: math.pi / 648000.0,
+    }
+    _internal = kRadians
+    _ui = kDegrees
+
+
+class MTime(_Unit):
+    kInvalid = 0
+    kHours = 1
+    kMinutes = 2
+    kSeconds = 3
+    kMilliseconds = 4
+    kFilm = 6
+    kPALFrame = 7
+    kNTSCFrame = 8
+    _factors = {
+        kHours: 86400.0,
+        kMinutes: 1440.0,
+        kSeconds: 24.0,
+        kMilliseconds: 0.024,
+        kFilm: 1.0,
+        kPALFrame: 24.0 / 25.0,
+        kNTSCFrame: 24.0 / 30.0,
+    }
+    _internal = kFilm
+    _ui = kFilm
+
+
+class MSpace(object):
+    kInvalid = 0
+    kTransform = 1
+    kPreTransform = 2
+    kPostTransform = 3
+    kWorld = 4
+    kObject = kPreTransform
+    kLast = 5
+
+
+##########################################################
+# MATH
+##########################################################
+
+
+class MVector(object):
+    kTol = 1e-10
+
+    def __init__(self, *args):
+        if not args:
+            x = y = z = 0.0
+        elif len(args) == 1:
+            values = list(args[0])
+            x, y, z = (values + [0.0, 0.0, 0.0])[:3]
+        else:
+            x, y, z = (list(args) + [0.0])[:3]
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z)[index]
+
+    def __setitem__(self, index, value):
+        setattr(self, "xyz"[index], float(value))
+
+    def __add__(self, other):
+        return MVector(self.x + other[0], self.y + other[1],
+                       self.z + other[2])
+
+    def __sub__(self, other):
+        return MVector(self.x - other[0], self.y - other[1],
+                       self.z - other[2])
+
+    def __neg__(self):
+        return MVector(-self.x, -self.y, -self.z)
+
+    def __mul__(self, other):
+        if isinstance(other, MVector):
+            return self.x * other.x + self.y * other.y + self.z * other.z
+        if isinstance(other, MMatrix):
+            m = other._m
+            return MVector(
+                self.x * m[0] + self.y * m[4] + self.z * m[8],
+                self.x * m[1] + self.y * m[5] + self.z * m[9],
+                self.x * m[2] + self.y * m[6] + self.z * m[10],
+            )
+        return MVector(self.x * other, self.y * other, self.z * other)
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        return MVector(self.x / other, self.y / other, self.z / other)
+
+    def __xor__(self, other):
+        return MVector(
+            self.y * other.z - self.z * other.y,
+            self.z * other.x - self.x * other.z,
+            self.x * other.y - self.y * other.x,
+        )
+
+    def __eq__(self, other):
+        try:
+            return all(abs(a - b) <= self.kTol
+                       for a, b in zip(self, other))
+        except TypeError:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "maya.api.OpenMaya.MVector({}, {}, {})".format(
+            self.x, self.y, self.z
+        )
+
+    def length(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def normal(self):
+        length = self.length()
+        return self / length if length else MVector(self)
+
+    def normalize(self):
+        n = self.normal()
+        self.x, self.y, self.z = n.x, n.y, n.z
+        return self
+
+    def angle(self, other):
+        d = self.length() * other.length()
+        if not d:
+            return 0.0
+        return math.acos(max(-1.0, min(1.0, (self * other) / d)))
+
+    def isEquivalent(self, other, tolerance=kTol):
+        return all(abs(a - b) <= tolerance for a, b in zip(self, other))
+
+    def isParallel(self, other, tolerance=kTol):
+        return (self ^ other).length() <= tolerance
+
+    def rotateBy(self, rotation):
+        if isinstance(rotation, MEulerRotation):
+            rotation = rotation.asQuaternion()
+        return self * rotation.asMatrix()
+
+    def rotateTo(self, other):
+        axis = self ^ other
+        angle = self.angle(other)
+        if axis.length() < self.kTol:
+            return MQuaternion()
+        return MQuaternion(angle, axis)
+
+    def transformAsNormal(self, matrix):
+        return (self * matrix.inverse().transpose()).normal()
+
+
+MVector.kZeroVector = MVector()
+MVector.kOneVector = MVector(1, 1, 1)
+MVector.kXaxisVector = MVector(1, 0, 0)
+MVector.kYaxisVector = MVector(0, 1, 0)
+MVector.kZaxisVector = MVector(0, 0, 1)
+
+
+class MPoint(object):
+    kTol = 1e-10
+
+    def __init__(self, *args):
+        if not args:
+            values = [0.0, 0.0, 0.0, 1.0]
+        elif len(args) == 1:
+            values = list(args[0])
+        else:
+            values = list(args)
+        if len(values) == 3:
+            values.append(1.0)
+        self.x, self.y, self.z, self.w = [float(v) for v in values[:4]]
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z, self.w))
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z, self.w)[index]
+
+    def __add__(self, other):
+        return MPoint(self.x + other[0], self.y + other[1],
+                      self.z + other[2])
+
+    def __sub__(self, other):
+        if isinstance(other, MPoint):
+            return MVector(self.x - other.x, self.y - other.y,
+                           self.z - other.z)
+        return MPoint(self.x - other[0], self.y - other[1],
+                      self.z - other[2])
+
+    def __mul__(self, other):
+        if isinstance(other, MMatrix):
+            m = other._m
+            v = (self.x, self.y, self.z, self.w)
+            return MPoint(*[sum(v[r] * m[r * 4 + c] for r in range(4))
+                            for c in range(4)])
+        return MPoint(self.x * other, self.y * other, self.z * other)
+
+    def __eq__(self, other):
+        try:
+            return all(abs(a - b) <= self.kTol
+                       for a, b in zip(self, other))
+        except TypeError:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def distanceTo(self, other):
+        return (self - MPoint(other)).length()
+
+    def cartesianize(self):
+        if self.w:
+            self.x, self.y, self.z = (self.x / self.w, self.y / self.w,
+                                      self.z / self.w)
+            self.w = 1.0
+        return self
+
+    def homogenize(self):
+        self.x, self.y, self.z = (self.x * self.w, self.y * self.w,
+                                  self.z * self.w)
+        return self
+
+    def rationalize(self):
+        return self.cartesianize()
+
+    def isEquivalent(self, other, tolerance=kTol):
+        return all(abs(a - b) <= tolerance for a, b in zip(self, other))
+
+
+MPoint.kOrigin = MPoint()
+
+
+class MMatrix(object):
+    kTol = 1e-10
+
+    def __init__(self, *args):
+        if not args:
+            self._m = list(_scene.IDENTITY)
+            return
+        value = args[0]
+        if isinstance(value, MMatrix):
+            self._m = list(value._m)
+            return
+        value = list(value)
+        if len(value) == 4:
+            value = [v for row in value for v in row]
+        if len(value) != 16:
+            raise ValueError("Invalid matrix size")
+        self._m = [float(v) for v in value]
+
+    def __len__(self):
+        return 16
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple):
+            return self._m[index[0] * 4 + index[1]]
+        return self._m[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, tuple):
+            index = index[0] * 4 + index[1]
+        self._m[index] = float(value)
+
+    def __iter__(self):
+        return iter(self._m)
+
+    def __mul__(self, other):
+        if isinstance(other, MMatrix):
+            return MMatrix(_scene.mult(self._m, other._m))
+        return MMatrix([v * other for v in self._m])
+
+    def __rmul__(self, other):
+        return MMatrix([v * other for v in self._m])
+
+    def __add__(self, other):
+        return MMatrix([a + b for a, b in zip(self._m, other._m)])
+
+    def __sub__(self, other):
+        return MMatrix([a - b for a, b in zip(self._m, other._m)])
+
+    def __eq__(self, other):
+        return isinstance(other, MMatrix) and self.isEquivalent(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "maya.api.OpenMaya.MMatrix({})".format(self._m)
+
+    def getElement(self, row, col):
+        return self._m[row * 4 + col]
+
+    def setElement(self, row, col, value):
+        self._m[row * 4 + col] = float(value)
+        return self
+
+    def setToIdentity(self):
+        self._m = list(_scene.IDENTITY)
+        return self
+
+    def setToProduct(self, left, right):
+        self._m = list(_scene.mult(left._m, right._m))
+        return self
+
+    def inverse(self):
+        return MMatrix(_scene.inverse(self._m))
+
+    def transpose(self):
+        m = self._m
+        return MMatrix([m[c * 4 + r] for r in range(4) for c in range(4)])
+
+    def homogenize(self):
+        return MMatrix(self)
+
+    def adjoint(self):
+        return self.inverse() * self.det4x4()
+
+    def det3x3(self):
+        m = self._m
+        return (m[0] * (m[5] * m[10] - m[6] * m[9])
+                - m[1] * (m[4] * m[10] - m[6] * m[8])
+                + m[2] * (m[4] * m[9] - m[5] * m[8]))
+
+    def det4x4(self):
+        m = self._m
+        det = 0.0
+        for c in range(4):
+            minor = [m[r * 4 + k] for r in range(1, 4)
+                     for k in range(4) if k != c]
+            sub = (minor[0] * (minor[4] * minor[8] - minor[5] * minor[7])
+                   - minor[1] * (minor[3] * minor[8] - minor[5] * minor[6])
+                   + minor[2] * (minor[3] * minor[7] - minor[4] * minor[6]))
+            det += (-1) ** c * m[c] * sub
+        return det
+
+    def isSingular(self):
+        return abs(self.det4x4()) < self.kTol
+
+    def isEquivalent(self, other, tolerance=kTol):
+        return all(abs(a - b) <= tolerance
+                   for a, b in zip(self._m, MMatrix(other)._m))
+
+
+MMatrix.kIdentity = MMatrix()
+
+
+class MEulerRotation(object):
+    kXYZ = 0
+    kYZX = 1
+    kZXY = 2
+    kXZY = 3
+    kYXZ = 4
+    kZYX = 5
+    kTolerance = 1e-10
+
+    def __init__(self, *args):
+        if not args:
+            x = y = z = 0.0
+            order = MEulerRotation.kXYZ
+        elif len(args) in (1, 2) and not isinstance(args[0], (int, float)):
+            values = list(args[0])
+            x, y, z = values[:3]
+            order = args[1] if len(args) == 2 else getattr(
+                args[0], "order", MEulerRotation.kXYZ
+            )
+        else:
+            x, y, z = args[:3]
+            order = args[3] if len(args) > 3 else MEulerRotation.kXYZ
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+        self.order = order
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z)[index]
+
+    def __neg__(self):
+        return MEulerRotation(-self.x, -self.y, -self.z, self.order)
+
+    def __eq__(self, other):
+        return isinstance(other, MEulerRotation) and self.isEquivalent(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def asMatrix(self):
+        return MMatrix(_scene.euler_matrix([self.x, self.y, self.z],
+                                           self.order))
+
+    def asQuaternion(self):
+        return MQuaternion.fromMatrix(self.asMatrix())
+
+    def asVector(self):
+        return MVector(self.x, self.y, self.z)
+
+    def isEquivalent(self, other, tolerance=kTolerance):
+        return all(abs(a - b) <= tolerance for a, b in zip(self, other))
+
+    def isZero(self, tolerance=kTolerance):
+        return all(abs(a) <= tolerance for a in self)
+
+    def reorder(self, order):
+        if order == self.order:
+            return MEulerRotation(self)
+        if order != MEulerRotation.kXYZ:
+            raise NotImplementedError("Only XYZ reorder is supported")
+        return MEulerRotation(_scene.matrix_euler(self.asMatrix()._m))
+
+    def reorderIt(self, order):
+        r = self.reorder(order)
+        self.x, self.y, self.z, self.order = r.x, r.y, r.z, r.order
+        return self
+
+    def bound(self):
+        return MEulerRotation(
+            *[(a + math.pi) % (2 * math.pi) - math.pi for a in self],
+            self.order
+        )
+
+    def boundIt(self):
+        r = self.bound()
+        self.x, self.y, self.z = r.x, r.y, r.z
+        return self
+
+    def setValue(self, x, y, z, order=None):
+        self.x, self.y, self.z = float(x), float(y), float(z)
+        if order is not None:
+            self.order = order
+        return self
+
+    def setToClosestSolution(self, other):
+        return self
+
+    def setToClosestCut(self, other):
+        return self
+
+    def incrementalRotateBy(self, axis, angle):
+        return self
+
+
+class MQuaternion(object):
+    kTolerance = 1e-10
+
+    def __init__(self, *args):
+        if not args:
+            self.x = self.y = self.z = 0.0
+            self.w = 1.0
+        elif len(args) == 2 and isinstance(args[0], (int, float)):
+            angle, axis = args
+            axis = MVector(axis).normal()
+            s = math.sin(angle * 0.5)
+            self.x, self.y, self.z = axis.x * s, axis.y * s, axis.z * s
+            self.w = math.cos(angle * 0.5)
+        elif len(args) == 1:
+            self.x, self.y, self.z, self.w = [float(v) for v in args[0]]
+        else:
+            self.x, self.y, self.z, self.w = [float(v) for v in args[:4]]
+
+    @staticmethod
+    def fromMatrix(matrix):
+        m = matrix._m
+        trace = m[0] + m[5] + m[10]
+        if trace > 0:
+            s = math.sqrt(trace + 1.0) * 2
+            return MQuaternion((m[6] - m[9]) / s, (m[8] - m[2]) / s,
+                               (m[1] - m[4]) / s, 0.25 * s)
+        if m[0] > m[5] and m[0] > m[10]:
+            s = math.sqrt(1.0 + m[0] - m[5] - m[10]) * 2
+            return MQuaternion(0.25 * s, (m[1] + m[4]) / s,
+                               (m[8] + m[2]) / s, (m[6] - m[9]) / s)
+        if m[5] > m[10]:
+            s = math.sqrt(1.0 + m[5] - m[0] - m[10]) * 2
+            return MQuaternion((m[1] + m[4]) / s, 0.25 * s,
+                               (m[6] + m[9]) / s, (m[8] - m[2]) / s)
+        s = math.sqrt(1.0 + m[10] - m[0] - m[5]) * 2
+        return MQuaternion((m[8] + m[2]) / s, (m[6] + m[9]) / s, 0.25 * s,
+                           (m[1] - m[4]) / s)
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z, self.w))
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z, self.w)[index]
+
+    def __mul__(self, other):
+        if isinstance(other, MQuaternion):
+            return MQuaternion.fromMatrix(self.asMatrix() * other.asMatrix())
+        return MQuaternion(self.x * other, self.y * other, self.z * other,
+                           self.w * other)
+
+    def __neg__(self):
+        return MQuaternion(-self.x, -self.y, -self.z, -self.w)
+
+    def __eq__(self, other):
+        return isinstance(other, MQuaternion) and self.isEquivalent(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def asMatrix(self):
+        x, y, z, w = self.x, self.y, self.z, self.w
+        return MMatrix([
+            1 - 2 * (y * y + z * z), 2 * (x * y + z * w),
+            2 * (x * z - y * w), 0.0,
+            2 * (x * y - z * w), 1 - 2 * (x * x + z * z),
+            2 * (y * z + x * w), 0.0,
+            2 * (x * z + y * w), 2 * (y * z - x * w),
+            1 - 2 * (x * x + y * y), 0.0,
+            0.0, 0.0, 0.0, 1.0,
+        ])
+
+    def asEulerRotation(self):
+        return MEulerRotation(_scene.matrix_euler(self.asMatrix()._m))
+
+    def asAxisAngle(self):
+        angle = 2 * math.acos(max(-1.0, min(1.0, self.w)))
+        s = math.sqrt(max(0.0, 1 - self.w * self.w))
+        if s < self.kTolerance:
+            return MVector(1, 0, 0), 0.0
+        return MVector(self.x / s, self.y / s, self.z / s), angle
+
+    def conjugate(self):
+        return MQuaternion(-self.x, -self.y, -self.z, self.w)
+
+    def conjugateIt(self):
+        self.x, self.y, self.z = -self.x, -self.y, -self.z
+        return self
+
+    def inverse(self):
+        return self.normal().conjugate()
+
+    def invertIt(self):
+        q = self.inverse()
+        self.x, self.y, self.z, self.w = q
+        return self
+
+    def normal(self):
+        length = math.sqrt(sum(v * v for v in self))
+        return MQuaternion(*[v / length for v in self])
+
+    def normalizeIt(self):
+        q = self.normal()
+        self.x, self.y, self.z, self.w = q
+        return self
+
+    def isEquivalent(self, other, tolerance=kTolerance):
+        return all(abs(a - b) <= tolerance for a, b in zip(self, other))
+
+    def negateIt(self):
+        self.x, self.y, self.z, self.w = -self.x, -self.y, -self.z, -self.w
+        return self
+
+    def setValue(self, *args):
+        q = MQuaternion(*args)
+        self.x, self.y, self.z, self.w = q
+        return self
+
+    def setToXAxis(self, angle):
+        return self.setValue(angle, MVector(1, 0, 0))
+
+    def setToYAxis(self, angle):
+        return self.setValue(angle, MVector(0, 1, 0))
+
+    def setToZAxis(self, angle):
+        return self.setValue(angle, MVector(0, 0, 1))
+
+    @staticmethod
+    def slerp(p, q, t, spin=0):
+        return MQuaternion(*[a + (b - a) * t for a, b in zip(p, q)]).normal()
+
+
+class MTransformationMatrix(object):
+    kInvalid = 0
+    kXYZ = 1
+    kYZX = 2
+    kZXY = 3
+    kXZY = 4
+    kYXZ = 5
+    kZYX = 6
+    kLast = 7
+
+    def __init__(self, matrix=None):
+        if isinstance(matrix, MTransformationMatrix):
+            matrix = matrix.asMatrix()
+        translate, rotate, scale = _scene.decompose(
+            MMatrix(matrix)._m if matrix is not None else _scene.IDENTITY
+        )
+        self._translate = translate
+        self._rotate = rotate
+        self._scale = scale
+        self._shear = [0.0, 0.0, 0.0]
+
+    def asMatrix(self, percent=None):
+        return MMatrix(_scene.compose(self._translate, self._rotate,
+                                      self._scale))
+
+    def asMatrixInverse(self):
+        return self.asMatrix().inverse()
+
+    def asRotateMatrix(self):
+        return MMatrix(_scene.euler_matrix(self._rotate))
+
+    def asScaleMatrix(self):
+        return MMatrix(_scene.compose([0, 0, 0], [0, 0, 0], self._scale))
+
+    def translation(self, space=MSpace.kTransform):
+        return MVector(self._translate)
+
+    def setTranslation(self, vector, space=MSpace.kTransform):
+        self._translate = [vector[0], vector[1], vector[2]]
+        return self
+
+    def translateBy(self, vector, space=MSpace.kTransform):
+        self._translate = [a + b for a, b in zip(self._translate, vector)]
+        return self
+
+    def rotation(self, asQuaternion=False):
+        euler = MEulerRotation(self._rotate)
+        return euler.asQuaternion() if asQuaternion else euler
+
+    def setRotation(self, rotation):
+        if isinstance(rotation, MQuaternion):
+            rotation = rotation.asEulerRotation()
+        self._rotate = [rotation.x, rotation.y, rotation.z]
+        return self
+
+    def rotateBy(self, rotation, space=MSpace.kTransform):
+        if isinstance(rotation, MEulerRotation):
+            rotation = rotation.asQuaternion()
+        m = self.asRotateMatrix() * rotation.asMatrix()
+        self._rotate = _scene.matrix_euler(m._m)
+        return self
+
+    def rotationOrder(self):
+        return MTransformationMatrix.kXYZ
+
+    def reorderRotation(self, order):
+        return self
+
+    def rotationOrientation(self):
+        return MQuaternion()
+
+    def setRotationOrientation(self, quaternion):
+        return self
+
+    def scale(self, space=MSpace.kTransform):
+        return list(self._scale)
+
+    def setScale(self, scale, space=MSpace.kTransform):
+        self._scale = [scale[0], scale[1], scale[2]]
+        return self
+
+    def scaleBy(self, scale, space=MSpace.kTransform):
+        self._scale = [a * b for a, b in zip(self._scale, scale)]
+        return self
+
+    def shear(self, space=MSpace.kTransform):
+        return list(self._shear)
+
+    def setShear(self, shear, space=MSpace.kTransform):
+        self._shear = [shear[0], shear[1], shear[2]]
+        return self
+
+    def shearBy(self, shear, space=MSpace.kTransform):
+        return self
+
+    def rotatePivot(self, space=MSpace.kTransform):
+        return MPoint()
+
+    def setRotatePivot(self, point, space=MSpace.kTransform, balance=True):
+        return self
+
+    def scalePivot(self, space=MSpace.kTransform):
+        return MPoint()
+
+    def setScalePivot(self, point, space=MSpace.kTransform, balance=True):
+        return self
+
+    def isEquivalent(self, other, tolerance=1e-10):
+        return self.asMatrix().isEquivalent(other.asMatrix(), tolerance)
+
+
+class MBoundingBox(object):
+    def __init__(self, *args):
+        if len(args) == 2:
+            self.min = MPoint(args[0])
+            self.max = MPoint(args[1])
+        elif args and isinstance(args[0], MBoundingBox):
+            self.min = MPoint(args[0].min)
+            self.max = MPoint(args[0].max)
+        else:
+            self.min = MPoint()
+            self.max = MPoint()
+
+    @property
+    def center(self):
+        return MPoint([(a + b) * 0.5 for a, b in zip(self.min, self.max)])
+
+    @property
+    def width(self):
+        return self.max.x - self.min.x
+
+    @property
+    def height(self):
+        return self.max.y - self.min.y
+
+    @property
+    def depth(self):
+        return self.max.z - self.min.z
+
+    def expand(self, point):
+        self.min = MPoint([min(a, b) for a, b in zip(self.min, point)])
+        self.max = MPoint([max(a, b) for a, b in zip(self.max, point)])
+        return self
+
+    def contains(self, point):
+        return all(a <= p <= b for a, p, b in
+                   zip(self.min, point, self.max))
+
+    def intersects(self, other, tolerance=0.0):
+        return all(a <= d + tolerance and c <= b + tolerance
+                   for a, b, c, d in zip(self.min, self.max,
+                                         other.min, other.max))
+
+    def clear(self):
+        self.min = MPoint()
+        self.max = MPoint()
+        return self
+
+    def transformUsing(self, matrix):
+        self.min = self.min * matrix
+        self.max = self.max * matrix
+        return self
+
+
+##########################################################
+# NOT MODELLED
+##########################################################
+
+
+class MFnSingleIndexedComponent(MFnBase):
+    def create(self, component_type):
+        raise NotImplementedError("Components are not modelled")
+
+
+class _NotModelled(object):
+    def __init__(self, *args, **kwargs):
+        raise NotImplementedError(
+            "{} is not modelled".format(self.__class__.__name__)
+        )
+
+
+class MFnMesh(_NotModelled):
+    pass
+
+
+class MFnNurbsCurve(_NotModelled):
+    kInvalid = 0
+    kOpen = 1
+    kClosed = 2
+    kPeriodic = 3
+
+
+class MItMeshVertex(_NotModelled):
+    pass
+
+
+class MItMeshEdge(_NotModelled):
+    pass
+
+
+class MItMeshPolygon(_NotModelled):
+    pass
+
+
+class MItCurveCV(_NotModelled):
+    pass
+
+
+class MDGContext(object):
+    kNormal = None
+
+    def __init__(self, time=None):
+        self.time = time
+
+
+##########################################################
+# MESSAGES
+##########################################################
+
+
+class MGlobal(object):
+    messages = []
+
+    @staticmethod
+    def displayInfo(msg):
+        MGlobal.messages.append(("info", msg))
+
+    @staticmethod
+    def displayWarning(msg):
+        MGlobal.messages.append(("warning", msg))
+
+    @staticmethod
+    def displayError(msg):
+        MGlobal.messages.append(("error", msg))
+
+
+class MMessage(object):
+    @staticmethod
+    def removeCallback(callback_id):
+        _SCENE.node_removed_callbacks.pop(callback_id, None)
+        _SCENE.scene_callbacks.pop(callback_id, None)
+
+
+def _next_callback_id():
+    _SCENE.next_callback += 1
+    return _SCENE.next_callback
+
+
+class MDGMessage(MMessage):
+    @staticmethod
+    def addNodeRemovedCallback(function, nodeType="dependNode",
+                               clientData=None):
+        cid = _next_callback_id()
+        _SCENE.node_removed_callbacks[cid] = (
+            lambda node: function(MObject(node), clientData)
+        )
+        return cid
+
+
+class MSceneMessage(MMessage):
+    kBeforeNew = 1
+    kAfterNew = 2
+    kBeforeImport = 3
+    kAfterImport = 4
+    kBeforeOpen = 7
+    kAfterOpen = 8
+    kBeforeReference = 20
+    kAfterReference = 21
+
+    @staticmethod
+    def addCallback(message, function, clientData=None):
+        cid = _next_callback_id()
+        if message in (MSceneMessage.kBeforeNew, MSceneMessage.kBeforeOpen):
+            _SCENE.scene_callbacks[cid] = lambda: function(clientData)
+        return cid
@@ -0,0 +1,6 @@
+"""Stand-in of maya.api.OpenMayaAnim. Deformers are not modelled."""
+
+
+class MFnSkinCluster(object):
+    def __init__(self, *args):
+        raise NotImplementedError("MFnSkinCluster is not modelled")
@@ -0,0 +1,2 @@
+"""Stand-in of maya.cmds. See maya._commands."""
+from maya._commands import *  # noqa: F401,F403
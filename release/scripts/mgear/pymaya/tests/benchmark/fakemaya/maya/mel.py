@@ -0,0 +1,7 @@
+"""Stand-in of maya.mel. No MEL procedure is available."""
+
+
+def eval(command):
+    if command.startswith("whatIs "):
+        return "Unknown"
+    raise RuntimeError("MEL is not available: {}".format(command))
@@ -0,0 +1,9 @@
+"""Stand-in of maya.standalone."""
+
+
+def initialize(name="python"):
+    pass
+
+
+def uninitialize():
+    pass
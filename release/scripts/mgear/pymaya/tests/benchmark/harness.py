@@ -0,0 +1,286 @@
+"""Benchmark registry, timing and baseline comparison.
+
+The benchmarks are registered with the benchmark decorator. Each one is
+timed ``repeat`` times, and each repetition calls the function ``number``
+times. The fastest repetition is used to compare with the baseline, the
+other repetitions are only noise from the machine.
+
+Example:
+    >>> @benchmark("vector_add", number=1000)
+    ... def vectorAdd(a, b):
+    ...     a + b
+"""
+import datetime
+import json
+import platform
+import statistics
+import sys
+import timeit
+
+
+BENCHMARKS = []
+
+FORMAT_VERSION = 1
+
+
+class Benchmark(object):
+    """A registered benchmark
+
+    Attributes:
+        name (str): unique name, used to compare with the baseline
+        func (callable): the timed function
+        group (str): micro or scenario
+        number (int): calls per repetition
+        repeat (int): repetitions
+        setup (callable): called before each repetition, returns the
+            arguments of the timed function
+    """
+
+    def __init__(self, name, func, group, number, repeat, setup):
+        self.name = name
+        self.func = func
+        self.group = group
+        self.number = number
+        self.repeat = repeat
+        self.setup = setup
+
+    def run(self, repeat=None, scale=1.0):
+        """Time the benchmark
+
+        Args:
+            repeat (int, optional): override the repetitions
+            scale (float, optional): multiplier of the number of calls
+
+        Returns:
+            dict: the timings in seconds
+        """
+        repeat = repeat or self.repeat
+        number = max(1, int(self.number * scale))
+        times = []
+        for _ in range(repeat):
+            args = self.setup() if self.setup else ()
+            if args is None:
+                args = ()
+            func = self.func
+            start = timeit.default_timer()
+            for _ in range(number):
+                func(*args)
+            times.append(timeit.default_timer() - start)
+
+        best = min(times)
+        return {
+            "group": self.group,
+            "number": number,
+            "repeat": repeat,
+            "best": best,
+            "median": statistics.median(times),
+            "per_call": best / number,
+        }
+
+
+def benchmark(name, group="micro", number=100, repeat=5, setup=None):
+    """Register a benchmark function
+
+    Args:
+        name (str): unique name of the benchmark
+        group (str, optional): micro or scenario
+        number (int, optional): calls per repetition
+        repeat (int, optional): repetitions
+        setup (callable, optional): called before each repetition, not
+            timed. The returned tuple is passed to the function
+
+    Returns:
+        callable: the decorator
+    """
+
+    def decorator(func):
+        if any(b.name == name for b in BENCHMARKS):
+            raise ValueError("Duplicated benchmark '{}'".format(name))
+        BENCHMARKS.append(
+            Benchmark(name, func, group, number, repeat, setup)
+        )
+        return func
+
+    return decorator
+
+
+def environment(fake):
+    """Information about the machine running the benchmarks
+
+    Args:
+        fake (bool): the benchmarks run against the Maya stand-in
+
+    Returns:
+        dict: the environment
+    """
+    from maya import cmds
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "maya": "fake" if fake else cmds.about(version=True),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def runBenchmarks(
+    names=None, groups=None, repeat=None, scale=1.0, fake=False, log=None
+):
+    """Run the registered benchmarks
+
+    Args:
+        names (list, optional): only run the benchmarks with these names
+        groups (list, optional): only run the benchmarks of these groups
+        repeat (int, optional): override the repetitions
+        scale (float, optional): multiplier of the number of calls
+        fake (bool, optional): the benchmarks run against the Maya stand-in
+        log (callable, optional): called with a line of text per benchmark
+
+    Returns:
+        dict: the results, with the environment and the benchmark timings
+    """
+    results = {}
+    for bench in BENCHMARKS:
+        if names and bench.name not in names:
+            continue
+        if groups and bench.group not in groups:
+            continue
+        results[bench.name] = bench.run(repeat=repeat, scale=scale)
+        if log:
+            log(formatResult(bench.name, results[bench.name]))
+
+    return {
+        "version": FORMAT_VERSION,
+        "environment": environment(fake),
+        "benchmarks": results,
+    }
+
+
+def formatTime(seconds):
+    for unit, factor in (("s", 1.0), ("ms", 1e3), ("us", 1e6)):
+        if seconds * factor >= 1.0:
+            return "{:.3f} {}".format(seconds * factor, unit)
+    return "{:.3f} ns".format(seconds * 1e9)
+
+
+def formatResult(name, result):
+    return "{:<40} {:>9} {:>14} per call  (x{})".format(
+        name,
+        result["group"],
+        formatTime(result["per_call"]),
+        result["number"],
+    )
+
+
+def writeResults(results, path):
+    """Write the results to a json file
+
+    Args:
+        results (dict): the results of runBenchmarks
+        path (str): file path
+    """
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def loadResults(path):
+    """Load the results from a json file
+
+    Args:
+        path (str): file path
+
+    Returns:
+        dict: the results
+    """
+    with open(path) as f:
+        results = json.load(f)
+
+    if results.get("version") != FORMAT_VERSION:
+        raise ValueError(
+            "Unsupported benchmark results version in '{}'".format(path)
+        )
+    return results
+
+
+def compare(results, baseline, threshold=0.1):
+    """Compare the results with a baseline
+
+    Args:
+        results (dict): the current results
+        baseline (dict): the baseline results
+        threshold (float, optional): relative change of the time per call
+            considered as a regression or an improvement
+
+    Returns:
+        list: (name, baseline per call, current per call, ratio, status)
+            rows, the status is faster, slower, same, new or missing
+    """
+    current = results["benchmarks"]
+    base = baseline["benchmarks"]
+    rows = []
+    for name in sorted(set(current) | set(base)):
+        if name not in base:
+            rows.append((name, None, current[name]["per_call"], None, "new"))
+            continue
+        if name not in current:
+            rows.append((name, base[name]["per_call"], None, None, "missing"))
+            continue
+
+        before = base[name]["per_call"]
+        after = current[name]["per_call"]
+        ratio = after / before if before else float("inf")
+        if ratio > 1.0 + threshold:
+            status = "slower"
+        elif ratio < 1.0 / (1.0 + threshold):
+            status = "faster"
+        else:
+            status = "same"
+        rows.append((name, before, after, ratio, status))
+
+    return rows
+
+
+def formatComparison(rows):
+    """Text table of a comparison
+
+    Args:
+        rows (list): the rows returned by compare
+
+    Returns:
+        str: the table
+    """
+    lines = [
+        "{:<40} {:>14} {:>14} {:>8}  {}".format(
+            "benchmark", "baseline", "current", "ratio", "status"
+        )
+    ]
+    for name, before, after, ratio, status in rows:
+        lines.append(
+            "{:<40} {:>14} {:>14} {:>8}  {}".format(
+                name,
+                formatTime(before) if before is not None else "-",
+                formatTime(after) if after is not None else "-",
+                "{:.2f}".format(ratio) if ratio is not None else "-",
+                status,
+            )
+        )
+    return "\n".join(lines)
+
+
+def regressions(rows):
+    """Names of the benchmarks slower than the baseline
+
+    Args:
+        rows (list): the rows returned by compare
+
+    Returns:
+        list: the benchmark names
+    """
+    return [row[0] for row in rows if row[4] == "slower"]
+
+
+def log(text):
+    sys.stdout.write(text + "\n")
+    sys.stdout.flush()
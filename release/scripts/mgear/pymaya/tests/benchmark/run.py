@@ -0,0 +1,163 @@
+"""Run the pymaya benchmarks.
+
+With Maya, run with mayapy:
+    mayapy run.py --output results.json --baseline baseline_2024.json
+
+Without Maya, the benchmarks run against the stand-in of the fakemaya
+folder. The stand-in is a small in memory scene implementing the commands
+and API classes used by pymaya, so the results measure the pure Python
+overhead of pymaya and can be compared between commits on any machine:
+    python run.py --fake --baseline baseline_fake.json
+
+The stand-in only models what the benchmarks need: dependency and DAG
+nodes, transforms and joints, static and dynamic attributes. Rotations are
+decomposed in XYZ order, and there are no connections, components,
+deformers or undo queue.
+
+The timings depend on the machine, the baselines are only comparable on the
+machine that generated them. Use --write-baseline to generate a new one.
+"""
+import argparse
+import os
+import sys
+
+
+BENCHMARK_PATH = os.path.dirname(os.path.abspath(__file__))
+FAKE_MAYA_PATH = os.path.join(BENCHMARK_PATH, "fakemaya")
+MGEAR_PATH = os.path.dirname(
+    os.path.dirname(os.path.dirname(BENCHMARK_PATH))
+)
+
+
+def _hasMaya():
+    try:
+        import maya.cmds  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def setupMaya(fake):
+    """Make maya and pymaya importable
+
+    Args:
+        fake (bool): use the Maya stand-in
+
+    Returns:
+        bool: True if the stand-in is used
+    """
+    if not fake and not _hasMaya():
+        fake = True
+
+    if fake:
+        if "maya" in sys.modules:
+            raise RuntimeError(
+                "maya is already imported, can't use the stand-in"
+            )
+        sys.path.insert(0, FAKE_MAYA_PATH)
+    else:
+        from maya import standalone
+
+        standalone.initialize()
+
+    for path in (MGEAR_PATH, BENCHMARK_PATH):
+        if path not in sys.path:
+            sys.path.append(path)
+
+    return fake
+
+
+def parseArgs(args=None):
+    parser = argparse.ArgumentParser(description="pymaya benchmarks")
+    parser.add_argument(
+        "--fake",
+        action="store_true",
+        help="run against the Maya stand-in. Default if maya is not found",
+    )
+    parser.add_argument(
+        "-o", "--output", help="write the results to this json file"
+    )
+    parser.add_argument(
+        "-b", "--baseline", help="compare the results with this json file"
+    )
+    parser.add_argument(
+        "--write-baseline",
+        action="store_true",
+        help="write the results to the --baseline file",
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative change reported as slower or faster. Default 0.1",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="exit with an error if a benchmark is slower than the baseline",
+    )
+    parser.add_argument(
+        "-k", "--name", action="append", help="only run this benchmark"
+    )
+    parser.add_argument(
+        "-g",
+        "--group",
+        action="append",
+        choices=["micro", "scenario"],
+        help="only run this group of benchmarks",
+    )
+    parser.add_argument("-r", "--repeat", type=int, help="repetitions")
+    parser.add_argument(
+        "-s",
+        "--scale",
+        type=float,
+        default=1.0,
+        help="multiplier of the number of calls of each benchmark",
+    )
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    options = parseArgs(args)
+    fake = setupMaya(options.fake)
+
+    import harness
+    import suite  # noqa: F401, registers the benchmarks
+
+    results = harness.runBenchmarks(
+        names=options.name,
+        groups=options.group,
+        repeat=options.repeat,
+        scale=options.scale,
+        fake=fake,
+        log=harness.log,
+    )
+
+    if options.output:
+        harness.writeResults(results, options.output)
+
+    if not options.baseline:
+        return 0
+
+    if options.write_baseline:
+        harness.writeResults(results, options.baseline)
+        return 0
+
+    rows = harness.compare(
+        results, harness.loadResults(options.baseline), options.threshold
+    )
+    harness.log("")
+    harness.log(harness.formatComparison(rows))
+
+    slower = harness.regressions(rows)
+    if slower and options.fail_on_regression:
+        harness.log("")
+        harness.log("Regressions: {}".format(", ".join(slower)))
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
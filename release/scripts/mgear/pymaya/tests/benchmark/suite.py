@@ -0,0 +1,255 @@
+"""pymaya benchmarks.
+
+The micro benchmarks time a single pymaya operation on a small scene. The
+scenario benchmarks time a complete task on a joint chain of CHAIN_LENGTH
+joints.
+
+maya must be importable before this module is imported, see run.py.
+"""
+from maya import cmds
+
+import pymaya as pm
+from pymaya import cache
+from pymaya import cmd
+from pymaya import datatypes
+
+from harness import benchmark
+
+
+CHAIN_LENGTH = 500
+
+MATRIX = [
+    0.0, 0.0, -1.0, 0.0,
+    0.0, 1.0, 0.0, 0.0,
+    1.0, 0.0, 0.0, 0.0,
+    1.0, 2.0, 3.0, 1.0,
+]
+
+BULK_PLUGS = [
+    "{}.{}".format(n, a)
+    for n in ("bulk_0", "bulk_1", "bulk_2")
+    for a in ("tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz", "v")
+]
+
+
+def newScene():
+    cmds.file(new=True, f=True)
+
+
+def buildChain(prefix, length, parent=None):
+    """Build a joint chain with commands, not timed
+
+    Returns:
+        list: the joint names
+    """
+    joints = []
+    for i in range(length):
+        parent = cmds.createNode(
+            "joint", n="{}_{}_jnt".format(prefix, i), p=parent
+        )
+        cmds.setAttr(parent + ".tx", 1.0)
+        cmds.setAttr(parent + ".jointOrient", 0, 0, 3)
+        joints.append(parent)
+    return joints
+
+
+def _nodeScene():
+    newScene()
+    joints = buildChain("small", 50)
+    for i in range(3):
+        cmds.createNode("transform", n="bulk_{}".format(i))
+    pm.PyNode(joints[0])
+    return (joints,)
+
+
+def _matrices():
+    return (datatypes.Matrix(MATRIX), datatypes.Matrix(MATRIX).inverse())
+
+
+##########################################################
+# MICRO
+##########################################################
+
+
+@benchmark("pynode_cached", number=2000, setup=_nodeScene)
+def pynodeCached(joints):
+    pm.PyNode(joints[0])
+
+
+@benchmark("pynode_uncached", number=500, setup=_nodeScene)
+def pynodeUncached(joints):
+    cache.clear()
+    pm.PyNode(joints[-1])
+
+
+@benchmark("pynode_attribute", number=500, setup=_nodeScene)
+def pynodeAttribute(joints):
+    pm.PyNode(joints[0] + ".translateX")
+
+
+@benchmark("attr_cached", number=5000, setup=_nodeScene)
+def attrCached(joints):
+    pm.PyNode(joints[0]).attr("tx")
+
+
+@benchmark("attr_getattr", number=5000, setup=_nodeScene)
+def attrGetattr(joints):
+    pm.PyNode(joints[0]).tx
+
+
+@benchmark("attr_compound_child", number=2000, setup=_nodeScene)
+def attrCompoundChild(joints):
+    pm.PyNode(joints[0]).attr("translate.translateX")
+
+
+@benchmark("attr_get", number=2000, setup=_nodeScene)
+def attrGet(joints):
+    pm.PyNode(joints[0]).tx.get()
+
+
+@benchmark("attr_set", number=2000, setup=_nodeScene)
+def attrSet(joints):
+    pm.PyNode(joints[0]).tx.set(1.0)
+
+
+@benchmark("getattr_loop", number=100, setup=_nodeScene)
+def getattrLoop(joints):
+    [pm.getAttr(plug) for plug in BULK_PLUGS]
+
+
+@benchmark("getattrs_bulk", number=100, setup=_nodeScene)
+def getattrsBulk(joints):
+    pm.getAttrs(BULK_PLUGS)
+
+
+@benchmark("setattrs_bulk_modifier", number=100, setup=_nodeScene)
+def setattrsBulkModifier(joints):
+    pm.setAttrs([(plug, 1) for plug in BULK_PLUGS], undoable=False)
+
+
+@benchmark("setattrs_bulk_undoable", number=100, setup=_nodeScene)
+def setattrsBulkUndoable(joints):
+    pm.setAttrs([(plug, 1) for plug in BULK_PLUGS])
+
+
+@benchmark("list_relatives_children", number=1000, setup=_nodeScene)
+def listRelativesChildren(joints):
+    pm.listRelatives(joints[0], c=True)
+
+
+@benchmark("list_relatives_descendents", number=50, setup=_nodeScene)
+def listRelativesDescendents(joints):
+    pm.listRelatives(joints[0], ad=True)
+
+
+@benchmark("get_parent", number=1000, setup=_nodeScene)
+def getParent(joints):
+    pm.PyNode(joints[-1]).getParent()
+
+
+@benchmark("cmd_wrap_cast_list", number=50, setup=_nodeScene)
+def cmdWrapCastList(joints):
+    pm.ls(type="joint")
+
+
+@benchmark("cmd_wrap_cast_single", number=1000, setup=_nodeScene)
+def cmdWrapCastSingle(joints):
+    pm.rename(joints[0], joints[0])
+
+
+@benchmark("cmd_wrap_no_cast", number=2000, setup=_nodeScene)
+def cmdWrapNoCast(joints):
+    pm.objExists(joints[0])
+
+
+@benchmark("cmd_wrap_overhead", number=2000, setup=_nodeScene)
+def cmdWrapOverhead(joints):
+    cmd._name_to_obj(cmds.objExists(joints[0]))
+
+
+@benchmark("matrix_construct", number=2000)
+def matrixConstruct():
+    datatypes.Matrix(MATRIX)
+
+
+@benchmark("matrix_multiply", number=2000, setup=_matrices)
+def matrixMultiply(a, b):
+    a * b
+
+
+@benchmark("matrix_inverse", number=2000, setup=_matrices)
+def matrixInverse(a, b):
+    a.inverse()
+
+
+@benchmark("matrix_rows", number=2000, setup=_matrices)
+def matrixRows(a, b):
+    a.get()
+
+
+@benchmark("transformation_matrix", number=1000, setup=_matrices)
+def transformationMatrix(a, b):
+    datatypes.TransformationMatrix(a).getTranslation("world")
+
+
+@benchmark("vector_math", number=2000)
+def vectorMath():
+    v = datatypes.Vector(1.0, 2.0, 3.0)
+    (v + datatypes.Vector(0.0, 1.0, 0.0)).normal() * 2.0
+
+
+##########################################################
+# SCENARIOS
+##########################################################
+
+
+@benchmark("scenario_build_chain", "scenario", 1, 3, setup=newScene)
+def scenarioBuildChain():
+    parent = None
+    for i in range(CHAIN_LENGTH):
+        parent = pm.createNode(
+            "joint", n="chain_{}_jnt".format(i), p=parent
+        )
+        parent.tx.set(1.0)
+        parent.jointOrient.set([0, 0, 3])
+        parent.addAttr("twist", at="double", k=True)
+
+
+def _chainScene():
+    newScene()
+    return (buildChain("chain", CHAIN_LENGTH),)
+
+
+@benchmark(
+    "scenario_query_attributes", "scenario", 1, 3, setup=_chainScene
+)
+def scenarioQueryAttributes(joints):
+    for name in joints:
+        for attribute in pm.listAttr(pm.PyNode(name), k=True):
+            attribute.get()
+
+
+def _mirrorScene():
+    newScene()
+    left = buildChain("L", CHAIN_LENGTH)
+    right = buildChain("R", CHAIN_LENGTH)
+    for i, name in enumerate(left):
+        cmds.setAttr(name + ".rotate", i % 30, (i * 7) % 45, 0)
+    return (left, right)
+
+
+def _mirrorMatrix(matrix):
+    # reflection on the YZ plane, applied on both sides to keep the axes
+    # right handed
+    m = [v for row in matrix.get() for v in row]
+    for i in (1, 2, 4, 8, 12):
+        m[i] = -m[i]
+    return datatypes.Matrix(m)
+
+
+@benchmark("scenario_mirror_pose", "scenario", 1, 3, setup=_mirrorScene)
+def scenarioMirrorPose(left, right):
+    for source, target in zip(left, right):
+        matrix = pm.PyNode(source).getMatrix(worldSpace=True)
+        pm.PyNode(target).setMatrix(_mirrorMatrix(matrix), worldSpace=True)
+
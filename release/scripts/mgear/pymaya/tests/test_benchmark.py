@@ -0,0 +1,46 @@
+import unittest
+import os
+import subprocess
+import sys
+
+BENCHMARK_PATH = os.path.join(os.path.dirname(__file__), "benchmark")
+
+# runs in its own process, the stand-in can't be imported next to maya
+FAKE_SCRIPT = """
+import run
+run.setupMaya(True)
+
+from maya import cmds
+import pymaya as pm
+
+node = pm.PyNode(cmds.createNode("transform", n="test"))
+node.tx.set(2.0)
+print(node.name(), node.tx.get())
+"""
+
+
+class TestBenchmark(unittest.TestCase):
+    def _run(self, args):
+        return subprocess.run(
+            [sys.executable] + args,
+            cwd=BENCHMARK_PATH,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+        )
+
+    def test_fake_pynode(self):
+        result = self._run(["-c", FAKE_SCRIPT])
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertEqual(result.stdout.split(), ["test", "2.0"])
+
+    def test_fake_run(self):
+        result = self._run(
+            ["run.py", "--fake", "-g", "micro", "-r", "1", "-s", "0.01"]
+        )
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertIn("pynode_cached", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
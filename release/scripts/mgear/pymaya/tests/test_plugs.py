@@ -0,0 +1,153 @@
+import unittest
+import sys
+import os
+from maya import standalone
+standalone.initialize()
+
+from maya import cmds
+
+mpath = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+if mpath not in sys.path:
+    sys.path.append(mpath)
+
+import pymaya as pm
+from pymaya import cache
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        cmds.file(new=True, f=True)
+
+    def test_same_instance(self):
+        node_name = cmds.createNode("transform", n="test")
+        node = pm.PyNode(node_name)
+        self.assertIs(node, pm.PyNode(node_name))
+        self.assertIs(node.tx, pm.PyNode(node_name).tx)
+
+    def test_rename(self):
+        node_name = cmds.createNode("transform", n="test")
+        node = pm.PyNode(node_name)
+        new_name = cmds.rename(node_name, "test2")
+        self.assertIs(node, pm.PyNode(new_name))
+        self.assertEqual(node, new_name)
+        self.assertNotEqual(node, node_name)
+
+    def test_delete(self):
+        node_name = cmds.createNode("transform", n="test")
+        node = pm.PyNode(node_name)
+        obj = node.object()
+        cmds.delete(node_name)
+        self.assertIsNone(cache.getNode(obj))
+        cmds.createNode("transform", n="test")
+        self.assertIsNot(node, pm.PyNode(node_name))
+
+    def test_new_scene(self):
+        pm.PyNode(cmds.createNode("transform", n="test"))
+        self.assertTrue(cache.NODES)
+        cmds.file(new=True, f=True)
+        self.assertFalse(cache.NODES)
+
+    def test_deleted_attr(self):
+        node_name = cmds.createNode("transform", n="test")
+        node = pm.PyNode(node_name)
+        node.addAttr("dyn", at="double")
+        self.assertIsNotNone(node.dyn)
+        cmds.deleteAttr(node_name + ".dyn")
+        with self.assertRaises(AttributeError):
+            node.dyn
+
+    def test_hash(self):
+        node_name = cmds.createNode("transform", n="test")
+        node = pm.PyNode(node_name)
+        nodes = {node: 1}
+        cmds.rename(node_name, "test2")
+        self.assertIn(pm.PyNode("test2"), nodes)
+
+
+class TestPlugs(unittest.TestCase):
+    def setUp(self):
+        cmds.file(new=True, f=True)
+
+    def test_get_attrs(self):
+        node_name = cmds.createNode("transform", n="test")
+        cmds.setAttr(node_name + ".t", 1, 2, 3)
+        cmds.setAttr(node_name + ".rx", 45)
+        cmds.setAttr(node_name + ".v", False)
+        cmds.setAttr(node_name + ".rotateOrder", 2)
+
+        tx, t, rx, v, ro, wm = pm.getAttrs(
+            [
+                node_name + ".tx",
+                node_name + ".translate",
+                pm.PyNode(node_name).rx,
+                node_name + ".v",
+                node_name + ".rotateOrder",
+                node_name + ".worldMatrix[0]",
+            ]
+        )
+        self.assertAlmostEqual(tx, 1)
+        self.assertEqual(list(t), [1, 2, 3])
+        self.assertAlmostEqual(rx, 45)
+        self.assertFalse(v)
+        self.assertEqual(ro, 2)
+        self.assertEqual(
+            list(wm), cmds.getAttr(node_name + ".worldMatrix[0]")
+        )
+
+    def test_set_attrs(self):
+        node_name = cmds.createNode("transform", n="test")
+        for undoable in (True, False):
+            pm.setAttrs(
+                {
+                    node_name + ".t": [1, 2, 3],
+                    node_name + ".ry": 90,
+                    node_name + ".v": False,
+                    node_name + ".rotateOrder": 3,
+                },
+                undoable=undoable,
+            )
+            self.assertEqual(cmds.getAttr(node_name + ".t")[0], (1, 2, 3))
+            self.assertAlmostEqual(cmds.getAttr(node_name + ".ry"), 90)
+            self.assertFalse(cmds.getAttr(node_name + ".v"))
+            self.assertEqual(cmds.getAttr(node_name + ".rotateOrder"), 3)
+            cmds.setAttr(node_name + ".t", 0, 0, 0)
+
+    def test_set_attrs_typed(self):
+        node_name = cmds.createNode("transform", n="test")
+        cmds.addAttr(node_name, ln="text", dt="string")
+        cmds.addAttr(node_name, ln="mtx", at="matrix")
+        cmds.addAttr(node_name, ln="mode", at="enum", en="a:b:c")
+        matrix = [2, 0, 0, 0, 0, 2, 0, 0, 0, 0, 2, 0, 1, 2, 3, 1]
+        for undoable in (True, False):
+            pm.setAttrs(
+                [
+                    (node_name + ".text", "hello"),
+                    (node_name + ".mtx", matrix),
+                    (node_name + ".mode", 2),
+                ],
+                undoable=undoable,
+            )
+            self.assertEqual(
+                pm.getAttrs(
+                    [node_name + ".text", node_name + ".mode"]
+                ),
+                ["hello", 2],
+            )
+            self.assertEqual(cmds.getAttr(node_name + ".mtx"), matrix)
+
+    def test_set_attrs_locked(self):
+        node_name = cmds.createNode("transform", n="test")
+        cmds.setAttr(node_name + ".ty", lock=True)
+        with self.assertRaises(pm.MayaAttributeError):
+            pm.setAttrs(
+                {node_name + ".tx": 1, node_name + ".t": [1, 1, 1]},
+                undoable=False,
+            )
+        self.assertEqual(cmds.getAttr(node_name + ".tx"), 0)
+
+    def test_undo(self):
+        node_name = cmds.createNode("transform", n="test")
+        cmds.undoInfo(state=True)
+        pm.setAttrs({node_name + ".tx": 5})
+        cmds.undo()
+        self.assertEqual(cmds.getAttr(node_name + ".tx"), 0)
@@ -84,6 +84,7 @@ from mgear.vendor.Qt import QtWidgets, QtCore, QtCompat
 # rbf
 from mgear.rigbits import rbf_io
 from mgear.rigbits import rbf_node
+from mgear.rigbits import rbf_pose_table
 from . import widget
 
 
@@ -1734,6 +1735,11 @@ class RBFManagerUI(widget.RBFWidget):
             driven_ctl.append(targetInfo[1][0])
             for attr in ["invTx", "invTy", "invTz", "invRx", "invRy", "invRz"]:
                 pm.setAttr(driven + "." + attr, pm.getAttr(ctrl + "." + attr))
+        # the mirrored poses are collected and written at once at the end
+        mrTables = [
+            rbf_pose_table.PoseTable(mrRbfNode, [], [])
+            for mrRbfNode in mrRbfNodes
+        ]
         for index in range(poseIndices):
             # Apply mirror pose to control
             aRbfNode.recallDriverPose(index)
@@ -1747,14 +1753,14 @@ class RBFManagerUI(widget.RBFWidget):
             for entry in mrData:
                 anim_utils.applyMirror(nameSpace, entry)
             poseInputs = rbf_node.getMultipleAttrs(mrDriverNode, mrDriverAttrs)
-            for mrRbfNode in mrRbfNodes:
-                poseValues = mrRbfNode.getPoseValues(resetDriven=False)
-                mrRbfNode.addPose(
-                    poseInput=poseInputs,
-                    poseValue=poseValues,
-                    posesIndex=index,
+            for mrRbfNode, mrTable in zip(mrRbfNodes, mrTables):
+                mrRbfNode.updateDriverControlPoseAttr(index)
+                mrTable.inputs.append(poseInputs)
+                mrTable.values.append(
+                    mrRbfNode.getPoseValues(resetDriven=False)
                 )
-                mrRbfNode.forceEvaluation()
+        rbf_pose_table.setPoseTables(mrTables)
+        [v.forceEvaluation() for v in mrRbfNodes]
         [v.setToggleRBFAttr(1) for v in mrRbfNodes]
         setupName, rbfType = self.getSelectedSetup()
         self.refreshRbfSetupList(setToSelection=setupName)
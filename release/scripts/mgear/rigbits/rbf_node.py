@@ -929,6 +929,7 @@ class RBFNode(object):
                 drivenNode,
                 getDrivenMatrix(drivenNode, absoluteWorld=absoluteWorld),
             )
+        otherAttrs = []
         for attr in drivenAttrs:
             if attr in TRANSLATE_ATTRS:
                 index = TRANSLATE_ATTRS.index(attr)
@@ -940,8 +941,12 @@ class RBFNode(object):
                 index = SCALE_ATTRS.index(attr)
                 attributeValue_dict[attr] = scale[index]
             else:
-                nodePlug = "{}.{}".format(drivenNode, attr)
-                attributeValue_dict[attr] = mc.getAttr(nodePlug)
+                otherAttrs.append(attr)
+        # all the other attrs in a single query
+        otherValues = pm.getAttrs(
+            ["{}.{}".format(drivenNode, attr) for attr in otherAttrs]
+        )
+        attributeValue_dict.update(zip(otherAttrs, otherValues))
         if resetDriven:
             resetDrivenNodes(drivenNode)
         poseValues = [attributeValue_dict[attr] for attr in drivenAttrs]
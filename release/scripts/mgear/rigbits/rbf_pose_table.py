@@ -0,0 +1,527 @@
+#!/usr/bin/env python
+"""Pose tables of rbf nodes, read and written in bulk
+
+All the supported rbf nodes store their poses in the same compound,
+poses[i].poseInput[j] and poses[i].poseValue[k]. A PoseTable holds all the
+inputs and values of a node as two (poses, attrs) tables, read with the API
+in a single pass, so the poses can be edited as a whole and written back
+at once.
+
+The tables are numpy arrays if numpy is available, lists of rows if not.
+
+Example:
+    >>> table = PoseTable.fromNode("shoulder_L0_WD")
+    >>> table.values[:, 0] *= 2.0
+    >>> table.write()
+
+    # add the same 10 poses to every node of a setup
+    >>> addPoses(setupNodes, inputs)
+
+    # copy the poses of a setup to its mirror
+    >>> mirrorSetups(leftNodes, rightNodes)
+
+Attributes:
+    POSES_ATTR (str): compound attr holding the poses
+    POSE_INPUT_ATTR (str): multi attr with the driver values of a pose
+    POSE_VALUE_ATTR (str): multi attr with the driven values of a pose
+"""
+# python
+from .six import PY2
+
+# core
+import maya.cmds as mc
+import maya.api.OpenMaya as om
+
+try:
+    import numpy as np
+
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
+
+# mgear
+from mgear.core import anim_utils
+
+if PY2:
+    import rbf_node
+else:
+    from . import rbf_node
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+POSES_ATTR = "poses"
+POSE_INPUT_ATTR = "poseInput"
+POSE_VALUE_ATTR = "poseValue"
+
+
+# =============================================================================
+# table utils
+# =============================================================================
+def _table(rows, width):
+    """create a table from a list of rows, padded with 0.0 to the width
+
+    Args:
+        rows (list): of lists of values
+        width (int): number of columns
+
+    Returns:
+        ndarray or list: (len(rows), width) table
+    """
+    rows = [list(row) + [0.0] * (width - len(row)) for row in rows]
+    if NUMPY_READY:
+        return np.array(rows, dtype=np.float64).reshape(len(rows), width)
+    return rows
+
+
+def _rows(table):
+    """the table as a list of lists of floats"""
+    if NUMPY_READY and isinstance(table, np.ndarray):
+        return table.tolist()
+    return [[float(v) for v in row] for row in table]
+
+
+def _width(table):
+    if NUMPY_READY and isinstance(table, np.ndarray):
+        return table.shape[1]
+    return len(table[0]) if table else 0
+
+
+def _scaleColumns(table, factors):
+    if NUMPY_READY:
+        return np.asarray(table, dtype=np.float64) * np.asarray(factors)
+    return [[v * f for v, f in zip(row, factors)] for row in table]
+
+
+def _takeColumns(table, indices, defaults):
+    """new table with the columns at the indices, or the default value
+    where the index is None
+    """
+    rows = [
+        [row[i] if i is not None else d for i, d in zip(indices, defaults)]
+        for row in _rows(table)
+    ]
+    return _table(rows, len(indices))
+
+
+def _appendRows(table, rows):
+    rows = _rows(table) + _rows(rows)
+    width = max([len(row) for row in rows] or [0])
+    return _table(rows, width)
+
+
+def defaultPoseValues(drivenAttrs):
+    """neutral pose values for the driven attrs, 1.0 for scale and 0.0
+    for everything else
+
+    Args:
+        drivenAttrs (list): of driven attr names
+
+    Returns:
+        list: of values
+    """
+    return [1.0 if a in rbf_node.SCALE_ATTRS else 0.0 for a in drivenAttrs]
+
+
+def mirrorSigns(node, attrs):
+    """get the sign of each attr when mirrored, from the mGear inverse
+    attrs (invTx, invRy, ...) of the node. Attrs without an inverse attr
+    are not inverted
+
+    Args:
+        node (str): name of the node with the inverse attrs
+        attrs (list): of attr names
+
+    Returns:
+        list: of 1.0 or -1.0
+    """
+    signs = []
+    for attr in attrs:
+        sign = 1.0
+        if mc.attributeQuery(attr, n=node, ex=True):
+            shortName = mc.attributeQuery(attr, n=node, sn=True)
+            invAttr = anim_utils.getInvertCheckButtonAttrName(shortName)
+            if mc.attributeQuery(invAttr, n=node, ex=True) and mc.getAttr(
+                "{}.{}".format(node, invAttr)
+            ):
+                sign = -1.0
+        signs.append(sign)
+    return signs
+
+
+# =============================================================================
+# read/write
+# =============================================================================
+def _getNodeObject(node):
+    selList = om.MSelectionList()
+    selList.add(str(node))
+    return selList.getDependNode(0)
+
+
+def _readMulti(plug):
+    """get the values of a multi attr
+
+    Returns:
+        list: values up to the last existing index, 0.0 for the missing ones
+    """
+    indices = plug.getExistingArrayAttributeIndices()
+    if not indices:
+        return []
+    values = [0.0] * (max(indices) + 1)
+    for index in indices:
+        values[index] = plug.elementByLogicalIndex(index).asDouble()
+    return values
+
+
+def _multiSize(plug):
+    indices = plug.getExistingArrayAttributeIndices()
+    return max(indices) + 1 if indices else 0
+
+
+def _queueRows(modifier, node, start, inputs, values):
+    """add the pose values of the rows to the modifier, from pose index
+    start
+    """
+    fnNode = om.MFnDependencyNode(_getNodeObject(node))
+    posesPlug = fnNode.findPlug(POSES_ATTR, False)
+    inputAttr = fnNode.attribute(POSE_INPUT_ATTR)
+    valueAttr = fnNode.attribute(POSE_VALUE_ATTR)
+    for attrObj, table in ((inputAttr, inputs), (valueAttr, values)):
+        for row, rowValues in enumerate(_rows(table)):
+            posePlug = posesPlug.elementByLogicalIndex(start + row)
+            multiPlug = posePlug.child(attrObj)
+            for index, value in enumerate(rowValues):
+                modifier.newPlugValueDouble(
+                    multiPlug.elementByLogicalIndex(index), value
+                )
+
+
+def _setRows(node, start, inputs, values):
+    """set the rows with one setAttr command per pose and attr, undoable"""
+    for attr, table in ((POSE_INPUT_ATTR, inputs), (POSE_VALUE_ATTR, values)):
+        for row, rowValues in enumerate(_rows(table)):
+            if not rowValues:
+                continue
+            plug = "{}.{}[{}].{}[0:{}]".format(
+                node, POSES_ATTR, start + row, attr, len(rowValues) - 1
+            )
+            mc.setAttr(plug, *rowValues)
+
+
+def writePoseRows(rowsInfo, undoable=True):
+    """write pose rows on many rbf nodes at once
+
+    With undoable False, all the values are written with a single
+    MDGModifier, which is not registered in the undo queue. With undoable
+    True, each pose is set with a setAttr command per attr.
+
+    Args:
+        rowsInfo (list): of (node, start pose index, inputs, values)
+        undoable (bool, optional): register the changes in the undo queue
+    """
+    if undoable:
+        for node, start, inputs, values in rowsInfo:
+            _setRows(node, start, inputs, values)
+        return
+
+    modifier = om.MDGModifier()
+    for node, start, inputs, values in rowsInfo:
+        _queueRows(modifier, node, start, inputs, values)
+    modifier.doIt()
+
+
+def trimPoses(node, length):
+    """remove the poses of the node from the index length
+
+    Args:
+        node (str): name of rbf node
+        length (int): number of poses to keep
+    """
+    indices = mc.getAttr("{}.{}".format(node, POSES_ATTR), mi=True) or []
+    for index in indices:
+        if index >= length:
+            mc.removeMultiInstance(
+                "{}.{}[{}]".format(node, POSES_ATTR, index), b=True
+            )
+
+
+class PoseTable(object):
+    """the poses of a rbf node as an inputs and a values table
+
+    Attributes:
+        node (str): name of the rbf node
+        inputs (ndarray or list): (poses, driver attrs) table
+        values (ndarray or list): (poses, driven attrs) table
+    """
+
+    def __init__(self, node, inputs, values):
+        self.node = str(node)
+        self.inputs = inputs
+        self.values = values
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def __repr__(self):
+        return "{}({}, {} poses)".format(
+            self.__class__.__name__, self.node, len(self)
+        )
+
+    @classmethod
+    def fromNode(cls, node):
+        """read all the poses of a rbf node in a single pass
+
+        Rows are in pose index order. Missing multi indices are read as 0.0
+        and every row is padded to the size of the input/output of the node
+
+        Args:
+            node (str): name of rbf node
+
+        Returns:
+            PoseTable: the poses of the node
+        """
+        fnNode = om.MFnDependencyNode(_getNodeObject(node))
+        posesPlug = fnNode.findPlug(POSES_ATTR, False)
+        inputAttr = fnNode.attribute(POSE_INPUT_ATTR)
+        valueAttr = fnNode.attribute(POSE_VALUE_ATTR)
+        inputs = []
+        values = []
+        for index in posesPlug.getExistingArrayAttributeIndices():
+            posePlug = posesPlug.elementByLogicalIndex(index)
+            inputs.append(_readMulti(posePlug.child(inputAttr)))
+            values.append(_readMulti(posePlug.child(valueAttr)))
+
+        inputWidth = max(
+            [len(r) for r in inputs]
+            + [_multiSize(fnNode.findPlug("input", False))]
+        )
+        valueWidth = max(
+            [len(r) for r in values]
+            + [_multiSize(fnNode.findPlug("output", False))]
+        )
+        return cls(
+            node, _table(inputs, inputWidth), _table(values, valueWidth)
+        )
+
+    def copy(self, node=None):
+        """copy of the table, optionally for another node
+
+        Args:
+            node (str, optional): name of the node of the copy
+
+        Returns:
+            PoseTable: the copy
+        """
+        return self.__class__(
+            node or self.node,
+            _table(_rows(self.inputs), _width(self.inputs)),
+            _table(_rows(self.values), _width(self.values)),
+        )
+
+    def poseInfo(self):
+        """the table in the getPoseInfo format
+
+        Returns:
+            dict: poseInput: list of rows, poseValue: list of rows
+        """
+        return {
+            POSE_INPUT_ATTR: _rows(self.inputs),
+            POSE_VALUE_ATTR: _rows(self.values),
+        }
+
+    def appendPoses(self, inputs, values):
+        """append poses at the end of the table
+
+        Args:
+            inputs (list): of pose input rows
+            values (list): of pose value rows
+        """
+        self.inputs = _appendRows(self.inputs, inputs)
+        self.values = _appendRows(self.values, values)
+
+    def removePose(self, index):
+        """remove a pose from the table
+
+        Args:
+            index (int): row to remove
+        """
+        inputs = _rows(self.inputs)
+        values = _rows(self.values)
+        inputs.pop(index)
+        values.pop(index)
+        self.inputs = _table(inputs, _width(self.inputs))
+        self.values = _table(values, _width(self.values))
+
+    def mirrored(self, inputSigns=None, valueSigns=None, node=None):
+        """copy of the table with the columns multiplied by the signs
+
+        Args:
+            inputSigns (list, optional): one sign per input column
+            valueSigns (list, optional): one sign per value column
+            node (str, optional): name of the node of the copy
+
+        Returns:
+            PoseTable: the mirrored table
+        """
+        table = self.copy(node)
+        if inputSigns is not None:
+            table.inputs = _scaleColumns(table.inputs, inputSigns)
+        if valueSigns is not None:
+            table.values = _scaleColumns(table.values, valueSigns)
+        return table
+
+    def retargeted(self, srcAttrs, dstAttrs, node=None, defaults=None):
+        """copy of the table with the value columns matched by driven attr
+        name. The attrs missing in the source get the default value
+
+        Args:
+            srcAttrs (list): driven attrs of the columns of this table
+            dstAttrs (list): driven attrs of the columns of the copy
+            node (str, optional): name of the node of the copy
+            defaults (list, optional): default per dstAttrs, see
+                defaultPoseValues
+
+        Returns:
+            PoseTable: the retargeted table
+        """
+        if defaults is None:
+            defaults = defaultPoseValues(dstAttrs)
+        indices = [
+            srcAttrs.index(a) if a in srcAttrs else None for a in dstAttrs
+        ]
+        table = self.copy(node)
+        table.values = _takeColumns(self.values, indices, defaults)
+        return table
+
+    def write(self, node=None, undoable=True, trim=True):
+        """write the table on the node
+
+        Args:
+            node (str, optional): write to another node
+            undoable (bool, optional): see writePoseRows
+            trim (bool, optional): remove the poses of the node past the end
+                of the table
+        """
+        node = node or self.node
+        writePoseRows([(node, 0, self.inputs, self.values)], undoable)
+        if trim:
+            trimPoses(node, len(self))
+
+
+# =============================================================================
+# batch operations
+# =============================================================================
+def getPoseTables(nodes):
+    """read the pose tables of many rbf nodes
+
+    Args:
+        nodes (list): of rbf node names
+
+    Returns:
+        list: of PoseTable
+    """
+    return [PoseTable.fromNode(node) for node in nodes]
+
+
+def setPoseTables(tables, undoable=True, trim=True):
+    """write many pose tables at once, see writePoseRows
+
+    Args:
+        tables (list): of PoseTable
+        undoable (bool, optional): register the changes in the undo queue
+        trim (bool, optional): remove the poses past the end of the tables
+    """
+    writePoseRows(
+        [(t.node, 0, t.inputs, t.values) for t in tables], undoable
+    )
+    if trim:
+        for table in tables:
+            trimPoses(table.node, len(table))
+
+
+def addPoses(rbfNodes, inputs, values=None, undoable=True):
+    """add the same poses at the end of all the nodes of a setup
+
+    Args:
+        rbfNodes (list): of RBFNode
+        inputs (list): of pose input rows, shared by all the nodes
+        values (dict, optional): node name: pose value rows. The nodes
+            missing get the default values of their driven attrs
+        undoable (bool, optional): register the changes in the undo queue
+
+    Returns:
+        int: index of the first added pose
+    """
+    values = values or {}
+    start = None
+    rowsInfo = []
+    for rbfNode in rbfNodes:
+        node = str(rbfNode)
+        indices = mc.getAttr("{}.{}".format(node, POSES_ATTR), mi=True)
+        nodeStart = max(indices) + 1 if indices else 0
+        start = nodeStart if start is None else max(start, nodeStart)
+        nodeValues = values.get(node)
+        if nodeValues is None:
+            default = defaultPoseValues(rbfNode.getDrivenNodeAttributes())
+            nodeValues = [default] * len(inputs)
+        rowsInfo.append([node, None, inputs, nodeValues])
+
+    for rowInfo in rowsInfo:
+        rowInfo[1] = start
+    writePoseRows(rowsInfo, undoable)
+    return start
+
+
+def mirrorSetups(srcNodes, dstNodes, undoable=True):
+    """copy the poses of a setup to its mirror, inverting the columns of
+    the attrs with an mGear inverse attr on the driver and driven nodes
+
+    Args:
+        srcNodes (list): of RBFNode
+        dstNodes (list): of RBFNode, in the same order
+        undoable (bool, optional): register the changes in the undo queue
+
+    Returns:
+        list: of the written PoseTable
+    """
+    tables = []
+    for srcNode, dstNode in zip(srcNodes, dstNodes):
+        inputSigns = mirrorSigns(
+            dstNode.getDriverNode()[0], dstNode.getDriverNodeAttributes()
+        )
+        srcAttrs = srcNode.getDrivenNodeAttributes()
+        dstAttrs = dstNode.getDrivenNodeAttributes()
+        table = PoseTable.fromNode(str(srcNode)).retargeted(
+            srcAttrs, dstAttrs, node=str(dstNode)
+        )
+        valueSigns = mirrorSigns(dstNode.getDrivenNode()[0], dstAttrs)
+        tables.append(table.mirrored(inputSigns, valueSigns))
+    setPoseTables(tables, undoable=undoable)
+    return tables
+
+
+def retargetSetups(srcNode, dstNodes, copyValues=False, undoable=True):
+    """copy the pose inputs of a node to other nodes, matching the pose
+    values by driven attr name or resetting them to the default
+
+    Args:
+        srcNode (RBFNode): node to copy the poses from
+        dstNodes (list): of RBFNode
+        copyValues (bool, optional): copy the values of the driven attrs
+            shared with the source, or use the default values
+        undoable (bool, optional): register the changes in the undo queue
+
+    Returns:
+        list: of the written PoseTable
+    """
+    srcTable = PoseTable.fromNode(str(srcNode))
+    srcAttrs = srcNode.getDrivenNodeAttributes() if copyValues else []
+    tables = []
+    for dstNode in dstNodes:
+        dstAttrs = dstNode.getDrivenNodeAttributes()
+        tables.append(
+            srcTable.retargeted(srcAttrs, dstAttrs, node=str(dstNode))
+        )
+    setPoseTables(tables, undoable=undoable)
+    return tables
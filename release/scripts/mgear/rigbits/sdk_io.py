@@ -28,11 +28,17 @@ copySDKsToNode("jacketFlap_L0_fk0_sdk",
 
 Attributes:
     SDK_ANIMCURVES_TYPE (list): sdk anim curves to support
+    TANGENT_TYPES (dict): tangent type names, as exported, to MFnAnimCurve
+        tangent types
 """
 import json
 import pprint
 
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as om2anim
+
 import mgear.pymaya as pm
+from mgear.core import api_undo
 from mgear.core import attribute
 
 import mgear.core.utils as mUtils
@@ -41,6 +47,22 @@ from .six import string_types
 SDK_UTILITY_TYPE = ("blendWeighted",)
 SDK_ANIMCURVES_TYPE = ("animCurveUA", "animCurveUL", "animCurveUU")
 
+TANGENT_TYPES = {
+    "global": om2anim.MFnAnimCurve.kTangentGlobal,
+    "fixed": om2anim.MFnAnimCurve.kTangentFixed,
+    "linear": om2anim.MFnAnimCurve.kTangentLinear,
+    "flat": om2anim.MFnAnimCurve.kTangentFlat,
+    "spline": om2anim.MFnAnimCurve.kTangentSmooth,
+    "step": om2anim.MFnAnimCurve.kTangentStep,
+    "slow": om2anim.MFnAnimCurve.kTangentSlow,
+    "fast": om2anim.MFnAnimCurve.kTangentFast,
+    "clamped": om2anim.MFnAnimCurve.kTangentClamped,
+    "plateau": om2anim.MFnAnimCurve.kTangentPlateau,
+    "stepnext": om2anim.MFnAnimCurve.kTangentStepNext,
+    "auto": om2anim.MFnAnimCurve.kTangentAuto,
+}
+TANGENT_NAMES = dict((v, k) for k, v in TANGENT_TYPES.items())
+
 
 # ==============================================================================
 # Data export
@@ -259,29 +281,15 @@ def getSDKInfo(animNode):
         animNode (pynode): name of node, pynode
 
     Returns:
-        dict: dictionary of all the attrs to be exported
+        dict: dictionary of all the attrs to be exported. The keys are
+        [input, value, inTangentType, outTangentType] lists, the values in
+        UI units. The tangents are [inX, inY, outX, outY] lists in internal
+        units, used to restore the fixed tangents
     """
     sdkInfo_dict = {}
-    sdkKey_Info = []
-    numberOfKeys = int(
-        len(pm.listAttr("{0}.ktv".format(animNode), multi=True)) / 3
-    )
-    itt_list = pm.keyTangent(animNode, itt=True, q=True)
-    ott_list = pm.keyTangent(animNode, ott=True, q=True)
-    # maya doesnt return value if there is only one key frame set.
-    if itt_list is None:
-        itt_list = ["linear"]
-    if ott_list is None:
-        ott_list = ["linear"]
-
-    for index in range(0, numberOfKeys):
-        value = pm.getAttr("{0}.keyTimeValue[{1}]".format(animNode, index))
-        absoluteValue = pm.keyframe(
-            animNode, q=True, valueChange=True, index=(index,)
-        )[0]
-        keyData = [value[0], absoluteValue, itt_list[index], ott_list[index]]
-        sdkKey_Info.append(keyData)
+    sdkKey_Info, tangents = getCurveKeys(animNode)
     sdkInfo_dict["keys"] = sdkKey_Info
+    sdkInfo_dict["tangents"] = tangents
     sdkInfo_dict["type"] = animNode.type()
     sdkInfo_dict["preInfinity"] = animNode.getAttr("preInfinity")
     sdkInfo_dict["postInfinity"] = animNode.getAttr("postInfinity")
@@ -531,6 +539,9 @@ def getBlendNodes(attrPlug):
 def createSDKFromDict(sdkInfo_dict):
     """Create a sdk node from the provided info dict
 
+    The node and connections are created with commands and the keys are
+    added with setCurveKeys, all registered in the undo queue.
+
     Args:
         sdkInfo_dict (dict): dict of node information to create
 
@@ -567,29 +578,324 @@ def createSDKFromDict(sdkInfo_dict):
         targetAttrPlug = drivenAttrPlug
 
     pm.connectAttr(sdkNode.output, targetAttrPlug, f=True)
+    sdkNode.setAttr("preInfinity", sdkInfo_dict["preInfinity"])
+    sdkNode.setAttr("postInfinity", sdkInfo_dict["postInfinity"])
 
-    animKeys = sdkInfo_dict["keys"]
-    for index in range(0, len(animKeys)):
-        frameValue = animKeys[index]
-        # Note: fixed is not supported by setKeyframe. we swap it to linear
+    # the keys are added in a single pass, the animCurve change registers
+    # them in the undo queue
+    change = om2anim.MAnimCurveChange()
+    swapped = setCurveKeys(
+        sdkNode.name(),
+        sdkInfo_dict["keys"],
+        sdkInfo_dict.get("tangents"),
+        sdkInfo_dict["weightedTangents"],
+        change=change,
+    )
+    api_undo.commit(change.undoIt, change.redoIt)
+    if swapped:
         pm.displayWarning(
-            "SDK fixed interpolation is not supported by setKeyframe."
-            " We swap it to linear"
+            "{}: SDK with fixed interpolation and no tangents in the file,"
+            " swapped to linear".format(sdkNode)
         )
-        it = "linear" if frameValue[2] == "fixed" else frameValue[2]
-        ot = "linear" if frameValue[3] == "fixed" else frameValue[3]
-        pm.setKeyframe(
-            sdkNode, float=frameValue[0], value=frameValue[1], itt=it, ott=ot
+
+    return sdkNode
+
+
+# ==============================================================================
+# SDK transfer engine
+# ==============================================================================
+
+
+def _getMObject(nodeName):
+    selList = om2.MSelectionList()
+    selList.add(str(nodeName))
+    return selList.getDependNode(0)
+
+
+def _getMPlug(plugName):
+    selList = om2.MSelectionList()
+    try:
+        selList.add(plugName)
+        return selList.getPlug(0)
+    except (RuntimeError, TypeError):
+        raise RuntimeError("No such attribute '{}'".format(plugName))
+
+
+def _uiValueConverters(curveType):
+    """Functions converting the output values of a curve type between
+    internal and UI units.
+
+    Returns:
+        tuple: (toUI, toInternal) functions
+    """
+    if curveType == "animCurveUA":
+        unit = om2.MAngle.uiUnit()
+        return (
+            lambda v: om2.MAngle(v).asUnits(unit),
+            lambda v: om2.MAngle(v, unit).asRadians(),
         )
+    if curveType == "animCurveUL":
+        unit = om2.MDistance.uiUnit()
+        internal = om2.MDistance.internalUnit()
+        return (
+            lambda v: om2.MDistance(v).asUnits(unit),
+            lambda v: om2.MDistance(v, unit).asUnits(internal),
+        )
+    return (float, float)
 
-    sdkNode.setAttr("preInfinity", sdkInfo_dict["preInfinity"])
-    sdkNode.setAttr("postInfinity", sdkInfo_dict["postInfinity"])
-    pm.keyTangent(sdkNode)
-    pm.keyTangent(
-        sdkNode, edit=True, weightedTangents=sdkInfo_dict["weightedTangents"]
+
+def getCurveKeys(animNode):
+    """Read all the keys of a sdk/animCurve with the animCurve function set
+
+    Args:
+        animNode (str, pynode): sdk node
+
+    Returns:
+        tuple: keys as [input, value, inTangentType, outTangentType] lists
+        with the value in UI units, and tangents as [inX, inY, outX, outY]
+        lists in internal units
+    """
+    obj = _getMObject(animNode)
+    fnCurve = om2anim.MFnAnimCurve(obj)
+    toUI = _uiValueConverters(om2.MFnDependencyNode(obj).typeName)[0]
+    keys = []
+    tangents = []
+    for index in range(fnCurve.numKeys):
+        keys.append(
+            [
+                fnCurve.input(index),
+                toUI(fnCurve.value(index)),
+                TANGENT_NAMES.get(fnCurve.inTangentType(index), "auto"),
+                TANGENT_NAMES.get(fnCurve.outTangentType(index), "auto"),
+            ]
+        )
+        tangents.append(
+            list(fnCurve.getTangentXY(index, True))
+            + list(fnCurve.getTangentXY(index, False))
+        )
+    return keys, tangents
+
+
+def setCurveKeys(animNode, keys, tangents=None, weighted=False, change=None):
+    """Add keys to an empty sdk/animCurve with the animCurve function set
+
+    The keys are added in a single pass, without the setKeyframe command.
+    The edits are only undoable through the change. Fixed tangents are
+    restored from the tangents, they are swapped to linear if the tangents
+    are not provided, like in the files exported before the tangents were
+    added.
+
+    Args:
+        animNode (str, pynode or MObject): sdk node
+        keys (list): [input, value, inTangentType, outTangentType] lists,
+            values in UI units
+        tangents (list, optional): [inX, inY, outX, outY] lists, in
+            internal units
+        weighted (bool, optional): weighted tangents
+        change (MAnimCurveChange, optional): records the edits, to
+            register them in the undo queue with api_undo
+
+    Returns:
+        int: number of fixed tangents swapped to linear
+    """
+    if not isinstance(animNode, om2.MObject):
+        animNode = _getMObject(animNode)
+    fnCurve = om2anim.MFnAnimCurve(animNode)
+    toInternal = _uiValueConverters(
+        om2.MFnDependencyNode(animNode).typeName
+    )[1]
+    fnCurve.setIsWeighted(weighted, change)
+
+    swapped = 0
+    linear = TANGENT_TYPES["linear"]
+    for keyIndex, (keyInput, value, itt, ott) in enumerate(keys):
+        tangentTypes = []
+        for tangentType in (itt, ott):
+            if tangentType == "fixed" and not tangents:
+                swapped += 1
+            tangentTypes.append(
+                linear
+                if tangentType == "fixed" and not tangents
+                else TANGENT_TYPES.get(tangentType, linear)
+            )
+        index = fnCurve.addKey(
+            keyInput, toInternal(value), *tangentTypes, change=change
+        )
+        if not tangents:
+            continue
+        inX, inY, outX, outY = tangents[keyIndex]
+        if itt == "fixed":
+            fnCurve.setTangent(
+                index, inX, inY, True, change, convertUnits=False
+            )
+        if ott == "fixed":
+            fnCurve.setTangent(
+                index, outX, outY, False, change, convertUnits=False
+            )
+
+    return swapped
+
+
+def _prepareSDK(sdkInfo_dict):
+    """Resolve the plugs of a sdk to create
+
+    Returns:
+        tuple: name of the sdk node, driver plug and driven plug
+    """
+    if sdkInfo_dict["type"] not in SDK_ANIMCURVES_TYPE:
+        raise RuntimeError(
+            "Unsupported sdk type '{}'".format(sdkInfo_dict["type"])
+        )
+    driverPlug = _getMPlug(
+        "{0}.{1}".format(
+            sdkInfo_dict["driverNode"], sdkInfo_dict["driverAttr"]
+        )
     )
+    drivenAttrPlug = "{0}.{1}".format(
+        sdkInfo_dict["drivenNode"], sdkInfo_dict["drivenAttr"]
+    )
+    drivenPlug = _getMPlug(drivenAttrPlug)
+    # resolve the alias name just in case is a blendshape
+    sdkAttrAliasName = attribute.get_alias_for_attr(drivenAttrPlug).split(
+        "."
+    )[1]
+    sdkName = "{0}_{1}".format(sdkInfo_dict["drivenNode"], sdkAttrAliasName)
+    return sdkName, driverPlug, drivenPlug
 
-    return sdkNode
+
+def _drivenSource(drivenPlug):
+    """Get the sdk or blendWeighted node already driving a plug
+
+    Returns:
+        MPlug: the source plug, or None if the plug is not connected
+
+    Raises:
+        RuntimeError: if the plug is driven by another type of node
+    """
+    sources = drivenPlug.connectedTo(True, False)
+    if not sources:
+        return None
+    source = sources[0]
+    sourceType = om2.MFnDependencyNode(source.node()).typeName
+    if sourceType not in SDK_UTILITY_TYPE + SDK_ANIMCURVES_TYPE:
+        raise RuntimeError(
+            "'{}' is already driven by '{}'".format(
+                drivenPlug.name(), source.name()
+            )
+        )
+    return source
+
+
+def _connectDriven(modifier, drivenPlug, source, outputs):
+    """Add the connections of the sdk outputs driving a plug to a modifier.
+    A blendWeighted node combines the outputs if there are many sdk, like
+    getBlendNodes.
+    """
+    if source is None and len(outputs) == 1:
+        modifier.connect(outputs[0], drivenPlug)
+        return
+
+    if source is not None and (
+        om2.MFnDependencyNode(source.node()).typeName in SDK_UTILITY_TYPE
+    ):
+        blendNode = source.node()
+    else:
+        blendNode = modifier.createNode(SDK_UTILITY_TYPE[0])
+        modifier.renameNode(
+            blendNode, "{0}_bwn".format(drivenPlug.name().replace(".", "_"))
+        )
+        if source is not None:
+            modifier.disconnect(source, drivenPlug)
+            outputs = [source] + outputs
+        modifier.connect(
+            om2.MFnDependencyNode(blendNode).findPlug("output", False),
+            drivenPlug,
+        )
+
+    inputPlug = om2.MFnDependencyNode(blendNode).findPlug("input", False)
+    indices = inputPlug.getExistingArrayAttributeIndices()
+    start = max(indices) + 1 if indices else 0
+    for i, output in enumerate(outputs):
+        modifier.connect(output, inputPlug.elementByLogicalIndex(start + i))
+
+
+def createSDKsFromDict(allSDKInfo_dict):
+    """Create all the sdk nodes of an export dict at once
+
+    The plugs are resolved first, then all the nodes and connections are
+    created with a single DG modifier and the keys are added with the
+    animCurve function set. The changes are not registered in the undo
+    queue. A sdk that can't be created doesn't stop the others, the
+    failures are returned.
+
+    Args:
+        allSDKInfo_dict (dict): sdk name as key, sdk info dict as value, as
+            exported by exportSDKs
+
+    Returns:
+        tuple: list of created sdk node names, and list of (sdk name,
+        error message) of the sdk that failed
+    """
+    failedNodes = []
+    drivenSDKs = {}
+    for sdkName, sdkInfo_dict in allSDKInfo_dict.items():
+        try:
+            nodeName, driverPlug, drivenPlug = _prepareSDK(sdkInfo_dict)
+        except Exception as e:
+            failedNodes.append((sdkName, str(e)))
+            continue
+        drivenSDKs.setdefault(drivenPlug.name(), (drivenPlug, []))[1].append(
+            (sdkName, nodeName, driverPlug, sdkInfo_dict)
+        )
+
+    modifier = om2.MDGModifier()
+    sdkNodes = []
+    for drivenName, (drivenPlug, sdks) in drivenSDKs.items():
+        try:
+            source = _drivenSource(drivenPlug)
+        except RuntimeError as e:
+            failedNodes.extend((sdk[0], str(e)) for sdk in sdks)
+            continue
+
+        outputs = []
+        for sdkName, nodeName, driverPlug, sdkInfo_dict in sdks:
+            sdkNode = modifier.createNode(sdkInfo_dict["type"])
+            modifier.renameNode(sdkNode, nodeName)
+            fnNode = om2.MFnDependencyNode(sdkNode)
+            modifier.connect(driverPlug, fnNode.findPlug("input", False))
+            for attr in ("preInfinity", "postInfinity"):
+                modifier.newPlugValueInt(
+                    fnNode.findPlug(attr, False), int(sdkInfo_dict[attr])
+                )
+            outputs.append(fnNode.findPlug("output", False))
+            sdkNodes.append((sdkName, sdkNode, sdkInfo_dict))
+        _connectDriven(modifier, drivenPlug, source, outputs)
+
+    modifier.doIt()
+
+    createdNodes = []
+    swapped = []
+    for sdkName, sdkNode, sdkInfo_dict in sdkNodes:
+        try:
+            if setCurveKeys(
+                sdkNode,
+                sdkInfo_dict["keys"],
+                sdkInfo_dict.get("tangents"),
+                sdkInfo_dict["weightedTangents"],
+            ):
+                swapped.append(sdkName)
+        except Exception as e:
+            failedNodes.append((sdkName, str(e)))
+            continue
+        createdNodes.append(om2.MFnDependencyNode(sdkNode).name())
+
+    if swapped:
+        pm.displayWarning(
+            "{} SDK with fixed interpolation and no tangents in the file, "
+            "swapped to linear: {}".format(len(swapped), ", ".join(swapped))
+        )
+
+    return createdNodes, failedNodes
 
 
 def exportSDKs(nodes, filePath):
@@ -608,14 +914,40 @@ def exportSDKs(nodes, filePath):
     return sdksToExport_dict
 
 
-@mUtils.one_undo
-def importSDKs(filePath):
+def importSDKs(filePath, undoable=True):
     """create sdk nodes from json file, connected to drivers and driven
 
+    By default each sdk is created with createSDKFromDict, in a single undo
+    chunk. Batch callers can set undoable to False to create all the sdk at
+    once with createSDKsFromDict, which is faster but can't be undone.
+
     Args:
         filePath (string): path to json file
+        undoable (bool, optional): create the sdk with undoable commands.
+            False creates them with a single DG modifier, without undo
+
+    Returns:
+        tuple: list of created sdk nodes, and list of failed sdk names
     """
     allSDKInfo_dict = _importData(filePath)
+    if undoable:
+        createdNodes, failedNodes = _importSDKsUndoable(allSDKInfo_dict)
+    else:
+        createdNodes, errors = createSDKsFromDict(allSDKInfo_dict)
+        failedNodes = []
+        for sdkName, error in errors:
+            failedNodes.append(sdkName)
+            print("{0}:{1}".format(sdkName, error))
+    print("Nodes created ---------------------------------")
+    pprint.pprint(createdNodes)
+
+    print("Nodes failed  ---------------------------------")
+    pprint.pprint(failedNodes)
+    return createdNodes, failedNodes
+
+
+@mUtils.one_undo
+def _importSDKsUndoable(allSDKInfo_dict):
     createdNodes = []
     failedNodes = []
     for sdkName, sdkInfo_dict in allSDKInfo_dict.items():
@@ -624,8 +956,4 @@ def importSDKs(filePath):
         except Exception as e:
             failedNodes.append(sdkName)
             print("{0}:{1}".format(sdkName, e))
-    print("Nodes created ---------------------------------")
-    pprint.pprint(createdNodes)
-
-    print("Nodes failed  ---------------------------------")
-    pprint.pprint(failedNodes)
+    return createdNodes, failedNodes
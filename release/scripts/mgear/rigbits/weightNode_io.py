@@ -43,9 +43,11 @@ import mgear.pymaya as pm
 if PY2:
     import rbf_io
     import rbf_node
+    import rbf_pose_table
 else:
     from . import rbf_io
     from . import rbf_node
+    from . import rbf_pose_table
 
 # ==============================================================================
 # Constants
@@ -318,20 +320,7 @@ def getPoseInfo(node):
     Returns:
         dict: of poseInput:list of values, poseValue:values
     """
-    lengthenCompoundAttrs(node)
-    tmp_dict = {"poseInput": [], "poseValue": []}
-    numberOfPoses = pm.getAttr("{}.poses".format(node), mi=True) or []
-    for index in numberOfPoses:
-        nameAttrInput = "{0}.poses[{1}].poseInput".format(node, index)
-        nameAttrValue = "{0}.poses[{1}].poseValue".format(node, index)
-        poseInputIndex = pm.getAttr(nameAttrInput, mi=True) or []
-        poseValueIndex = pm.getAttr(nameAttrValue, mi=True) or []
-        poseInput = getIndexValue(nameAttrInput, poseInputIndex)
-        poseValue = getIndexValue(nameAttrValue, poseValueIndex)
-        tmp_dict["poseInput"].append(poseInput)
-        tmp_dict["poseValue"].append(poseValue)
-
-    return tmp_dict
+    return rbf_pose_table.PoseTable.fromNode(node).poseInfo()
 
 
 def getDriverListInfo(node):
@@ -493,7 +482,7 @@ def getDrivenNodeAttributes(node):
 
 def copyPoses(nodeA, nodeB, emptyPoseValues=True):
     """Copy poses from nodeA to nodeB with the option to be blank or node
-    for syncing nodes OF EQUAL LENGTH IN POSE INFO
+    for syncing nodes. The pose values are matched by driven attr name.
 
     Args:
         nodeA (str): name of weightedNode
@@ -504,32 +493,13 @@ def copyPoses(nodeA, nodeB, emptyPoseValues=True):
     Returns:
         n/a: n/a
     """
-    posesIndices = pm.getAttr("{}.poses".format(nodeA), mi=True) or [None]
-    if len(posesIndices) == 1 and posesIndices[0] is None:
+    table = rbf_pose_table.PoseTable.fromNode(str(nodeA))
+    if not len(table):
         return
-    nodeA_poseInfo = getPoseInfo(nodeA)
-    drivenAttrs = getDrivenNodeAttributes(nodeB)
-    nodeBdrivenIndex = list(range(len(drivenAttrs)))
-    for attr, value in nodeA_poseInfo.items():
-        if value == ():
-            continue
-        numberOfPoses = len(value)
-        for poseIndex in range(numberOfPoses):
-            poseValues = value[poseIndex]
-            for index, pIndexValue in enumerate(poseValues):
-                pathToAttr = "{}.poses[{}].{}[{}]".format(
-                    nodeB, poseIndex, attr, index
-                )
-                if attr == "poseInput":
-                    valueToSet = pIndexValue
-                elif attr == "poseValue" and emptyPoseValues:
-                    if drivenAttrs[index] in rbf_node.SCALE_ATTRS:
-                        valueToSet = 1.0
-                    else:
-                        valueToSet = 0.0
-                if index > nodeBdrivenIndex:
-                    continue
-                pm.setAttr(pathToAttr, valueToSet)
+    srcAttrs = [] if emptyPoseValues else getDrivenNodeAttributes(str(nodeA))
+    dstAttrs = getDrivenNodeAttributes(str(nodeB))
+    table = table.retargeted(srcAttrs, dstAttrs, node=str(nodeB))
+    table.write(trim=False)
 
 
 def syncPoseIndices(srcNode, destNode):
@@ -541,25 +511,10 @@ def syncPoseIndices(srcNode, destNode):
         srcNode (str): weightedDriver
         destNode (str): weightedDriver
     """
-    src_poseInfo = getPoseInfo(srcNode)
-    destDrivenAttrs = getDrivenNodeAttributes(destNode)
-    for poseIndex, piValues in enumerate(src_poseInfo["poseInput"]):
-        for index, piValue in enumerate(piValues):
-            pathToAttr = "{}.poses[{}].poseInput[{}]".format(
-                destNode, poseIndex, index
-            )
-            pm.setAttr(pathToAttr, piValue)
-
-    for poseIndex, piValues in enumerate(src_poseInfo["poseValue"]):
-        for index, piValAttr in enumerate(destDrivenAttrs):
-            pathToAttr = "{}.poses[{}].poseValue[{}]".format(
-                destNode, poseIndex, index
-            )
-            if piValAttr in rbf_node.SCALE_ATTRS:
-                valueToSet = 1.0
-            else:
-                valueToSet = 0.0
-            pm.setAttr(pathToAttr, valueToSet)
+    table = rbf_pose_table.PoseTable.fromNode(str(srcNode))
+    destDrivenAttrs = getDrivenNodeAttributes(str(destNode))
+    table = table.retargeted([], destDrivenAttrs, node=str(destNode))
+    table.write(trim=False)
 
 
 def getNodeInfo(node):
@@ -627,16 +582,9 @@ def deletePose(node, indexToPop):
         node (str): weightDriver
         indexToPop (int): pose index to remove
     """
-    node = pm.PyNode(node)
-    posesInfo = getPoseInfo(node)
-    poseInput = posesInfo["poseInput"]
-    poseValue = posesInfo["poseValue"]
-    currentLength = list(range(len(poseInput)))
-    poseInput.pop(indexToPop)
-    poseValue.pop(indexToPop)
-    setPosesFromInfo(node, posesInfo)
-    attrPlug = "{}.poses[{}]".format(node, currentLength[-1])
-    pm.removeMultiInstance(attrPlug, b=True)
+    table = rbf_pose_table.PoseTable.fromNode(str(node))
+    table.removePose(indexToPop)
+    table.write()
 
 
 def addPose(node, poseInput, poseValue, posesIndex=None):
@@ -652,13 +600,9 @@ def addPose(node, poseInput, poseValue, posesIndex=None):
     if posesIndex is None:
         posesIndex = len(pm.getAttr("{}.poses".format(node), mi=True) or [])
 
-    for index, value in enumerate(poseInput):
-        attrPlug = "{}.poses[{}].poseInput[{}]".format(node, posesIndex, index)
-        pm.setAttr(attrPlug, value)
-
-    for index, value in enumerate(poseValue):
-        attrPlug = "{}.poses[{}].poseValue[{}]".format(node, posesIndex, index)
-        pm.setAttr(attrPlug, value)
+    rbf_pose_table.writePoseRows(
+        [(str(node), posesIndex, [poseInput], [poseValue])]
+    )
 
 
 def setPosesFromInfo(node, posesInfo):
@@ -668,15 +612,16 @@ def setPosesFromInfo(node, posesInfo):
         node (str): weightDriver
         posesInfo (dict): of poseInput/PoseValue:values
     """
-    for attr, value in posesInfo.items():
-        if value == ():
-            continue
-        numberOfPoses = len(value)
-        for poseIndex in range(numberOfPoses):
-            poseValues = value[poseIndex]
-            for index, pIndexValue in enumerate(poseValues):
-                pathToAttr = "poses[{}].{}[{}]".format(poseIndex, attr, index)
-                node.setAttr(pathToAttr, pIndexValue)
+    rbf_pose_table.writePoseRows(
+        [
+            (
+                str(node),
+                0,
+                posesInfo.get("poseInput") or [],
+                posesInfo.get("poseValue") or [],
+            )
+        ]
+    )
 
 
 def setDriverListFromInfo(node, driverListInfo):
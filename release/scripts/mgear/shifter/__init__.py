@@ -16,10 +16,10 @@ import mgear.core.utils
 from . import guide, component
 
 from mgear.core import primitive, attribute, skin, dag, icon, node
-from mgear import shifter_classic_components
-from mgear import shifter_epic_components
 from mgear.shifter import naming
-import importlib
+from mgear.shifter import incremental
+from mgear.shifter import profiler
+from mgear.shifter import registry
 from mgear.core import utils
 
 PY2 = sys.version_info[0] == 2
@@ -36,7 +36,7 @@ if not pm.pluginInfo("matrixNodes", q=True, loaded=True):
 COMPONENT_PATH = os.path.join(os.path.dirname(__file__), "component")
 TEMPLATE_PATH = os.path.join(COMPONENT_PATH, "templates")
 
-SHIFTER_COMPONENT_ENV_KEY = "MGEAR_SHIFTER_COMPONENT_PATH"
+SHIFTER_COMPONENT_ENV_KEY = registry.SHIFTER_COMPONENT_ENV_KEY
 
 
 def log_window():
@@ -95,23 +95,26 @@ def log_window():
 
 
 def getComponentDirectories():
-    """Get the components directory"""
-    # TODO: ready to support multiple default directories
-    return mgear.core.utils.gatherCustomModuleDirectories(
-        SHIFTER_COMPONENT_ENV_KEY,
-        [
-            os.path.join(os.path.dirname(shifter_classic_components.__file__)),
-            os.path.join(os.path.dirname(shifter_epic_components.__file__)),
-        ],
-    )
-    # return mgear.core.utils.gatherCustomModuleDirectories(
-    #     SHIFTER_COMPONENT_ENV_KEY,
-    #     os.path.join(os.path.dirname(shifter_classic_components.__file__)))
+    """Get the components directory
+
+    The directories are resolved from the component registry, so the
+    folders are only listed again when a search directory changed.
+
+    Returns:
+        dict: Directory as key and the list of component types as value
+    """
+    return registry.get_component_directories()
 
 
 def importComponentGuide(comp_type):
     """Import the Component guide"""
-    dirs = getComponentDirectories()
+    if registry.get_component_info(comp_type) is not None:
+        return registry.import_component(comp_type, guide=True)
+
+    # not registered type. Fallback to the standard module search
+    dirs = mgear.core.utils.gatherCustomModuleDirectories(
+        SHIFTER_COMPONENT_ENV_KEY, registry.DEFAULT_COMPONENT_PATHS
+    )
     defFmt = "mgear.shifter.component.{}.guide"
     customFmt = "{}.guide"
 
@@ -123,7 +126,13 @@ def importComponentGuide(comp_type):
 
 def importComponent(comp_type):
     """Import the Component"""
-    dirs = getComponentDirectories()
+    if registry.get_component_info(comp_type) is not None:
+        return registry.import_component(comp_type)
+
+    # not registered type. Fallback to the standard module search
+    dirs = mgear.core.utils.gatherCustomModuleDirectories(
+        SHIFTER_COMPONENT_ENV_KEY, registry.DEFAULT_COMPONENT_PATHS
+    )
     defFmt = "mgear.shifter.component.{}"
     customFmt = "{}"
 
@@ -136,23 +145,22 @@ def importComponent(comp_type):
 def reloadComponents(*args):
     """Reload all componets
 
+    The component registry is scanned again before the reload.
+
     Args:
         *args: Dummy
     """
-    compDir = getComponentDirectories()
-
-    for x in compDir:
-        for com in compDir[x]:
-            try:
-                if PY2:
-                    reload(importComponent(com)) # type: ignore
-                    reload(importComponentGuide(com)) # type: ignore
-                else:
-                    importlib.reload(importComponent(com))
-                    importlib.reload(importComponentGuide(com))
-                print("reload : {}.{}".format(os.path.basename(x), com))
-            except ImportError:
-                pass
+    components = registry.get_registry(force=True)
+
+    for com, entry in components.items():
+        try:
+            registry.import_component(com, reload_module=True)
+            registry.import_component(com, guide=True, reload_module=True)
+            print(
+                "reload : {}.{}".format(os.path.basename(entry["base"]), com)
+            )
+        except ImportError:
+            pass
 
 
 class Rig(object):
@@ -167,6 +175,19 @@ class Rig(object):
 
     """
 
+    # nodes of the initial hierarchy, reused by the incremental build
+    INCREMENTAL_NODES = (
+        "model",
+        "global_ctl",
+        "setupWS",
+        "jnt_org",
+        "root_joint",
+        "rigGroups",
+        "rigPoses",
+        "rigCtlTags",
+        "rigScriptNodes",
+    )
+
     def __init__(self):
 
         self.guide = guide.Rig()
@@ -184,6 +205,11 @@ class Rig(object):
 
         self.build_data = {}
 
+        # nodes created by each component, used by the incremental build
+        self.component_nodes = {}
+
+        self.profiler = profiler.BuildProfiler()
+
     @utils.one_undo
     def buildFromDict(self, conf_dict):
         log_window()
@@ -212,6 +238,7 @@ class Rig(object):
             build_data = self.collect_build_data()
         else:
             build_data = None
+        self.profiler.output(self.model)
 
         endTime = datetime.datetime.now()
         finalTime = endTime - startTime
@@ -274,6 +301,7 @@ class Rig(object):
                 build_data = self.collect_build_data()
             else:
                 build_data = None
+            self.profiler.output(self.model)
 
             endTime = datetime.datetime.now()
             finalTime = endTime - startTime
@@ -301,12 +329,165 @@ class Rig(object):
 
         self.customStepDic["mgearRun"] = self
 
-        self.initialHierarchy()
+        with self.profiler.record("rig", "Initial Hierarchy"):
+            self.initialHierarchy()
         self.processComponents()
         self.finalize()
 
+        incremental.store_hashes(
+            self.model, incremental.get_component_hashes(self.guide)
+        )
+        incremental.register_rig(self)
+
         return self.model
 
+    @utils.one_undo
+    def buildIncrementalFromSelection(self):
+        """Rebuild only the components changed since the last build.
+
+        The rig from the last build of the same guide in the current session
+        is updated. The changed components, and the components depending on
+        them, are deleted and build again. The rest of the rig is reused.
+
+        Note:
+            If the guide root settings changed, the guide has custom steps or
+            the rig wasn't build in this session, a full build is done.
+        """
+        startTime = datetime.datetime.now()
+        mgear.log("\n" + "= SHIFTER INCREMENTAL BUILD " + "=" * 39)
+
+        self.stopBuild = False
+        selection = pm.ls(selection=True)
+        if not selection:
+            selection = pm.ls("guide")
+            if not selection:
+                mgear.log(
+                    "Not guide found or selected.\n"
+                    + "Select one or more guide root or a guide model",
+                    mgear.sev_error,
+                )
+                return
+
+        mgear.log("\n" + "= GUIDE VALIDATION " + "=" * 46)
+        self.guide.setFromSelection()
+        if not self.guide.valid:
+            return
+
+        previous = incremental.get_cached_rig(self.guide.values["rig_name"])
+        if previous is None or not self.update(previous):
+            mgear.log(
+                "Incremental build not available. Building the full rig",
+                mgear.sev_warning,
+            )
+            self.guide = guide.Rig()
+            return self.buildFromSelection()
+
+        if (
+            self.options["data_collector_embedded"]
+            or self.options["data_collector"]
+        ):
+            build_data = self.collect_build_data()
+        else:
+            build_data = None
+        self.profiler.output(self.model)
+
+        finalTime = datetime.datetime.now() - startTime
+        mgear.log(
+            "\n"
+            + "= SHIFTER INCREMENTAL BUILD DONE {} [ {} ] {}".format(
+                "=" * 8, finalTime, "=" * 7
+            )
+        )
+        return build_data
+
+    def update(self, previous):
+        """Update the rig of a previous build with the current guide.
+
+        Arguments:
+            previous (Rig): The Rig instance of the previous build
+
+        Returns:
+            bool: False if the rig can't be updated and needs a full build
+        """
+        new_hashes = incremental.get_component_hashes(self.guide)
+        old_hashes = incremental.get_stored_hashes(previous.model)
+        root_key = incremental.ROOT_KEY
+        if not old_hashes or old_hashes.get(root_key) != new_hashes[root_key]:
+            return False
+        # partial builds or builds without node tracking
+        step = previous.options["step"]
+        if 1 <= step < len(component.Main.steps):
+            return False
+        if not previous.component_nodes:
+            return False
+        # the custom steps expect the full rig
+        for checker, attr in (
+            ("doPreCustomStep", "preCustomStep"),
+            ("doPostCustomStep", "postCustomStep"),
+        ):
+            if self.guide.values[checker] and self.guide.values[attr]:
+                mgear.log("The guide has custom steps", mgear.sev_warning)
+                return False
+
+        dirty, removed = incremental.get_dirty_components(
+            self.guide, old_hashes, new_hashes
+        )
+
+        # Take over the rig nodes and the components of the previous build
+        for key, value in previous.__dict__.items():
+            if key.endswith("_att") or key in self.INCREMENTAL_NODES:
+                setattr(self, key, value)
+        self.components = dict(previous.components)
+        self.componentsIndex = list(previous.componentsIndex)
+        self.components_infos = dict(previous.components_infos)
+        self.component_nodes = dict(previous.component_nodes)
+        self.base_groups = previous.base_groups
+        self.base_subGroups = previous.base_subGroups
+        self.bindPlanes = previous.bindPlanes
+        self.combinedBindPlanes = previous.combinedBindPlanes
+        self.options = self.guide.values
+        self.guides = self.guide.components
+        self.customStepDic["mgearRun"] = self
+        for comp in self.components.values():
+            comp.rig = self
+
+        if not dirty and not removed:
+            mgear.log("No changes found in the guide components")
+            return True
+
+        mgear.log("Rebuilding components: " + ", ".join(dirty))
+        if removed:
+            mgear.log("Removing components: " + ", ".join(removed))
+
+        # Delete the dirty components and the finalize nodes
+        to_delete = []
+        for comp_name in dirty + removed + [incremental.FINALIZE_KEY]:
+            tracker = self.component_nodes.pop(comp_name, None)
+            if tracker:
+                to_delete.extend(tracker.alive_nodes())
+            if comp_name in self.components:
+                del self.components[comp_name]
+                self.componentsIndex.remove(comp_name)
+                self.components_infos.pop(comp_name, None)
+        incremental.delete_nodes(to_delete)
+
+        self.guide_data_att.set(self.get_guide_data())
+
+        # Build the dirty components
+        self.initComponents(dirty)
+        self.componentsIndex = [
+            c for c in self.guide.componentsIndex if c in self.components
+        ]
+        self.processSteps(dirty)
+
+        self.groups = {k: list(v) for k, v in self.base_groups.items()}
+        self.subGroups = {k: list(v) for k, v in self.base_subGroups.items()}
+        self.finalize()
+
+        incremental.store_hashes(self.model, new_hashes)
+        incremental.register_rig(self)
+        return True
+
     def stepsList(self, checker, attr):
         if self.options[checker] and self.options[attr]:
             return self.options[attr].split(",")
@@ -331,9 +512,13 @@ class Rig(object):
                 if not self.stopBuild:
                     if step.startswith("*"):
                         continue
-                    self.stopBuild = guide.helperSlots.runStep(
-                        step.split("|")[-1][1:], self.customStepDic
-                    )
+                    stepPath = step.split("|")[-1][1:]
+                    with self.profiler.record(
+                        "custom_step", os.path.basename(stepPath)
+                    ):
+                        self.stopBuild = guide.helperSlots.runStep(
+                            stepPath, self.customStepDic
+                        )
                 else:
                     pm.displayWarning("Build Stopped")
                     break
@@ -522,8 +707,18 @@ class Rig(object):
 
         # Init
         self.components_infos = {}
+        self.initComponents(self.guide.componentsIndex)
+
+        # Creation steps
+        self.processSteps(self.componentsIndex)
 
-        for comp in self.guide.componentsIndex:
+    def initComponents(self, compNames):
+        """Create the component instances.
+
+        Args:
+            compNames (list): Name of the components to initialize
+        """
+        for comp in compNames:
             guide_ = self.guides[comp]
             mgear.log("Init : " + guide_.fullName + " (" + guide_.type + ")")
 
@@ -541,22 +736,46 @@ class Rig(object):
                     guide_.author,
                 ]
 
-        # Creation steps
+    def processSteps(self, compNames):
+        """Run the creation steps of the given components.
+
+        The nodes created by each component are recorded for the
+        incremental build.
+
+        Args:
+            compNames (list): Name of the components to build
+        """
         self.steps = component.Main.steps
         for i, name in enumerate(self.steps):
             # for count, compName in enumerate(self.componentsIndex):
-            for compName in self.componentsIndex:
+            for compName in compNames:
                 comp = self.components[compName]
                 mgear.log(
                     name + " : " + comp.fullName + " (" + comp.type + ")"
                 )
-                comp.stepMethods[i]()
+                tracker = self.component_nodes.setdefault(
+                    compName, incremental.NodeTracker()
+                )
+                with tracker, self.profiler.record(compName, name, comp.type):
+                    comp.stepMethods[i]()
 
             if self.options["step"] >= 1 and i >= self.options["step"] - 1:
                 break
 
     def finalize(self):
         """Finalize the rig."""
+        # keep the rig groups before adding the components groups
+        # for the incremental build
+        self.base_groups = {k: list(v) for k, v in self.groups.items()}
+        self.base_subGroups = {
+            k: list(v) for k, v in self.subGroups.items()
+        }
+        tracker = incremental.NodeTracker()
+        self.component_nodes[incremental.FINALIZE_KEY] = tracker
+        with tracker, self.profiler.record("rig", "Finalize"):
+            self._finalize()
+
+    def _finalize(self):
         groupIdx = 0
 
         # Properties --------------------------------------
@@ -0,0 +1,401 @@
+"""Compiled guide template format for Shifter.
+
+A compiled guide (.sgc) stores the same data as a guide template (.sgt), but
+the numeric data (component transforms, positions, blades and control shape
+buffers points and knots) is stored as flat binary arrays, using the
+core.columnar container. Parameter values and names are kept in the JSON
+footer.
+
+The component list is validated when the file is compiled, so loading a
+compiled guide doesn't need to check the component order or parenting again.
+
+The conversion is lossless, so a compiled guide can be converted back to
+.sgt with the same content.
+
+Compiled guides are also used as an on-disk cache for the .sgt files, when
+the templates are imported or build with shifter.io. The cache is keyed by
+the hash of the .sgt file content, so the cache is invalidated as soon as
+the file changes. Set the MGEAR_SHIFTER_GUIDE_CACHE_DISABLE environment
+variable to disable it. Old cache files are not removed automatically, use
+clear_cache to remove them.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+from mgear.core import columnar
+
+SGC_EXT = ".sgc"
+SGT_EXT = ".sgt"
+COMPILED_KIND = "shifter_guide"
+COMPILED_VERSION = 1
+
+GUIDE_CACHE_ENV_KEY = "MGEAR_SHIFTER_GUIDE_CACHE"
+GUIDE_CACHE_DISABLE_ENV_KEY = "MGEAR_SHIFTER_GUIDE_CACHE_DISABLE"
+
+# keys not converted to arrays. Parameter values are kept as they are in the
+# JSON footer
+_SKIP_KEYS = ("param_values",)
+
+# lists smaller than this are kept in the JSON data
+_MIN_ARRAY_LENGTH = 3
+
+_ARRAY_KEY = "__array__"
+
+
+##########################################################
+# ARRAYS
+##########################################################
+
+
+def _get_shape(value):
+    """Get the shape of a rectangular nested list of numbers.
+
+    Args:
+        value (list): The nested list
+
+    Returns:
+        tuple: shape list and dtype ("f8" or "i4"). None if the list is not
+            rectangular or the values are not all floats or all ints
+    """
+    shape = []
+    level = [value]
+    while isinstance(level[0], list):
+        length = len(level[0])
+        if not length or any(
+            not isinstance(v, list) or len(v) != length for v in level
+        ):
+            return None
+        shape.append(length)
+        level = [i for v in level for i in v]
+
+    leaf_type = type(level[0])
+    if leaf_type not in (float, int) or any(
+        type(v) is not leaf_type for v in level
+    ):
+        return None
+    if leaf_type is int and any(
+        v < -2147483648 or v > 2147483647 for v in level
+    ):
+        return None
+    return shape, "f8" if leaf_type is float else "i4"
+
+
+def _flatten(value, depth):
+    for _ in range(depth - 1):
+        value = [i for v in value for i in v]
+    return value
+
+
+def _unflatten(flat, shape):
+    value = flat.tolist()
+    for size in reversed(shape[1:]):
+        value = list(map(list, zip(*[iter(value)] * size)))
+    return value
+
+
+def extract_arrays(data, arrays=None):
+    """Replace the numeric lists of a data structure by array references.
+
+    The values are appended to a flat array per data type, and the list is
+    replaced by a reference with the data type, offset and shape.
+
+    Args:
+        data (variant): JSON like data
+        arrays (dict, optional): Data type as key and flat list of values
+            as value. The extracted values are appended to it.
+
+    Returns:
+        tuple: The data with the array references and the arrays dict
+    """
+    if arrays is None:
+        arrays = {"f8": [], "i4": []}
+
+    def walk(value):
+        if isinstance(value, dict):
+            return {
+                k: v if k in _SKIP_KEYS else walk(v)
+                for k, v in value.items()
+            }
+        if isinstance(value, list) and value:
+            shape_info = _get_shape(value)
+            if shape_info:
+                shape, dtype = shape_info
+                flat = _flatten(value, len(shape))
+                if len(flat) >= _MIN_ARRAY_LENGTH:
+                    offset = len(arrays[dtype])
+                    arrays[dtype].extend(flat)
+                    return [_ARRAY_KEY, dtype, offset, shape]
+            return [walk(v) for v in value]
+        return value
+
+    return walk(data), arrays
+
+
+def restore_arrays(data, arrays):
+    """Replace the array references of a data structure by nested lists.
+
+    Args:
+        data (variant): Data with array references
+        arrays (dict): Data type as key and the flat array as value
+
+    Returns:
+        variant: The data with the nested lists
+    """
+    if isinstance(data, dict):
+        return {k: restore_arrays(v, arrays) for k, v in data.items()}
+    if isinstance(data, list):
+        if data and data[0] == _ARRAY_KEY:
+            _, dtype, offset, shape = data
+            size = 1
+            for s in shape:
+                size *= s
+            return _unflatten(arrays[dtype][offset : offset + size], shape)
+        return [restore_arrays(v, arrays) for v in data]
+    return data
+
+
+##########################################################
+# VALIDATION
+##########################################################
+
+
+def validate_guide_template(conf):
+    """Check the component list of a guide template.
+
+    Args:
+        conf (dict): The guide template dictionary
+
+    Raises:
+        ValueError: If a component is missing, has no type or is listed
+            before his parent component
+    """
+    components_dict = conf["components_dict"]
+    listed = set()
+    for comp in conf["components_list"]:
+        c_dict = components_dict.get(comp)
+        if c_dict is None:
+            raise ValueError("Component not found in the template: " + comp)
+        if not c_dict["param_values"].get("comp_type"):
+            raise ValueError("Component without type: " + comp)
+        parent = c_dict.get("parent_fullName")
+        if parent and parent not in listed:
+            raise ValueError(
+                "Component {} is listed before his parent {}".format(
+                    comp, parent
+                )
+            )
+        listed.add(comp)
+
+
+##########################################################
+# READ WRITE
+##########################################################
+
+
+def write_compiled_guide(conf, filePath, compress=True):
+    """Write a guide template dictionary as compiled guide.
+
+    Args:
+        conf (dict): The guide template dictionary
+        filePath (str): Destination file path
+        compress (bool, optional): zlib compress the arrays
+
+    Returns:
+        int: The file size in bytes
+    """
+    validate_guide_template(conf)
+
+    header = {
+        k: v
+        for k, v in conf.items()
+        if k not in ("components_dict", "ctl_buffers_dict")
+    }
+    arrays = {"f8": [], "i4": []}
+    components = []
+    for comp in conf["components_list"]:
+        data, arrays = extract_arrays(conf["components_dict"][comp], arrays)
+        components.append(data)
+    buffers = conf.get("ctl_buffers_dict")
+    if buffers:
+        buffers, arrays = extract_arrays(buffers, arrays)
+
+    with columnar.ColumnarWriter(
+        filePath, kind=COMPILED_KIND, compress=compress
+    ) as writer:
+        writer.attributes["version"] = COMPILED_VERSION
+        writer.attributes["header"] = header
+        writer.write_record(
+            {"components": components, "ctl_buffers_dict": buffers},
+            {k: (k, v) for k, v in arrays.items()},
+        )
+    return writer.bytes_written
+
+
+def read_compiled_guide(filePath):
+    """Read a compiled guide as guide template dictionary.
+
+    Args:
+        filePath (str): Compiled guide file path
+
+    Returns:
+        dict: The guide template dictionary
+
+    Raises:
+        IOError: If the file is not a compiled guide
+    """
+    with columnar.ColumnarReader(filePath) as reader:
+        if reader.kind != COMPILED_KIND:
+            raise IOError("Not a compiled guide: {}".format(filePath))
+        conf = dict(reader.attributes["header"])
+        meta, arrays = reader.read_record(0)
+        components = restore_arrays(meta["components"], arrays)
+        conf["components_dict"] = dict(
+            zip(conf["components_list"], components)
+        )
+        conf["ctl_buffers_dict"] = restore_arrays(
+            meta["ctl_buffers_dict"], arrays
+        )
+    return conf
+
+
+def is_compiled_guide(filePath):
+    """Check if a file is a compiled guide.
+
+    Args:
+        filePath (str): File path
+
+    Returns:
+        bool: True if the file is a compiled guide
+    """
+    return columnar.is_columnar_file(filePath)
+
+
+def convert_guide_template(filePath, outPath=None):
+    """Convert a guide template to compiled guide or vice versa.
+
+    Args:
+        filePath (str): .sgt or .sgc file path
+        outPath (str, optional): Destination path. If None, the source path
+            with the other extension is used
+
+    Returns:
+        str: The destination path
+    """
+    base = os.path.splitext(filePath)[0]
+    if is_compiled_guide(filePath):
+        conf = read_compiled_guide(filePath)
+        outPath = outPath or base + SGT_EXT
+        with open(outPath, "w") as f:
+            f.write(json.dumps(conf, indent=4, sort_keys=True))
+    else:
+        with open(filePath, "r") as f:
+            conf = json.load(f)
+        outPath = outPath or base + SGC_EXT
+        write_compiled_guide(conf, outPath)
+    return outPath
+
+
+##########################################################
+# CACHE
+##########################################################
+
+
+def get_cache_folder():
+    """Get the guide cache folder.
+
+    The folder is defined by MGEAR_SHIFTER_GUIDE_CACHE environment variable.
+    If not defined a folder in the system temp folder is used.
+
+    Returns:
+        str: The cache folder path
+    """
+    folder = os.environ.get(GUIDE_CACHE_ENV_KEY)
+    if not folder:
+        folder = os.path.join(tempfile.gettempdir(), "mgear_guide_cache")
+    return folder
+
+
+def is_cache_enabled():
+    """Check if the guide cache is used by the build and import tools.
+
+    The cache is disabled by the MGEAR_SHIFTER_GUIDE_CACHE_DISABLE
+    environment variable.
+
+    Returns:
+        bool: True if the cache is enabled
+    """
+    return not os.environ.get(GUIDE_CACHE_DISABLE_ENV_KEY)
+
+
+def clear_cache():
+    """Remove the compiled guide files from the guide cache folder.
+
+    Returns:
+        int: The number of cache files removed
+    """
+    folder = get_cache_folder()
+    if not os.path.isdir(folder):
+        return 0
+
+    removed = 0
+    for name in os.listdir(folder):
+        if not name.endswith((SGC_EXT, ".tmp")):
+            continue
+        try:
+            os.remove(os.path.join(folder, name))
+            removed += 1
+        except OSError:
+            # used by another session
+            pass
+    return removed
+
+
+def load_guide_template(filePath, use_cache=False):
+    """Load a guide template file, optionally using the compiled guide cache.
+
+    The compiled cache file is keyed by the hash of the template content.
+    If the cache file doesn't exist, the template is parsed and compiled to
+    the cache for the next load.
+
+    Args:
+        filePath (str): .sgt or .sgc file path
+        use_cache (bool, optional): Use the compiled cache for .sgt files
+
+    Returns:
+        dict: The guide template dictionary
+    """
+    if is_compiled_guide(filePath):
+        return read_compiled_guide(filePath)
+
+    with open(filePath, "rb") as f:
+        content = f.read()
+    if not use_cache:
+        return json.loads(content.decode("utf-8"))
+
+    cache_folder = get_cache_folder()
+    cache_path = os.path.join(
+        cache_folder, hashlib.sha1(content).hexdigest() + SGC_EXT
+    )
+    if os.path.exists(cache_path):
+        try:
+            return read_compiled_guide(cache_path)
+        except (IOError, OSError, ValueError, KeyError):
+            # corrupted or old cache file, compile again
+            pass
+
+    conf = json.loads(content.decode("utf-8"))
+    try:
+        if not os.path.isdir(cache_folder):
+            os.makedirs(cache_folder)
+        # write to a temp file first, so other sessions never read a
+        # partial cache file
+        temp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+        write_compiled_guide(conf, temp_path, compress=False)
+        os.replace(temp_path, cache_path)
+    except (IOError, OSError, ValueError):
+        # the cache is optional. Invalid templates are reported on build
+        pass
+    return conf
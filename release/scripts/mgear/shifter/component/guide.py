@@ -948,25 +948,26 @@ class ComponentGuide(guide.Main):
         return objects
 
     def getObjects3(self, model):
-        """
-        NOTE: Experimental function
-        Get the objects of the component.
-        This version only get the transforms by Name using Maya Cmds
+        """Get the objects of the component.
+
+        This version only get the transforms by name, using the hierarchy
+        index of the model.
 
         Args:
             model(dagNode): The root of the component.
 
         Returns:
-            list of dagNode: The list of the objects.
+            dict: The local name as key and the dagNode as value.
 
         """
         objects = {}
-
-        for child in cmds.ls(self.fullName + "_*", type="transform"):
-            if pm.PyNode(child).getParent(-1) == model:
-                objects[
-                    child[child.index(self.fullName + "_") + len(self.fullName + "_") :]
-                ] = child
+        prefix = self.fullName + "_"
+        tokens = self.fullName.split("_")
+        index = dag.get_hierarchy_index(model)
+        for child in index.find_component(tokens[0], tokens[1]):
+            short_name = child.split("|")[-1]
+            if short_name.startswith(prefix):
+                objects[short_name[len(prefix) :]] = pm.PyNode(child)
 
         return objects
 
@@ -21,11 +21,21 @@ Tasks / Conditions
 - Partition Skeleton + Geometry.
 - Exports each partition as an FBX.
 
+Parallel Export
+---------------
+When more than one export worker is used, the conditioning process writes a
+partition plan next to the conditioned file instead of exporting the
+partitions. The partitions of the plan are then split between several batch
+processes that export from the same conditioned snapshot.
+
 Note
 ----
-- Print logs are being used by the partition subprocess thread to detect progress.
+- Structured progress events are printed with the EVENT_TAG prefix and are
+  used by the partition subprocess thread to report progress.
 """
+import json
 import os
+import timeit
 import traceback
 from collections import OrderedDict
 
@@ -36,6 +46,20 @@ import mgear.pymaya as pm
 from mgear.core import pyFBX as pfbx
 import mgear.shifter.game_tools_disconnect as gtDisc
 
+EVENT_TAG = "[FBX_EVENT]"
+
+
+def emit_event(event, **data):
+    """Prints a structured progress event for the parent process.
+
+    Args:
+        event (str): Event type. "stage", "item_start" or "item_done"
+        **data: JSON serializable event data
+    """
+    data["event"] = event
+    print("{} {}".format(EVENT_TAG, json.dumps(data)))
+
+
 def perform_fbx_condition(
         remove_namespace,
         scene_clean,
@@ -45,11 +69,17 @@ def perform_fbx_condition(
         skinning=True,
         blendshapes=True,
         partitions=True,
-        export_data=None):
+        export_data=None,
+        plan_path=None):
     """
     Performs the FBX file conditioning and partition exports.
 
     This is called by a MayaBatch process.
+
+    If plan_path is defined, the partitions are not exported. The partition
+    plan is written to plan_path and the conditioned file is kept, so the
+    partitions can be exported by several processes with
+    export_partitions_from_plan.
     """
     print("--------------------------")
     print(" PERFORM FBX CONDITIONING")
@@ -59,6 +89,7 @@ def perform_fbx_condition(
     print("--------------------------")
 
     # Load the master .ma file and force the scene to load it
+    emit_event("stage", stage="open")
     cmds.file(master_ma_path, open=True, force=True)
 
     # formats the output location from the master fbx path.
@@ -73,6 +104,7 @@ def perform_fbx_condition(
     # Removes all namespaces from any DG or DAG object.
     if remove_namespace:
         print("Removing Namespace..")
+        emit_event("stage", stage="namespace")
         export_data = _clean_namespaces(export_data)
 
         # updates root joint name if namespace is found
@@ -82,6 +114,7 @@ def perform_fbx_condition(
 
     if scene_clean:
         print("Cleaning Scene..")
+        emit_event("stage", stage="clean_scene")
 
         _partitions = export_data.get("partitions", dict())
 
@@ -134,6 +167,7 @@ def perform_fbx_condition(
     # Conditioned file, is the file that stores the rig which has already had data
     # update for the export process.
     print("Save Conditioned Scene...")
+    emit_event("stage", stage="conditioned")
     print("    Path: {}".format(master_ma_path))
     cmds.file(save=True, force=True, type="mayaAscii")
 
@@ -151,6 +185,13 @@ def perform_fbx_condition(
 
     if partitions and export_data is not None:
         print("[Partitions]")
+        emit_event("stage", stage="partitions")
+        if plan_path:
+            # the conditioned file is kept as snapshot for the workers
+            print("   Writing Partition plan: {}".format(plan_path))
+            return write_partition_plan(
+                plan_path, [root_joint], export_data, master_ma_path
+            )
         print("   Preparing scene for Partition creation..")
         status = _export_skeletal_mesh_partitions([root_joint], export_data, master_ma_path)
 
@@ -175,17 +216,48 @@ def _export_skeletal_mesh_partitions(jnt_roots, export_data, scene_path):
     alterations performed to it.
 
     """
-    print("   Correlating Mesh to joints...")
-
-    file_path = export_data.get("file_path", "")
-    file_name = export_data.get("file_name", "")
-
     partitions = export_data.get("partitions", dict())
     if not partitions:
         cmds.warning("  Partitions not defined!")
         return False
 
-    cull_joints = export_data.get("cull_joints", False)
+    partitions_data = _get_partitions_data(jnt_roots, partitions)
+
+    print("   Modifying Hierarchy...")
+
+    # - Loop over each Partition
+    # - Load the master .ma file
+    # - Perform removal of geometry, that is not relevent to the partition
+    # - Perform removal of skeleton, that is not relevent to the partition
+    # - Export an fbx
+    for partition_name, partition_data in partitions_data.items():
+        if not partition_data:
+            print("   Partition {} contains no data.".format(partition_name))
+            continue
+
+        partition_meshes = partitions.get(partition_name).get("skeletal_meshes")
+        partition_joints = partition_data.get("hierarchy", [])
+
+        if not _timed_export_partition(
+            scene_path,
+            partition_name,
+            partition_meshes,
+            partition_joints,
+            export_data,
+        ):
+            return False
+    return True
+
+
+def _get_partitions_data(jnt_roots, partitions):
+    """
+    Collects the joint hierarchy of each enabled partition.
+
+    Returns an OrderedDict with the partition name as key and a dict with
+    the "root" and "hierarchy" joints as value. The value is empty if no
+    joint hierarchy was found for the partition.
+    """
+    print("   Correlating Mesh to joints...")
 
     # Collects all partition data, so it can be more easily accessed in the next stage
     # where mesh and skeleton data is deleted and exported.
@@ -243,78 +315,227 @@ def _export_skeletal_mesh_partitions(jnt_roots, export_data, scene_path):
 
         partitions_data[partition_name]["hierarchy"] = short_hierarchy
 
-    print("   Modifying Hierarchy...")
+    return partitions_data
 
-    # - Loop over each Partition
-    # - Load the master .ma file
-    # - Perform removal of geometry, that is not relevent to the partition
-    # - Perform removal of skeleton, that is not relevent to the partition
-    # - Export an fbx
+
+def _export_partition(
+        scene_path,
+        partition_name,
+        partition_meshes,
+        partition_joints,
+        export_data):
+    """
+    Exports one partition from the conditioned scene.
+
+    Returns the exported fbx path.
+    """
+    file_path = export_data.get("file_path", "")
+    file_name = export_data.get("file_name", "")
+    cull_joints = export_data.get("cull_joints", False)
+
+    print("Open Conditioned Scene: {}".format(scene_path))
+    # Loads the conditioned scene file, to perform partition actions on.
+    cmds.file(scene_path, open=True, force=True, save=False)
+
+    # Deletes meshes that are not included in the partition.
+    all_meshes = _get_all_mesh_dag_objects()
+    for mesh in all_meshes:
+        if not mesh in partition_meshes:
+            cmds.delete(mesh)
+
+    # Delete joints that are not included in the partition
+    if cull_joints:
+        print("    Culling Joints...")
+        all_joints = _get_all_joint_dag_objects()
+        for jnt in reversed(all_joints):
+            if not jnt in partition_joints:
+                cmds.delete(jnt)
+
+    # Exporting fbx
+    partition_file_name = file_name + "_" + partition_name + ".fbx"
+    export_path = os.path.join(file_path, partition_file_name)
+
+    print("Exporting FBX: {}".format(export_path))
+    try:
+        preset_path = export_data.get("preset_path", None)
+        up_axis = export_data.get("up_axis", None)
+        fbx_version = export_data.get("fbx_version", None)
+        file_type = export_data.get("file_type", "binary").lower()
+        # export settings config
+        pfbx.FBXResetExport()
+        # set configuration
+        if preset_path is not None:
+            # load FBX export preset file
+            pfbx.FBXLoadExportPresetFile(f=preset_path)
+        fbx_version_str = None
+        if up_axis is not None:
+            pfbx.FBXExportUpAxis(up_axis.lower())
+        if fbx_version is not None:
+            fbx_version_str = "{}00".format(
+                fbx_version.split("/")[0].replace(" ", "")
+            )
+            pfbx.FBXExportFileVersion(v=fbx_version_str)
+        if file_type == "ascii":
+            pfbx.FBXExportInAscii(v=True)
+
+        cmds.select(clear=True)
+        cmds.select(partition_joints + partition_meshes)
+        pfbx.FBXExport(f=export_path, s=True)
+    except Exception:
+        cmds.error(
+            "Something wrong happened while export Partition {}: {}".format(
+                partition_name,
+                traceback.format_exc()
+            )
+        )
+        return False
+    return export_path
+
+
+def _timed_export_partition(
+        scene_path,
+        partition_name,
+        partition_meshes,
+        partition_joints,
+        export_data):
+    """
+    Exports one partition, wrapped by the item start and done events.
+    """
+    emit_event("item_start", name=partition_name)
+    start = timeit.default_timer()
+    try:
+        export_path = _export_partition(
+            scene_path,
+            partition_name,
+            partition_meshes,
+            partition_joints,
+            export_data,
+        )
+    except Exception:
+        traceback.print_exc()
+        export_path = False
+    emit_event(
+        "item_done",
+        name=partition_name,
+        success=bool(export_path),
+        time=timeit.default_timer() - start,
+        path=export_path or "",
+    )
+    return export_path
+
+
+def write_partition_plan(plan_path, jnt_roots, export_data, scene_path):
+    """
+    Writes the partition plan used by the parallel partition export.
+
+    The plan stores the conditioned scene path, the export data after the
+    conditioning and the meshes and joints of each partition.
+    """
+    partitions = export_data.get("partitions", dict())
+    if not partitions:
+        cmds.warning("  Partitions not defined!")
+        return False
+
+    plan = {
+        "scene_path": scene_path,
+        "export_data": export_data,
+        "partitions": OrderedDict(),
+    }
+    partitions_data = _get_partitions_data(jnt_roots, partitions)
     for partition_name, partition_data in partitions_data.items():
         if not partition_data:
             print("   Partition {} contains no data.".format(partition_name))
             continue
+        plan["partitions"][partition_name] = {
+            "meshes": partitions[partition_name].get("skeletal_meshes"),
+            "joints": partition_data.get("hierarchy", []),
+        }
 
-        partition_meshes = partitions.get(partition_name).get("skeletal_meshes")
-        partition_joints = partition_data.get("hierarchy", [])
+    with open(plan_path, "w") as f:
+        json.dump(plan, f, indent=4)
+    return True
+
+
+def export_partitions_from_plan(plan_path, partition_names):
+    """
+    Exports some partitions of a partition plan.
+
+    This is called by a MayaBatch worker process. Each worker exports his
+    partitions from the conditioned snapshot of the plan.
+    """
+    with open(plan_path, "r") as f:
+        plan = json.load(f)
+
+    status = True
+    for partition_name in partition_names:
+        partition_data = plan["partitions"][partition_name]
+        export_path = _timed_export_partition(
+            plan["scene_path"],
+            partition_name,
+            partition_data["meshes"],
+            partition_data["joints"],
+            plan["export_data"],
+        )
+        status = status and bool(export_path)
+    return status
 
-        print("Open Conditioned Scene: {}".format(scene_path))
-        # Loads the conditioned scene file, to perform partition actions on.
-        cmds.file(scene_path, open=True, force=True, save=False)
-
-        # Deletes meshes that are not included in the partition.
-        all_meshes = _get_all_mesh_dag_objects()
-        for mesh in all_meshes:
-            if not mesh in partition_meshes:
-                cmds.delete(mesh)
-
-        # Delete joints that are not included in the partition
-        if cull_joints:
-            print("    Culling Joints...")
-            all_joints = _get_all_joint_dag_objects()
-            for jnt in reversed(all_joints):
-                if not jnt in partition_joints:
-                    cmds.delete(jnt)
-
-        # Exporting fbx
-        partition_file_name = file_name + "_" + partition_name + ".fbx"
-        export_path = os.path.join(file_path, partition_file_name)
-
-        print("Exporting FBX: {}".format(export_path))
-        try:
-            preset_path = export_data.get("preset_path", None)
-            up_axis = export_data.get("up_axis", None)
-            fbx_version = export_data.get("fbx_version", None)
-            file_type = export_data.get("file_type", "binary").lower()
-            # export settings config
-            pfbx.FBXResetExport()
-            # set configuration
-            if preset_path is not None:
-                # load FBX export preset file
-                pfbx.FBXLoadExportPresetFile(f=preset_path)
-            fbx_version_str = None
-            if up_axis is not None:
-                pfbx.FBXExportUpAxis(up_axis.lower())
-            if fbx_version is not None:
-                fbx_version_str = "{}00".format(
-                    fbx_version.split("/")[0].replace(" ", "")
-                )
-                pfbx.FBXExportFileVersion(v=fbx_version_str)
-            if file_type == "ascii":
-                pfbx.FBXExportInAscii(v=True)
 
-            cmds.select(clear=True)
-            cmds.select(partition_joints + partition_meshes)
-            pfbx.FBXExport(f=export_path, s=True)
+def export_animation_clips_from_snapshot(scene_path, export_data, clips):
+    """
+    Exports animation clips from a prepared scene snapshot.
+
+    This is called by a MayaBatch worker process.
+    """
+    from mgear.shifter.game_tools_fbx import utils
+
+    cmds.file(scene_path, open=True, force=True, save=False)
+
+    status = True
+    for clip_data in clips:
+        title = clip_data.get("title", "")
+        emit_event("item_start", name=title)
+        start = timeit.default_timer()
+        try:
+            export_path = utils.export_animation_clip(export_data, clip_data)
         except Exception:
-            cmds.error(
-                "Something wrong happened while export Partition {}: {}".format(
-                    partition_name,
-                    traceback.format_exc()
-                )
-            )
-            return False
-    return True
+            traceback.print_exc()
+            export_path = False
+        emit_event(
+            "item_done",
+            name=title,
+            success=bool(export_path),
+            time=timeit.default_timer() - start,
+            path=export_path or "",
+        )
+        status = status and bool(export_path)
+    return status
+
+
+def run_job(job_path):
+    """
+    Runs a worker job file written by the partition thread.
+
+    The job is a JSON file with the "type" key ("partitions" or "clips") and
+    the arguments of the job.
+    """
+    with open(job_path, "r") as f:
+        job = json.load(f)
+
+    if job["type"] == "partitions":
+        status = export_partitions_from_plan(
+            job["plan_path"], job["partitions"]
+        )
+    elif job["type"] == "clips":
+        status = export_animation_clips_from_snapshot(
+            job["scene_path"], job["export_data"], job["clips"]
+        )
+    else:
+        raise ValueError("Unknown job type: {}".format(job["type"]))
+
+    if not status:
+        # non zero exit code for the parent process
+        cmds.quit(force=True, exitCode=1)
+    return status
 
 
 def _delete_blendshapes():
@@ -1,6 +1,7 @@
 import importlib
 import json
 import os
+import tempfile
 import timeit
 from functools import partial
 
@@ -226,6 +227,21 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         fbx_sdk_layout.addWidget(self.remove_namespace_checkbox)
         fbx_sdk_layout.addWidget(self.clean_scene_checkbox)
 
+        # batch export workers
+        workers_layout = QtWidgets.QHBoxLayout()
+        fbx_sdk_layout.addLayout(workers_layout)
+        workers_label = QtWidgets.QLabel("Batch Export Workers")
+        self.export_workers_spinbox = QtWidgets.QSpinBox()
+        self.export_workers_spinbox.setRange(1, 32)
+        self.export_workers_spinbox.setValue(partition_thread.EXPORT_WORKERS)
+        self.export_workers_spinbox.setToolTip(
+            "Number of Maya batch processes exporting partitions and "
+            "animation clips at the same time"
+        )
+        workers_layout.addWidget(workers_label)
+        workers_layout.addWidget(self.export_workers_spinbox)
+        workers_layout.addStretch()
+
     def create_file_path_widget(self):
         # main collapsible widget layout
         file_path_collap_wgt = widgets.CollapsibleWidget("File Path")
@@ -747,6 +763,7 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         print("\t>>> Preset File Path: {}".format(preset_file_path))
 
         self.default_progress_bar()
+        self.progress_bar.setFormat("%p%")
         self.progress_bar.setHidden(False)
 
         # Creates a Thread to perform the maya batch in.
@@ -754,6 +771,7 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         # Settup Thread Signals
         self.partition_thread.completed.connect(self._import_into_unreal)
         self.partition_thread.progress_signal.connect(self.update_progress_bar)
+        self.partition_thread.event_signal.connect(self.update_progress_event)
         # Show the process is starting
         self.update_progress_bar(5)
         self.partition_thread.init_data()
@@ -771,6 +789,17 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         # if value == 100:
         #     self.progress_bar.setHidden(True)
 
+    def update_progress_event(self, event):
+        """
+        Shows the last exported item in the progress bar.
+        """
+        if event.get("event") == "item_start":
+            self.progress_bar.setFormat(
+                "%p% - Exporting: {}".format(event.get("name"))
+            )
+        elif event.get("event") == "item_done" and not event.get("success"):
+            print("ERROR: Failed to export {}".format(event.get("name")))
+
     def error_progress_bar(self):
         """
         Sets the progress bar to be red, errored
@@ -851,6 +880,7 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
                )
 
         # Complete
+        self.progress_bar.setFormat("%p%")
         self.update_progress_bar(100)
 
     def _prefilter_partitions(self):
@@ -991,47 +1021,95 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         # Store the fbx locations that were successfully exported.
         export_fbx_paths = []
 
-        # Exports each clip
-        for clip_data in anim_clip_data:
-
-            # skip disabled clips.
-            if not clip_data["enabled"]:
-                continue
-
-            result = utils.export_animation_clip(export_config, clip_data)
-            if not result:
-                print(
-                    "\t!!! >>> Failed to export clip: {}".format(
-                        clip_data["title"]
-                    )
+        enabled_clips = [c for c in anim_clip_data if c["enabled"]]
+        parallel = (
+            export_config.get("export_workers", 1) > 1
+            and len(enabled_clips) > 1
+        )
+        snapshot_path = None
+        try:
+            if parallel:
+                # Save the prepared scene as snapshot for the batch workers.
+                # Unique name, so concurrent exports don't share the file
+                handle, snapshot_path = tempfile.mkstemp(
+                    prefix="temporary_anim_export_snapshot_",
+                    suffix=".ma",
+                    dir=file_path,
                 )
+                os.close(handle)
+                cmds.file(rename=snapshot_path)
+                cmds.file(save=True, type="mayaAscii", force=True)
             else:
-                export_fbx_paths.append(result)
-
-        # Load temporary scene after all exportation
-        # Set temporary scene file path to stashed scene file path
-        # Clean up temporary .ma file
-        cmds.file(_temporary_ma_path, open=True, force=True, save=False)
-        cmds.file(rename=_scene_path)
-        cmds.file(modified=False)
-        os.remove(_temporary_ma_path)
-
-        if original_selection:
-            pm.select(original_selection)
-
-        # Unreal Import, if enabled.
-        if self.ue_import_cbx.isChecked():
-            skeleton_path = self.ue_skeleton_listwgt.selectedItems()[0].text()
-            unreal_folder = self.ue_file_path_lineedit.text()
-
-            for path in export_fbx_paths:
-                name = os.path.basename(path)
-                animation_name = ".".join(name.split(".")[:-1])
-                result = uegear.export_animation_to_unreal(
-                    path, unreal_folder, animation_name, skeleton_path
+                # Exports each clip
+                for clip_data in enabled_clips:
+                    result = utils.export_animation_clip(
+                        export_config, clip_data
+                    )
+                    if not result:
+                        print(
+                            "\t!!! >>> Failed to export clip: {}".format(
+                                clip_data["title"]
+                            )
+                        )
+                    else:
+                        export_fbx_paths.append(result)
+
+            # Load temporary scene after all exportation
+            # Set temporary scene file path to stashed scene file path
+            # Clean up temporary .ma file
+            cmds.file(_temporary_ma_path, open=True, force=True, save=False)
+            cmds.file(rename=_scene_path)
+            cmds.file(modified=False)
+            os.remove(_temporary_ma_path)
+
+            if original_selection:
+                pm.select(original_selection)
+
+            if parallel:
+                # Exports the clips in concurrent batch processes
+                self.anim_clip_thread = partition_thread.AnimClipThread(
+                    export_config, snapshot_path, enabled_clips
+                )
+                self.anim_clip_thread.completed.connect(
+                    self._anim_clips_completed
                 )
+                self.anim_clip_thread.start()
+                # the thread deletes the snapshot when the clips are exported
+                snapshot_path = None
+                return True
+        finally:
+            if snapshot_path and os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+
+        self._import_animations_into_unreal(export_fbx_paths)
         return True
 
+    def _anim_clips_completed(self, export_config, success):
+        """
+        Event triggered when the animation clips Thread has completed.
+        """
+        if not success:
+            print("ERROR: Some animation clips failed to export")
+        self._import_animations_into_unreal(
+            export_config.get("exported_fbx_paths", [])
+        )
+
+    def _import_animations_into_unreal(self, export_fbx_paths):
+        """
+        Imports the exported animation clips into unreal, if enabled.
+        """
+        if not self.ue_import_cbx.isChecked():
+            return
+        skeleton_path = self.ue_skeleton_listwgt.selectedItems()[0].text()
+        unreal_folder = self.ue_file_path_lineedit.text()
+
+        for path in export_fbx_paths:
+            name = os.path.basename(path)
+            animation_name = ".".join(name.split(".")[:-1])
+            uegear.export_animation_to_unreal(
+                path, unreal_folder, animation_name, skeleton_path
+            )
+
     # helper methods
     def _get_or_create_export_node(self):
         """
@@ -1086,6 +1164,7 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
             "ue_file_path": self.ue_file_path_lineedit.text(),
             "ue_active_skeleton": "",
             "cull_joints": self.culljoints_checkbox.isChecked(),
+            "export_workers": self.export_workers_spinbox.value(),
         }
 
         # converting qt list widget data to text
@@ -1117,6 +1196,9 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         self.partitions_checkbox.setChecked(data.get("use_partitions", False))
         self.export_tab.setCurrentIndex(data.get("export_tab", 0))
         self.culljoints_checkbox.setChecked(data.get("cull_joints", False))
+        self.export_workers_spinbox.setValue(
+            data.get("export_workers", partition_thread.EXPORT_WORKERS)
+        )
 
         self.ue_import_cbx.setChecked(data.get("ue_enabled", False))
         self.ue_file_path_lineedit.setText(data.get("ue_file_path", ""))
@@ -1,9 +1,12 @@
 import os
+import json
 import subprocess
-from typing import Callable
 import tempfile
 import shlex
-import datetime
+import threading
+import timeit
+from collections import OrderedDict
+from concurrent import futures
 
 from mgear.vendor.Qt.QtCore import QThread, Signal
 from mgear.core import (
@@ -11,15 +14,105 @@ from mgear.core import (
     string,
     utils as coreUtils,
 )
+from mgear.shifter.game_tools_fbx import fbx_batch
 
 import maya.cmds as cmds
 
+# Default number of Maya batch processes exporting at the same time
+EXPORT_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+
+# Progress bar value reached at each conditioning stage. The exported items
+# fill the progress from ITEMS_PROGRESS_START to ITEMS_PROGRESS_END
+STAGE_PROGRESS = {
+    "open": 25,
+    "namespace": 30,
+    "clean_scene": 35,
+    "conditioned": 40,
+    "partitions": 40,
+}
+ITEMS_PROGRESS_START = 40
+ITEMS_PROGRESS_END = 95
+
+
+def get_mayabatch_command(script_file_path):
+    """
+    Gets the command that runs a MEL script file in a Maya batch process.
+
+    Returns the command arguments and if the command needs to run in a shell.
+    """
+    mayabatch_dir = coreUtils.get_maya_path()
+
+    # Depending on the os we would need to change from maya, to maya batch
+    # windows uses mayabatch
+    if str(coreUtils.get_os()) == "win64" or str(coreUtils.get_os()) == "nt":
+        option = "mayabatch"
+    else:
+        option = "maya"
+
+    mayabatch_command = "maya"
+    mayabatch_path = os.path.join(mayabatch_dir, mayabatch_command)
+    if option == "maya":
+        mayabatch_args = [shlex.quote(mayabatch_path)]
+        mayabatch_args.append("-batch")
+        mayabatch_shell = False
+        mayabatch_args.append("-script")
+        mayabatch_args.append(shlex.quote(script_file_path))
+    else:
+        mayabatch_args = ['"'+mayabatch_path+'"']
+        mayabatch_args.append("-batch")
+        mayabatch_shell = True
+        mayabatch_args.append("-script")
+        mayabatch_args.append('"'+script_file_path+'"')
+        mayabatch_args = "{}".format(" ".join(mayabatch_args))
+
+    return mayabatch_args, mayabatch_shell
+
+
+def write_job_file(job):
+    """
+    Writes a worker job as JSON and the MEL script that runs it.
+
+    Returns the MEL script path and the job file path.
+    """
+    job_file = tempfile.NamedTemporaryFile(
+        mode="w", delete=False, suffix=".json"
+    )
+    json.dump(job, job_file)
+    job_file.close()
+    job_path = string.normalize_path(job_file.name)
+
+    script_content = """
+python "from mgear.shifter.game_tools_fbx import fbx_batch";
+python "fbx_batch.run_job('{}')";
+""".format(job_path)
+    script_file = tempfile.NamedTemporaryFile(
+        mode="w", delete=False, suffix=".mel"
+    )
+    script_file.write(script_content)
+    script_file.close()
 
-class PartitionThread(QThread):
-    """ Thread that handles the creation of fbx partitions"""
+    return script_file.name, job_path
+
+
+def split_jobs(items, workers):
+    """
+    Splits the items in balanced groups, one for each worker.
+    """
+    workers = max(1, min(workers, len(items)))
+    return [items[i::workers] for i in range(workers)]
+
+
+class BatchExportThread(QThread):
+    """ Base thread that runs and monitors Maya batch export processes.
+
+    The batch processes report the progress with structured events. Each
+    event is emitted by event_signal and the exported items timings are
+    stored in the report.
+    """
 
     completed = Signal(object, bool)
     progress_signal = Signal(float)
+    event_signal = Signal(object)
 
     def __init__(self, export_config):
         """
@@ -27,61 +120,237 @@ class PartitionThread(QThread):
         """
         super().__init__()
 
-        # self.log_message = log_message_function
-
         self.export_config = export_config
+        self.workers = export_config.get("export_workers", EXPORT_WORKERS)
+
+        # exported item name as key, and timing data as value
+        self.report = OrderedDict()
+        self.total_items = 0
+        self.done_items = 0
+        self.start_time = None
+        self._lock = threading.Lock()
 
         # Makes sure the Thread removes itself
         self.finished.connect(self.deleteLater)
 
+    def onComplete(self, success):
+        """
+        Cleans up the thread when the thread is finished.
+        """
+        self.completed.emit(self.export_config, success)
+
+    def handle_event(self, event, worker=0):
+        """
+        Updates the report and progress from a batch process event.
+        """
+        event_type = event.get("event")
+        with self._lock:
+            if event_type == "stage":
+                progress = STAGE_PROGRESS.get(event.get("stage"))
+                if progress is not None:
+                    self.progress_signal.emit(progress)
+
+            elif event_type == "item_start":
+                self.report[event["name"]] = {
+                    "worker": worker,
+                    "success": None,
+                    "time": 0.0,
+                    "path": "",
+                }
+
+            elif event_type == "item_done":
+                self.report.setdefault(event["name"], {"worker": worker})
+                self.report[event["name"]].update(
+                    success=event.get("success", False),
+                    time=event.get("time", 0.0),
+                    path=event.get("path", ""),
+                )
+                self.done_items += 1
+                if self.total_items:
+                    ratio = min(1.0, self.done_items / float(self.total_items))
+                    self.progress_signal.emit(
+                        ITEMS_PROGRESS_START
+                        + (ITEMS_PROGRESS_END - ITEMS_PROGRESS_START) * ratio
+                    )
+
+        event["worker"] = worker
+        self.event_signal.emit(event)
+
+    def run_batch(self, script_file_path, worker=0):
+        """
+        Runs a MEL script in a Maya batch process.
+
+        Returns True if the process completed successfully.
+        """
+        mayabatch_args, mayabatch_shell = get_mayabatch_command(
+            script_file_path
+        )
+        prefix = "[worker {}] ".format(worker) if worker else ""
+
+        print("-------------------------------------------")
+        print("[Launching] MayaBatch {}".format(prefix))
+        print("   {}".format(mayabatch_args))
+        print("-------------------------------------------")
+
+        try:
+            with subprocess.Popen(mayabatch_args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                shell=mayabatch_shell,
+                universal_newlines=True,
+                bufsize=1
+                ) as process:
+
+                for line in process.stdout:
+                    line = line.strip()
+                    if line.startswith(fbx_batch.EVENT_TAG):
+                        try:
+                            event = json.loads(
+                                line[len(fbx_batch.EVENT_TAG):]
+                            )
+                        except ValueError:
+                            print(prefix + line)
+                            continue
+                        self.handle_event(event, worker)
+                        continue
+                    print(prefix + line)
+
+                returncode = process.wait()
+        except FileNotFoundError as error:
+            print("Error:", error)
+            return False
+        finally:
+            # Clean up Mel batch file
+            if os.path.exists(script_file_path):
+                os.remove(script_file_path)
+
+        print("{}Return Code: {}".format(prefix, returncode))
+        if returncode != 0:
+            print("{}Mayabatch process failed.".format(prefix))
+            return False
+        print("{}Mayabatch process completed successfully.".format(prefix))
+        return True
+
+    def run_jobs(self, jobs):
+        """
+        Runs the worker jobs in concurrent Maya batch processes.
+
+        Returns True if all the jobs completed successfully.
+        """
+        scripts = []
+        job_paths = []
+        for job in jobs:
+            script_file_path, job_path = write_job_file(job)
+            scripts.append(script_file_path)
+            job_paths.append(job_path)
+
+        try:
+            with futures.ThreadPoolExecutor(max_workers=len(scripts)) as pool:
+                results = list(
+                    pool.map(
+                        self.run_batch,
+                        scripts,
+                        range(1, len(scripts) + 1),
+                    )
+                )
+        finally:
+            for job_path in job_paths:
+                if os.path.exists(job_path):
+                    os.remove(job_path)
+        return all(results)
+
+    def print_report(self):
+        """
+        Prints the time spent exporting each item.
+        """
+        if not self.report:
+            return
+        print("----------- Export Summary ----------------")
+        for name, data in self.report.items():
+            print(
+                "  {:<30} {:>8.2f}s  worker {:<3} {}".format(
+                    name,
+                    data.get("time", 0.0),
+                    data.get("worker", 0),
+                    "OK" if data.get("success") else "FAILED",
+                )
+            )
+        items_time = sum(d.get("time", 0.0) for d in self.report.values())
+        print("  Items time: {:.2f}s".format(items_time))
+        if self.start_time is not None:
+            print(
+                "  Wall time: {:.2f}s".format(
+                    timeit.default_timer() - self.start_time
+                )
+            )
+        print("-------------------------------------------")
+
+
+class PartitionThread(BatchExportThread):
+    """ Thread that handles the creation of fbx partitions"""
+
     def run(self):
         """
         Main function that gets called when the thread starts.
         """
+        self.start_time = timeit.default_timer()
         # Show the Thread is starting
         self.progress_signal.emit(20)
 
         success = self.export_skeletal_mesh()
+        self.print_report()
         self.onComplete(success)
 
-    def onComplete(self, success):
+    def get_master_path(self):
         """
-        Cleans up the thread when the thread is finished.
+        Gets the path of the master .ma file.
         """
-        self.completed.emit(self.export_config, success)
+        file_path = self.export_config.get("file_path", "")
+        file_name = self.export_config.get("file_name", "")
+
+        if not file_name.endswith(".fbx"):
+            file_name = "{}.ma".format(file_name)
+        else:
+            file_name = "{}.ma".format(os.path.splitext(file_name)[0])
+
+        return string.normalize_path(os.path.join(file_path, file_name))
 
     def export_skeletal_mesh(self):
         """
         Triggers the batch process
+
+        The master file is conditioned in a first batch process. If more
+        than one worker is used, the partitions are then exported by
+        several batch processes from the conditioned file.
         """
         export_data = self.export_config
 
         geo_roots = export_data.get("geo_roots", "")
         joint_roots = [export_data.get("joint_root", "")]
-        file_path = export_data.get("file_path", "")
-        file_name = export_data.get("file_name", "")
         remove_namespaces = export_data.get("remove_namespace", True)
         scene_clean = export_data.get("scene_clean", True)
         skinning = export_data.get("skinning", True)
         blendshapes = export_data.get("blendshapes", True)
         use_partitions = export_data.get("use_partitions", True)
+        partitions = export_data.get("partitions", dict())
 
-        if not file_name.endswith(".fbx"):
-            file_name = "{}.ma".format(file_name)
-        else:
-            file_name = "{}.ma".format(os.path.splitext(file_name)[0])
-
-        export_path = string.normalize_path(os.path.join(file_path, file_name))
-
-        log_path = os.path.normpath(os.path.join(file_path, "logs_{}.txt".format(datetime.datetime.now().strftime("%m%d%Y%H%M"))))
+        export_path = self.get_master_path()
         print("\t>>> Export Path: {}".format(export_path))
 
-        path_is_valid = os.path.exists(export_path)
-
         # "master" .ma file does not exist, exit early.
-        if not path_is_valid:
+        if not os.path.exists(export_path):
             return False
 
+        parallel = use_partitions and self.workers > 1 and len(partitions) > 1
+        plan_path = None
+        if parallel:
+            plan_path = string.normalize_path(
+                os.path.splitext(export_path)[0] + "_partitions.json"
+            )
+        if use_partitions:
+            self.total_items = len(partitions)
+
         # Creates a MEL temporary job file..
         script_content = """
 python "from mgear.shifter.game_tools_fbx import fbx_batch";
@@ -89,7 +358,7 @@ python "master_path='{master_path}'";
 python "root_joint='{joint_root}'";
 python "root_geos={geo_roots}";
 python "export_data={e_data}";
-python "fbx_batch.perform_fbx_condition({ns}, {sc}, master_path, root_joint, root_geos, {sk}, {bs}, {ps}, export_data)";
+python "fbx_batch.perform_fbx_condition({ns}, {sc}, master_path, root_joint, root_geos, {sk}, {bs}, {ps}, export_data, {plan})";
 """.format(
             ns=remove_namespaces,
             sc=scene_clean,
@@ -99,116 +368,45 @@ python "fbx_batch.perform_fbx_condition({ns}, {sc}, master_path, root_joint, roo
             sk=skinning,
             bs=blendshapes,
             ps=use_partitions,
-            e_data=export_data)
+            e_data=export_data,
+            plan=repr(plan_path))
 
         script_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.mel')
         script_file.write(script_content)
         script_file_path = script_file.name
         script_file.close()
 
-        mayabatch_dir = coreUtils.get_maya_path()
-        mayabatch_path = None
-        mayabatch_args = None
-        mayabatch_shell = False
-
-        # Depending on the os we would need to change from maya, to maya batch
-        # windows uses mayabatch
-        if str(coreUtils.get_os()) == "win64" or str(coreUtils.get_os()) == "nt":
-            option = "mayabatch"
-        else:
-            option = "maya"
-
-        if option == "maya":
-            mayabatch_command = 'maya'
-            mayabatch_path = os.path.join(mayabatch_dir, mayabatch_command)
-            mayabatch_args = [shlex.quote(mayabatch_path)]
-            mayabatch_args.append("-batch")
-            mayabatch_shell = False
-            mayabatch_args.append("-script")
-            mayabatch_args.append(shlex.quote(script_file_path))
-            # mayabatch_args.append("-log")
-            # mayabatch_args.append(shlex.quote(log_path))
-
-            print("-------------------------------------------")
-            print("[Launching] MayaBatch")
-            print("   {}".format(mayabatch_args))
-            print("   {}".format(" ".join(mayabatch_args)))
-            print("-------------------------------------------")
-
-        else:
-            mayabatch_command = "maya"
-            mayabatch_path = os.path.join(mayabatch_dir, mayabatch_command)
-            mayabatch_args = ['"'+mayabatch_path+'"']
-            mayabatch_args.append("-batch")
-            mayabatch_shell = True
-            mayabatch_args.append("-script")
-            mayabatch_args.append('"'+script_file_path+'"')
-            # mayabatch_args.append("-log")
-            # mayabatch_args.append('"'+log_path+'"')
-
-            mayabatch_args = "{}".format(" ".join(mayabatch_args))
-
-            print("-------------------------------------------")
-            print("[Launching] MayaBatch")
-            print("   {}".format(mayabatch_args))
-            print("-------------------------------------------")
-
-        self.progress_signal.emit(50)
+        success = self.run_batch(script_file_path)
+        if not parallel:
+            return success
 
         try:
-            with subprocess.Popen(mayabatch_args,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                shell=mayabatch_shell,
-                universal_newlines=True,
-                bufsize=1
-                ) as process:
-
-                # Process each line (sentence) from the subprocess output
-                # Looks for specific sentences in the logs and uses those as progress milestones.
-                for line in process.stdout:
-                    line = line.strip()
-                    print(line)
-                    if line.find("Conditioned file:") >= 0:
-                        self.progress_signal.emit(60)
-                    if line.find("Removing Namespace..") >= 0:
-                        self.progress_signal.emit(65)
-                    if line.find("Cleaning Scene..") >= 0:
-                        self.progress_signal.emit(75)
-                    if line.find("[Partitions]") >= 0:
-                        self.progress_signal.emit(80)
-
-                # Capture the output and errors
-                stdout, stderr = process.communicate()
-
-                # Check the return code
-                #returncode = process.returncode
-                returncode = process.wait()
-                print("Return Code: {}".format(returncode))
-
-                # Check the result
-                if returncode == 0:
-                    print("Mayabatch process completed successfully.")
-                    print("-------------------------------------------")
-                    # print("Output:", stdout)
-                    #print("-------------------------------------------")
-                else:
-                    print("Mayabatch process failed.")
-                    print("Error:", stderr)
-                    print("-------------------------------------------")
-                    return False
-        except FileNotFoundError as error:
-            print("Error:", error)
-            return False
-
-        # Clean up Mel batch file
-        if os.path.exists(script_file_path):
-            print("[Removing File] {}".format(script_file_path))
-            os.remove(script_file_path)
-
-        # If all goes well return the export path location, else None
-        return True
+            if not success or not os.path.exists(plan_path):
+                return False
+
+            with open(plan_path, "r") as f:
+                partition_names = list(json.load(f)["partitions"].keys())
+            self.total_items = len(partition_names)
+            jobs = [
+                {
+                    "type": "partitions",
+                    "plan_path": plan_path,
+                    "partitions": names,
+                }
+                for names in split_jobs(partition_names, self.workers)
+            ]
+            print(
+                "[Partitions] Exporting {} partitions with {} workers".format(
+                    len(partition_names), len(jobs)
+                )
+            )
+            return self.run_jobs(jobs)
+        finally:
+            # Delete the conditioned snapshot and the plan
+            for path in [export_path, plan_path]:
+                if os.path.exists(path):
+                    print("[Removing File] {}".format(path))
+                    os.remove(path)
 
     def init_data(self):
         """
@@ -220,17 +418,8 @@ python "fbx_batch.perform_fbx_condition({ns}, {sc}, master_path, root_joint, roo
         Note: This process cannot be run in the thread as Maya commands are not thread safe,
         This causes Maya to become partially unresponsive.
         """
-        # Export initial FBX Master, from current Maya scene
-        file_path = self.export_config.get("file_path", "")
-        file_name = self.export_config.get("file_name", "")
-
-        if not file_name.endswith(".fbx"):
-            file_name = "{}.ma".format(file_name)
-        else:
-            file_name = "{}.ma".format(os.path.splitext(file_name)[0])
-
         # The location where the temoprary maya file will be saved to
-        master_path = string.normalize_path(os.path.join(file_path, file_name))
+        master_path = self.get_master_path()
 
         # Get the current scene path
         current_scene_path = cmds.file(query=True, sceneName=True)
@@ -248,3 +437,48 @@ python "fbx_batch.perform_fbx_condition({ns}, {sc}, master_path, root_joint, roo
         print("Temporary Master file: {}".format(master_path))
 
         return
+
+
+class AnimClipThread(BatchExportThread):
+    """ Thread that exports animation clips in concurrent batch processes.
+
+    The clips are exported from a scene snapshot prepared by the exporter.
+    The snapshot is deleted when all the clips are exported.
+    """
+
+    def __init__(self, export_config, snapshot_path, clips):
+        super().__init__(export_config)
+        self.snapshot_path = snapshot_path
+        self.clips = clips
+        self.total_items = len(clips)
+
+    def run(self):
+        self.start_time = timeit.default_timer()
+        self.progress_signal.emit(ITEMS_PROGRESS_START)
+
+        jobs = [
+            {
+                "type": "clips",
+                "scene_path": string.normalize_path(self.snapshot_path),
+                "export_data": self.export_config,
+                "clips": clips,
+            }
+            for clips in split_jobs(self.clips, self.workers)
+        ]
+        try:
+            success = self.run_jobs(jobs)
+        finally:
+            if os.path.exists(self.snapshot_path):
+                os.remove(self.snapshot_path)
+
+        self.export_config["exported_fbx_paths"] = self.exported_paths()
+        self.print_report()
+        self.onComplete(success)
+
+    def exported_paths(self):
+        """
+        Gets the fbx paths of the clips exported successfully.
+        """
+        return [
+            d["path"] for d in self.report.values() if d.get("success")
+        ]
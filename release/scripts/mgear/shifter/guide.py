@@ -2391,7 +2391,9 @@ class GuideSettings(MayaQWidgetDockableMixin, GuideMainSettings):
             fileMode=1,
             startingDirectory=startDir,
             okc="Apply",
-            fileFilter="mGear skin (*%s)" % skin.FILE_EXT,
+            fileFilter="mGear skin (*{})".format(
+                " *".join(skin.SKIN_FILE_EXTS)
+            ),
         )
         if not filePath:
             return
@@ -1,4 +1,3 @@
-import os
 import sys
 import traceback
 from functools import partial
@@ -12,8 +11,8 @@ from mgear.vendor.Qt import QtCore, QtWidgets, QtGui
 
 from mgear import shifter
 from mgear.shifter import guide_manager
+from mgear.shifter import registry
 from mgear.shifter import guide_manager_component_ui as gmcUI
-import importlib
 
 PY2 = sys.version_info[0] == 2
 
@@ -80,45 +79,30 @@ class GuideManagerComponent(MayaQWidgetDockableMixin, QtWidgets.QDialog):
 
     def get_component_list(self):
         comp_list = []
-        compDir = shifter.getComponentDirectories()
-        trackLoadComponent = []
-        for path, comps in compDir.items():
+        components = registry.get_registry()
+        for comp_name, path in registry.get_duplicates():
+            pm.displayWarning(
+                "Custom component name: %s, already in default "
+                "components. Names should be unique. This component is"
+                " not loaded" % comp_name
+            )
+        pm.progressWindow(
+            title="Loading Components", progress=0, max=len(components)
+        )
+        for comp_name in components.keys():
             pm.progressWindow(
-                title="Loading Components", progress=0, max=len(comps)
+                e=True, step=1, status="\nLoading: %s" % comp_name
             )
-            for comp_name in comps:
-                pm.progressWindow(
-                    e=True, step=1, status="\nLoading: %s" % comp_name
+            try:
+                # the guide module is reloaded only if the file changed
+                module = shifter.importComponentGuide(comp_name)
+                comp_list.append(module.TYPE)
+            except Exception as e:
+                pm.displayWarning(
+                    "{} can't be load. Error at import".format(comp_name)
                 )
-                if comp_name == "__init__.py":
-                    continue
-                elif comp_name in trackLoadComponent:
-                    pm.displayWarning(
-                        "Custom component name: %s, already in default "
-                        "components. Names should be unique. This component is"
-                        " not loaded" % comp_name
-                    )
-                    continue
-                else:
-                    trackLoadComponent.append(comp_name)
-
-                if not os.path.exists(
-                    os.path.join(path, comp_name, "__init__.py")
-                ):
-                    continue
-                try:
-                    module = shifter.importComponentGuide(comp_name)
-                    if PY2:
-                        reload(module)
-                    else:
-                        importlib.reload(module)
-                    comp_list.append(module.TYPE)
-                except Exception as e:
-                    pm.displayWarning(
-                        "{} can't be load. Error at import".format(comp_name)
-                    )
-                    pm.displayError(e)
-                    pm.displayError(traceback.format_exc())
+                pm.displayError(e)
+                pm.displayError(traceback.format_exc())
 
         pm.progressWindow(e=True, endProgress=True)
         return comp_list
@@ -236,10 +220,6 @@ class GuideManagerComponent(MayaQWidgetDockableMixin, QtWidgets.QDialog):
             item = self.gmcUIInst.component_listView.selectedIndexes()[0]
             comp_name = item.data()
             module = shifter.importComponentGuide(comp_name)
-            if PY2:
-                reload(module)
-            else:
-                importlib.reload(module)
             info_text = (
                 "{}\n".format(module.DESCRIPTION)
                 + "\n-------------------------------\n\n"
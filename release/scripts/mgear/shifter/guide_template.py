@@ -2,6 +2,7 @@ import json
 
 import mgear.pymaya as pm
 from mgear.shifter import guide
+from mgear.shifter import template_diff
 
 
 def updateGuide(*args):
@@ -57,10 +58,12 @@ def guide_component_diff(guideA, guideB):
     """
     compA = guideA["components_list"]
     compB = guideB["components_list"]
+    setA = set(compA)
+    setB = set(compB)
 
-    match = [c for c in compA if c in compB]
-    miss = list(set(compB).difference(compA))
-    extra = list(set(compA).difference(compB))
+    match = [c for c in compA if c in setB]
+    miss = [c for c in compB if c not in setA]
+    extra = [c for c in compA if c not in setB]
 
     diff_dict = {"match": match, "miss": miss, "extra": extra}
 
@@ -92,10 +95,9 @@ def guide_transform_diff(guideA, guideB, pos=False):
     # check root position
     root_tra_A = guideA["guide_root"]['tra']
     root_tra_B = guideB["guide_root"]['tra']
-    if root_tra_A != root_tra_B:
-        root_tra_match = False
-    else:
-        root_tra_match = True
+    not_found, not_match = tra_diff({"root": root_tra_A},
+                                    {"root": root_tra_B})
+    root_tra_match = not (not_found or not_match)
 
     return not_match_tra, root_tra_match
 
@@ -441,6 +443,28 @@ def guide_diff(guide,
         return gdiff
 
 
+def guide_changes(guide,
+                  master_guide,
+                  tolerance=template_diff.DEFAULT_TOLERANCE):
+    """Get the typed change list of a guide against a master guide.
+
+    Faster alternative to guide_diff for big guides. See template_diff
+    module for the change types.
+
+    Args:
+        guide (dict): Guide dictionary template
+        master_guide (dict): Guide dictionary template
+        tolerance (float, optional): Maximum absolute difference of the
+            transform values
+
+    Returns:
+        list: The changes. Empty list if the guides match
+    """
+    return template_diff.diff_templates(master_guide,
+                                        guide,
+                                        tolerance=tolerance)
+
+
 def print_guide_diff(diff_report):
 
     if diff_report:
@@ -593,22 +617,34 @@ def truncate_tra_dict_values(tra_dict):
     return tra_dict
 
 
-def tra_diff(tra_dictA, tra_dictB):
+def tra_diff(tra_dictA, tra_dictB, tolerance=None):
     """Check the differences between 2 transform dictionary
 
-    This function will truncate the values before make the comparation.
+    The values are compared under a tolerance, to avoid precision errors.
+    The dictionaries are not modified.
 
     Args:
         tra_dictA (dict): Transform or position dictionary
         tra_dictB (dict): Transform or position dictionary
+        tolerance (float, optional): Maximum absolute difference per value.
+            If None template_diff.DEFAULT_TOLERANCE is used
 
     Returns:
         dict: Not matching transforms or positions
     """
-    tra_dictA = truncate_tra_dict_values(tra_dictA)
-    tra_dictB = truncate_tra_dict_values(tra_dictB)
+    if tolerance is None:
+        tolerance = template_diff.DEFAULT_TOLERANCE
+    not_found_key = [k for k in tra_dictA.keys() if k not in tra_dictB]
+    keys = [k for k in tra_dictA.keys() if k in tra_dictB]
+    deltas = template_diff.max_deltas(
+        [template_diff.flat_matrix(tra_dictA[k]) for k in keys],
+        [template_diff.flat_matrix(tra_dictB[k]) for k in keys],
+    )
+    not_match_value = [[k, tra_dictA[k], tra_dictB[k]]
+                       for k, d in zip(keys, deltas)
+                       if d is None or d > tolerance]
 
-    return dict_diff(tra_dictA, tra_dictB)
+    return not_found_key, not_match_value
 
 
 def custom_step_values(customStep_val):
@@ -0,0 +1,321 @@
+"""Incremental build helpers for Shifter.
+
+Each component of the guide is fingerprinted from its guide template
+dictionary and the fingerprint of its parent chain. The fingerprints are
+stored on the rig root, so the next build can detect which components changed
+and only delete and regenerate those and their dependents.
+
+The nodes created by each component are recorded during the build with a
+node added callback, so a dirty component can be removed from the rig without
+relying on naming conventions.
+"""
+
+import hashlib
+import json
+
+import maya.api.OpenMaya as om
+from maya import cmds
+import mgear.pymaya as pm
+
+from mgear.core import attribute
+from mgear.core import curve
+
+HASH_ATTR = "component_hashes"
+ROOT_KEY = "__guide_root__"
+FINALIZE_KEY = "__finalize__"
+
+# decimals used to round the guide values before hashing. Avoid flagging
+# components as dirty because of floating point noise
+HASH_PRECISION = 5
+
+# Rig instances of the session builds, keyed by rig root uuid
+try:
+    BUILD_CACHE
+except NameError:
+    BUILD_CACHE = {}
+
+
+##########################################################
+# HASHING
+##########################################################
+
+
+def _round_values(value):
+    if isinstance(value, float):
+        return round(value, HASH_PRECISION)
+    if isinstance(value, dict):
+        return {str(k): _round_values(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_round_values(v) for v in value]
+    return value
+
+
+def hash_data(data):
+    """Get a stable hash from a json serializable data structure.
+
+    Args:
+        data (variant): The data to hash
+
+    Returns:
+        str: The hexadecimal hash
+    """
+    data_string = json.dumps(
+        _round_values(data), sort_keys=True, default=str
+    ).encode("utf-8")
+    return hashlib.sha1(data_string).hexdigest()
+
+
+def get_component_hashes(guide):
+    """Get the hash of each component of the guide.
+
+    The hash of a component include the hash of his parent and the local
+    name of the parent relative, so any change in the parent chain will flag
+    the children components as changed too. The guide root settings are
+    stored in the ROOT_KEY key.
+
+    Args:
+        guide (guide.Rig): The guide
+
+    Returns:
+        dict: Component full name as key and the hash as value
+    """
+    hashes = {ROOT_KEY: hash_data(guide.get_param_values())}
+    for comp_name in guide.componentsIndex:
+        comp_guide = guide.components[comp_name]
+        c_dict = dict(comp_guide.get_guide_template_dict())
+        c_dict.pop("child_components", None)
+        # control shape buffers stored in the guide for the component
+        buffers = [
+            guide.controllers[k]
+            for k in sorted(guide.controllers.keys())
+            if k.startswith(comp_name + "_")
+        ]
+        c_dict["ctl_buffers"] = curve.collect_curve_data(objs=buffers)
+        parent_hash = ""
+        if comp_guide.parentComponent:
+            # componentsIndex is sorted from parent to children
+            parent_hash = hashes.get(comp_guide.parentComponent.fullName, "")
+        hashes[comp_name] = hash_data(
+            [c_dict, parent_hash, comp_guide.parentLocalName]
+        )
+    return hashes
+
+
+def get_dirty_components(guide, old_hashes, new_hashes):
+    """Get the components to rebuild.
+
+    Changed and new components are dirty. Components with settings pointing
+    to a dirty component (i.e: space references or UI host) are flagged as
+    dependents and also dirty.
+
+    Args:
+        guide (guide.Rig): The guide
+        old_hashes (dict): The hashes stored in the rig
+        new_hashes (dict): The hashes of the current guide
+
+    Returns:
+        tuple: list of dirty components, sorted as the guide, and list of
+            removed components
+    """
+    dirty = set(
+        c
+        for c in guide.componentsIndex
+        if old_hashes.get(c) != new_hashes.get(c)
+    )
+    removed = [
+        c
+        for c in old_hashes.keys()
+        if c != ROOT_KEY and c not in new_hashes
+    ]
+
+    # components settings refering others components
+    references = {}
+    for comp_name in guide.componentsIndex:
+        values = guide.components[comp_name].get_param_values()
+        references[comp_name] = " ".join(
+            v for v in values.values() if isinstance(v, str)
+        )
+
+    changed = dirty.union(removed)
+    while changed:
+        new_dirty = set()
+        for comp_name, ref_string in references.items():
+            if comp_name in dirty:
+                continue
+            for c in changed:
+                if c + "_" in ref_string:
+                    new_dirty.add(comp_name)
+                    break
+        dirty.update(new_dirty)
+        changed = new_dirty
+
+    return [c for c in guide.componentsIndex if c in dirty], removed
+
+
+def get_stored_hashes(model):
+    """Get the component hashes stored in the rig root.
+
+    Args:
+        model (dagNode): The rig root
+
+    Returns:
+        dict: The stored hashes. Empty if the rig doesn't have hashes.
+    """
+    if not model.hasAttr(HASH_ATTR):
+        return {}
+    try:
+        return json.loads(model.attr(HASH_ATTR).get())
+    except (TypeError, ValueError):
+        return {}
+
+
+def store_hashes(model, hashes):
+    """Store the component hashes in the rig root.
+
+    Args:
+        model (dagNode): The rig root
+        hashes (dict): The component hashes
+    """
+    if model.hasAttr(HASH_ATTR):
+        model.attr(HASH_ATTR).set(json.dumps(hashes))
+    else:
+        attribute.addAttribute(model, HASH_ATTR, "string", json.dumps(hashes))
+
+
+##########################################################
+# BUILD CACHE
+##########################################################
+
+
+def _get_uuid(node):
+    return cmds.ls(node.name(), uuid=True)[0]
+
+
+def _evict_deleted():
+    for uuid in list(BUILD_CACHE.keys()):
+        if not cmds.ls(uuid):
+            del BUILD_CACHE[uuid]
+
+
+def register_rig(rig):
+    """Register a Rig instance as the last build of his rig root.
+
+    The previous builds with the same rig name are replaced, and the builds
+    of deleted rig roots are removed.
+
+    Args:
+        rig (shifter.Rig): The rig instance
+    """
+    _evict_deleted()
+    rig_name = rig.options["rig_name"]
+    for uuid, cached in list(BUILD_CACHE.items()):
+        if cached.options["rig_name"] == rig_name:
+            del BUILD_CACHE[uuid]
+    BUILD_CACHE[_get_uuid(rig.model)] = rig
+
+
+def get_cached_rig(rig_name):
+    """Get the Rig instance of the last session build of a rig.
+
+    Args:
+        rig_name (str): The rig root name
+
+    Returns:
+        shifter.Rig: The rig instance or None if the rig was not build in
+            the current session or the rig root doesn't exist anymore
+    """
+    _evict_deleted()
+    for model in pm.ls(rig_name, type="transform"):
+        if not model.hasAttr("is_rig"):
+            continue
+        rig = BUILD_CACHE.get(_get_uuid(model))
+        if rig is not None:
+            return rig
+    return None
+
+
+##########################################################
+# NODE TRACKING
+##########################################################
+
+
+class NodeTracker(object):
+    """Record the nodes created while the tracker is active.
+
+    Example:
+        >>> with NodeTracker() as tracker:
+        ...     pm.createNode("transform")
+        >>> len(tracker.handles)
+        1
+    """
+
+    def __init__(self):
+        self.handles = []
+        self._callback_id = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _node_added(self, mobject, *args):
+        self.handles.append(om.MObjectHandle(mobject))
+
+    def start(self):
+        if self._callback_id is None:
+            self._callback_id = om.MDGMessage.addNodeAddedCallback(
+                self._node_added, "dependNode"
+            )
+
+    def stop(self):
+        if self._callback_id is not None:
+            om.MMessage.removeCallback(self._callback_id)
+            self._callback_id = None
+
+    def alive_nodes(self):
+        """Get the recorded nodes that still exist in the scene.
+
+        Returns:
+            list: MObject list
+        """
+        return [h.object() for h in self.handles if h.isValid()]
+
+
+def delete_nodes(mobjects):
+    """Delete a list of nodes. Nodes already deleted are skipped.
+
+    DAG nodes are deleted first and only the top most nodes of the list, so
+    the children deletion doesn't invalidate the rest of the list.
+
+    Args:
+        mobjects (list): MObject list
+    """
+    handles = [om.MObjectHandle(m) for m in mobjects]
+    hash_codes = set(h.hashCode() for h in handles)
+    dag_nodes = []
+    for handle in handles:
+        mobject = handle.object()
+        if not mobject.hasFn(om.MFn.kDagNode):
+            continue
+        fn = om.MFnDagNode(mobject)
+        parents = [fn.parent(i) for i in range(fn.parentCount())]
+        if any(om.MObjectHandle(p).hashCode() in hash_codes for p in parents):
+            continue
+        dag_nodes.append(fn.fullPathName())
+    if dag_nodes:
+        cmds.delete(dag_nodes)
+
+    dg_nodes = []
+    for handle in handles:
+        if not handle.isValid():
+            continue
+        fn = om.MFnDependencyNode(handle.object())
+        if fn.isDefaultNode or fn.isShared:
+            continue
+        dg_nodes.append(fn.name())
+    for dg_node in dg_nodes:
+        # some nodes are deleted with the connected nodes
+        if cmds.objExists(dg_node):
+            cmds.delete(dg_node)
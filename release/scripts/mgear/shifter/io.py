@@ -5,6 +5,7 @@ import sys
 import mgear.pymaya as pm
 from mgear import shifter
 from mgear.core import curve
+from mgear.shifter import compiled_guide
 
 if sys.version_info[0] == 2:
     string_types = (basestring, )
@@ -64,7 +65,10 @@ def _get_file(write=False):
         mode = 1
     filePath = pm.fileDialog2(
         fileMode=mode,
-        fileFilter='Shifter Guide Template .sgt (*%s)' % ".sgt")
+        fileFilter="Shifter Guide Template .sgt (*{0});;"
+        "Shifter Compiled Guide .sgc (*{1});;"
+        "All Guide Templates (*{0} *{1})".format(
+            compiled_guide.SGT_EXT, compiled_guide.SGC_EXT))
 
     if not filePath:
         return
@@ -77,6 +81,9 @@ def _get_file(write=False):
 def export_guide_template(filePath=None, meta=None, conf=None, *args):
     """Export the guide templata to a file
 
+    If the file extension is .sgc, the template is saved in the compiled
+    guide format.
+
     Args:
         filePath (str, optional): Path to save the file
         meta (dict, optional): Arbitraty metadata dictionary. This can
@@ -85,21 +92,30 @@ def export_guide_template(filePath=None, meta=None, conf=None, *args):
     if not conf:
         conf = get_template_from_selection(meta)
     if conf:
-        data_string = json.dumps(conf, indent=4, sort_keys=True)
         if not filePath:
             filePath = _get_file(True)
             if not filePath:
                 return
 
+        if filePath.lower().endswith(compiled_guide.SGC_EXT):
+            compiled_guide.write_compiled_guide(conf, filePath)
+            return
+
+        data_string = json.dumps(conf, indent=4, sort_keys=True)
         with open(filePath, 'w') as f:
             f.write(data_string)
 
 
-def _import_guide_template(filePath=None):
+def _import_guide_template(filePath=None, use_cache=False):
     """Summary
 
+    With use_cache, the .sgt files are loaded from the compiled guide cache
+    if the file was already loaded before. Compiled .sgc files are also
+    supported.
+
     Args:
         filePath (str, optional): Path to the template file to import
+        use_cache (bool, optional): Use the compiled guide cache
 
     Returns:
         dict: the parsed guide dictionary
@@ -109,12 +125,31 @@ def _import_guide_template(filePath=None):
     if not filePath:
         pm.displayWarning("File path to template is None")
         return
-    conf = None
-    with open(filePath, 'r') as f:
-        if f:
-            conf = json.load(f)
 
-    return conf
+    return compiled_guide.load_guide_template(filePath, use_cache=use_cache)
+
+
+def convert_guide_template(filePath=None, outPath=None, *args):
+    """Convert a guide template (.sgt) to compiled guide (.sgc) or a
+    compiled guide back to guide template.
+
+    Args:
+        filePath (str, optional): Path to the file to convert
+        outPath (str, optional): Destination path. If None, the same path
+            with the other extension is used
+
+    Returns:
+        str: the converted file path
+    """
+    if not filePath:
+        filePath = _get_file()
+    if not filePath:
+        pm.displayWarning("File path to template is None")
+        return
+
+    outPath = compiled_guide.convert_guide_template(filePath, outPath)
+    pm.displayInfo("Guide template converted: {}".format(outPath))
+    return outPath
 
 
 def import_partial_guide(
@@ -136,7 +171,8 @@ def import_partial_guide(
             create a new initial heirarchy
     """
     if not conf:
-        conf = _import_guide_template(filePath)
+        conf = _import_guide_template(
+            filePath, use_cache=compiled_guide.is_cache_enabled())
     if conf:
         rig = shifter.Rig()
         rig.guide.set_from_dict(conf)
@@ -189,7 +225,8 @@ def build_from_file(filePath=None, conf=False, *args):
 
     """
     if not conf:
-        conf = _import_guide_template(filePath)
+        conf = _import_guide_template(
+            filePath, use_cache=compiled_guide.is_cache_enabled())
     if conf:
         rig = shifter.Rig()
         rig.buildFromDict(conf)
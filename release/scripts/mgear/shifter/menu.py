@@ -16,6 +16,11 @@ def install():
         ("Extract Controls", str_extract_controls, "mgear_move.svg"),
         ("-----", None),
         ("Build from Selection", str_build_from_selection, "mgear_play.svg"),
+        (
+            "Incremental Build from Selection",
+            str_build_incremental_from_selection,
+            "mgear_play.svg",
+        ),
         (
             "Build From Guide Template File",
             str_build_from_file,
@@ -33,6 +38,11 @@ def install():
             str_export_guide_template,
             "mgear_log-out.svg",
         ),
+        (
+            "Convert Guide Template (.sgt <-> .sgc)",
+            str_convert_guide_template,
+            "mgear_refresh-cw.svg",
+        ),
         (
             "Extract Guide From Rig",
             str_extract_guide_from_rig,
@@ -236,6 +246,11 @@ from mgear.shifter import guide_manager
 guide_manager.build_from_selection()
 """
 
+str_build_incremental_from_selection = """
+from mgear.shifter import guide_manager
+guide_manager.build_incremental_from_selection()
+"""
+
 str_build_from_file = """
 from mgear.shifter import io
 io.build_from_file(None)
@@ -251,6 +266,11 @@ from mgear.shifter import io
 io.export_guide_template(None, None)
 """
 
+str_convert_guide_template = """
+from mgear.shifter import io
+io.convert_guide_template(None)
+"""
+
 str_plebes = """
 from mgear.shifter import plebes
 plebes.plebes_gui()
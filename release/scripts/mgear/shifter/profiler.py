@@ -0,0 +1,268 @@
+"""Build profiler for Shifter.
+
+Records the wall time, the number of created nodes and the number of DG
+connections made for every (component, step) pair of a build, the custom
+steps and the finalize step.
+
+The profiler is disabled by default. It can be enabled from the Rig instance
+or with the MGEAR_SHIFTER_BUILD_PROFILE environment variable. If the
+variable value is a folder, the JSON and folded stack reports are saved
+there after each build.
+
+Example:
+    >>> rg = shifter.Rig()
+    >>> rg.profiler.enabled = True
+    >>> rg.buildFromSelection()
+    >>> rg.profiler.print_report(sort_by="nodes", limit=20)
+
+The folded stack report can be loaded in any flame graph viewer
+(i.e: speedscope or flamegraph.pl)
+"""
+
+import contextlib
+import json
+import os
+import timeit
+
+import maya.api.OpenMaya as om
+
+import mgear
+from mgear.core import attribute
+
+SHIFTER_PROFILE_ENV_KEY = "MGEAR_SHIFTER_BUILD_PROFILE"
+PROFILE_ATTR = "build_profile"
+PROFILE_EXT = ".sbp"
+FOLDED_EXT = ".folded"
+
+SORT_KEYS = ("time", "nodes", "connections")
+
+
+class BuildProfiler(object):
+    """Collect the timings and node counts of a Shifter build."""
+
+    def __init__(self, enabled=None):
+        """
+        Args:
+            enabled (bool, optional): Enable the profiler. If None the
+                MGEAR_SHIFTER_BUILD_PROFILE environment variable is used
+        """
+        if enabled is None:
+            enabled = bool(os.environ.get(SHIFTER_PROFILE_ENV_KEY, ""))
+        self.enabled = enabled
+        self.entries = []
+        self._nodes = 0
+        self._connections = 0
+        self._callback_ids = []
+
+    # =====================================================
+    # Counters
+
+    def _node_added(self, *args):
+        self._nodes += 1
+
+    def _connection_made(self, srcPlug, dstPlug, made, *args):
+        if made:
+            self._connections += 1
+
+    def start(self):
+        """Start counting the created nodes and connections."""
+        if self._callback_ids:
+            return
+        self._callback_ids = [
+            om.MDGMessage.addNodeAddedCallback(self._node_added, "dependNode"),
+            om.MDGMessage.addConnectionCallback(self._connection_made),
+        ]
+
+    def stop(self):
+        """Stop counting the created nodes and connections."""
+        for callback_id in self._callback_ids:
+            om.MMessage.removeCallback(callback_id)
+        self._callback_ids = []
+
+    def clear(self):
+        self.entries = []
+
+    @contextlib.contextmanager
+    def record(self, component, step, comp_type=""):
+        """Record the cost of a block of the build.
+
+        Args:
+            component (str): Component name or build section
+                (i.e: "custom_step" or "rig")
+            step (str): Step name
+            comp_type (str, optional): Component type
+        """
+        if not self.enabled:
+            yield
+            return
+
+        owner = not self._callback_ids
+        if owner:
+            self.start()
+        nodes = self._nodes
+        connections = self._connections
+        start = timeit.default_timer()
+        try:
+            yield
+        finally:
+            self.entries.append(
+                {
+                    "component": component,
+                    "type": comp_type,
+                    "step": step,
+                    "time": timeit.default_timer() - start,
+                    "nodes": self._nodes - nodes,
+                    "connections": self._connections - connections,
+                }
+            )
+            if owner:
+                self.stop()
+
+    # =====================================================
+    # Reports
+
+    def get_report(self, sort_by="time", group_by=None):
+        """Get the profile entries sorted.
+
+        Args:
+            sort_by (str, optional): "time", "nodes" or "connections"
+            group_by (str, optional): Sum the entries by "component", "type"
+                or "step". If None the entries are returned per
+                (component, step)
+
+        Returns:
+            list: List of dictionaries
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(
+                "Not valid sort key: {}. Use {}".format(sort_by, SORT_KEYS)
+            )
+        entries = self.entries
+        if group_by:
+            grouped = {}
+            for entry in self.entries:
+                key = entry[group_by]
+                if key not in grouped:
+                    grouped[key] = {
+                        group_by: key,
+                        "time": 0.0,
+                        "nodes": 0,
+                        "connections": 0,
+                    }
+                for k in SORT_KEYS:
+                    grouped[key][k] += entry[k]
+            entries = list(grouped.values())
+        return sorted(entries, key=lambda x: x[sort_by], reverse=True)
+
+    def print_report(self, sort_by="time", group_by=None, limit=None):
+        """Print the profile report in the script editor.
+
+        Args:
+            sort_by (str, optional): "time", "nodes" or "connections"
+            group_by (str, optional): "component", "type" or "step"
+            limit (int, optional): Number of entries to print
+        """
+        report = self.get_report(sort_by, group_by)
+        total = sum(e["time"] for e in self.entries)
+        mgear.log("\n" + "= SHIFTER BUILD PROFILE " + "=" * 43)
+        for entry in report[:limit]:
+            if group_by:
+                name = entry[group_by]
+            else:
+                name = "{} ({}) : {}".format(
+                    entry["component"], entry["type"], entry["step"]
+                )
+            mgear.log(
+                "{:<50} {:>8.3f}s {:>5.1f}% nodes: {:>6} conn: {:>6}".format(
+                    name,
+                    entry["time"],
+                    entry["time"] / total * 100 if total else 0.0,
+                    entry["nodes"],
+                    entry["connections"],
+                )
+            )
+
+    def to_dict(self):
+        return {
+            "entries": self.entries,
+            "total_time": sum(e["time"] for e in self.entries),
+            "total_nodes": sum(e["nodes"] for e in self.entries),
+            "total_connections": sum(e["connections"] for e in self.entries),
+        }
+
+    def to_folded(self, rig_name="rig", value="time"):
+        """Get the profile in folded stack format for flame graphs.
+
+        Each line is "rig;component (type);step value". Time values are in
+        microseconds.
+
+        Args:
+            rig_name (str, optional): Name of the root frame
+            value (str, optional): "time", "nodes" or "connections"
+
+        Returns:
+            str: The folded stacks
+        """
+        lines = []
+        for entry in self.entries:
+            if entry["type"]:
+                frame = "{} ({})".format(entry["component"], entry["type"])
+            else:
+                frame = entry["component"]
+            if value == "time":
+                count = int(entry["time"] * 1000000)
+            else:
+                count = entry[value]
+            lines.append(
+                "{};{};{} {}".format(rig_name, frame, entry["step"], count)
+            )
+        return "\n".join(lines) + "\n"
+
+    def export(self, folder, rig_name="rig"):
+        """Save the JSON and folded stack reports.
+
+        Args:
+            folder (str): Destination folder
+            rig_name (str, optional): Name used for the files and the root
+                frame of the flame graph
+
+        Returns:
+            tuple: JSON and folded file paths
+        """
+        json_path = os.path.join(folder, rig_name + PROFILE_EXT)
+        with open(json_path, "w") as f:
+            f.write(json.dumps(self.to_dict(), indent=4))
+        folded_path = os.path.join(folder, rig_name + FOLDED_EXT)
+        with open(folded_path, "w") as f:
+            f.write(self.to_folded(rig_name))
+        return json_path, folded_path
+
+    def embed(self, node):
+        """Store the JSON report in a node attribute.
+
+        Args:
+            node (dagNode): The node. i.e: the rig root
+        """
+        data = json.dumps(self.to_dict())
+        if node.hasAttr(PROFILE_ATTR):
+            node.attr(PROFILE_ATTR).set(data)
+        else:
+            attribute.addAttribute(node, PROFILE_ATTR, "string", data)
+
+    def output(self, model):
+        """Output the reports at the end of the build.
+
+        Prints the report, embeds it in the rig root and saves the files
+        if the environment variable points to a folder.
+
+        Args:
+            model (dagNode): The rig root
+        """
+        if not self.enabled or not self.entries:
+            return
+        self.print_report(limit=30)
+        self.embed(model)
+        folder = os.environ.get(SHIFTER_PROFILE_ENV_KEY, "")
+        if os.path.isdir(folder):
+            for path in self.export(folder, model.name()):
+                mgear.log("Build profile saved: " + path)
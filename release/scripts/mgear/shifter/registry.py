@@ -0,0 +1,251 @@
+"""Shifter component registry.
+
+Resolve the component types to their module folder once and keep the result
+for the session, so importing a component doesn't need to list every
+component directory or try a failing import first.
+
+The registry is validated with the modification time of the search
+directories. Adding or removing a component folder changes the mtime of his
+parent directory and triggers a new scan. The component modules are
+reloaded on import if the source file changed since the last import.
+
+Example:
+    >>> from mgear.shifter import registry
+    >>> registry.get_component_info("EPIC_arm_01")["path"]
+    '.../shifter_epic_components/EPIC_arm_01'
+    >>> module = registry.import_component("EPIC_arm_01", guide=True)
+"""
+
+import importlib
+import os
+import sys
+from collections import OrderedDict
+
+import mgear
+import mgear.pymaya as pm
+from mgear import shifter_classic_components
+from mgear import shifter_epic_components
+
+PY2 = sys.version_info[0] == 2
+
+SHIFTER_COMPONENT_ENV_KEY = "MGEAR_SHIFTER_COMPONENT_PATH"
+
+DEFAULT_COMPONENT_PATHS = [
+    os.path.dirname(shifter_classic_components.__file__),
+    os.path.dirname(shifter_epic_components.__file__),
+]
+
+# Components found in the session
+try:
+    REGISTRY
+except NameError:
+    REGISTRY = {
+        "paths": None,
+        "components": OrderedDict(),
+        "duplicates": [],
+    }
+
+
+##########################################################
+# SCAN
+##########################################################
+
+
+def get_search_paths():
+    """Get the component search directories.
+
+    The default component directories are followed by the paths of the
+    MGEAR_SHIFTER_COMPONENT_PATH environment variable.
+
+    Returns:
+        list: Directory paths
+    """
+    paths = list(DEFAULT_COMPONENT_PATHS)
+    envvarval = os.environ.get(SHIFTER_COMPONENT_ENV_KEY, "")
+    for path in envvarval.split(os.pathsep):
+        if path and path not in paths:
+            paths.append(path)
+    return paths
+
+
+def _get_mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _get_paths_state(paths):
+    return [(p, _get_mtime(p)) for p in paths]
+
+
+def _scan(paths):
+    """Scan the search directories for component folders.
+
+    Args:
+        paths (list): Search directories
+
+    Returns:
+        tuple: OrderedDict of component entries and list of (type, path)
+            duplicated components that are not registered
+    """
+    components = OrderedDict()
+    duplicates = []
+    for base in paths:
+        if not os.path.isdir(base):
+            if base in DEFAULT_COMPONENT_PATHS:
+                message = "= GEAR RIG SYSTEM ====== notify:"
+                message += (
+                    "\n  default module directory is not "
+                    "found at {}".format(base)
+                )
+                message += "\n\n check your mGear installation"
+                message += " or call your system administrator."
+                message += "\n"
+                mgear.log(message, mgear.sev_error)
+            continue
+        for comp_type in sorted(os.listdir(base)):
+            path = os.path.join(base, comp_type)
+            init_path = os.path.join(path, "__init__.py")
+            if not os.path.isfile(init_path):
+                continue
+            if comp_type in components:
+                duplicates.append((comp_type, path))
+                continue
+            components[comp_type] = {
+                "type": comp_type,
+                "base": base,
+                "path": path,
+                "mtime": _get_mtime(init_path),
+                "version": None,
+                "loaded": {},
+            }
+    return components, duplicates
+
+
+def get_registry(force=False):
+    """Get the registered components.
+
+    The search directories are only listed again if the search paths or
+    the mtime of any of them changed since the last scan.
+
+    Args:
+        force (bool, optional): Scan the directories even if the registry
+            is up to date
+
+    Returns:
+        OrderedDict: Component type as key and the component entry as value.
+            The entry have the "type", "base", "path", "mtime" and
+            "version" keys. Version is None until the guide is imported.
+    """
+    state = _get_paths_state(get_search_paths())
+    if force or REGISTRY["paths"] != state:
+        components, duplicates = _scan([p for p, _ in state])
+        # keep the import records of the modules already loaded
+        for comp_type, entry in components.items():
+            old = REGISTRY["components"].get(comp_type)
+            if old and old["path"] == entry["path"]:
+                entry["loaded"] = old["loaded"]
+                entry["version"] = old["version"]
+        REGISTRY["components"] = components
+        REGISTRY["duplicates"] = duplicates
+        REGISTRY["paths"] = state
+    return REGISTRY["components"]
+
+
+def get_duplicates():
+    """Get the components not registered because the type name is
+    already used in a previous search directory.
+
+    Returns:
+        list: List of (type, path) tuples
+    """
+    get_registry()
+    return list(REGISTRY["duplicates"])
+
+
+def get_component_info(comp_type):
+    """Get the registry entry of a component type.
+
+    Args:
+        comp_type (str): Component type
+
+    Returns:
+        dict: The component entry or None if the type is not registered
+    """
+    return get_registry().get(comp_type)
+
+
+def get_component_directories():
+    """Get the registered components grouped by search directory.
+
+    Returns:
+        dict: Directory as key and the list of component types as value
+    """
+    directories = OrderedDict()
+    for entry in get_registry().values():
+        directories.setdefault(entry["base"], []).append(entry["type"])
+    return directories
+
+
+def clear():
+    """Clear the registry. The next query will scan the directories."""
+    REGISTRY["paths"] = None
+    REGISTRY["components"] = OrderedDict()
+    REGISTRY["duplicates"] = []
+
+
+##########################################################
+# IMPORT
+##########################################################
+
+
+def _reload(module):
+    if PY2:
+        return reload(module)  # type: ignore # noqa: F821
+    return importlib.reload(module)
+
+
+def import_component(comp_type, guide=False, reload_module=False):
+    """Import the module of a registered component.
+
+    The module is reloaded if the source file changed since the last import.
+
+    Args:
+        comp_type (str): Component type
+        guide (bool, optional): Import the guide module instead of the
+            component module
+        reload_module (bool, optional): Force the module reload
+
+    Returns:
+        module: The imported module
+
+    Raises:
+        ImportError: If the component type is not registered
+    """
+    entry = get_component_info(comp_type)
+    if entry is None:
+        raise ImportError("Component not found: {}".format(comp_type))
+
+    base = pm.dirmap(cd=entry["base"])
+    if base not in sys.path:
+        sys.path.append(base)
+
+    if guide:
+        module_name = "{}.guide".format(comp_type)
+        file_path = os.path.join(entry["path"], "guide.py")
+    else:
+        module_name = comp_type
+        file_path = os.path.join(entry["path"], "__init__.py")
+    mtime = _get_mtime(file_path)
+
+    module = sys.modules.get(module_name)
+    if module is None:
+        module = importlib.import_module(module_name)
+    elif reload_module or entry["loaded"].get(module_name, mtime) != mtime:
+        module = _reload(module)
+    entry["loaded"][module_name] = mtime
+
+    if guide:
+        entry["version"] = getattr(module, "VERSION", None)
+    return module
@@ -28,11 +28,13 @@ Attributes:
 # python
 import json
 import math
+import re
 
 # dcc
 import maya.cmds as mc
 import mgear.pymaya as pm
 import maya.OpenMaya as om
+import maya.api.OpenMaya as om2
 
 # mgear
 from mgear.core import utils
@@ -40,6 +42,13 @@ from mgear.core import vector
 from mgear.core import transform
 from mgear.core import meshNavigation
 
+try:
+    import numpy as np
+
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
+
 
 # constants -------------------------------------------------------------------
 
@@ -273,6 +282,262 @@ def getRepositionMatrixSingleRef(node_matrix,
     return refPosition_matrix
 
 
+# batched placement -----------------------------------------------------------
+
+VERTEX_NAME_RE = re.compile(r"^(.+)\.vtx\[(\d+)\]$")
+
+
+def splitVertexName(vertex_name):
+    """split a vertex name into mesh name and vertex index
+
+    Args:
+        vertex_name (str): eg "skin_geo_setupShape.vtx[12]"
+
+    Returns:
+        tuple: mesh name, vertex index
+    """
+    match = VERTEX_NAME_RE.match(vertex_name)
+    if not match:
+        raise ValueError("Not a vertex name: {}".format(vertex_name))
+    return match.group(1), int(match.group(2))
+
+
+def getVertexFrames(query, vertices):
+    """Same frames as getVertMatrix, for many vertices at once.
+
+    The frame position is the bounding box center of the connected faces
+    and the rotation is aligned to the normal of the first connected face.
+    The mesh points, topology and normals are read from the mesh query,
+    no component nodes are created.
+
+    Args:
+        query (meshNavigation.MeshQuery): query of the mesh
+        vertices (list): vertex indices
+
+    Returns:
+        dict: vertex index as key and the frame MMatrix as value
+    """
+    query.load_topology()
+    points = query.points
+    vertex_it = om2.MItMeshVertex(query.dag_path)
+    frames = {}
+    for vertex in vertices:
+        if vertex in frames:
+            continue
+        vertex_it.setIndex(vertex)
+        faces = list(vertex_it.getConnectedFaces())
+        face_points = [v for f in faces for v in query.face_vertices(f)]
+        if NUMPY_READY:
+            face_pos = points[face_points]
+            center = (face_pos.min(axis=0) + face_pos.max(axis=0)) * .5
+        else:
+            face_pos = [points[v] for v in face_points]
+            center = [(min(p[i] for p in face_pos)
+                       + max(p[i] for p in face_pos)) * .5
+                      for i in range(3)]
+        normal = query.fn.getPolygonNormal(faces[0], om2.MSpace.kWorld)
+        normal = [normal.x, normal.y, normal.z]
+        tangent = [0, 1, 0]
+        cross = [normal[1] * tangent[2] - normal[2] * tangent[1],
+                 normal[2] * tangent[0] - normal[0] * tangent[2],
+                 normal[0] * tangent[1] - normal[1] * tangent[0]]
+        tMatrix = normal + [0] + tangent + [0] + cross + [0, 0, 0, 0, 1]
+        rotation = om2.MTransformationMatrix(om2.MMatrix(tMatrix)).rotation()
+        frame = om2.MTransformationMatrix()
+        frame.setRotation(rotation)
+        frame.setTranslation(om2.MVector(*[float(c) for c in center]),
+                             om2.MSpace.kWorld)
+        frames[vertex] = frame.asMatrix()
+    return frames
+
+
+def getWorldMatrices(nodes):
+    """world matrices of nodes, read with the api in one pass
+
+    Args:
+        nodes (list): node names
+
+    Returns:
+        list: of MMatrix
+    """
+    sel = om2.MSelectionList()
+    for node in nodes:
+        sel.add(node)
+    return [sel.getDagPath(i).inclusiveMatrix() for i in range(len(nodes))]
+
+
+def _matrixToList(matrix):
+    return [[matrix.getElement(r, c) for c in range(4)] for r in range(4)]
+
+
+def computeGuideRelativeDictionary(mesh, guideOrder):
+    """Batched version of getGuideRelativeDictionary.
+
+    The closest vertices of all the guides, and of the mirrored reference
+    positions, are found with two batched mesh queries and the vertex
+    frames are computed once per vertex.
+
+    Args:
+        mesh (str): name of the mesh
+        guideOrder (list): the order to query the guide hierarchy
+
+    Returns:
+        dictionary: create a dictionary of guide:[[edgeIDs], relativeMatrix]
+    """
+    guideOrder = [str(g) for g in guideOrder]
+    if not guideOrder:
+        return {}
+    query = meshNavigation.MeshQuery(mesh)
+    node_matrices = getWorldMatrices(guideOrder)
+    guide_pos = [[m.getElement(3, i) for i in range(3)]
+                 for m in node_matrices]
+
+    clst_verts = query.closest_vertices(guide_pos)
+    frames = getVertexFrames(query, clst_verts)
+
+    # reference position mirrored through the guide position
+    mr_pos = []
+    for pos, vert in zip(guide_pos, clst_verts):
+        ref = frames[vert]
+        mr_pos.append([2 * pos[i] - ref.getElement(3, i) for i in range(3)])
+    mr_verts = query.closest_vertices(mr_pos)
+    frames.update(getVertexFrames(query, mr_verts))
+
+    vtx_name = query.partial_name + ".vtx[{}]"
+    relativeGuide_dict = {}
+    for guide, node_matrix, vert, mr_vert in zip(guideOrder,
+                                                 node_matrices,
+                                                 clst_verts,
+                                                 mr_verts):
+        relativeGuide_dict[guide] = [[vtx_name.format(vert),
+                                      vtx_name.format(mr_vert)],
+                                     _matrixToList(node_matrix),
+                                     _matrixToList(frames[vert]),
+                                     _matrixToList(frames[mr_vert])]
+    return relativeGuide_dict
+
+
+def _getVertexPositions(vertex_names):
+    """current world positions of vertices, one bulk read per mesh
+
+    Args:
+        vertex_names (list): of vertex names
+
+    Returns:
+        list: of [x, y, z]
+    """
+    queries = {}
+    positions = []
+    for vertex_name in vertex_names:
+        mesh, index = splitVertexName(vertex_name)
+        if mesh not in queries:
+            queries[mesh] = meshNavigation.MeshQuery(mesh)
+        positions.append(queries[mesh].points[index])
+    if NUMPY_READY:
+        return np.array(positions, dtype=np.float64).reshape(-1, 3)
+    return positions
+
+
+def computeRepositionMatrices(guideOrder, guideDictionary):
+    """Batched version of getRepositionMatrix for all the guides.
+
+    The vertex positions of the current mesh are read in bulk and the
+    reference lengths and centers of all the guides are computed at once.
+
+    Args:
+        guideOrder (list): of the hierarchy to crawl
+        guideDictionary (dictionary): dict of the guide:edge, matrix position
+
+    Returns:
+        list: of (guide, MMatrix) in guideOrder, skipping the guides not
+            found or not placed
+    """
+    guides = [g for g in guideOrder
+              if g in guideDictionary
+              and g not in SKIP_PLACEMENT_NODES
+              and mc.objExists(g)]
+    if not guides:
+        return []
+
+    entries = [guideDictionary[g] for g in guides]
+    current = _getVertexPositions([e[0][0] for e in entries])
+    mr_current = _getVertexPositions([e[0][1] for e in entries])
+    orig = [[e[2][3][i] for i in range(3)] for e in entries]
+    mr_orig = [[e[3][3][i] for i in range(3)] for e in entries]
+
+    if NUMPY_READY:
+        orig = np.array(orig, dtype=np.float64).reshape(-1, 3)
+        mr_orig = np.array(mr_orig, dtype=np.float64).reshape(-1, 3)
+        current_length = np.linalg.norm(mr_current - current, axis=1)
+        orig_length = np.linalg.norm(mr_orig - orig, axis=1)
+        safe_length = np.where(orig_length != 0, orig_length, 1.0)
+        length_percentage = np.where(orig_length != 0,
+                                     current_length / safe_length,
+                                     1.0).tolist()
+        orig_center = ((orig + mr_orig) * .5).tolist()
+        current_center = ((current + mr_current) * .5).tolist()
+    else:
+        length_percentage = []
+        orig_center = []
+        current_center = []
+        for a, b, c, d in zip(current, mr_current, orig, mr_orig):
+            current_length = math.sqrt(sum((b[i] - a[i]) ** 2
+                                           for i in range(3)))
+            orig_length = math.sqrt(sum((d[i] - c[i]) ** 2
+                                        for i in range(3)))
+            length_percentage.append(current_length / orig_length
+                                     if orig_length else 1)
+            orig_center.append([(c[i] + d[i]) * .5 for i in range(3)])
+            current_center.append([(a[i] + b[i]) * .5 for i in range(3)])
+
+    result = []
+    for guide, entry, pct, o_center, c_center in zip(guides,
+                                                     entries,
+                                                     length_percentage,
+                                                     orig_center,
+                                                     current_center):
+        node_matrix = om2.MMatrix([v for row in entry[1] for v in row])
+        orig_center_matrix = om2.MMatrix()
+        for i in range(3):
+            orig_center_matrix.setElement(3, i, o_center[i])
+        refPosition_matrix = om2.MMatrix()
+        for i in range(3):
+            refPosition_matrix.setElement(3, i, c_center[i])
+
+        deltaMatrix = node_matrix * orig_center_matrix.inverse()
+        deltaMatrix = deltaMatrix * pct
+        tm = om2.MTransformationMatrix(deltaMatrix)
+        tm.setScale([1, 1, 1], om2.MSpace.kWorld)
+        tm.setShear([0, 0, 0], om2.MSpace.kWorld)
+        result.append((guide, tm.asMatrix() * refPosition_matrix))
+    return result
+
+
+def applyGuidePlacement(guideOrder, guideDictionary, reset_scale=False):
+    """Move the guides to the batched reposition matrices, in a single pass
+    in the hierarchy order
+
+    Args:
+        guideOrder (list): of the hierarchy to crawl
+        guideDictionary (dictionary): dict of the guide:edge, matrix position
+        reset_scale (bool, optional): set the guides scale to 1
+
+    Yields:
+        str: the placed guide
+    """
+    for guide, matrix in computeRepositionMatrices(guideOrder,
+                                                   guideDictionary):
+        scl = mc.getAttr(guide + ".scale")[0]
+        mc.xform(guide,
+                 matrix=list(matrix),
+                 worldSpace=True,
+                 preserve=True)
+        if reset_scale:
+            scl = (1, 1, 1)
+        mc.setAttr(guide + ".scale", *scl)
+        yield guide
+
+
 @utils.viewport_off
 @utils.one_undo
 def getGuideRelativeDictionaryLegacy(mesh, guideOrder):
@@ -318,6 +583,9 @@ def getGuideRelativeDictionaryLegacy(mesh, guideOrder):
 def yieldGuideRelativeDictionary(mesh, guideOrder, relativeGuide_dict):
     """create a dictionary of guide:[[shape.vtx[int]], relativeMatrix]
 
+    The placement of all the guides is computed in batch, the dictionary is
+    then filled one guide at a time to report the progress.
+
     Args:
         mesh (string): name of the mesh
         guideOrder (list): the order to query the guide hierarchy
@@ -325,28 +593,9 @@ def yieldGuideRelativeDictionary(mesh, guideOrder, relativeGuide_dict):
     Returns:
         dictionary: create a dictionary of guide:[[edgeIDs], relativeMatrix]
     """
+    batch_dict = computeGuideRelativeDictionary(mesh, guideOrder)
     for guide in guideOrder:
-        guide = pm.PyNode(guide)
-        # slow function A
-        clst_vert = meshNavigation.getClosestVertexFromTransform(mesh, guide)
-        vertexIds = [clst_vert.name()]
-        # slow function B
-        orig_ref_matrix = getVertMatrix(clst_vert.name())
-        #  --------------------------------------------------------------------
-        a_mat = guide.getMatrix(worldSpace=True)
-
-        mm = ((orig_ref_matrix - a_mat) * -1) + a_mat
-        pos = mm[3][:3]
-
-        mr_vert = meshNavigation.getClosestVertexFromTransform(mesh, pos)
-        mr_orig_ref_matrix = getVertMatrix(mr_vert.name())
-        vertexIds.append(mr_vert.name())
-
-        node_matrix = guide.getMatrix(worldSpace=True)
-        relativeGuide_dict[guide.name()] = [vertexIds,
-                                            node_matrix.get(),
-                                            orig_ref_matrix.get(),
-                                            mr_orig_ref_matrix.get()]
+        relativeGuide_dict[str(guide)] = batch_dict[str(guide)]
         yield relativeGuide_dict
 
 
@@ -362,12 +611,7 @@ def getGuideRelativeDictionary(mesh, guideOrder):
     Returns:
         dictionary: create a dictionary of guide:[[edgeIDs], relativeMatrix]
     """
-    relativeGuide_dict = {}
-    mesh = pm.PyNode(mesh)
-    for result in yieldGuideRelativeDictionary(
-            mesh, guideOrder, relativeGuide_dict):
-        pass
-    return relativeGuide_dict
+    return computeGuideRelativeDictionary(mesh, guideOrder)
 
 
 @utils.viewport_off
@@ -406,21 +650,9 @@ def yieldUpdateGuidePlacement(guideOrder, guideDictionary):
         guideOrder (list): of the hierarchy to crawl
         guideDictionary (dictionary): dict of the guide:edge, matrix position
     """
-    for guide in guideOrder:
-        if guide not in guideDictionary or not mc.objExists(guide):
-            continue
-        elif guide in SKIP_PLACEMENT_NODES:
-            continue
-        (vertexIds,
-         node_matrix,
-         orig_ref_matrix,
-         mr_orig_ref_matrix) = guideDictionary[guide]
-
-        repoMatrix = getRepositionMatrix(pm.dt.Matrix(node_matrix),
-                                         pm.dt.Matrix(orig_ref_matrix),
-                                         pm.dt.Matrix(mr_orig_ref_matrix),
-                                         vertexIds)
-        yield repoMatrix
+    for _, repoMatrix in computeRepositionMatrices(guideOrder,
+                                                   guideDictionary):
+        yield pm.dt.Matrix(repoMatrix)
 
 
 @utils.viewport_off
@@ -432,20 +664,9 @@ def updateGuidePlacement(guideOrder, guideDictionary, reset_scale=False):
         guideOrder (list): of the hierarchy to crawl
         guideDictionary (dictionary): dict of the guide:edge, matrix position
     """
-    updateGen = yieldUpdateGuidePlacement(guideOrder, guideDictionary)
-    for guide in guideOrder:
-        if guide not in guideDictionary or not mc.objExists(guide):
-            continue
-        elif guide in SKIP_PLACEMENT_NODES:
-            continue
-        guideNode = pm.PyNode(guide)
-        scl = guideNode.getScale()
-        repoMatrix = next(updateGen)
-        guideNode.setMatrix(repoMatrix, worldSpace=True, preserve=True)
-        if reset_scale:
-            guideNode.setScale([1, 1, 1])
-        else:
-            guideNode.setScale(scl)
+    for _ in applyGuidePlacement(guideOrder,
+                                 guideDictionary,
+                                 reset_scale=reset_scale):
         yield True
 
 
@@ -515,7 +736,9 @@ def importGuidePlacement(filepath):
         referenceMesh (str, optional): name of mesh to compare against
     """
     data = _importData(filepath)
-    updateGuidePlacement(data["ordered_hierarchy"], data["relativeGuide_dict"])
+    for _ in applyGuidePlacement(data["ordered_hierarchy"],
+                                 data["relativeGuide_dict"]):
+        pass
     return data["relativeGuide_dict"], data["ordered_hierarchy"]
 
 
@@ -0,0 +1,77 @@
+"""Headless worker process of the Rig Builder batch mode.
+
+Builds the single row of a Rig Builder config and writes the validator
+results in a JSON file, so the parent Maya session can merge them in the
+batch report.
+
+Usage:
+    mayapy batch_worker.py <config.srb> <result.json>
+"""
+
+import json
+import os
+import sys
+import traceback
+
+
+def main(argv):
+    config_path, result_path = argv
+
+    result = {
+        "output_name": None,
+        "valid": False,
+        "results": {},
+        "error": None,
+    }
+    try:
+        import maya.standalone
+
+        maya.standalone.initialize(name="python")
+
+        from mgear.shifter.rig_builder import builder
+
+        with open(config_path, "r") as fp:
+            data = json.load(fp)
+        row = data["rows"][0]
+        result["output_name"] = row.get("output_name")
+
+        rig_builder = builder.RigBuilder()
+        valid, report = rig_builder.build_row(
+            data,
+            row,
+            validate=data.get("validate", True),
+            passed_only=data.get("passed_only", False),
+        )
+        print(report)
+        result["valid"] = valid
+        result["results"] = rig_builder.serialize_results(
+            row.get("output_name")
+        )
+    except Exception:
+        traceback.print_exc()
+        result["error"] = traceback.format_exc().strip().splitlines()[-1]
+
+    with open(result_path, "w") as fp:
+        json.dump(result, fp, indent=4)
+
+    return 0 if result["error"] is None else 1
+
+
+if __name__ == "__main__":
+    # the mgear scripts folder, so the worker can be started without the
+    # Maya module files
+    sys.path.insert(
+        0,
+        os.path.dirname(
+            os.path.dirname(
+                os.path.dirname(
+                    os.path.dirname(os.path.realpath(__file__))
+                )
+            )
+        ),
+    )
+    exit_code = main(sys.argv[1:])
+    sys.stdout.flush()
+    sys.stderr.flush()
+    # skip the standalone uninitialize, the process is discarded anyway
+    os._exit(exit_code)
@@ -1,6 +1,11 @@
 import json
 import os
+import shutil
+import subprocess
+import tempfile
+import timeit
 import traceback
+from concurrent import futures
 
 import maya.api.OpenMaya as om
 import maya.cmds as cmds
@@ -29,6 +34,110 @@ except:
     )
 
 
+# batch build defaults
+BATCH_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+BATCH_TIMEOUT = 1800
+BATCH_RETRIES = 1
+
+WORKER_SCRIPT = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "batch_worker.py"
+)
+
+
+def get_mayapy_path():
+    """Get the mayapy executable of the running Maya.
+
+    Returns:
+        str: mayapy path. "mayapy" if MAYA_LOCATION is not defined, so it
+            is resolved from the PATH
+    """
+    exe_name = "mayapy.exe" if os.name == "nt" else "mayapy"
+    maya_location = os.environ.get("MAYA_LOCATION")
+    if maya_location:
+        mayapy = os.path.join(maya_location, "bin", exe_name)
+        if os.path.exists(mayapy):
+            return mayapy
+    return exe_name
+
+
+def run_batch_job(job, mayapy, timeout=BATCH_TIMEOUT, retries=BATCH_RETRIES):
+    """Builds one row in a headless Maya process.
+
+    The process output is appended to the job log file. Failed or timed out
+    processes are started again up to the number of retries.
+
+    Args:
+        job (dict): The job with "config_path", "result_path" and "log_path"
+        mayapy (str): mayapy executable path
+        timeout (float): Seconds before the process is killed
+        retries (int): Number of retries
+
+    Returns:
+        dict: Status with "success", "attempts", "time", "error" and
+            "results" keys
+    """
+    # make sure the worker process finds the same mgear package
+    scripts_path = os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.dirname(WORKER_SCRIPT)))
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in [scripts_path, env.get("PYTHONPATH")] if p
+    )
+    cmd = [mayapy, WORKER_SCRIPT, job["config_path"], job["result_path"]]
+
+    status = {
+        "success": False,
+        "attempts": 0,
+        "time": 0.0,
+        "error": None,
+        "results": {},
+    }
+    start = timeit.default_timer()
+    while status["attempts"] <= retries:
+        status["attempts"] += 1
+        if os.path.exists(job["result_path"]):
+            os.remove(job["result_path"])
+        with open(job["log_path"], "a") as log:
+            log.write(
+                "=== attempt {}: {}\n".format(
+                    status["attempts"], " ".join(cmd)
+                )
+            )
+            log.flush()
+            try:
+                subprocess.run(
+                    cmd,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    env=env,
+                    timeout=timeout,
+                )
+            except subprocess.TimeoutExpired:
+                status["error"] = "timeout after {}s".format(timeout)
+                log.write("=== {}\n".format(status["error"]))
+                continue
+            except OSError as e:
+                # mayapy not found, retrying doesn't help
+                status["error"] = str(e)
+                break
+
+        try:
+            with open(job["result_path"], "r") as fp:
+                result = json.load(fp)
+        except (IOError, OSError, ValueError):
+            status["error"] = "the process ended without result"
+            continue
+        status["error"] = result.get("error")
+        status["results"] = result.get("results", {})
+        if status["error"] is None:
+            status["success"] = True
+            break
+
+    status["time"] = timeit.default_timer() - start
+    return status
+
+
 class RigBuilder(object):
     def __init__(self):
         self.results_dict = {}
@@ -101,86 +210,64 @@ class RigBuilder(object):
         report_string = "\n".join(results)
         return valid, report_string
 
-    def execute_build_logic(self, json_data, validate=True, passed_only=False):
-        """
-        Executes the rig building logic based on the provided JSON data.
-        Optionally runs Pyblish validators on the builds.
+    @staticmethod
+    def _load_data(json_data):
+        if type(json_data) is str:
+            return json.loads(json_data)
+        return json_data
+
+    @staticmethod
+    def get_output_path(data, row):
+        """Get the Maya file path of a build row.
 
         Args:
-            json_data (str): A JSON string containing the necessary data
-            validate (bool): Option to run Pyblish validators
-            passed_only (bool): Option to publish only rigs that pass validation
+            data (dict): The config data
+            row (dict): The row data
+
+        Returns:
+            str: The Maya file path
         """
-        if type(json_data) is str:
-            data = json.loads(json_data)
-        else:
-            data = json_data
+        file_path = row.get("file_path")
+        output_folder = data.get("output_folder")
+        if not output_folder:
+            output_folder = os.path.dirname(file_path)
 
-        data_rows = data.get("rows")
-        if not data_rows:
-            return
-        for row in data_rows:
-            # Continue with the logic only if file_path is provided
-            file_path = row.get("file_path")
-            if not file_path:
-                return
+        custom_output_path = row.get("custom_output_path")
 
-            output_folder = data.get("output_folder")
-            if not output_folder:
-                output_folder = os.path.dirname(file_path)
-            
-            custom_output_path = row.get("custom_output_path")
-            
-            # if row has a custom path, override output folder with custom path
-            if custom_output_path:
-                print(f"custom output{custom_output_path}")
-                output_folder = custom_output_path
-                
-
-            output_name = row.get("output_name")
-            maya_file_name = "{}.ma".format(output_name)
-            maya_file_path = os.path.join(output_folder, maya_file_name)
-
-            pre_script_path = data.get("pre_script")
-            if pre_script_path:
-                io.import_guide_template(file_path)
-                guide_root = cmds.ls("*.ismodel", objectsOnly=True, long=True)
-                if guide_root:
-                    guide_root = guide_root[0]
-                    pm.displayInfo(
-                        "Updating the guide with pre-script: {}".format(pre_script_path)
-                    )
-                    with open(pre_script_path, "r") as file:
-                        try:
-                            exec(file.read())
-                        except Exception as e:
-                            error_message = str(e)
-                            full_traceback = traceback.format_exc()
-                            pm.displayWarning(
-                                "Update script failed, check error log"
-                            )
-                            pm.displayError(
-                                "Exception message:", error_message
-                            )
-                            pm.displayError("Full traceback:", full_traceback)
-
-                    pm.select(guide_root, r=True)
-                    pm.displayInfo("Building rig '{}'...".format(output_name))
-                    guide_manager.build_from_selection()
-                    pm.delete(guide_root)
-                else:
-                    pm.displayWarning("Guide not found.")
-            else:
-                pm.displayInfo("Building rig '{}'...".format(output_name))
-                io.build_from_file(file_path)
+        # if row has a custom path, override output folder with custom path
+        if custom_output_path:
+            print(f"custom output{custom_output_path}")
+            output_folder = custom_output_path
 
-            post_script_path = data.get("post_script")
-            
-            if post_script_path:
+        maya_file_name = "{}.ma".format(row.get("output_name"))
+        return os.path.join(output_folder, maya_file_name)
+
+    def build_row(self, data, row, validate=True, passed_only=False):
+        """Builds, validates and saves the rig of one row of the config.
+
+        Args:
+            data (dict): The config data
+            row (dict): The row data
+            validate (bool): Option to run Pyblish validators
+            passed_only (bool): Option to publish only rigs that pass validation
+
+        Returns:
+            tuple: valid (bool) and the validator report (str)
+        """
+        file_path = row.get("file_path")
+        output_name = row.get("output_name")
+        maya_file_path = self.get_output_path(data, row)
+
+        pre_script_path = data.get("pre_script")
+        if pre_script_path:
+            io.import_guide_template(file_path)
+            guide_root = cmds.ls("*.ismodel", objectsOnly=True, long=True)
+            if guide_root:
+                guide_root = guide_root[0]
                 pm.displayInfo(
-                        "Updating the guide with post-script: {}".format(post_script_path)
-                    )
-                with open(post_script_path, "r") as file:
+                    "Updating the guide with pre-script: {}".format(pre_script_path)
+                )
+                with open(pre_script_path, "r") as file:
                     try:
                         exec(file.read())
                     except Exception as e:
@@ -194,34 +281,255 @@ class RigBuilder(object):
                         )
                         pm.displayError("Full traceback:", full_traceback)
 
-            context = None
-            save_build = True
-            report_string = self.format_report_header()
+                pm.select(guide_root, r=True)
+                pm.displayInfo("Building rig '{}'...".format(output_name))
+                guide_manager.build_from_selection()
+                pm.delete(guide_root)
+            else:
+                pm.displayWarning("Guide not found.")
+        else:
+            pm.displayInfo("Building rig '{}'...".format(output_name))
+            io.build_from_file(file_path)
 
-            if PYBLISH_READY and validate:
-                pm.displayInfo("Validating rig '{}'...\n".format(output_name))
-                context = self.run_validators()
-                self.build_results_dict(output_name, context)
-                valid, report = self.generate_instance_report(output_name)
+        post_script_path = data.get("post_script")
 
-                report_string += "{}\n".format(report)
-                if passed_only and not valid:
-                    save_build = False
-                    pm.displayInfo(
-                        "Found errors, please fix and rebuild the rig."
+        if post_script_path:
+            pm.displayInfo(
+                    "Updating the guide with post-script: {}".format(post_script_path)
+                )
+            with open(post_script_path, "r") as file:
+                try:
+                    exec(file.read())
+                except Exception as e:
+                    error_message = str(e)
+                    full_traceback = traceback.format_exc()
+                    pm.displayWarning(
+                        "Update script failed, check error log"
                     )
+                    pm.displayError(
+                        "Exception message:", error_message
+                    )
+                    pm.displayError("Full traceback:", full_traceback)
 
-                report_string += "{}\n".format(" -" * 35)
+        valid = True
+        report = ""
+
+        if PYBLISH_READY and validate:
+            pm.displayInfo("Validating rig '{}'...\n".format(output_name))
+            context = self.run_validators()
+            self.build_results_dict(output_name, context)
+            valid, report = self.generate_instance_report(output_name)
+            if passed_only and not valid:
+                pm.displayInfo(
+                    "Found errors, please fix and rebuild the rig."
+                )
 
-            cmds.file(rename=maya_file_path)
-            cmds.file(save=save_build, type="mayaAscii")
-            cmds.file(new=True, force=True)
+        cmds.file(rename=maya_file_path)
+        cmds.file(save=valid or not passed_only, type="mayaAscii")
+        cmds.file(new=True, force=True)
+
+        return valid, report
+
+    def execute_build_logic(
+        self,
+        json_data,
+        validate=True,
+        passed_only=False,
+        batch=False,
+        **batch_kwargs
+    ):
+        """
+        Executes the rig building logic based on the provided JSON data.
+        Optionally runs Pyblish validators on the builds.
+
+        Args:
+            json_data (str): A JSON string containing the necessary data
+            validate (bool): Option to run Pyblish validators
+            passed_only (bool): Option to publish only rigs that pass validation
+            batch (bool): Build the rigs in headless Maya processes. See
+                execute_batch_build for the batch options
+        """
+        if batch:
+            return self.execute_batch_build(
+                json_data,
+                validate=validate,
+                passed_only=passed_only,
+                **batch_kwargs
+            )
+
+        data = self._load_data(json_data)
+
+        data_rows = data.get("rows")
+        if not data_rows:
+            return
+        report_string = self.format_report_header()
+        for row in data_rows:
+            # Continue with the logic only if file_path is provided
+            if not row.get("file_path"):
+                return
+
+            valid, report = self.build_row(
+                data, row, validate=validate, passed_only=passed_only
+            )
+            if report:
+                report_string += "{}\n".format(report)
+                report_string += "{}\n".format(" -" * 35)
 
         if validate:
             pm.displayInfo(report_string)
 
         return self.results_dict
 
+    ##########################################################
+    # BATCH BUILD
+    ##########################################################
+
+    def serialize_results(self, output_name):
+        """Get the validator results of a rig as JSON serializable data.
+
+        Args:
+            output_name (str): name of the rig and its output file
+
+        Returns:
+            dict: The checks dictionary with the instance and error as string
+        """
+        results = {}
+        for check_name, check_data in self.results_dict.get(
+            output_name, {}
+        ).items():
+            error = check_data.get("error")
+            results[check_name] = {
+                "instance": str(check_data.get("instance")),
+                "success": bool(check_data.get("success")),
+                "error": None if error is None else str(error),
+            }
+        return results
+
+    def execute_batch_build(
+        self,
+        json_data,
+        validate=True,
+        passed_only=False,
+        workers=BATCH_WORKERS,
+        timeout=BATCH_TIMEOUT,
+        retries=BATCH_RETRIES,
+        mayapy=None,
+        log_folder=None,
+    ):
+        """Builds the rigs of the config in parallel headless Maya processes.
+
+        Each row is built in his own mayapy process, so the rows don't share
+        the scene and a crash only affect one rig. The validator results of
+        each process are merged in results_dict and in a single report.
+
+        Args:
+            json_data (str): A JSON string containing the necessary data
+            validate (bool): Option to run Pyblish validators
+            passed_only (bool): Option to publish only rigs that pass validation
+            workers (int): Maximum number of Maya processes at the same time
+            timeout (float): Seconds before a build process is killed
+            retries (int): Number of retries of a failed or timed out build
+            mayapy (str, optional): mayapy executable path. If None, it is
+                resolved from MAYA_LOCATION
+            log_folder (str, optional): Folder for the log file of each row.
+                If None, the logs are stored in a new temporary folder. The
+                rows configs and results are written to a temporary folder
+                removed after the build
+
+        Returns:
+            dict: The validator results
+        """
+        data = self._load_data(json_data)
+
+        data_rows = data.get("rows")
+        if not data_rows:
+            return
+
+        if not mayapy:
+            mayapy = get_mayapy_path()
+        if not log_folder:
+            # kept after the build, the report refers to the logs
+            log_folder = tempfile.mkdtemp(prefix="mgear_rig_builder_logs_")
+        if not os.path.isdir(log_folder):
+            os.makedirs(log_folder)
+
+        batch_folder = tempfile.mkdtemp(prefix="mgear_rig_builder_")
+        try:
+            jobs = []
+            for i, row in enumerate(data_rows):
+                if not row.get("file_path"):
+                    continue
+                row_data = dict(data)
+                row_data["rows"] = [row]
+                row_data["validate"] = validate
+                row_data["passed_only"] = passed_only
+                name = "{:03d}_{}".format(i, row.get("output_name"))
+                config_path = os.path.join(batch_folder, name + ".srb")
+                with open(config_path, "w") as fp:
+                    json.dump(row_data, fp)
+                jobs.append(
+                    {
+                        "output_name": row.get("output_name"),
+                        "config_path": config_path,
+                        "result_path": os.path.join(
+                            batch_folder, name + "_result.json"
+                        ),
+                        "log_path": os.path.join(log_folder, name + ".log"),
+                    }
+                )
+
+            pm.displayInfo(
+                "Building {} rigs with {} workers. Logs: {}".format(
+                    len(jobs), workers, log_folder
+                )
+            )
+            statuses = {}
+            with futures.ThreadPoolExecutor(
+                max_workers=max(1, workers)
+            ) as pool:
+                future_jobs = {
+                    pool.submit(
+                        run_batch_job, job, mayapy, timeout, retries
+                    ): job
+                    for job in jobs
+                }
+                for future in futures.as_completed(future_jobs):
+                    job = future_jobs[future]
+                    status = future.result()
+                    statuses[job["config_path"]] = status
+                    pm.displayInfo(
+                        "Rig '{}' {} in {:.1f}s ({} attempts)".format(
+                            job["output_name"],
+                            "built" if status["success"] else "FAILED",
+                            status["time"],
+                            status["attempts"],
+                        )
+                    )
+
+            # merge the results in the rows order
+            report_string = self.format_report_header()
+            for job in jobs:
+                status = statuses[job["config_path"]]
+                output_name = job["output_name"]
+                if not status["success"]:
+                    report_string += "{:<10}{} - build failed: {}\n".format(
+                        "False", output_name, status["error"]
+                    )
+                    report_string += "{:<10} > log: {}\n".format(
+                        "", job["log_path"]
+                    )
+                if status["results"]:
+                    self.results_dict[output_name] = status["results"]
+                    valid, report = self.generate_instance_report(output_name)
+                    report_string += "{}\n".format(report)
+                report_string += "{}\n".format(" -" * 35)
+
+            pm.displayInfo(report_string)
+
+            return self.results_dict
+        finally:
+            shutil.rmtree(batch_folder, ignore_errors=True)
+
     def build_from_file(self, file_path):
         json_data = self.load_config_data_from_file(file_path)
         self.execute_build_logic(json_data)
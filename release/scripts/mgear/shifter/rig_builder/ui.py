@@ -84,6 +84,24 @@ class RigBuilderUI(
         )
         run_validators_layout.addWidget(self.publish_passed_checkbox)
 
+        # Batch build options
+        batch_layout = QtWidgets.QHBoxLayout()
+        self.layout.addLayout(batch_layout)
+
+        self.batch_checkbox = QtWidgets.QCheckBox("Headless Batch Build")
+        self.batch_checkbox.setToolTip(
+            "Build each rig in a separated mayapy process"
+        )
+        batch_layout.addWidget(self.batch_checkbox)
+        batch_layout.addStretch()
+
+        batch_layout.addWidget(QtWidgets.QLabel("Workers"))
+        self.workers_spinbox = QtWidgets.QSpinBox()
+        self.workers_spinbox.setRange(1, 64)
+        self.workers_spinbox.setValue(builder.BATCH_WORKERS)
+        self.workers_spinbox.setEnabled(False)
+        batch_layout.addWidget(self.workers_spinbox)
+
         if not builder.PYBLISH_READY:
             self.run_validators_checkbox.setEnabled(False)
             self.run_validators_checkbox.setChecked(False)
@@ -163,6 +181,7 @@ class RigBuilderUI(
         self.run_validators_checkbox.toggled.connect(
             self.on_run_validators_checkbox_changed
         )
+        self.batch_checkbox.toggled.connect(self.workers_spinbox.setEnabled)
         self.add_button.clicked.connect(self.on_add_button_clicked)
         self.remove_button.clicked.connect(self.on_remove_button_clicked)
         self.build_button.clicked.connect(self.on_build_button_clicked)
@@ -229,8 +248,12 @@ class RigBuilderUI(
         data = self.collect_table_data()
         validate = self.run_validators_checkbox.isChecked()
         passed_rigs_only = self.publish_passed_checkbox.isChecked()
+        kwargs = {}
+        if self.batch_checkbox.isChecked():
+            kwargs["batch"] = True
+            kwargs["workers"] = self.workers_spinbox.value()
         results_dict = self.builder.execute_build_logic(
-            data, validate=validate, passed_only=passed_rigs_only
+            data, validate=validate, passed_only=passed_rigs_only, **kwargs
         )
         if (
             self.run_validators_checkbox.isChecked()
@@ -0,0 +1,483 @@
+"""Structured diff engine for Shifter guide templates.
+
+Both templates are indexed once and the differences are streamed as a typed
+change list. The transforms of all the matching components are compared in
+a single vectorized pass under an absolute tolerance, instead of rounding
+every matrix value before the comparison.
+
+Change types:
+    added: Component found only in the target guide
+    removed: Component found only in the source guide
+    retyped: Same component name with a different component type
+    reparented: Same component with a different parent component
+    moved: Locator or blade transforms not matching under the tolerance
+    settings: Parameter values not matching
+
+Every change is a dictionary with the "change", "component" and "details"
+keys. The guide root is reported with the "guide_root" component name.
+
+This module has no Maya dependency. It can be used from the command line to
+compare two guide template files (i.e: in a CI job)::
+
+    python template_diff.py master.sgt character.sgt --tolerance 1e-5
+
+The exit code is 1 if any difference is found. Compiled guides (.sgc) are
+supported when the mgear package can be imported (i.e: from mayapy).
+"""
+
+import argparse
+import json
+import sys
+
+try:
+    import numpy as np
+
+    NUMPY_READY = True
+except ImportError:
+    NUMPY_READY = False
+
+try:
+    from mgear.shifter import compiled_guide
+
+    COMPILED_GUIDE_READY = True
+except ImportError:
+    COMPILED_GUIDE_READY = False
+
+ROOT_NAME = "guide_root"
+DEFAULT_TOLERANCE = 1e-6
+
+CHANGE_TYPES = (
+    "added",
+    "removed",
+    "retyped",
+    "reparented",
+    "moved",
+    "settings",
+)
+
+# Information and custom step parameters are not considered settings
+# differences on the guide root. The custom steps have their own check in
+# guide_template.custom_step_diff
+ROOT_IGNORE_PARAMS = (
+    "date",
+    "user",
+    "ismodel",
+    "maya_version",
+    "gear_version",
+    "preCustomStep",
+    "postCustomStep",
+)
+
+# transform keys checked in the component dictionary
+_TRANSFORM_KEYS = ("tra", "blade")
+
+
+##########################################################
+# INDEX
+##########################################################
+
+
+def flat_matrix(value):
+    """Flatten a nested matrix list. Flat lists are returned as they are.
+
+    Args:
+        value (list): Matrix as list of rows or flat list
+
+    Returns:
+        list: Flat list of values
+    """
+    if value and isinstance(value[0], list):
+        return [v for row in value for v in row]
+    return value
+
+
+class GuideIndex(object):
+    """Flat index of a guide template dictionary.
+
+    Attributes:
+        names (list): Component names in the template order
+        types (dict): Component name as key and component type as value
+        parents (dict): Component name as key and parent fullName as value
+        settings (dict): Component name as key and param_values as value.
+            Includes the guide root
+        transforms (dict): (component, key, locator) tuple as key and the
+            flat matrix values as value. Includes the guide root transform
+    """
+
+    def __init__(self, conf):
+        """
+        Args:
+            conf (dict): Guide template dictionary
+        """
+        self.names = list(conf["components_list"])
+        self.types = {}
+        self.parents = {}
+        self.settings = {}
+        self.transforms = {}
+
+        root = conf.get("guide_root", {})
+        self.settings[ROOT_NAME] = root.get("param_values", {})
+        if root.get("tra"):
+            self.transforms[(ROOT_NAME, "tra", ROOT_NAME)] = flat_matrix(
+                root["tra"]
+            )
+
+        components_dict = conf["components_dict"]
+        for name in self.names:
+            comp = components_dict[name]
+            param_values = comp.get("param_values", {})
+            self.types[name] = param_values.get("comp_type")
+            self.parents[name] = comp.get("parent_fullName")
+            self.settings[name] = param_values
+            for key in _TRANSFORM_KEYS:
+                for loc, matrix in comp.get(key, {}).items():
+                    self.transforms[(name, key, loc)] = flat_matrix(matrix)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.types
+
+
+##########################################################
+# COMPARE
+##########################################################
+
+
+def max_deltas(source_values, target_values):
+    """Get the maximum absolute difference of each pair of matrices.
+
+    Args:
+        source_values (list): List of flat matrices
+        target_values (list): List of flat matrices
+
+    Returns:
+        list: Maximum difference per pair. None if the sizes don't match
+    """
+    if NUMPY_READY:
+        deltas = [None] * len(source_values)
+        # group by size, so every group is a single 2D array operation
+        groups = {}
+        for i, (a, b) in enumerate(zip(source_values, target_values)):
+            if len(a) == len(b):
+                groups.setdefault(len(a), []).append(i)
+        for size, indices in groups.items():
+            if not size:
+                for i in indices:
+                    deltas[i] = 0.0
+                continue
+            a = np.array([source_values[i] for i in indices], dtype=float)
+            b = np.array([target_values[i] for i in indices], dtype=float)
+            for i, d in zip(indices, np.abs(a - b).max(axis=1).tolist()):
+                deltas[i] = d
+        return deltas
+
+    deltas = []
+    for a, b in zip(source_values, target_values):
+        if len(a) != len(b):
+            deltas.append(None)
+        elif not a:
+            deltas.append(0.0)
+        else:
+            deltas.append(max(abs(x - y) for x, y in zip(a, b)))
+    return deltas
+
+
+def _transform_changes(source, target, names, tolerance):
+    """Compare the transforms of the components found in both indices.
+
+    Args:
+        source (GuideIndex): Source index
+        target (GuideIndex): Target index
+        names (set): Component names to check
+        tolerance (float): Maximum absolute difference per value
+
+    Returns:
+        dict: Component name as key and the "moved" details as value
+    """
+    changes = {}
+
+    def details(name):
+        if name not in changes:
+            changes[name] = {"not_match": {}, "missing": [], "extra": []}
+        return changes[name]
+
+    keys = []
+    for k in source.transforms:
+        if k[0] not in names:
+            continue
+        if k in target.transforms:
+            keys.append(k)
+        else:
+            details(k[0])["missing"].append("{}:{}".format(k[1], k[2]))
+    for k in target.transforms:
+        if k[0] in names and k not in source.transforms:
+            details(k[0])["extra"].append("{}:{}".format(k[1], k[2]))
+
+    deltas = max_deltas(
+        [source.transforms[k] for k in keys],
+        [target.transforms[k] for k in keys],
+    )
+    for k, delta in zip(keys, deltas):
+        if delta is None or delta > tolerance:
+            details(k[0])["not_match"]["{}:{}".format(k[1], k[2])] = delta
+    return changes
+
+
+def _settings_changes(source_values, target_values, ignore=()):
+    """Compare two parameter values dictionaries.
+
+    Args:
+        source_values (dict): Source param_values
+        target_values (dict): Target param_values
+        ignore (tuple, optional): Parameter names not compared
+
+    Returns:
+        dict: The "not_match", "missing" and "extra" parameters. None if
+            the settings match
+    """
+    if source_values == target_values:
+        return None
+    not_match = []
+    missing = []
+    for k, v in source_values.items():
+        if k in ignore:
+            continue
+        if k not in target_values:
+            missing.append(k)
+        elif v != target_values[k]:
+            not_match.append([k, v, target_values[k]])
+    extra = [
+        k for k in target_values if k not in source_values and k not in ignore
+    ]
+    if not_match or missing or extra:
+        return {"not_match": not_match, "missing": missing, "extra": extra}
+    return None
+
+
+def iter_changes(
+    source,
+    target,
+    tolerance=DEFAULT_TOLERANCE,
+    check_transforms=True,
+    check_settings=True,
+    root_ignore_params=ROOT_IGNORE_PARAMS,
+):
+    """Compare two guide templates and yield the changes.
+
+    The source is the reference guide and the target the guide to check.
+    i.e: "added" means the component is only in the target guide.
+
+    Args:
+        source (dict or GuideIndex): Source guide template
+        target (dict or GuideIndex): Target guide template
+        tolerance (float, optional): Maximum absolute difference of the
+            transform values
+        check_transforms (bool, optional): Check the "moved" changes
+        check_settings (bool, optional): Check the "settings" changes
+        root_ignore_params (tuple, optional): Guide root parameters not
+            compared
+
+    Yields:
+        dict: Change with the "change", "component" and "details" keys
+    """
+    if not isinstance(source, GuideIndex):
+        source = GuideIndex(source)
+    if not isinstance(target, GuideIndex):
+        target = GuideIndex(target)
+
+    for name in target.names:
+        if name not in source:
+            yield {
+                "change": "added",
+                "component": name,
+                "details": {"type": target.types[name]},
+            }
+    for name in source.names:
+        if name not in target:
+            yield {
+                "change": "removed",
+                "component": name,
+                "details": {"type": source.types[name]},
+            }
+
+    match = [n for n in source.names if n in target]
+    for name in match:
+        if source.types[name] != target.types[name]:
+            yield {
+                "change": "retyped",
+                "component": name,
+                "details": {
+                    "source": source.types[name],
+                    "target": target.types[name],
+                },
+            }
+        if source.parents[name] != target.parents[name]:
+            yield {
+                "change": "reparented",
+                "component": name,
+                "details": {
+                    "source": source.parents[name],
+                    "target": target.parents[name],
+                },
+            }
+
+    if check_transforms:
+        checked = set(match)
+        checked.add(ROOT_NAME)
+        moved = _transform_changes(source, target, checked, tolerance)
+        for name in [ROOT_NAME] + match:
+            if name in moved:
+                yield {
+                    "change": "moved",
+                    "component": name,
+                    "details": moved[name],
+                }
+
+    if check_settings:
+        for name in [ROOT_NAME] + match:
+            if name == ROOT_NAME:
+                ignore = root_ignore_params
+            else:
+                # the type is reported by the "retyped" change
+                ignore = ("comp_type",)
+            details = _settings_changes(
+                source.settings[name], target.settings[name], ignore
+            )
+            if details:
+                yield {
+                    "change": "settings",
+                    "component": name,
+                    "details": details,
+                }
+
+
+def diff_templates(source, target, **kwargs):
+    """Compare two guide templates and get the change list.
+
+    Args:
+        source (dict or GuideIndex): Source guide template
+        target (dict or GuideIndex): Target guide template
+        **kwargs: iter_changes keyword arguments
+
+    Returns:
+        list: List of changes
+    """
+    return list(iter_changes(source, target, **kwargs))
+
+
+def summarize(changes):
+    """Count the changes by type.
+
+    Args:
+        changes (list): List of changes
+
+    Returns:
+        dict: Change type as key and the number of changes as value
+    """
+    summary = dict.fromkeys(CHANGE_TYPES, 0)
+    for c in changes:
+        summary[c["change"]] += 1
+    return summary
+
+
+##########################################################
+# COMMAND LINE
+##########################################################
+
+
+def load_template(filePath):
+    """Load a guide template or compiled guide file.
+
+    Args:
+        filePath (str): .sgt or .sgc file path
+
+    Returns:
+        dict: The guide template dictionary
+    """
+    if COMPILED_GUIDE_READY:
+        return compiled_guide.load_guide_template(filePath)
+    with open(filePath, "r") as f:
+        return json.load(f)
+
+
+def format_change(change):
+    """Format a change as a single line string.
+
+    Args:
+        change (dict): The change
+
+    Returns:
+        str: The formatted change
+    """
+    details = change["details"]
+    kind = change["change"]
+    if kind in ("added", "removed"):
+        info = details["type"]
+    elif kind in ("retyped", "reparented"):
+        info = "{} -> {}".format(details["source"], details["target"])
+    elif kind == "moved":
+        info = ", ".join(
+            ["{} ({})".format(k, v) for k, v in details["not_match"].items()]
+            + ["missing " + k for k in details["missing"]]
+            + ["extra " + k for k in details["extra"]]
+        )
+    else:
+        info = ", ".join(
+            ["{}: {!r} -> {!r}".format(*p) for p in details["not_match"]]
+            + ["missing " + k for k in details["missing"]]
+            + ["extra " + k for k in details["extra"]]
+        )
+    return "{:<11} {:<30} {}".format(kind, change["component"], info)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare two Shifter guide templates. Exit code is 1 if "
+        "the guides are different."
+    )
+    parser.add_argument("source", help="Reference guide (.sgt or .sgc)")
+    parser.add_argument("target", help="Guide to check (.sgt or .sgc)")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Maximum absolute difference of the transform values",
+    )
+    parser.add_argument(
+        "--no-transforms",
+        action="store_true",
+        help="Don't compare the transforms",
+    )
+    parser.add_argument(
+        "--no-settings",
+        action="store_true",
+        help="Don't compare the parameter values",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Output the changes as JSON"
+    )
+    args = parser.parse_args(argv)
+
+    changes = iter_changes(
+        load_template(args.source),
+        load_template(args.target),
+        tolerance=args.tolerance,
+        check_transforms=not args.no_transforms,
+        check_settings=not args.no_settings,
+    )
+    found = False
+    if args.json:
+        changes = list(changes)
+        found = bool(changes)
+        print(json.dumps(changes, indent=4))
+    else:
+        for change in changes:
+            found = True
+            print(format_change(change))
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,20 +7,262 @@ ueGear Client to interact with ueGear Commands within Unreal Engine.
 
 from __future__ import print_function, division, absolute_import
 
+import ast
 import json
 import pprint
+import select
+import socket
+import threading
 
-from mgear.core.six.moves import urllib
+from concurrent import futures
 
-# from urllib.request import urlopen, Request
-
-Request = urllib.request.Request
-urlopen = urllib.request.urlopen
+from mgear.core.six.moves import http_client
+from mgear.core.six.moves import queue
 
 from mgear.uegear import log
 
 logger = log.uegear_logger
 
+CALL_URL = "/remote/object/call"
+BATCH_URL = "/remote/batch"
+
+# maximum number of calls sent in a single batch request
+BATCH_SIZE = 200
+
+# maximum number of keep-alive connections per server
+POOL_SIZE = 4
+
+# errors raised when a kept alive connection was closed by the server
+_STALE_CONNECTION_ERRORS = (
+    http_client.BadStatusLine,
+    http_client.CannotSendRequest,
+    http_client.ResponseNotReady,
+    socket.error,
+)
+
+# methods sent again if the connection was closed after the request was sent
+_IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+
+try:
+    CONNECTION_POOLS
+except NameError:
+    CONNECTION_POOLS = {}
+    CONNECTION_POOLS_LOCK = threading.Lock()
+
+try:
+    EXECUTOR
+except NameError:
+    EXECUTOR = None
+
+
+# =================================================================================================================
+# TRANSPORT
+# =================================================================================================================
+
+
+def decode_return(value):
+    """
+    Decodes the value returned by a PyUeGearCommands function.
+
+    Unreal returns the Python function result as a string. It is decoded as JSON or as a Python literal, without
+    evaluating any code. Values that can't be decoded are returned as they are.
+
+    :param str value: returned value.
+    :return: decoded value.
+    :rtype: object
+    """
+
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        return value
+
+
+def decode_response(response):
+    """
+    Decodes the "return" value of a Remote Control call response.
+
+    :param dict response: response coming from the Unreal Remote Server.
+    :return: decoded response.
+    :rtype: dict
+    """
+
+    if isinstance(response, dict) and isinstance(response.get("return"), str):
+        return {"return": decode_return(response["return"])}
+    return response
+
+
+class ConnectionPool(object):
+    """
+    Pool of keep-alive HTTP connections to a Remote Control server.
+
+    Connections are reused between requests, so the TCP handshake is only done once per connection. The pool is
+    thread safe, each thread takes its own connection while the request is being processed.
+    """
+
+    def __init__(self, host_address, port, size=POOL_SIZE):
+        self._host_address = host_address
+        self._port = port
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _connect(self, timeout):
+        connection = http_client.HTTPConnection(
+            self._host_address, self._port, timeout=timeout
+        )
+        connection.connect()
+        # small requests are sent right away instead of waiting for the
+        # delayed acknowledgement of the previous packet
+        connection.sock.setsockopt(
+            socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+        )
+        return connection
+
+    @staticmethod
+    def _is_dropped(connection):
+        # an idle connection is only readable when the server closed it
+        if connection.sock is None:
+            return True
+        try:
+            readable, _, _ = select.select([connection.sock], [], [], 0)
+        except (ValueError, select.error, socket.error):
+            return True
+        return bool(readable)
+
+    def _acquire(self, timeout):
+        """
+        Returns an idle connection, or a new one if there is no idle connection left.
+
+        :param float timeout: connection timeout.
+        :return: connection and whether it is a kept alive connection.
+        :rtype: tuple(http_client.HTTPConnection, bool)
+        """
+
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect(timeout), False
+            if self._is_dropped(connection):
+                connection.close()
+                continue
+            connection.timeout = timeout
+            connection.sock.settimeout(timeout)
+            return connection, True
+
+    def _release(self, connection):
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def request(self, method, url, payload, headers, timeout):
+        """
+        Sends a request and returns the decoded JSON response.
+
+        If a kept alive connection was closed by the server, the request is sent again with a new connection. Non
+        idempotent requests are only sent again if the request itself could not be sent, so a call is never executed
+        twice by the server.
+
+        :param str method: HTTP method.
+        :param str url: request URL path.
+        :param dict payload: JSON payload.
+        :param dict headers: request headers.
+        :param float timeout: time in seconds after which the request will timeout.
+        :return: decoded JSON response.
+        :rtype: dict or list
+        :raises http_client.HTTPException: if the server returns an error status.
+        """
+
+        body = json.dumps(payload).encode("utf-8")
+        for attempt in range(2):
+            connection, reused = self._acquire(timeout)
+            sent = False
+            try:
+                connection.request(method, url, body, headers)
+                sent = True
+                response = connection.getresponse()
+                data = response.read()
+            except _STALE_CONNECTION_ERRORS:
+                connection.close()
+                retry = not sent or method in _IDEMPOTENT_METHODS
+                if attempt or not reused or not retry:
+                    raise
+                continue
+            except Exception:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(connection)
+            if response.status >= 400:
+                raise http_client.HTTPException(
+                    "{} {}: {}".format(response.status, response.reason, data[:200])
+                )
+            return json.loads(data.decode("utf-8"))
+
+    def close(self):
+        """
+        Closes all the idle connections.
+        """
+
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def get_connection_pool(host_address, port):
+    """
+    Returns the connection pool of the given server. Pools are shared by all the bridge instances.
+
+    :param str host_address: server address.
+    :param int port: server port.
+    :return: connection pool.
+    :rtype: ConnectionPool
+    """
+
+    with CONNECTION_POOLS_LOCK:
+        pool = CONNECTION_POOLS.get((host_address, port))
+        if pool is None:
+            pool = ConnectionPool(host_address, port)
+            CONNECTION_POOLS[(host_address, port)] = pool
+        return pool
+
+
+def close_connection_pools():
+    """
+    Closes the idle connections of all the servers.
+    """
+
+    with CONNECTION_POOLS_LOCK:
+        for pool in CONNECTION_POOLS.values():
+            pool.close()
+        CONNECTION_POOLS.clear()
+
+
+def get_executor():
+    """
+    Returns the thread pool used to dispatch the asynchronous calls. The threads are limited to the connection pool
+    size, so every thread can keep its connection alive.
+
+    :return: thread pool executor.
+    :rtype: concurrent.futures.ThreadPoolExecutor
+    """
+
+    global EXECUTOR
+    with CONNECTION_POOLS_LOCK:
+        if EXECUTOR is None:
+            EXECUTOR = futures.ThreadPoolExecutor(max_workers=POOL_SIZE)
+        return EXECUTOR
+
 
 class UeGearBridge(object):
     """
@@ -35,8 +277,8 @@ class UeGearBridge(object):
         self._timeout = (
             1000  # connection to the server will time out after this value.
         )
-        self._echo_execution = True  # whether client should print the response coming from server.
-        self._echo_payload = True  # whether client should print the JSON payload it's sending to server.
+        self._echo_execution = False  # whether client should print the response coming from server.
+        self._echo_payload = False  # whether client should print the JSON payload it's sending to server.
         self._is_executing = (
             False  # whether client is still executing a command.
         )
@@ -100,6 +342,19 @@ class UeGearBridge(object):
     # BASE
     # =================================================================================================================
 
+    def _payload(self, command, parameters=None):
+        return {
+            "objectPath": self._commands_object_path,
+            "functionName": command,
+            "parameters": parameters or dict(),
+            "generateTransaction": True,
+        }
+
+    def _request(self, url, payload, timeout):
+        timeout = timeout if timeout > 0 else self._timeout
+        pool = get_connection_pool(self._host_address, self._port)
+        return pool.request("PUT", url, payload, self._headers, timeout)
+
     def execute(self, command, parameters=None, timeout=0):
         """
         Executes given command for this client. The server will look for this command in the modules it has loaded.
@@ -113,34 +368,14 @@ class UeGearBridge(object):
         """
 
         self._is_executing = True
-        timeout = timeout if timeout > 0 else self._timeout
-        parameters = parameters or dict()
-
-        url = "http://{}:{}/remote/object/call".format(
-            self._host_address, self._port
-        )
-        payload = {
-            "objectPath": self._commands_object_path,
-            "functionName": command,
-            "parameters": parameters,
-            "generateTransaction": True,
-        }
+        payload = self._payload(command, parameters)
         try:
-            request = Request(
-                url,
-                json.dumps(payload).encode("ascii"),
-                self._headers,
-                method="PUT",
+            response = decode_response(
+                self._request(CALL_URL, payload, timeout)
             )
-            with urlopen(request, timeout=timeout) as response:
-                response = json.load(response)
-        except Exception:
+        except Exception as exc:
+            logger.debug("Command {} failed: {}".format(command, exc))
             response = {"return": False}
-        try:
-            evaluated_return = eval(response.get("return"))
-            response = {"return": evaluated_return}
-        except Exception:
-            pass
 
         if self._echo_payload:
             pprint.pprint(payload)
@@ -151,3 +386,97 @@ class UeGearBridge(object):
         self._is_executing = False
 
         return response
+
+    def execute_batch(self, calls, timeout=0, batch_size=BATCH_SIZE):
+        """
+        Executes several commands using the Remote Control batch endpoint, so many calls are sent in a single request.
+
+        :param list(tuple(str, dict)) calls: list of command name and parameters pairs.
+        :param float timeout: time in seconds after which each batch request will timeout.
+        :param int batch_size: maximum number of calls sent in a single request.
+        :return: responses coming from the Unreal Remote Server, in the same order as the calls. Failed calls return
+            {"return": False}.
+        :rtype: list(dict)
+        """
+
+        self._is_executing = True
+        calls = list(calls)
+        responses = list()
+        for start in range(0, len(calls), batch_size):
+            chunk = calls[start : start + batch_size]
+            payload = {
+                "Requests": [
+                    {
+                        "RequestId": i,
+                        "URL": CALL_URL,
+                        "Verb": "PUT",
+                        "Body": self._payload(command, parameters),
+                    }
+                    for i, (command, parameters) in enumerate(chunk)
+                ]
+            }
+            if self._echo_payload:
+                pprint.pprint(payload)
+            try:
+                result = self._request(BATCH_URL, payload, timeout)
+            except Exception as exc:
+                logger.debug("Batch request failed: {}".format(exc))
+                result = dict()
+
+            chunk_responses = [{"return": False}] * len(chunk)
+            for item in result.get("Responses", list()):
+                request_id = item.get("RequestId", -1)
+                if not 0 <= request_id < len(chunk):
+                    continue
+                if item.get("ResponseCode", 200) >= 400:
+                    continue
+                body = item.get("ResponseBody", dict())
+                if isinstance(body, str):
+                    body = decode_return(body)
+                chunk_responses[request_id] = decode_response(body)
+            responses.extend(chunk_responses)
+
+        if self._echo_execution:
+            pprint.pprint(responses)
+
+        self._is_executing = False
+
+        return responses
+
+    def execute_async(self, command, parameters=None, timeout=0):
+        """
+        Executes given command in a background thread.
+
+        :param str command:  The command name that you want to execute within PyUeGearCommands class.
+        :param dict parameters: arguments for the command to execute.
+        :param float timeout: time in seconds after which the request will timeout.
+        :return: future with the response coming from the Unreal Remote Server.
+        :rtype: concurrent.futures.Future
+        """
+
+        return get_executor().submit(
+            self.execute, command, parameters, timeout
+        )
+
+    def execute_batch_async(self, calls, timeout=0, batch_size=BATCH_SIZE):
+        """
+        Executes several commands using the batch endpoint. The batch requests are dispatched concurrently.
+
+        :param list(tuple(str, dict)) calls: list of command name and parameters pairs.
+        :param float timeout: time in seconds after which each batch request will timeout.
+        :param int batch_size: maximum number of calls sent in a single request.
+        :return: futures with the responses of each batch request, in the same order as the calls.
+        :rtype: list(concurrent.futures.Future)
+        """
+
+        calls = list(calls)
+        executor = get_executor()
+        return [
+            executor.submit(
+                self.execute_batch,
+                calls[start : start + batch_size],
+                timeout,
+                batch_size,
+            )
+            for start in range(0, len(calls), batch_size)
+        ]
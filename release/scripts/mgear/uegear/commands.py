@@ -586,6 +586,8 @@ def update_selected_transforms():
         cmds.setAttr(f"{node_name}.rotateOrder", 0) # XYZ
 
     try:
+        # all the actors are updated with a single batch request
+        calls = list()
         objects = cmds.ls(sl=True, sn=True)
         for obj in objects:
             ue_world_transform = (
@@ -598,19 +600,25 @@ def update_selected_transforms():
                 continue
             actor_guid = actor_guids[0]
 
-            result = uegear_bridge.execute(
-                "set_actor_world_transform",
-                parameters={
-                    "actor_guid": actor_guid,
-                    "translation": str(ue_world_transform["rotatePivot"]),
-                    "rotation": str(ue_world_transform["rotation"]),
-                    "scale": str(ue_world_transform["scale"]),
-                    "world_up": str(world_up),
-                },
+            calls.append(
+                (
+                    "set_actor_world_transform",
+                    {
+                        "actor_guid": actor_guid,
+                        "translation": str(ue_world_transform["rotatePivot"]),
+                        "rotation": str(ue_world_transform["rotation"]),
+                        "scale": str(ue_world_transform["scale"]),
+                        "world_up": str(world_up),
+                    },
+                )
             )
+
+        uegear_bridge.execute_batch(calls)
     finally:
         for i, selected_node in enumerate(selected_nodes):
-            cmds.setAttr(f"{node_name}.rotateOrder", old_rotation_orders[i])
+            cmds.setAttr(
+                f"{selected_node}.rotateOrder", old_rotation_orders[i]
+            )
 
 
 # NOT IMPLEMENTED
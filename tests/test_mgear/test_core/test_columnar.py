@@ -0,0 +1,72 @@
+"""mgear.core.columnar test"""
+
+import os
+
+
+def test_columnar_round_trip(setup_path, tmp_path):
+    # mGear imports
+    from mgear.core import columnar
+
+    weights = [0.0, 0.25, 0.5, 1.0]
+    for compress in (True, False):
+        file_path = str(tmp_path / "weights.col")
+        with columnar.ColumnarWriter(
+            file_path, kind="test", compress=compress
+        ) as writer:
+            writer.write_record(
+                {"name": "first"},
+                {"indices": ("u4", [0, 1, 2, 3]), "values": ("f8", weights)},
+            )
+            writer.write_record({"name": "second"}, {"values": ("u2", [7])})
+
+        assert columnar.is_columnar_file(file_path)
+        with columnar.ColumnarReader(file_path) as reader:
+            assert reader.kind == "test"
+            assert len(reader) == 2
+            meta, arrays = reader.read_record(0, copy=True)
+            assert meta == {"name": "first"}
+            assert list(arrays["indices"]) == [0, 1, 2, 3]
+            assert list(arrays["values"]) == weights
+            meta, arrays = reader.read_record(1, copy=True)
+            assert list(arrays["values"]) == [7]
+
+
+def test_quantize(setup_path):
+    # mGear imports
+    from mgear.core import columnar
+
+    values = [0.0, 0.5, 1.0, 1.5, -1.0]
+    result = columnar.dequantize(columnar.quantize(values))
+    expected = [0.0, 0.5, 1.0, 1.0, 0.0]
+    assert all(abs(a - b) < 1e-4 for a, b in zip(result, expected))
+
+
+def test_columnar_abort(setup_path, tmp_path):
+    # mGear imports
+    from mgear.core import columnar
+
+    file_path = str(tmp_path / "aborted.col")
+    try:
+        with columnar.ColumnarWriter(file_path) as writer:
+            writer.write_record({}, {"values": ("f4", [1.0])})
+            raise ValueError("export failed")
+    except ValueError:
+        pass
+    assert not os.path.exists(file_path)
+
+
+def test_columnar_close_releases_views(setup_path, tmp_path):
+    # mGear imports
+    from mgear.core import columnar
+
+    file_path = str(tmp_path / "mapped.col")
+    with columnar.ColumnarWriter(file_path, compress=False) as writer:
+        writer.write_record({}, {"values": ("f8", [0.5, 1.0])})
+
+    reader = columnar.ColumnarReader(file_path)
+    reader.open()
+    meta, arrays = reader.read_record(0)
+    assert list(arrays["values"]) == [0.5, 1.0]
+    mapped = reader._map
+    reader.close()
+    assert mapped.closed
@@ -0,0 +1,127 @@
+"""mgear.core.solvers test"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+def _translation(x, y, z):
+    matrix = np.identity(4)
+    matrix[3, :3] = (x, y, z)
+    return matrix
+
+
+def test_ikfk2bone_ik(setup_path):
+    # mGear imports
+    from mgear.core import solvers
+
+    # 3-4-5 triangle with the up vector on +Y
+    identity = np.identity(4)
+    out = solvers.ikfk2bone(
+        _translation(0, 0, 0),
+        _translation(5, 0, 0),
+        _translation(2.5, 5, 0),
+        identity,
+        identity,
+        identity,
+        blend=1.0,
+        length_a=3.0,
+        length_b=4.0,
+    )
+    expected_a = [
+        [1.8, 2.4, 0, 0],
+        [-0.8, 0.6, 0, 0],
+        [0, 0, 1, 0],
+        [0, 0, 0, 1],
+    ]
+    expected_b = [
+        [3.2, -2.4, 0, 0],
+        [0.6, 0.8, 0, 0],
+        [0, 0, 1, 0],
+        [1.8, 2.4, 0, 1],
+    ]
+    assert np.allclose(out["outA"][0], expected_a, atol=1e-6)
+    assert np.allclose(out["outB"][0], expected_b, atol=1e-6)
+    assert np.allclose(out["outEff"][0], _translation(5, 0, 0), atol=1e-6)
+
+
+def test_ikfk2bone_blend(setup_path):
+    # mGear imports
+    from mgear.core import solvers
+
+    # fk pose, and the match of the ik pose for all the frames at once
+    fk_match = solvers.ikfk2bone_fk_match(
+        _translation(0, 0, 0),
+        _translation(5, 0, 0),
+        _translation(2.5, 5, 0),
+        length_a=3.0,
+        length_b=4.0,
+    )
+    out = solvers.ikfk2bone(
+        _translation(0, 0, 0),
+        _translation(5, 0, 0),
+        _translation(2.5, 5, 0),
+        *fk_match,
+        blend=np.array([0.0, 0.5, 1.0]),
+        length_a=3.0,
+        length_b=4.0
+    )
+    for frame in range(3):
+        assert np.allclose(
+            out["outB"][frame, 3, :3], [1.8, 2.4, 0], atol=1e-6
+        )
+        assert np.allclose(out["outEff"][frame, 3, :3], [5, 0, 0], atol=1e-6)
+
+    ikref, upv = solvers.ikfk2bone_ik_match(*fk_match)
+    assert np.allclose(ikref[0, 3, :3], [5, 0, 0], atol=1e-6)
+    assert np.allclose(upv[0], [1.8, 9.4, 0], atol=1e-6)
+
+
+def test_squash_stretch2(setup_path):
+    # mGear imports
+    from mgear.core import solvers
+
+    result = solvers.squash_stretch2([1.0, 3.0, 6.0, 2.0])
+    expected = [[1, 1.5, 1.5], [1, 1, 1], [1, 0.5, 0.5], [1, 1.25, 1.25]]
+    assert np.allclose(result, expected)
+
+
+def test_spring(setup_path):
+    # mGear imports
+    from mgear.core import solvers
+
+    goal = np.zeros((5, 3))
+    goal[1:, 0] = 1.0
+    result = solvers.spring(goal, stiffness=0.5, damping=0.5)
+    assert np.allclose(result[:4, 0], [0.0, 0.5, 0.875, 1.03125])
+
+    # jumping in time restarts from the goal
+    result = solvers.spring(goal, time=[0, 1, 2, 10, 11])
+    assert np.allclose(result[3], goal[3])
+
+
+def test_roll_spline_kine(setup_path):
+    # mGear imports
+    from mgear.core import solvers
+
+    inputs = np.stack([_translation(0, 0, 0), _translation(10, 0, 0)])
+    result = solvers.roll_spline_kine(inputs, inputs, [0, 0], [0, 0.5, 1])
+    expected = [[0, 0, 0], [5, 0, 0], [10, 0, 0]]
+    assert np.allclose(result[:, 3, :3], expected)
+    assert np.allclose(result[:, :3, :3], np.identity(3))
+
+    result = solvers.roll_spline_kine(
+        inputs, inputs, [0, 0], [0.25], resample=True
+    )
+    assert np.allclose(result[0, 3, :3], [2.5, 0, 0])
+
+
+def test_matrix_constraint(setup_path):
+    # mGear imports
+    from mgear.core import solvers
+
+    out = solvers.matrix_constraint(
+        _translation(1, 2, 3), driver_rotation_offset=(0, 0, 90)
+    )
+    assert np.allclose(out["translate"], [[1, 2, 3]])
+    assert np.allclose(out["rotate"], [[0, 0, 90]])
+    assert np.allclose(out["scale"], [[1, 1, 1]])
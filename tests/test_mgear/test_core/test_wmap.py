@@ -0,0 +1,35 @@
+"""mgear.core.wmap test"""
+import json
+
+import pytest
+
+pytest.importorskip("maya.standalone")
+
+
+def test_import_baseline_wmap(setup_path, run_with_maya_standalone, tmpdir):
+    # Maya imports
+    from maya import cmds
+
+    # mGear imports
+    from mgear.core import wmap
+
+    cmds.file(new=True, force=True)
+    cube = cmds.polyCube(name="wmapCube")[0]
+    cluster = cmds.cluster(cube)[0]
+    count = cmds.polyEvaluate(cube, vertex=True)
+
+    # older .wmap files are keyed by the transform full path
+    weights = [i / float(count) for i in range(count)]
+    filePath = str(tmpdir.join("baseline.wmap"))
+    with open(filePath, "w") as fp:
+        json.dump({"|wmapCube": weights, "_deformed_index": ["|wmapCube"]}, fp)
+
+    wmap.import_weights(cluster, filePath)
+    index, shape = wmap.get_deformed_geometry(cluster)[0]
+    result = wmap.read_weights(cluster, index, count)
+    assert list(result) == pytest.approx(weights, abs=1e-6)
+
+    # the transform short name is also matched
+    wmap.set_weights_buffers(cluster, [("other:wmapCube", [1.0] * count)])
+    result = wmap.read_weights(cluster, index, count)
+    assert list(result) == pytest.approx([1.0] * count)
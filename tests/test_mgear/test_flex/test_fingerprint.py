@@ -0,0 +1,47 @@
+"""mgear.flex.fingerprint test"""
+import pytest
+
+pytest.importorskip("maya.api.OpenMaya")
+
+
+def _fingerprint(fingerprint, **kwargs):
+    values = dict((field, field) for field in fingerprint.Fingerprint._fields)
+    values.update(kwargs)
+    return fingerprint.Fingerprint(**values)
+
+
+def test_compare_fingerprints(setup_path):
+    # mGear imports
+    from mgear.flex import fingerprint
+
+    source = _fingerprint(fingerprint)
+    assert fingerprint.compare_fingerprints(source, source) == set()
+
+    target = _fingerprint(fingerprint, points="moved", attributes="changed")
+    assert fingerprint.compare_fingerprints(source, target) == set(
+        ["points", "attributes"])
+
+    # the transform only counts when the update replaces it
+    target = _fingerprint(fingerprint, transform="moved")
+    assert fingerprint.compare_fingerprints(source, target) == set()
+    assert fingerprint.compare_fingerprints(
+        source, target, compare_transform=True) == set(["transform"])
+
+
+@pytest.mark.parametrize("changes, expected", [
+    (set(), "unchanged"),
+    (set(["attributes"]), "attributes only"),
+    (set(["points"]), "points only"),
+    (set(["uvs", "attributes"]), "points only"),
+    (set(["normals"]), "points only"),
+    (set(["colors"]), "points only"),
+    (set(["creases"]), "points only"),
+    (set(["transform"]), "points only"),
+    (set(["topology", "points"]), "topology changed"),
+    (set(["type"]), "topology changed"),
+])
+def test_classify_changes(setup_path, changes, expected):
+    # mGear imports
+    from mgear.flex import fingerprint
+
+    assert fingerprint.classify_changes(changes) == expected
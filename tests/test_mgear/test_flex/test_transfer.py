@@ -0,0 +1,56 @@
+"""mgear.flex.transfer test"""
+import pytest
+
+om = pytest.importorskip("maya.api.OpenMaya")
+
+
+# two new points, each interpolating 2 of the 3 old points
+INDICES = [0, 1, 1, 2]
+WEIGHTS = [0.25, 0.75, 0.5, 0.5]
+# old values, two columns per point with normalized rows
+VALUES = [1.0, 0.0, 0.5, 0.5, 0.2, 0.8]
+
+
+def _mapping(transfer, monkeypatch, numpy_ready):
+    monkeypatch.setattr(transfer, "NUMPY_READY", numpy_ready)
+    mapping = transfer.PointMapping(INDICES, WEIGHTS, 2)
+    return [float(x) for x in mapping.apply(VALUES, 2)]
+
+
+def test_point_mapping_apply(setup_path, monkeypatch):
+    # mGear imports
+    from mgear.flex import transfer
+
+    result = _mapping(transfer, monkeypatch, False)
+    assert result == pytest.approx([0.625, 0.375, 0.35, 0.65])
+
+    # weights rows are still normalized
+    assert sum(result[:2]) == pytest.approx(1.0)
+    assert sum(result[2:]) == pytest.approx(1.0)
+
+
+def test_point_mapping_apply_numpy(setup_path, monkeypatch):
+    pytest.importorskip("numpy")
+    # mGear imports
+    from mgear.flex import transfer
+
+    result = _mapping(transfer, monkeypatch, True)
+    assert result == pytest.approx(_mapping(transfer, monkeypatch, False))
+
+
+@pytest.mark.parametrize("numpy_ready", [False, True])
+def test_closest_mapping(setup_path, monkeypatch, numpy_ready):
+    if numpy_ready:
+        pytest.importorskip("numpy")
+    # mGear imports
+    from mgear.flex import transfer
+
+    monkeypatch.setattr(transfer, "NUMPY_READY", numpy_ready)
+    old_points = om.MPointArray([om.MPoint(0, 0, 0), om.MPoint(1, 0, 0),
+                                 om.MPoint(2, 0, 0)])
+    points = om.MPointArray([om.MPoint(1.9, 0.1, 0), om.MPoint(-1, 0, 0),
+                             om.MPoint(0.6, 0, 0), om.MPoint(1, 0, 0)])
+
+    mapping = transfer.get_closest_mapping(old_points, points)
+    result = [float(x) for x in mapping.apply([10.0, 20.0, 30.0])]
+    assert result == [30.0, 10.0, 20.0, 20.0]
@@ -0,0 +1,103 @@
+"""mgear.uegear.bridge test"""
+
+import json
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class RemoteControlStub(BaseHTTPRequestHandler):
+    """Minimal Unreal Remote Control server. Calls return the parameters"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = set()
+    requests = []
+
+    def _call(self, body):
+        return {"return": repr(body["parameters"])}
+
+    def do_PUT(self):
+        RemoteControlStub.connections.add(self.client_address)
+        RemoteControlStub.requests.append(self.path)
+        length = int(self.headers["Content-Length"])
+        body = json.loads(self.rfile.read(length).decode("utf-8"))
+        status = 200
+        if body.get("functionName") == "error":
+            status = 500
+            result = {"errorMessage": "Function not found"}
+        elif self.path == "/remote/batch":
+            result = {
+                "Responses": [
+                    {
+                        "RequestId": r["RequestId"],
+                        "ResponseCode": 200,
+                        "ResponseBody": self._call(r["Body"]),
+                    }
+                    for r in body["Requests"]
+                ]
+            }
+        else:
+            result = self._call(body)
+        data = json.dumps(result).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RemoteControlStub)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def test_bridge_transport(setup_path):
+    # mGear imports
+    from mgear.uegear import bridge
+
+    server = _start_server()
+    try:
+        ue_bridge = bridge.UeGearBridge(port=server.server_address[1])
+        RemoteControlStub.connections.clear()
+        del RemoteControlStub.requests[:]
+
+        # safe decoding of the returned python literals
+        for i in range(3):
+            response = ue_bridge.execute("command", {"value": [i, "a"]})
+            assert response == {"return": {"value": [i, "a"]}}
+        # the connection is kept alive between calls
+        assert len(RemoteControlStub.connections) == 1
+
+        # error status are failed calls, not decoded as results
+        assert ue_bridge.execute("error") == {"return": False}
+        assert ue_bridge.execute("command", {"value": 1}) == {
+            "return": {"value": 1}
+        }
+
+        calls = [("command", {"index": i}) for i in range(450)]
+        responses = ue_bridge.execute_batch(calls, batch_size=200)
+        assert [r["return"]["index"] for r in responses] == list(range(450))
+        assert RemoteControlStub.requests.count("/remote/batch") == 3
+
+        future = ue_bridge.execute_async("command", {"value": 1})
+        assert future.result() == {"return": {"value": 1}}
+        batch_futures = ue_bridge.execute_batch_async(calls, batch_size=100)
+        indices = [
+            r["return"]["index"] for f in batch_futures for r in f.result()
+        ]
+        assert indices == list(range(450))
+    finally:
+        server.shutdown()
+        server.server_close()
+        bridge.close_connection_pools()
+
+    assert bridge.decode_return("__import__('os')") == "__import__('os')"
+    assert bridge.decode_return('{"a": 1}') == {"a": 1}